@@ -5,6 +5,7 @@ Simplified configuration with Redis broker and task_routes based queues
 import os
 from celery import Celery
 from celery.schedules import crontab
+from celery.signals import worker_process_init
 from app.config import get_settings
 
 settings = get_settings()
@@ -117,6 +118,24 @@ celery_app.conf.update(
             "task": "app.monitoring.tasks.send_daily_report",
             "schedule": crontab(hour=6, minute=0),  # Daily at 6 AM UTC
             "options": {"queue": "monitoring"}
+        },
+        # Incremental topic model update (no-op unless BERTOPIC_INCREMENTAL_ENABLED)
+        "update-topic-model-incremental": {
+            "task": "workers.nlp_pipeline.tasks.update_topic_model_incremental",
+            "schedule": _parse_cron_schedule(settings.bertopic_incremental_cron),
+            "options": {"queue": settings.queue_process_name}
+        },
+        # Retrain the local pre-classifier (no-op unless PRE_CLASSIFIER_ENABLED)
+        "train-pre-classifier": {
+            "task": "workers.nlp_pipeline.tasks.train_pre_classifier",
+            "schedule": _parse_cron_schedule(settings.pre_classifier_train_cron),
+            "options": {"queue": settings.queue_process_name}
+        },
+        # Bulk summary_ko quality scoring, flags posts for re-summarization
+        "check-summary-quality": {
+            "task": "workers.nlp_pipeline.tasks.check_summary_quality",
+            "schedule": _parse_cron_schedule(settings.summary_quality_cron),
+            "options": {"queue": settings.queue_process_name}
         }
     },
     beat_schedule_filename="celerybeat-schedule",
@@ -176,5 +195,13 @@ celery_app.conf.task_annotations = {
 celery_app.conf.task_soft_time_limit = 300  # 5 minutes
 celery_app.conf.task_time_limit = 600  # 10 minutes hard limit
 
+
+@worker_process_init.connect
+def init_worker_database(**kwargs) -> None:
+    """Give each prefork child its own small connection pool"""
+    from app.infrastructure import configure_worker_database
+    configure_worker_database()
+
+
 if __name__ == "__main__":
     celery_app.start()
\ No newline at end of file
@@ -25,6 +25,9 @@ class Settings(BaseSettings):
     database_url: str = Field(env="DATABASE_URL")
     database_pool_size: int = Field(default=10, env="DATABASE_POOL_SIZE")
     database_max_overflow: int = Field(default=20, env="DATABASE_MAX_OVERFLOW")
+    database_pool_recycle: int = Field(default=1800, env="DATABASE_POOL_RECYCLE")  # seconds
+    worker_database_pool_size: int = Field(default=2, env="WORKER_DATABASE_POOL_SIZE")  # per Celery prefork child
+    worker_database_max_overflow: int = Field(default=2, env="WORKER_DATABASE_MAX_OVERFLOW")
     
     # Redis
     redis_url: str = Field(env="REDIS_URL")
@@ -49,7 +52,28 @@ class Settings(BaseSettings):
     openai_api_key: Optional[str] = Field(default=None, env="OPENAI_API_KEY")
     openai_primary_model: str = Field(default="gpt-4o-mini", env="OPENAI_PRIMARY_MODEL")
     openai_fallback_model: str = Field(default="gpt-4o", env="OPENAI_FALLBACK_MODEL")
+    model_router_window_seconds: int = Field(default=300, env="MODEL_ROUTER_WINDOW_SECONDS")  # latency/error sliding window
+    model_router_min_samples: int = Field(default=10, env="MODEL_ROUTER_MIN_SAMPLES")  # calls before health is judged
+    model_router_max_error_rate: float = Field(default=0.5, env="MODEL_ROUTER_MAX_ERROR_RATE")
+    model_router_max_p95_latency_ms: int = Field(default=20000, env="MODEL_ROUTER_MAX_P95_LATENCY_MS")
+    model_router_long_prompt_tokens: int = Field(default=6000, env="MODEL_ROUTER_LONG_PROMPT_TOKENS")  # analysis prompts routed to the fallback model
+    model_router_max_escalation_share: float = Field(default=0.2, env="MODEL_ROUTER_MAX_ESCALATION_SHARE")  # cap on expensive-model share of recent calls
     openai_daily_tokens_limit: int = Field(default=100000, env="OPENAI_DAILY_TOKENS_LIMIT")  # daily token budget
+    openai_tpm_limit: int = Field(default=200000, env="OPENAI_TPM_LIMIT")  # tokens per minute (org limit)
+    openai_rate_limit_max_wait: int = Field(default=120, env="OPENAI_RATE_LIMIT_MAX_WAIT")  # seconds to wait for TPM window
+    openai_rate_limit_retries: int = Field(default=3, env="OPENAI_RATE_LIMIT_RETRIES")  # 429 retries on primary model
+    openai_streaming_enabled: bool = Field(default=True, env="OPENAI_STREAMING_ENABLED")  # validate JSON/tags while streaming
+    openai_stream_retries: int = Field(default=2, env="OPENAI_STREAM_RETRIES")  # immediate retries after a cancelled stream
+    llm_backend: str = Field(default="openai", env="LLM_BACKEND")  # openai | mock (offline load testing)
+    mock_llm_latency_median_ms: float = Field(default=800.0, env="MOCK_LLM_LATENCY_MEDIAN_MS")
+    mock_llm_latency_sigma: float = Field(default=0.5, env="MOCK_LLM_LATENCY_SIGMA")  # lognormal spread
+    mock_llm_rate_limit_rate: float = Field(default=0.0, env="MOCK_LLM_RATE_LIMIT_RATE")  # 429 probability per call
+    mock_llm_timeout_rate: float = Field(default=0.0, env="MOCK_LLM_TIMEOUT_RATE")  # timeout probability per call
+    mock_llm_completion_tokens: int = Field(default=300, env="MOCK_LLM_COMPLETION_TOKENS")
+    mock_llm_seed: int = Field(default=42, env="MOCK_LLM_SEED")
+    token_ledger_flush_size: int = Field(default=50, env="TOKEN_LEDGER_FLUSH_SIZE")  # records per bulk INSERT
+    token_ledger_flush_interval: int = Field(default=30, env="TOKEN_LEDGER_FLUSH_INTERVAL")  # seconds
+    token_ledger_max_buffer: int = Field(default=10000, env="TOKEN_LEDGER_MAX_BUFFER")  # records kept for retry while the DB is unavailable
     
     # Cost per 1K tokens (fixed internal cost map)
     cost_per_1k_tokens: Dict[str, float] = Field(default={
@@ -61,12 +85,82 @@ class Settings(BaseSettings):
     cost_gpt4o_mini_per_1k: float = Field(default=0.00015, env="COST_GPT4O_MINI_PER_1K")
     cost_gpt4o_per_1k: float = Field(default=0.005, env="COST_GPT4O_PER_1K")
     
+    # Sentence embeddings (topic modeling)
+    embedding_model_name: str = Field(default="all-MiniLM-L6-v2", env="EMBEDDING_MODEL_NAME")
+    embedding_batch_size: int = Field(default=64, env="EMBEDDING_BATCH_SIZE")
+    embedding_cache_dir: str = Field(default="models/embeddings", env="EMBEDDING_CACHE_DIR")
+    bertopic_model_dir: str = Field(default="models/bertopic", env="BERTOPIC_MODEL_DIR")
+    bertopic_inference_only: bool = Field(default=True, env="BERTOPIC_INFERENCE_ONLY")  # skip loading the transformer at startup
+    bertopic_incremental_enabled: bool = Field(default=False, env="BERTOPIC_INCREMENTAL_ENABLED")
+    bertopic_incremental_cron: str = Field(default="30 */6 * * *", env="BERTOPIC_INCREMENTAL_CRON")  # every 6 hours
+    bertopic_online_clusters: int = Field(default=20, env="BERTOPIC_ONLINE_CLUSTERS")  # MiniBatchKMeans topics
+    tag_similarity_threshold: float = Field(default=0.5, env="TAG_SIMILARITY_THRESHOLD")  # min cosine similarity
+    tag_mapping_top_k: int = Field(default=3, env="TAG_MAPPING_TOP_K")  # candidate tags per keyword
+    
+    # Local pre-classifier gating OpenAI processing
+    pre_classifier_enabled: bool = Field(default=False, env="PRE_CLASSIFIER_ENABLED")
+    pre_classifier_model_path: str = Field(default="models/pre_classifier/model.joblib", env="PRE_CLASSIFIER_MODEL_PATH")
+    pre_classifier_threshold: float = Field(default=0.5, env="PRE_CLASSIFIER_THRESHOLD")  # process at or above
+    pre_classifier_skip_threshold: float = Field(default=0.2, env="PRE_CLASSIFIER_SKIP_THRESHOLD")  # skip below, delay in between
+    pre_classifier_delay_seconds: int = Field(default=3600, env="PRE_CLASSIFIER_DELAY_SECONDS")
+    pre_classifier_min_samples: int = Field(default=50, env="PRE_CLASSIFIER_MIN_SAMPLES")  # per class
+    pre_classifier_unpublished_days: int = Field(default=7, env="PRE_CLASSIFIER_UNPUBLISHED_DAYS")  # processed but unpublished = negative
+    pre_classifier_train_cron: str = Field(default="0 4 * * 0", env="PRE_CLASSIFIER_TRAIN_CRON")  # weekly
+
+    # Summary quality checks (scheduled, in bulk)
+    summary_quality_enabled: bool = Field(default=True, env="SUMMARY_QUALITY_ENABLED")
+    summary_quality_cron: str = Field(default="*/30 * * * *", env="SUMMARY_QUALITY_CRON")
+    summary_quality_batch_size: int = Field(default=1000, env="SUMMARY_QUALITY_BATCH_SIZE")
+    summary_min_chars: int = Field(default=40, env="SUMMARY_MIN_CHARS")
+    summary_max_chars: int = Field(default=1500, env="SUMMARY_MAX_CHARS")
+    summary_min_hangul_ratio: float = Field(default=0.5, env="SUMMARY_MIN_HANGUL_RATIO")  # Hangul / all letters
+    summary_min_sentences: int = Field(default=2, env="SUMMARY_MIN_SENTENCES")
+    summary_max_sentences: int = Field(default=8, env="SUMMARY_MAX_SENTENCES")
+    summary_langid_model_path: str = Field(default="models/langid/lid.176.ftz", env="SUMMARY_LANGID_MODEL_PATH")  # optional fastText model
+    summary_langid_min_confidence: float = Field(default=0.5, env="SUMMARY_LANGID_MIN_CONFIDENCE")
+    summary_max_resummarize: int = Field(default=2, env="SUMMARY_MAX_RESUMMARIZE")  # then the post is marked failed
+    summary_resummarize_chunk_size: int = Field(default=20, env="SUMMARY_RESUMMARIZE_CHUNK_SIZE")  # posts per resummarize task
+    
+    # Concurrent analysis (AIMD concurrency limit, backs off on 429)
+    analysis_initial_concurrency: int = Field(default=4, env="ANALYSIS_INITIAL_CONCURRENCY")
+    analysis_min_concurrency: int = Field(default=1, env="ANALYSIS_MIN_CONCURRENCY")
+    analysis_max_concurrency: int = Field(default=16, env="ANALYSIS_MAX_CONCURRENCY")  # thread pool size
+    nlp_checkpoint_ttl: int = Field(default=86400, env="NLP_CHECKPOINT_TTL")  # seconds to keep per-stage results for retries
+    
     # Ghost CMS
     ghost_admin_key: Optional[str] = Field(default=None, env="GHOST_ADMIN_KEY")
     ghost_api_url: str = Field(env="GHOST_API_URL")
     ghost_jwt_expiry: int = Field(default=300, env="GHOST_JWT_EXPIRY")  # 5 minutes
+    ghost_http_pool_size: int = Field(default=10, env="GHOST_HTTP_POOL_SIZE")  # keep-alive connections per process
+    ghost_http_timeout: int = Field(default=30, env="GHOST_HTTP_TIMEOUT")  # seconds
+    ghost_http2_enabled: bool = Field(default=False, env="GHOST_HTTP2_ENABLED")  # requires the h2 package
+    ghost_tag_sync_ttl: int = Field(default=3600, env="GHOST_TAG_SYNC_TTL")  # seconds between fleet-wide full tag syncs
+    ghost_tag_claim_ttl: int = Field(default=30, env="GHOST_TAG_CLAIM_TTL")  # seconds a worker holds a tag creation claim
+    ghost_tag_claim_wait: float = Field(default=5.0, env="GHOST_TAG_CLAIM_WAIT")  # seconds to wait for a tag another worker is creating
+    ghost_tag_create_concurrency: int = Field(default=4, env="GHOST_TAG_CREATE_CONCURRENCY")  # parallel tag creations per post
     default_og_image_url: str = Field(default="", env="DEFAULT_OG_IMAGE_URL")  # fallback OG image
     
+    # Image pipeline
+    image_concurrency: int = Field(default=4, env="IMAGE_CONCURRENCY")  # images downloaded/uploaded in parallel per post
+    image_process_workers: int = Field(default=2, env="IMAGE_PROCESS_WORKERS")  # PIL worker processes; 0 processes in-thread
+    image_output_format: str = Field(default="webp", env="IMAGE_OUTPUT_FORMAT")  # webp, avif (falls back to webp if unsupported) or jpeg
+    image_webp_quality: int = Field(default=80, env="IMAGE_WEBP_QUALITY")
+    image_avif_quality: int = Field(default=60, env="IMAGE_AVIF_QUALITY")
+    image_webp_method: int = Field(default=4, env="IMAGE_WEBP_METHOD")  # 0-6, higher is smaller and slower
+    image_avif_speed: int = Field(default=8, env="IMAGE_AVIF_SPEED")  # 0-10, lower is smaller and much slower
+    image_max_pixels: int = Field(default=2073600, env="IMAGE_MAX_PIXELS")  # output pixel budget (1920x1080)
+    image_dedup_enabled: bool = Field(default=True, env="IMAGE_DEDUP_ENABLED")  # reuse Ghost URLs by source URL / content hash
+    image_cache_ttl: int = Field(default=2592000, env="IMAGE_CACHE_TTL")  # seconds in the Redis hot cache (30 days)
+    
+    # Template rendering
+    template_render_cache_enabled: bool = Field(default=True, env="TEMPLATE_RENDER_CACHE_ENABLED")  # reuse rendered HTML by content_hash
+    template_render_cache_ttl: int = Field(default=604800, env="TEMPLATE_RENDER_CACHE_TTL")  # seconds in Redis (7 days)
+    template_render_cache_size: int = Field(default=256, env="TEMPLATE_RENDER_CACHE_SIZE")  # in-process LRU entries; 0 disables
+    template_reload_enabled: bool = Field(default=True, env="TEMPLATE_RELOAD_ENABLED")  # recompile changed .hbs files in the background
+    template_reload_interval: float = Field(default=2.0, env="TEMPLATE_RELOAD_INTERVAL")  # seconds between template mtime checks
+    template_type_detection: bool = Field(default=True, env="TEMPLATE_TYPE_DETECTION")  # use list/qa templates for matching posts
+    template_subreddit_map: str = Field(default="", env="TEMPLATE_SUBREDDIT_MAP")  # e.g. "askreddit:qa,python:subreddits/python"
+    
     # Scheduling (Cron expressions)
     collect_cron: str = Field(default="0 * * * *", env="COLLECT_CRON")  # hourly collection
     backup_cron: str = Field(default="0 4 * * *", env="BACKUP_CRON")    # daily backup at 4 AM
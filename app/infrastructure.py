@@ -3,6 +3,8 @@ Infrastructure initialization and management
 """
 import asyncio
 import logging
+import os
+import socket
 from typing import Dict, Any, AsyncGenerator
 from contextlib import asynccontextmanager
 from sqlalchemy import create_engine, text
@@ -10,40 +12,113 @@ from sqlalchemy.engine import Engine
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine, AsyncSession, async_sessionmaker
 import redis.asyncio as redis
+import redis as redis_sync
 
 from app.config import get_settings, get_database_url, get_redis_url
 
 logger = logging.getLogger(__name__)
 
+# Redis hash of engine creations per "host:pid" (exported by /metrics)
+ENGINE_CREATIONS_KEY = "metrics:db_engine_creations"
+
 # Global instances
 _database_engine: Engine = None
+_database_engine_pid: int = None
+_engine_creations = 0
+_worker_process = False
 _session_factory: sessionmaker = None
 _async_database_engine: AsyncEngine = None
 _async_session_factory: async_sessionmaker = None
 _redis_client: redis.Redis = None
 
 
+def _record_engine_creation() -> None:
+    """Count engine creations per process in Redis (best effort)"""
+    try:
+        client = redis_sync.from_url(get_redis_url(), decode_responses=True)
+        pipe = client.pipeline(transaction=False)
+        pipe.hincrby(ENGINE_CREATIONS_KEY, f"{socket.gethostname()}:{os.getpid()}", 1)
+        pipe.expire(ENGINE_CREATIONS_KEY, 24 * 3600)
+        pipe.execute()
+    except Exception as e:
+        logger.warning(f"Failed to record database engine creation: {e}")
+
+
 def get_database() -> Engine:
-    """Get database engine instance"""
-    global _database_engine
+    """
+    Get the per-process pooled database engine
+    
+    Created once per process. An engine inherited across fork (Celery prefork)
+    is dropped without closing the parent's connections and recreated.
+    """
+    global _database_engine, _database_engine_pid, _session_factory, _engine_creations
+    
+    if _database_engine is not None and _database_engine_pid != os.getpid():
+        _database_engine.dispose(close=False)
+        _database_engine = None
+        _session_factory = None
     
     if _database_engine is None:
         database_url = get_database_url()
         settings = get_settings()
         
+        # A prefork child runs one task at a time; keep its pool small
+        if _worker_process:
+            pool_size = settings.worker_database_pool_size
+            max_overflow = settings.worker_database_max_overflow
+        else:
+            pool_size = settings.database_pool_size
+            max_overflow = settings.database_max_overflow
+        
         _database_engine = create_engine(
             database_url,
-            pool_size=settings.database_pool_size,
-            max_overflow=settings.database_max_overflow,
+            pool_size=pool_size,
+            max_overflow=max_overflow,
             pool_pre_ping=True,
+            pool_recycle=settings.database_pool_recycle,
             echo=settings.debug
         )
+        _database_engine_pid = os.getpid()
+        _engine_creations += 1
+        _record_engine_creation()
         
-        logger.info("Database engine created", url=database_url.split('@')[-1] if '@' in database_url else database_url)
+        logger.info(
+            f"Database engine created (pid={_database_engine_pid}, pool_size={pool_size}, "
+            f"max_overflow={max_overflow}): {database_url.split('@')[-1] if '@' in database_url else database_url}"
+        )
     
     return _database_engine
 
 
+def configure_worker_database() -> None:
+    """Use per-child pool sizing (called from Celery worker_process_init)"""
+    global _worker_process, _database_engine, _session_factory
+    
+    _worker_process = True
+    if _database_engine is not None:
+        # Connections inherited from the parent must not be shared across processes
+        _database_engine.dispose(close=False)
+        _database_engine = None
+        _session_factory = None
+
+
+def get_database_stats() -> Dict[str, Any]:
+    """Engine creations and pool usage for this process"""
+    stats = {
+        "pid": os.getpid(),
+        "engine_creations": _engine_creations,
+        "worker_process": _worker_process
+    }
+    if _database_engine is not None:
+        pool = _database_engine.pool
+        stats.update({
+            "pool_size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "overflow": pool.overflow()
+        })
+    return stats
+
+
 def get_async_database() -> AsyncEngine:
     """Get async database engine instance"""
     global _async_database_engine
@@ -77,8 +152,8 @@ def get_session_factory() -> sessionmaker:
     """Get synchronous session factory"""
     global _session_factory
     
+    engine = get_database()  # recreates the engine (and drops this factory) after fork
     if _session_factory is None:
-        engine = get_database()
         _session_factory = sessionmaker(
             bind=engine,
             expire_on_commit=False
@@ -93,6 +168,11 @@ def get_database_session() -> Session:
     return session_factory()
 
 
+def get_db_session() -> Session:
+    """Get synchronous database session (closes on exit when used in a with block)"""
+    return get_database_session()
+
+
 def get_async_session_factory() -> async_sessionmaker:
     """Get async session factory"""
     global _async_session_factory
@@ -143,11 +223,12 @@ def get_redis_client() -> redis.Redis:
 
 def close_database():
     """Close database connections"""
-    global _database_engine, _session_factory
+    global _database_engine, _database_engine_pid, _session_factory
     
     if _database_engine is not None:
         _database_engine.dispose()
         _database_engine = None
+        _database_engine_pid = None
         _session_factory = None
         logger.info("Database connections closed")
 
@@ -31,6 +31,7 @@ class MediaFile(BaseModel):
     ghost_url: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     file_type: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
     file_size: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    content_sha256: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)  # hash of the downloaded bytes
     processed_at: Mapped[Optional[datetime]] = mapped_column(nullable=True)
     
     # Relationship
@@ -41,6 +42,8 @@ class MediaFile(BaseModel):
         Index("idx_media_files_post_id", "post_id"),
         Index("idx_media_files_processed_at", "processed_at"),
         Index("idx_media_files_file_type", "file_type"),
+        Index("idx_media_files_content_sha256", "content_sha256"),
+        Index("idx_media_files_original_url", "original_url", postgresql_using="hash"),
     )
     
     def __repr__(self) -> str:
@@ -76,7 +76,7 @@ class Post(BaseModel):
     # Table constraints
     __table_args__ = (
         CheckConstraint(
-            "status IN ('collected', 'processing', 'processed', 'published', 'failed')",
+            "status IN ('collected', 'processing', 'processed', 'published', 'failed', 'skipped')",
             name="check_post_status"
         ),
         CheckConstraint(
@@ -172,7 +172,7 @@ class Post(BaseModel):
     
     def validate_status(self) -> bool:
         """Validate that status is one of allowed values"""
-        allowed_statuses = {"collected", "processing", "processed", "published", "failed"}
+        allowed_statuses = {"collected", "processing", "processed", "published", "failed", "skipped"}
         return self.status in allowed_statuses
     
     def validate_takedown_status(self) -> bool:
@@ -216,7 +216,7 @@ class Post(BaseModel):
             errors.append("Comments count must be non-negative")
         
         if not self.validate_status():
-            errors.append("Status must be one of: collected, processing, processed, published, failed")
+            errors.append("Status must be one of: collected, processing, processed, published, failed, skipped")
         
         if not self.validate_takedown_status():
             errors.append("Takedown status must be one of: active, takedown_pending, removed")
@@ -35,6 +35,11 @@ class TokenUsage(BaseModel):
     output_tokens: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
     cost_usd: Mapped[Optional[Decimal]] = mapped_column(DECIMAL(10, 6), nullable=True)
     
+    # Prompt caching (input tokens served from the provider cache) and call latency
+    cached_tokens: Mapped[int] = mapped_column(Integer, default=0, server_default="0", nullable=False)
+    prompt_version: Mapped[Optional[str]] = mapped_column(String(20), nullable=True)
+    latency_ms: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    
     # Relationship
     post = relationship("Post", back_populates="token_usage")
     
@@ -54,6 +59,13 @@ class TokenUsage(BaseModel):
         """Get total tokens used (input + output)"""
         return self.input_tokens + self.output_tokens
     
+    @property
+    def cache_hit_ratio(self) -> float:
+        """Fraction of input tokens served from the prompt cache"""
+        if not self.input_tokens:
+            return 0.0
+        return self.cached_tokens / self.input_tokens
+    
     @property
     def cost_formatted(self) -> str:
         """Get formatted cost string"""
@@ -114,7 +126,11 @@ class TokenUsage(BaseModel):
     
     def validate_tokens(self) -> bool:
         """Validate that token counts are non-negative"""
-        return self.input_tokens >= 0 and self.output_tokens >= 0
+        return (
+            self.input_tokens >= 0
+            and self.output_tokens >= 0
+            and 0 <= (self.cached_tokens or 0) <= self.input_tokens
+        )
     
     def validate_cost(self) -> bool:
         """Validate that cost is non-negative if provided"""
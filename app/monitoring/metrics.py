@@ -245,6 +245,69 @@ class MetricsCollector:
             logger.error(f"Failed to get token usage metrics: {e}")
             return self._get_empty_token_metrics()
     
+    def get_model_metrics(self, time_window_hours: int = 1) -> List[Dict[str, Any]]:
+        """
+        Get per-model call latency percentiles and cost from the token ledger
+        
+        Args:
+            time_window_hours: Time window in hours for metrics collection
+            
+        Returns:
+            List of per-model dictionaries (model, calls, p50/p95 latency, cost)
+        """
+        try:
+            start_time = datetime.utcnow() - timedelta(hours=time_window_hours)
+            
+            query = self.db_session.query(
+                TokenUsage.model,
+                func.count(TokenUsage.id).label('calls'),
+                func.percentile_cont(0.5).within_group(TokenUsage.latency_ms).label('p50_latency_ms'),
+                func.percentile_cont(0.95).within_group(TokenUsage.latency_ms).label('p95_latency_ms'),
+                func.sum(TokenUsage.input_tokens + TokenUsage.output_tokens).label('total_tokens'),
+                func.sum(TokenUsage.cost_usd).label('total_cost')
+            ).filter(
+                TokenUsage.created_at >= start_time,
+                TokenUsage.service == "openai",
+                TokenUsage.model.isnot(None)
+            ).group_by(TokenUsage.model)
+            
+            return [
+                {
+                    "model": row.model,
+                    "calls": row.calls or 0,
+                    "p50_latency_ms": float(row.p50_latency_ms or 0),
+                    "p95_latency_ms": float(row.p95_latency_ms or 0),
+                    "total_tokens": int(row.total_tokens or 0),
+                    "cost_usd": float(row.total_cost or 0)
+                }
+                for row in query.all()
+            ]
+            
+        except Exception as e:
+            logger.error(f"Failed to get model metrics: {e}")
+            return []
+    
+    def get_database_engine_metrics(self) -> Dict[str, int]:
+        """
+        Get database engine creations per process ("host:pid") from Redis
+        
+        Each process should report exactly 1; more means engines are being
+        rebuilt (and connections re-opened) at runtime.
+        
+        Returns:
+            Dictionary mapping process to engine creation count
+        """
+        try:
+            import redis
+            from app.infrastructure import ENGINE_CREATIONS_KEY
+            
+            client = redis.from_url(self.settings.redis_url, decode_responses=True)
+            return {process: int(count) for process, count in client.hgetall(ENGINE_CREATIONS_KEY).items()}
+            
+        except Exception as e:
+            logger.error(f"Failed to get database engine metrics: {e}")
+            return {}
+    
     def get_recent_failure_rate(self, time_window_minutes: int = 5) -> float:
         """
         Get failure rate for recent time window (sliding window)
@@ -447,7 +510,9 @@ class PrometheusFormatter:
         error_metrics: Dict[str, int],
         token_metrics: Dict[str, float],
         queue_metrics: Dict[str, int],
-        failure_rate: float
+        failure_rate: float,
+        model_metrics: Optional[List[Dict[str, Any]]] = None,
+        engine_metrics: Optional[Dict[str, int]] = None
     ) -> str:
         """
         Format all metrics in Prometheus text format
@@ -458,6 +523,8 @@ class PrometheusFormatter:
             token_metrics: Token usage metrics dictionary
             queue_metrics: Queue metrics dictionary
             failure_rate: Recent failure rate
+            model_metrics: Optional per-model latency/cost metrics
+            engine_metrics: Optional database engine creations per process
             
         Returns:
             Prometheus formatted metrics string
@@ -603,6 +670,37 @@ class PrometheusFormatter:
             ""
         ])
         
+        # Per-model latency and cost (last hour, from the token ledger)
+        if model_metrics:
+            prometheus_output.extend([
+                "# HELP openai_model_latency_ms OpenAI call latency by model over the last hour",
+                "# TYPE openai_model_latency_ms summary"
+            ])
+            for row in model_metrics:
+                prometheus_output.extend([
+                    f'openai_model_latency_ms{{model="{row["model"]}",quantile="0.5"}} {row["p50_latency_ms"]:.0f}',
+                    f'openai_model_latency_ms{{model="{row["model"]}",quantile="0.95"}} {row["p95_latency_ms"]:.0f}',
+                    f'openai_model_latency_ms_count{{model="{row["model"]}"}} {row["calls"]}'
+                ])
+            prometheus_output.extend([
+                "",
+                "# HELP openai_model_cost_usd OpenAI cost by model over the last hour",
+                "# TYPE openai_model_cost_usd gauge"
+            ])
+            for row in model_metrics:
+                prometheus_output.append(f'openai_model_cost_usd{{model="{row["model"]}"}} {row["cost_usd"]:.6f}')
+            prometheus_output.append("")
+        
+        # Database engine creations per process (expected: 1)
+        if engine_metrics:
+            prometheus_output.extend([
+                "# HELP db_engine_creations_total Database engines created per process",
+                "# TYPE db_engine_creations_total counter"
+            ])
+            for process, count in sorted(engine_metrics.items()):
+                prometheus_output.append(f'db_engine_creations_total{{process="{process}"}} {count}')
+            prometheus_output.append("")
+        
         return "\n".join(prometheus_output)
 
 
@@ -624,6 +722,8 @@ def get_all_metrics(db_session: Session) -> str:
     token_metrics = collector.get_token_usage_metrics()
     queue_metrics = collector.get_queue_metrics()
     failure_rate = collector.get_recent_failure_rate()
+    model_metrics = collector.get_model_metrics()
+    engine_metrics = collector.get_database_engine_metrics()
     
     # Format as Prometheus metrics
     return PrometheusFormatter.format_metrics(
@@ -631,5 +731,7 @@ def get_all_metrics(db_session: Session) -> str:
         error_metrics,
         token_metrics,
         queue_metrics,
-        failure_rate
+        failure_rate,
+        model_metrics,
+        engine_metrics
     )
\ No newline at end of file
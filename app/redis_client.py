@@ -146,6 +146,42 @@ class RedisClient:
             logger.error(f"Redis EXPIRE failed for key {key}: {e}")
             return False
     
+    async def mget(self, keys: List[str]) -> List[Optional[Any]]:
+        """Get multiple values in a single round trip"""
+        if not keys:
+            return []
+        try:
+            values = await self._client.mget(keys)
+            
+            # Try to parse each value as JSON
+            parsed_values = []
+            for value in values:
+                try:
+                    parsed_values.append(json.loads(value) if value is not None else None)
+                except (json.JSONDecodeError, TypeError):
+                    parsed_values.append(value)
+            
+            return parsed_values
+        except Exception as e:
+            logger.error(f"Redis MGET failed for {len(keys)} keys: {e}")
+            return [None] * len(keys)
+    
+    async def mset(self, mapping: Dict[str, Any], ex: Optional[int] = None) -> bool:
+        """Set multiple key-value pairs in one pipelined round trip with optional expiration"""
+        if not mapping:
+            return True
+        try:
+            async with self._client.pipeline(transaction=False) as pipe:
+                for key, value in mapping.items():
+                    if isinstance(value, (dict, list)):
+                        value = json.dumps(value)
+                    pipe.set(key, value, ex=ex)
+                results = await pipe.execute()
+            return all(results)
+        except Exception as e:
+            logger.error(f"Redis MSET failed for {len(mapping)} keys: {e}")
+            return False
+    
     # Hash operations
     async def hset(self, name: str, mapping: Dict[str, Any]) -> int:
         """Set hash fields"""
@@ -341,6 +377,14 @@ class RedisClient:
         cache_key = f"cache:{key}"
         return await self.get(cache_key)
     
+    async def cache_mget(self, keys: List[str]) -> List[Optional[Any]]:
+        """Get multiple entries from cache"""
+        return await self.mget([f"cache:{key}" for key in keys])
+    
+    async def cache_mset(self, mapping: Dict[str, Any], ttl: int = 3600) -> bool:
+        """Set multiple cache entries with TTL"""
+        return await self.mset({f"cache:{key}": value for key, value in mapping.items()}, ex=ttl)
+    
     async def cache_delete(self, key: str) -> int:
         """Delete from cache"""
         cache_key = f"cache:{key}"
@@ -0,0 +1,31 @@
+"""add_prompt_cache_columns_to_token_usage
+
+Revision ID: c4e2a7d91f03
+Revises: 9f47a4c1b294
+Create Date: 2026-10-18 09:12:41.518203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4e2a7d91f03'
+down_revision: Union[str, None] = '9f47a4c1b294'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Track provider-side prompt cache hits and latency per OpenAI call
+    op.add_column('token_usage', sa.Column('cached_tokens', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('token_usage', sa.Column('prompt_version', sa.String(length=20), nullable=True))
+    op.add_column('token_usage', sa.Column('latency_ms', sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('token_usage', 'latency_ms')
+    op.drop_column('token_usage', 'prompt_version')
+    op.drop_column('token_usage', 'cached_tokens')
@@ -0,0 +1,38 @@
+"""allow_skipped_post_status
+
+Revision ID: d7f3b9e2a614
+Revises: e5b81c0d4a27
+Create Date: 2026-10-18 22:05:17.284519
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd7f3b9e2a614'
+down_revision: Union[str, None] = 'e5b81c0d4a27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Terminal status for posts the pre-classifier keeps away from OpenAI
+    op.drop_constraint('check_post_status', 'posts', type_='check')
+    op.create_check_constraint(
+        'check_post_status',
+        'posts',
+        "status IN ('collected', 'processing', 'processed', 'published', 'failed', 'skipped')"
+    )
+
+
+def downgrade() -> None:
+    op.execute("UPDATE posts SET status = 'collected' WHERE status = 'skipped'")
+    op.drop_constraint('check_post_status', 'posts', type_='check')
+    op.create_check_constraint(
+        'check_post_status',
+        'posts',
+        "status IN ('collected', 'processing', 'processed', 'published', 'failed')"
+    )
@@ -0,0 +1,31 @@
+"""add_content_sha256_to_media_files
+
+Revision ID: e5b81c0d4a27
+Revises: c4e2a7d91f03
+Create Date: 2026-10-18 21:40:12.904117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5b81c0d4a27'
+down_revision: Union[str, None] = 'c4e2a7d91f03'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Image dedup: look up hosted images by content hash and by source URL
+    op.add_column('media_files', sa.Column('content_sha256', sa.String(length=64), nullable=True))
+    op.create_index('idx_media_files_content_sha256', 'media_files', ['content_sha256'], unique=False)
+    op.create_index('idx_media_files_original_url', 'media_files', ['original_url'], unique=False, postgresql_using='hash')
+
+
+def downgrade() -> None:
+    op.drop_index('idx_media_files_original_url', table_name='media_files')
+    op.drop_index('idx_media_files_content_sha256', table_name='media_files')
+    op.drop_column('media_files', 'content_sha256')
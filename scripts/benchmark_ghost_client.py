@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Per-request latency of Ghost Admin API calls: one connection per request
+(module-level requests.request, the old behaviour) vs the pooled keep-alive
+session owned by GhostClient
+
+Runs mock_ghost_api.py in-process by default; pass --base-url to target a real Ghost.
+On loopback the TCP handshake is nearly free, so use --tls (self-signed, needs
+the cryptography package) to include the TLS handshake a hosted Ghost costs.
+
+Examples:
+    python scripts/benchmark_ghost_client.py --requests 500
+    python scripts/benchmark_ghost_client.py --requests 500 --tls
+    python scripts/benchmark_ghost_client.py --requests 500 --tls --concurrency 8
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from socketserver import ThreadingMixIn
+from wsgiref.simple_server import ServerHandler, WSGIRequestHandler, WSGIServer, make_server
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Mock credentials so GhostClient can sign JWTs (key_id:hex_secret)
+os.environ.setdefault("GHOST_ADMIN_KEY", "benchmark:" + "ab" * 32)
+os.environ.setdefault("GHOST_API_URL", "http://127.0.0.1:3001")
+
+import requests
+import urllib3
+
+from workers.publisher.ghost_client import GhostClient
+
+
+def _percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+class ConnectionCounter:
+    """Counts sockets opened by urllib3, including reconnects of dropped pooled connections"""
+
+    def __init__(self):
+        self.opened = 0
+        self._lock = threading.Lock()
+        self._original = urllib3.connection.HTTPConnection._new_conn
+
+    def install(self):
+        counter = self
+
+        def _new_conn(connection):
+            with counter._lock:
+                counter.opened += 1
+            return counter._original(connection)
+
+        urllib3.connection.HTTPConnection._new_conn = _new_conn
+
+    def uninstall(self):
+        urllib3.connection.HTTPConnection._new_conn = self._original
+
+
+class _KeepAliveServerHandler(ServerHandler):
+    http_version = "1.1"
+
+
+class _KeepAliveRequestHandler(WSGIRequestHandler):
+    """
+    wsgiref handler that serves several requests per connection
+    (the werkzeug dev server always answers Connection: close)
+    """
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True  # headers and body are separate writes; avoid delayed-ACK stalls
+
+    def handle(self):
+        self.close_connection = True
+        self.handle_one_request()
+        while not self.close_connection:
+            self.handle_one_request()
+
+    def handle_one_request(self):
+        self.raw_requestline = self.rfile.readline(65537)
+        if not self.raw_requestline:
+            self.close_connection = True
+            return
+        if not self.parse_request():
+            return
+        handler = _KeepAliveServerHandler(
+            self.rfile, self.wfile, self.get_stderr(), self.get_environ(), multithread=True
+        )
+        handler.request_handler = self
+        handler.run(self.server.get_app())
+
+    def log_message(self, *args):
+        pass
+
+
+class _ThreadingWSGIServer(ThreadingMixIn, WSGIServer):
+    daemon_threads = True
+
+
+def start_mock_server(port, tls):
+    """Serve mock_ghost_api.py over HTTP/1.1 keep-alive, optionally behind a self-signed TLS cert"""
+    from mock_ghost_api import app
+
+    server = make_server("127.0.0.1", port, app, server_class=_ThreadingWSGIServer,
+                         handler_class=_KeepAliveRequestHandler)
+    if tls:
+        from werkzeug.serving import generate_adhoc_ssl_context
+        server.socket = generate_adhoc_ssl_context().wrap_socket(server.socket, server_side=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def run(call, count, concurrency):
+    """Run `call` count times and return per-request latencies in ms"""
+    def timed(_):
+        started = time.perf_counter()
+        call()
+        return (time.perf_counter() - started) * 1000
+
+    if concurrency <= 1:
+        return [timed(i) for i in range(count)]
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        return list(executor.map(timed, range(count)))
+
+
+def summarize(latencies, elapsed):
+    return {
+        "requests": len(latencies),
+        "mean_ms": round(statistics.mean(latencies), 3),
+        "p50_ms": round(statistics.median(latencies), 3),
+        "p95_ms": round(_percentile(latencies, 95), 3),
+        "requests_per_sec": round(len(latencies) / elapsed, 1) if elapsed else None
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark GhostClient connection reuse")
+    parser.add_argument("--requests", type=int, default=300, help="Requests per mode")
+    parser.add_argument("--concurrency", type=int, default=1, help="Concurrent threads")
+    parser.add_argument("--port", type=int, default=3001, help="Port for the in-process mock server")
+    parser.add_argument("--tls", action="store_true", help="Serve the mock over HTTPS (self-signed)")
+    parser.add_argument("--base-url", help="Admin API base URL of an existing server (skips the mock)")
+    parser.add_argument("--endpoint", default="site/", help="GET endpoint to call")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    server = None
+    verify = True
+    if args.base_url:
+        base_url = args.base_url.rstrip("/") + "/"
+    else:
+        server = start_mock_server(args.port, args.tls)
+        scheme = "https" if args.tls else "http"
+        base_url = f"{scheme}://127.0.0.1:{args.port}/ghost/api/v5/admin/"
+        verify = not args.tls
+        if args.tls:
+            urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+    client = GhostClient()
+    client.base_url = base_url
+    if not verify:
+        session = client._get_session()
+        session.verify = False
+        session.trust_env = False  # REQUESTS_CA_BUNDLE would otherwise re-enable verification
+    url = f"{base_url}{args.endpoint}"
+
+    counter = ConnectionCounter()
+    counter.install()
+
+    def per_request_connection():
+        response = requests.request("GET", url, headers=client._get_headers(), timeout=30, verify=verify)
+        response.raise_for_status()
+
+    def pooled_session():
+        client._make_request_with_retry("GET", args.endpoint)
+
+    # Warm up both paths (JWT generation, server threads)
+    per_request_connection()
+    pooled_session()
+
+    results = {}
+    for mode, call in (("per_request_connection", per_request_connection), ("pooled_session", pooled_session)):
+        counter.opened = 0
+        started = time.perf_counter()
+        latencies = run(call, args.requests, args.concurrency)
+        results[mode] = summarize(latencies, time.perf_counter() - started)
+        results[mode]["connections_opened"] = counter.opened
+
+    before, after = results["per_request_connection"], results["pooled_session"]
+    results["p50_speedup"] = round(before["p50_ms"] / after["p50_ms"], 2) if after["p50_ms"] else None
+    results["concurrency"] = args.concurrency
+    results["target"] = base_url
+
+    counter.uninstall()
+    client.close()
+    if server:
+        server.shutdown()
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"📊 Ghost client benchmark against {base_url} (concurrency={args.concurrency})")
+    for mode in ("per_request_connection", "pooled_session"):
+        stats = results[mode]
+        print(
+            f"  {mode}: mean={stats['mean_ms']}ms p50={stats['p50_ms']}ms "
+            f"p95={stats['p95_ms']}ms ({stats['requests_per_sec']} req/s, "
+            f"{stats['connections_opened']} connections)"
+        )
+    print(f"  p50 speedup: {results['p50_speedup']}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+CPU time and output size of ImageHandler transcoding per output format
+
+Compares the previous pipeline (full decode, convert, LANCZOS thumbnail,
+JPEG/PNG with optimize=True) with transcode_image (draft/reduce/resize) for
+JPEG, WebP and, when Pillow supports it, AVIF output.
+
+The default corpus is generated deterministically (fixed seed), so runs are
+comparable across machines; pass --corpus to use a directory of real images.
+
+Examples:
+    python scripts/benchmark_image_transcode.py
+    python scripts/benchmark_image_transcode.py --repeat 5 --json
+    python scripts/benchmark_image_transcode.py --corpus ~/reddit-images
+"""
+
+import argparse
+import io
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("GHOST_API_URL", "http://127.0.0.1:3001")
+
+from PIL import Image, ImageDraw, ImageFilter, ImageOps
+
+from workers.publisher.image_handler import avif_supported, sniff_image_type, transcode_image
+
+MAX_DIMENSIONS = (1920, 1080)
+MAX_PIXELS = 1920 * 1080
+QUALITY = {"jpeg": 85, "webp": 80, "avif": 60}
+WEBP_METHOD = 4
+AVIF_SPEED = 8
+
+
+def legacy_transcode(image_data, content_type, max_dimensions, quality):
+    """The pre-draft pipeline, kept here as the baseline"""
+    image = Image.open(io.BytesIO(image_data))
+    if image.mode in ('RGBA', 'LA', 'P'):
+        background = Image.new('RGB', image.size, (255, 255, 255))
+        if image.mode == 'P':
+            image = image.convert('RGBA')
+        background.paste(image, mask=image.split()[-1] if image.mode == 'RGBA' else None)
+        image = background
+    elif image.mode != 'RGB':
+        image = image.convert('RGB')
+    image = ImageOps.exif_transpose(image)
+    if image.size[0] > max_dimensions[0] or image.size[1] > max_dimensions[1]:
+        image.thumbnail(max_dimensions, Image.Resampling.LANCZOS)
+    output = io.BytesIO()
+    if content_type in ('image/png', 'image/gif'):
+        image.save(output, format='PNG', optimize=True)
+        return output.getvalue(), 'image/png'
+    image.save(output, format='JPEG', quality=quality, optimize=True)
+    return output.getvalue(), 'image/jpeg'
+
+
+def _photo(rng, size):
+    """Noisy gradient with soft shapes: compresses like a camera photo"""
+    image = Image.linear_gradient('L').resize(size).convert('RGB')
+    draw = ImageDraw.Draw(image)
+    for _ in range(40):
+        x, y = rng.randrange(size[0]), rng.randrange(size[1])
+        radius = rng.randrange(50, size[0] // 4)
+        color = tuple(rng.randrange(256) for _ in range(3))
+        draw.ellipse((x - radius, y - radius, x + radius, y + radius), fill=color)
+    image = image.filter(ImageFilter.GaussianBlur(8))
+    noise = Image.effect_noise(size, 24).convert('RGB')
+    return Image.blend(image, noise, 0.15)
+
+
+def _screenshot(rng, size):
+    """Flat UI blocks and text-like strokes: compresses like a screenshot"""
+    image = Image.new('RGB', size, (250, 250, 250))
+    draw = ImageDraw.Draw(image)
+    y = 20
+    while y < size[1] - 40:
+        draw.rectangle((20, y, size[0] - 20, y + 60), fill=(235, 238, 242))
+        for x in range(40, size[0] - 60, 18):
+            if rng.random() < 0.8:
+                draw.line((x, y + 20, x + 12, y + 20), fill=(30, 30, 30), width=3)
+        y += 80
+    return image
+
+
+def build_corpus(seed=20240611):
+    """Fixed set of (name, bytes) covering the shapes seen in Reddit posts"""
+    rng = random.Random(seed)
+    corpus = []
+
+    photo = _photo(rng, (4032, 3024))
+    exif = photo.getexif()
+    exif[0x0112] = 6  # portrait phone photo stored sideways
+    buffer = io.BytesIO()
+    photo.save(buffer, format='JPEG', quality=92, exif=exif.tobytes())
+    corpus.append(("photo_4032x3024.jpg", buffer.getvalue()))
+
+    buffer = io.BytesIO()
+    _photo(rng, (1600, 1200)).save(buffer, format='JPEG', quality=90)
+    corpus.append(("photo_1600x1200.jpg", buffer.getvalue()))
+
+    buffer = io.BytesIO()
+    _screenshot(rng, (1170, 2532)).save(buffer, format='PNG')
+    corpus.append(("screenshot_1170x2532.png", buffer.getvalue()))
+
+    logo = Image.new('RGBA', (1200, 1200), (0, 0, 0, 0))
+    ImageDraw.Draw(logo).ellipse((100, 100, 1100, 1100), fill=(255, 69, 0, 255))
+    buffer = io.BytesIO()
+    logo.save(buffer, format='PNG')
+    corpus.append(("logo_alpha_1200.png", buffer.getvalue()))
+
+    frames = [_photo(rng, (480, 270)).quantize(128) for _ in range(4)]
+    buffer = io.BytesIO()
+    frames[0].save(buffer, format='GIF', save_all=True, append_images=frames[1:], duration=100, loop=0)
+    corpus.append(("animation_480x270.gif", buffer.getvalue()))
+
+    return corpus
+
+
+def load_corpus(directory):
+    corpus = []
+    for name in sorted(os.listdir(directory)):
+        with open(os.path.join(directory, name), 'rb') as f:
+            data = f.read()
+        if sniff_image_type(data):
+            corpus.append((name, data))
+    return corpus
+
+
+def measure(transcode, data, content_type, repeat):
+    """Best-of-repeat CPU time (ms) and the output"""
+    best = None
+    for _ in range(repeat):
+        started = time.process_time()
+        output, output_type = transcode(data, content_type)
+        elapsed = (time.process_time() - started) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best, output, output_type
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark image transcoding per output format")
+    parser.add_argument("--corpus", help="Directory of images (default: generated corpus)")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per image; the fastest is kept")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus) if args.corpus else build_corpus()
+
+    modes = {
+        "legacy": lambda data, ct: legacy_transcode(data, ct, MAX_DIMENSIONS, QUALITY["jpeg"])
+    }
+    formats = ["jpeg", "webp"] + (["avif"] if avif_supported() else [])
+    for output_format in formats:
+        modes[output_format] = (
+            lambda data, ct, fmt=output_format: transcode_image(
+                data, ct, MAX_DIMENSIONS, QUALITY[fmt], fmt, MAX_PIXELS, WEBP_METHOD, AVIF_SPEED
+            )
+        )
+
+    results = {"images": {}, "totals": {}}
+    for name, data in corpus:
+        content_type = sniff_image_type(data)
+        row = {"input_bytes": len(data)}
+        for mode, transcode in modes.items():
+            cpu_ms, output, output_type = measure(transcode, data, content_type, args.repeat)
+            row[mode] = {
+                "cpu_ms": round(cpu_ms, 1),
+                "bytes": len(output),
+                "type": output_type,
+                "size": list(Image.open(io.BytesIO(output)).size)
+            }
+            totals = results["totals"].setdefault(mode, {"cpu_ms": 0.0, "bytes": 0})
+            totals["cpu_ms"] += cpu_ms
+            totals["bytes"] += len(output)
+        results["images"][name] = row
+
+    baseline = results["totals"]["legacy"]
+    for mode, totals in results["totals"].items():
+        totals["cpu_ms"] = round(totals["cpu_ms"], 1)
+        totals["cpu_vs_legacy"] = round(totals["cpu_ms"] / baseline["cpu_ms"], 3) if baseline["cpu_ms"] else None
+        totals["bytes_vs_legacy"] = round(totals["bytes"] / baseline["bytes"], 3) if baseline["bytes"] else None
+    results["avif_supported"] = "avif" in modes
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"📊 Image transcoding ({len(corpus)} images, best of {args.repeat}, "
+          f"max {MAX_DIMENSIONS[0]}x{MAX_DIMENSIONS[1]} / {MAX_PIXELS} px)")
+    for name, row in results["images"].items():
+        print(f"  {name} ({row['input_bytes']} bytes)")
+        for mode in modes:
+            stats = row[mode]
+            print(f"    {mode:>6}: {stats['cpu_ms']:>8}ms {stats['bytes']:>9} bytes "
+                  f"{stats['type']} {stats['size'][0]}x{stats['size'][1]}")
+    print("  totals:")
+    for mode, totals in results["totals"].items():
+        print(f"    {mode:>6}: {totals['cpu_ms']}ms ({totals['cpu_vs_legacy']}x CPU), "
+              f"{totals['bytes']} bytes ({totals['bytes_vs_legacy']}x size)")
+    if not results["avif_supported"]:
+        print("  (AVIF skipped: Pillow has no AVIF encoder)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Offline load test for the NLP pipeline using the deterministic mock LLM backend
+Measures stage throughput, queue drain time and retry amplification without spending tokens
+
+Examples:
+    python scripts/benchmark_nlp_pipeline.py --posts 200 --workers 4
+    python scripts/benchmark_nlp_pipeline.py --mode engine --rate-limit-rate 0.05 --time-scale 0.1
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import queue
+import statistics
+import sys
+import threading
+import time
+from collections import defaultdict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from workers.nlp_pipeline.llm_backends import MockLLMBackend, MockLLMConfig
+from workers.nlp_pipeline.openai_client import get_openai_client
+
+STAGES = ("summary", "tags", "analysis")
+
+
+def _percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def _make_posts(count):
+    return [
+        {
+            "id": f"bench-{i:05d}",
+            "title": f"How do you handle recurring billing pain #{i}?",
+            "content": "We are a small SaaS team and spend hours every week reconciling invoices. " * (1 + i % 5)
+        }
+        for i in range(count)
+    ]
+
+
+def run_worker_queue(client, posts, workers):
+    """process_content_with_ai layout: each worker runs the three calls for one post at a time"""
+    work = queue.Queue()
+    for post in posts:
+        work.put(post)
+
+    latencies = defaultdict(list)
+    outcomes = {"completed": 0, "failed": 0}
+    lock = threading.Lock()
+
+    calls = {
+        "summary": client.generate_korean_summary,
+        "tags": client.extract_tags_llm,
+        "analysis": client.analyze_pain_points_and_ideas
+    }
+
+    def worker():
+        while True:
+            try:
+                post = work.get_nowait()
+            except queue.Empty:
+                return
+            ok = True
+            for stage in STAGES:
+                started = time.perf_counter()
+                try:
+                    calls[stage](post["title"], post["content"], post["id"])
+                except Exception:
+                    ok = False
+                    break
+                finally:
+                    with lock:
+                        latencies[stage].append(time.perf_counter() - started)
+            with lock:
+                outcomes["completed" if ok else "failed"] += 1
+
+    threads = [threading.Thread(target=worker) for _ in range(workers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    return latencies, outcomes
+
+
+def run_engine(posts, batch_size):
+    """batch_process_posts layout: AnalysisEngine runs each batch concurrently"""
+    from workers.nlp_pipeline.analysis_engine import get_analysis_engine
+
+    engine = get_analysis_engine()
+    outcomes = {"completed": 0, "failed": 0}
+
+    async def run():
+        for start in range(0, len(posts), batch_size):
+            for result in await engine.process_posts(posts[start:start + batch_size]):
+                outcomes["failed" if "error" in result else "completed"] += 1
+
+    asyncio.run(run())
+    return {}, outcomes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the NLP pipeline against a mock LLM backend")
+    parser.add_argument("--posts", type=int, default=100, help="Posts in the queue")
+    parser.add_argument("--workers", type=int, default=4, help="Concurrent workers (worker_queue mode)")
+    parser.add_argument("--mode", choices=["worker_queue", "engine"], default="worker_queue")
+    parser.add_argument("--batch-size", type=int, default=50, help="Posts per batch (engine mode)")
+    parser.add_argument("--latency-median-ms", type=float, default=800.0)
+    parser.add_argument("--latency-sigma", type=float, default=0.5)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="429 probability per call")
+    parser.add_argument("--timeout-rate", type=float, default=0.0, help="Timeout probability per call")
+    parser.add_argument("--completion-tokens", type=int, default=300)
+    parser.add_argument("--time-scale", type=float, default=1.0, help="Scale all simulated sleeps")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    backend = MockLLMBackend(MockLLMConfig(
+        latency_median_ms=args.latency_median_ms,
+        latency_sigma=args.latency_sigma,
+        rate_limit_rate=args.rate_limit_rate,
+        timeout_rate=args.timeout_rate,
+        completion_tokens=args.completion_tokens,
+        time_scale=args.time_scale,
+        seed=args.seed
+    ))
+
+    # Global client, so the analysis engine uses the mock backend too
+    client = get_openai_client()
+    client.initialize(backend=backend)
+
+    posts = _make_posts(args.posts)
+    started = time.perf_counter()
+    if args.mode == "engine":
+        latencies, outcomes = run_engine(posts, args.batch_size)
+    else:
+        latencies, outcomes = run_worker_queue(client, posts, args.workers)
+    drain_seconds = time.perf_counter() - started
+
+    stats = backend.stats()
+    logical_calls = sum(len(v) for v in latencies.values()) or len(posts) * len(STAGES)
+    results = {
+        "mode": args.mode,
+        "posts": args.posts,
+        "workers": args.workers if args.mode == "worker_queue" else None,
+        "queue_drain_seconds": round(drain_seconds, 3),
+        "throughput_posts_per_sec": round(args.posts / drain_seconds, 3) if drain_seconds else None,
+        "completed_posts": outcomes["completed"],
+        "failed_posts": outcomes["failed"],
+        "backend_calls": stats["calls"],
+        "injected_rate_limits": stats["rate_limited"],
+        "injected_timeouts": stats["timeouts"],
+        "retry_amplification": round(stats["calls"] / logical_calls, 3) if logical_calls else None,
+        "prompt_tokens": stats["prompt_tokens"],
+        "completion_tokens": stats["completion_tokens"],
+        "models": client.model_stats,
+        "stage_latency_seconds": {
+            stage: {
+                "p50": round(statistics.median(values), 3),
+                "p95": round(_percentile(values, 95), 3)
+            }
+            for stage, values in latencies.items() if values
+        }
+    }
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print("📊 NLP pipeline benchmark (mock LLM backend)")
+    for key, value in results.items():
+        if key not in ("stage_latency_seconds", "models"):
+            print(f"  {key}: {value}")
+    for stage, values in results["stage_latency_seconds"].items():
+        print(f"  {stage} latency: p50={values['p50']}s p95={values['p95']}s")
+    for model, values in results["models"].items():
+        print(
+            f"  {model}: calls={values['calls']} errors={values['errors']} "
+            f"p50={values['p50_latency_ms']}ms p95={values['p95_latency_ms']}ms cost=${values['cost_usd']:.6f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
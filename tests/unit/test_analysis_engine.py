@@ -0,0 +1,95 @@
+"""
+Unit tests for concurrent analysis in AnalysisEngine
+"""
+import asyncio
+import threading
+import time
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from workers.nlp_pipeline.analysis_engine import AIMDConcurrencyLimiter, AnalysisEngine
+
+
+class TestAIMDConcurrencyLimiter:
+    """Test additive increase / multiplicative decrease of the limit"""
+
+    def test_limit_grows_after_a_window_of_successes(self):
+        """Test one slot is added after `limit` successful calls"""
+        limiter = AIMDConcurrencyLimiter(initial_limit=2, min_limit=1, max_limit=4)
+
+        async def run():
+            for _ in range(2):
+                await limiter.acquire()
+                await limiter.release()
+
+        asyncio.run(run())
+        assert limiter.limit == 3
+
+    def test_limit_halves_on_rate_limit(self):
+        """Test a rate limit signal halves the limit down to the minimum"""
+        limiter = AIMDConcurrencyLimiter(initial_limit=8, min_limit=2, max_limit=16)
+
+        async def run():
+            for _ in range(3):
+                await limiter.acquire()
+                await limiter.release(rate_limited=True)
+
+        asyncio.run(run())
+        assert limiter.limit == 2
+
+
+class TestAnalysisEngineConcurrency:
+    """Test batch analysis runs OpenAI calls concurrently off the event loop"""
+
+    @pytest.fixture
+    def openai_client(self):
+        """Blocking fake client that records peak concurrency"""
+        client = Mock()
+        client.rate_limit_events = 0
+        state = {"active": 0, "peak": 0}
+        lock = threading.Lock()
+
+        def analyze(**kwargs):
+            with lock:
+                state["active"] += 1
+                state["peak"] = max(state["peak"], state["active"])
+            time.sleep(0.05)
+            with lock:
+                state["active"] -= 1
+            return {"analysis": {"pain_points": [], "product_ideas": []}, "total_tokens": 10}
+
+        client.analyze_pain_points_and_ideas.side_effect = analyze
+        client.state = state
+        return client
+
+    @pytest.fixture
+    def engine(self, openai_client):
+        """Engine with mocked OpenAI client and Redis cache"""
+        with patch('workers.nlp_pipeline.analysis_engine.get_openai_client', return_value=openai_client), \
+             patch('workers.nlp_pipeline.analysis_engine.redis_client') as redis:
+            redis.cache_mget = AsyncMock(side_effect=lambda keys: [None] * len(keys))
+            redis.cache_mset = AsyncMock(return_value=True)
+            engine = AnalysisEngine()
+            engine._limiter = AIMDConcurrencyLimiter(initial_limit=4, min_limit=1, max_limit=4)
+            engine.redis = redis
+            yield engine
+
+    def test_batch_runs_calls_concurrently(self, engine, openai_client):
+        """Test blocking client calls overlap up to the concurrency limit"""
+        posts = [{"id": f"post-{i}", "title": "t", "content": "c"} for i in range(8)]
+
+        results = asyncio.run(engine.batch_analyze_posts(posts))
+
+        assert len(results) == 8
+        assert openai_client.state["peak"] == 4
+
+    def test_batch_uses_one_cache_lookup_and_write(self, engine):
+        """Test cache reads and writes are pipelined for the whole batch"""
+        posts = [{"id": f"post-{i}", "title": "t", "content": "c"} for i in range(3)]
+
+        asyncio.run(engine.batch_analyze_posts(posts))
+
+        engine.redis.cache_mget.assert_awaited_once()
+        engine.redis.cache_mset.assert_awaited_once()
+        assert len(engine.redis.cache_mset.await_args[0][0]) == 3
@@ -0,0 +1,96 @@
+"""
+Unit tests for the shared embedding service and its on-disk cache
+"""
+import numpy as np
+import pytest
+from unittest.mock import Mock
+
+from workers.nlp_pipeline.embedding_service import EmbeddingService
+
+
+class TestEmbeddingService:
+    """Test EmbeddingService batching and persistent cache"""
+
+    @pytest.fixture
+    def fake_model(self):
+        """Fake SentenceTransformer returning deterministic 4-dim vectors"""
+        model = Mock()
+        model.get_sentence_embedding_dimension.return_value = 4
+        model.encode.side_effect = lambda texts, **kwargs: np.array(
+            [[len(t), 1.0, 2.0, 3.0] for t in texts], dtype=np.float32
+        )
+        return model
+
+    @pytest.fixture
+    def service(self, tmp_path, fake_model):
+        """Create service with cache under a temp directory"""
+        service = EmbeddingService(model_name="test-model", cache_dir=str(tmp_path), batch_size=8)
+        service._model = fake_model
+        return service
+
+    def test_embed_returns_rows_in_input_order(self, service):
+        """Test embeddings line up with the input documents"""
+        result = service.embed(["a", "bbb", "cc"])
+
+        assert result.shape == (3, 4)
+        assert result[:, 0].tolist() == [1.0, 3.0, 2.0]
+
+    def test_known_documents_are_not_re_embedded(self, service, fake_model):
+        """Test second call only encodes unseen documents"""
+        service.embed(["first", "second"])
+        service.embed(["first", "second", "third"])
+
+        assert fake_model.encode.call_count == 2
+        assert fake_model.encode.call_args[0][0] == ["third"]
+
+    def test_duplicate_documents_embedded_once(self, service, fake_model):
+        """Test duplicates within a batch are encoded once"""
+        result = service.embed(["same", "same"])
+
+        assert fake_model.encode.call_args[0][0] == ["same"]
+        assert result.shape == (2, 4)
+
+    def test_cache_is_shared_across_instances(self, tmp_path, service, fake_model):
+        """Test a new process (instance) reads vectors from disk without the model"""
+        service.embed(["persisted"])
+
+        other = EmbeddingService(model_name="test-model", cache_dir=str(tmp_path))
+        cached = other.get_cached([other.content_hash("persisted")])
+
+        assert len(cached) == 1
+        assert other._model is None
+        np.testing.assert_allclose(cached[other.content_hash("persisted")], [9.0, 1.0, 2.0, 3.0])
+
+    def test_orphan_rows_from_crash_are_discarded(self, service):
+        """Test rows written without their hash line do not shift later rows"""
+        service.embed(["one"])
+        # Simulate a crash after the matrix write but before the hash write
+        with open(service._matrix_path, "ab") as f:
+            f.write(np.array([[9, 9, 9, 9]], dtype=np.float16).tobytes())
+
+        result = service.embed(["one", "three"])
+        fresh = EmbeddingService(model_name="test-model", cache_dir=service._cache_dir.rsplit("/", 1)[0])
+        cached = fresh.get_cached([fresh.content_hash("three")])
+
+        assert result[:, 0].tolist() == [3.0, 5.0]
+        assert cached[fresh.content_hash("three")][0] == 5.0
+
+    def test_partial_hash_line_from_crash_is_discarded(self, service):
+        """Test a truncated hash line is not glued onto the next appended hash"""
+        service.embed(["one"])
+        with open(service._matrix_path, "ab") as f:
+            f.write(np.array([[9, 9, 9, 9]], dtype=np.float16).tobytes())
+        with open(service._hashes_path, "ab") as f:
+            f.write(b"deadbeef")
+
+        service.embed(["three"])
+
+        with open(service._hashes_path) as f:
+            lines = f.read().splitlines()
+        assert lines == [service.content_hash("one"), service.content_hash("three")]
+
+    def test_precomputed_hashes_are_used_as_keys(self, service):
+        """Test callers can key the cache by posts.content_hash"""
+        service.embed(["body text"], content_hashes=["abc123"])
+
+        assert "abc123" in service.get_cached(["abc123"])
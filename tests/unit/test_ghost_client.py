@@ -422,4 +422,105 @@ async def test_get_ghost_client_singleton():
         
         assert client1 is client2
         MockGhostClient.assert_called_once()
-        mock_instance.initialize.assert_called_once()
\ No newline at end of file
+        mock_instance.initialize.assert_called_once()
+
+class TestGhostClientSession:
+    """Test the pooled keep-alive session owned by GhostClient"""
+    
+    @pytest.fixture
+    def client(self):
+        """Create client with test settings"""
+        test_settings = Mock(
+            ghost_admin_key="key_id:" + "ab" * 32,
+            ghost_api_url="http://ghost.test",
+            ghost_http_pool_size=4,
+            ghost_http_timeout=5,
+            ghost_http2_enabled=False
+        )
+        with patch('workers.publisher.ghost_client.settings', test_settings):
+            yield GhostClient()
+    
+    def test_session_reused_across_requests(self, client):
+        """Test every request goes through one pooled session"""
+        response = Mock(status_code=200, content=b'{"site": {}}')
+        response.json.return_value = {"site": {}}
+        
+        with patch('workers.publisher.ghost_client.requests.Session.request', return_value=response) as mock_request:
+            client._make_request_with_retry("GET", "site/")
+            session = client._session
+            client._make_request_with_retry("GET", "site/")
+        
+        assert client._session is session
+        assert mock_request.call_count == 2
+        assert mock_request.call_args.kwargs["timeout"] == 5
+    
+    def test_adapter_pool_sized_from_settings(self, client):
+        """Test the HTTPAdapter pool size follows GHOST_HTTP_POOL_SIZE"""
+        adapter = client._get_session().get_adapter("http://ghost.test/")
+        
+        assert adapter._pool_maxsize == 4
+    
+    def test_session_recreated_after_fork(self, client):
+        """Test a session inherited from another process is not reused"""
+        inherited = client._get_session()
+        client._session_pid = -1
+        
+        assert client._get_session() is not inherited
+
+
+class TestGhostClientTags:
+    """Test tag listing pagination and lookup"""
+    
+    @pytest.fixture
+    def client(self):
+        """Create client with test settings"""
+        test_settings = Mock(
+            ghost_admin_key="key_id:" + "ab" * 32,
+            ghost_api_url="http://ghost.test",
+            ghost_http_pool_size=4,
+            ghost_http_timeout=5,
+            ghost_http2_enabled=False
+        )
+        with patch('workers.publisher.ghost_client.settings', test_settings):
+            yield GhostClient()
+    
+    def test_get_tags_follows_pagination(self, client):
+        """Test every page is fetched with query parameters"""
+        pages = [
+            {"tags": [{"id": "1", "name": "AI"}], "meta": {"pagination": {"page": 1, "next": 2}}},
+            {"tags": [{"id": "2", "name": "Python"}], "meta": {"pagination": {"page": 2, "next": 3}}},
+            {"tags": [{"id": "3", "name": "Rust"}], "meta": {"pagination": {"page": 3, "next": None}}}
+        ]
+        
+        with patch.object(client, '_make_request_with_retry', side_effect=pages) as mock_request:
+            tags = client.get_tags(page_size=1)
+        
+        assert [tag["id"] for tag in tags] == ["1", "2", "3"]
+        assert [c.kwargs["params"]["page"] for c in mock_request.call_args_list] == [1, 2, 3]
+        assert mock_request.call_args.kwargs["params"]["limit"] == 1
+    
+    def test_get_tags_without_meta(self, client):
+        """Test a response without pagination metadata is a single page"""
+        with patch.object(client, '_make_request_with_retry', return_value={"tags": [{"id": "1"}]}) as mock_request:
+            assert client.get_tags() == [{"id": "1"}]
+        
+        mock_request.assert_called_once()
+    
+    def test_params_sent_as_query_string(self, client):
+        """Test params reach the HTTP layer instead of a JSON body"""
+        response = Mock(status_code=200, content=b'{"tags": []}')
+        response.json.return_value = {"tags": []}
+        
+        with patch('workers.publisher.ghost_client.requests.Session.request', return_value=response) as mock_request:
+            client.get_tags()
+        
+        assert mock_request.call_args.kwargs["params"]["limit"] == 100
+        assert mock_request.call_args.kwargs["json"] is None
+    
+    def test_find_tag_by_name_escapes_quotes(self, client):
+        """Test names are quoted for the NQL filter"""
+        with patch.object(client, '_make_request_with_retry', return_value={"tags": [{"id": "7"}]}) as mock_request:
+            tag = client.find_tag_by_name("Don't Panic")
+        
+        assert tag == {"id": "7"}
+        assert mock_request.call_args.kwargs["params"]["filter"] == "name:'Don\\'t Panic'"
@@ -0,0 +1,278 @@
+"""
+Unit tests for the Redis-shared Ghost tag index
+"""
+import threading
+import time
+from unittest.mock import Mock
+
+import pytest
+
+from workers.publisher.ghost_client import GhostAPIError, GhostValidationError
+from workers.publisher.ghost_tag_index import (
+    TAG_CLAIM_PREFIX,
+    TAG_CREATED_KEY,
+    TAG_INDEX_KEY,
+    TAG_INDEX_SYNCED_KEY,
+    TAG_SYNC_LOCK_KEY,
+    TAG_VOCABULARY_KEY,
+    TAG_VOCABULARY_VERSION_KEY,
+    GhostTagIndex
+)
+
+
+class FakeRedis:
+    """Thread-safe in-memory stand-in for the commands used by the index"""
+
+    def __init__(self):
+        self.values = {}
+        self.hashes = {}
+        self.sets = {}
+        self.lock = threading.Lock()
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    def exists(self, key):
+        with self.lock:
+            return int(key in self.values)
+
+    def set(self, key, value, nx=False, ex=None):
+        with self.lock:
+            if nx and key in self.values:
+                return None
+            self.values[key] = str(value)
+            return True
+
+    def delete(self, *keys):
+        with self.lock:
+            return sum(
+                (self.values.pop(key, None) is not None) | (self.hashes.pop(key, None) is not None)
+                for key in keys
+            )
+
+    def rename(self, src, dst):
+        with self.lock:
+            self.hashes[dst] = self.hashes.pop(src)
+            return True
+
+    def hset(self, key, mapping):
+        with self.lock:
+            self.hashes.setdefault(key, {}).update(mapping)
+
+    def hmget(self, key, fields):
+        with self.lock:
+            return [self.hashes.get(key, {}).get(field) for field in fields]
+
+    def hgetall(self, key):
+        with self.lock:
+            return dict(self.hashes.get(key, {}))
+
+    def hdel(self, key, *fields):
+        with self.lock:
+            existing = self.hashes.get(key, {})
+            return sum(existing.pop(field, None) is not None for field in fields)
+
+    def sadd(self, key, *members):
+        with self.lock:
+            existing = self.sets.setdefault(key, set())
+            added = len(set(members) - existing)
+            existing.update(members)
+            return added
+
+    def incr(self, key):
+        with self.lock:
+            self.values[key] = str(int(self.values.get(key, 0)) + 1)
+            return int(self.values[key])
+
+
+class FakePipeline:
+    """Queues commands and runs them on execute()"""
+
+    def __init__(self, redis_client):
+        self.redis_client = redis_client
+        self.calls = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.calls.append((getattr(self.redis_client, name), args, kwargs))
+            return self
+        return queue
+
+    def execute(self):
+        return [method(*args, **kwargs) for method, args, kwargs in self.calls]
+
+
+def make_index(redis_client):
+    """Index (one per simulated worker) backed by a shared fake Redis"""
+    index = GhostTagIndex()
+    index.sync_ttl = 3600
+    index.claim_ttl = 30
+    index.claim_wait = 2.0
+    index.create_concurrency = 4
+    index._redis_client = redis_client
+    return index
+
+
+@pytest.fixture
+def redis_client():
+    return FakeRedis()
+
+
+@pytest.fixture
+def ghost_client():
+    """Ghost client whose create_tag hands out sequential ids"""
+    client = Mock()
+    client.get_tags.return_value = [{"id": "1", "name": "AI"}, {"id": "2", "name": "Python"}]
+    counter = iter(range(100, 1000))
+    lock = threading.Lock()
+
+    def create_tag(name, description=""):
+        time.sleep(0.02)
+        with lock:
+            return {"id": str(next(counter)), "name": name}
+
+    client.create_tag.side_effect = create_tag
+    return client
+
+
+class TestGhostTagIndex:
+    """Test shared sync, claim-guarded creation and fallbacks"""
+
+    def test_sync_fills_index_and_vocabulary(self, redis_client, ghost_client):
+        """Test a full sync stores ids and publishes the vocabulary once"""
+        index = make_index(redis_client)
+
+        index.ensure_synced(ghost_client)
+
+        assert redis_client.hgetall(TAG_INDEX_KEY) == {"ai": "1", "python": "2"}
+        assert redis_client.exists(TAG_INDEX_SYNCED_KEY)
+        assert not redis_client.exists(TAG_SYNC_LOCK_KEY)
+        assert redis_client.sets[TAG_VOCABULARY_KEY] == {"ai", "python"}
+        assert redis_client.values[TAG_VOCABULARY_VERSION_KEY] == "1"
+
+    def test_fresh_index_is_shared_by_workers(self, redis_client, ghost_client):
+        """Test only the first worker fetches tags while the index is fresh"""
+        make_index(redis_client).ensure_synced(ghost_client)
+        other_worker = make_index(redis_client)
+
+        assert other_worker.get_all(ghost_client) == {"ai": "1", "python": "2"}
+        ghost_client.get_tags.assert_called_once()
+
+    def test_full_sync_drops_deleted_tags(self, redis_client, ghost_client):
+        """Test a full sync replaces the index, so tags deleted in Ghost disappear"""
+        make_index(redis_client).ensure_synced(ghost_client)
+        ghost_client.get_tags.return_value = [{"id": "1", "name": "AI"}, {"id": "3", "name": "Python3"}]
+        redis_client.delete(TAG_INDEX_SYNCED_KEY)
+
+        make_index(redis_client).ensure_synced(ghost_client)
+
+        assert redis_client.hgetall(TAG_INDEX_KEY) == {"ai": "1", "python3": "3"}
+
+    def test_sync_keeps_tags_created_during_fetch(self, redis_client, ghost_client):
+        """Test a tag another worker creates while the sync is fetching survives the rebuild"""
+        other_worker = make_index(redis_client)
+        fetched = list(ghost_client.get_tags.return_value)
+
+        def get_tags():
+            other_worker.create_missing(ghost_client, ["Rust"])
+            return fetched
+
+        ghost_client.get_tags.side_effect = get_tags
+        redis_client.set(TAG_INDEX_SYNCED_KEY, 1)
+        make_index(redis_client).sync(ghost_client)
+
+        index = redis_client.hgetall(TAG_INDEX_KEY)
+        assert set(index) == {"ai", "python", "rust"}
+        assert index["rust"] == redis_client.hgetall(TAG_CREATED_KEY)["rust"].split(":")[0]
+
+    def test_sync_prunes_old_creation_log(self, redis_client, ghost_client):
+        """Test creations older than the fetch are dropped from the log, not replayed"""
+        redis_client.hset(TAG_CREATED_KEY, {"gone": f"9:{int(time.time()) - 3600}"})
+
+        make_index(redis_client).sync(ghost_client)
+
+        assert redis_client.hgetall(TAG_INDEX_KEY) == {"ai": "1", "python": "2"}
+        assert redis_client.hgetall(TAG_CREATED_KEY) == {}
+
+    def test_sync_skipped_while_another_worker_syncs(self, redis_client, ghost_client):
+        """Test the sync lock keeps concurrent full syncs from piling up"""
+        redis_client.set(TAG_SYNC_LOCK_KEY, "other")
+
+        make_index(redis_client).ensure_synced(ghost_client)
+
+        ghost_client.get_tags.assert_not_called()
+
+    def test_create_missing_creates_only_unknown_tags(self, redis_client, ghost_client):
+        """Test known tags are skipped and the rest created in one batch"""
+        index = make_index(redis_client)
+
+        tag_ids = index.create_missing(ghost_client, ["AI", "Rust", "Go", "rust", " "])
+
+        assert set(tag_ids) == {"ai", "rust", "go"} and tag_ids["ai"] == "1"
+        assert ghost_client.create_tag.call_count == 2
+        assert {c.kwargs["name"] for c in ghost_client.create_tag.call_args_list} == {"Rust", "Go"}
+        assert index.lookup(["rust", "go", "ai"]) == tag_ids
+        assert {"rust", "go"} <= redis_client.sets[TAG_VOCABULARY_KEY]
+
+    def test_each_tag_created_once_across_workers(self, redis_client, ghost_client):
+        """Test racing workers create every missing tag exactly once"""
+        make_index(redis_client).ensure_synced(ghost_client)
+        workers = [make_index(redis_client) for _ in range(4)]
+        tags = ["Rust", "Go", "Zig", "Elixir"]
+
+        threads = [
+            threading.Thread(target=worker.create_missing, args=(ghost_client, tags))
+            for worker in workers
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        created_names = sorted(c.kwargs["name"] for c in ghost_client.create_tag.call_args_list)
+        assert created_names == sorted(tags)
+        assert set(redis_client.hgetall(TAG_INDEX_KEY)) == {"ai", "python", "rust", "go", "zig", "elixir"}
+
+    def test_existing_ghost_tag_resolved_by_name(self, redis_client, ghost_client):
+        """Test a tag Ghost already has (validation error) is looked up instead"""
+        ghost_client.create_tag.side_effect = GhostValidationError("Tag already exists")
+        ghost_client.find_tag_by_name.return_value = {"id": "42", "name": "Rust"}
+
+        created = make_index(redis_client).create_missing(ghost_client, ["Rust"])
+
+        assert created == {"rust": "42"}
+        ghost_client.find_tag_by_name.assert_called_once_with("Rust")
+
+    def test_failed_creation_releases_claim(self, redis_client, ghost_client):
+        """Test a failed create can be retried by any worker immediately"""
+        ghost_client.create_tag.side_effect = GhostAPIError("Server error")
+
+        created = make_index(redis_client).create_missing(ghost_client, ["Rust"])
+
+        assert created == {}
+        assert not redis_client.exists(TAG_CLAIM_PREFIX + "rust")
+
+    def test_waits_for_tag_claimed_elsewhere(self, redis_client, ghost_client):
+        """Test a worker that loses the claim waits for the other worker's id"""
+        index = make_index(redis_client)
+        index.ensure_synced(ghost_client)
+        redis_client.set(TAG_CLAIM_PREFIX + "rust", "other")
+        threading.Timer(0.2, redis_client.hset, args=(TAG_INDEX_KEY, {"rust": "77"})).start()
+
+        tag_ids = index.create_missing(ghost_client, ["Rust", "AI"])
+
+        assert tag_ids == {"rust": "77", "ai": "1"}
+        ghost_client.create_tag.assert_not_called()
+
+    def test_redis_unavailable_falls_back_to_process(self, ghost_client):
+        """Test tags are still synced and created without Redis"""
+        broken = Mock()
+        for command in ("exists", "set", "hset", "hmget", "hgetall", "sadd", "pipeline", "delete"):
+            getattr(broken, command).side_effect = ConnectionError("redis down")
+        index = make_index(broken)
+
+        tag_ids = index.create_missing(ghost_client, ["AI", "Rust"])
+
+        assert set(tag_ids) == {"ai", "rust"}
+        assert index.get_all(ghost_client) == {"ai": "1", "python": "2", "rust": tag_ids["rust"]}
+        ghost_client.get_tags.assert_called_once()
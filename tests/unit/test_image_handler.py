@@ -3,11 +3,13 @@ Unit tests for Image Handler
 """
 
 import pytest
+import hashlib
 import io
 from unittest.mock import AsyncMock, Mock, patch
 from PIL import Image
 
 import httpx
+import requests
 
 from workers.publisher.image_handler import (
     ImageHandler,
@@ -193,11 +195,12 @@ class TestImageHandler:
         processed_data, content_type = image_handler.process_image(sample_image_data, 'image/jpeg')
         
         assert isinstance(processed_data, bytes)
-        assert content_type == 'image/jpeg'
+        assert content_type == 'image/webp'
         assert len(processed_data) > 0
     
     def test_process_image_png_to_png(self, image_handler):
-        """Test PNG image processing (should remain PNG)"""
+        """Test PNG image processing in legacy JPEG mode (should remain PNG)"""
+        image_handler.output_format = 'jpeg'
         # Create PNG image
         image = Image.new('RGBA', (100, 100), color=(255, 0, 0, 128))
         buffer = io.BytesIO()
@@ -425,4 +428,245 @@ async def test_get_image_handler_with_client():
     
     handler = await get_image_handler(mock_client)
     
-    assert handler.ghost_client is mock_client
\ No newline at end of file
+    assert handler.ghost_client is mock_client
+
+class TestImagePipeline:
+    """Test concurrent download/process/upload pipeline"""
+    
+    @pytest.fixture
+    def pipeline_handler(self):
+        """Create ImageHandler with a thread pool and in-thread PIL work"""
+        ghost_client = Mock()
+        ghost_client.upload_image.side_effect = (
+            lambda data, filename, content_type='image/jpeg': f"https://cdn.ghost.io/{filename}"
+        )
+        dedup_cache = Mock()
+        dedup_cache.get_by_url.return_value = None
+        dedup_cache.get_by_hash.return_value = None
+        handler = ImageHandler(ghost_client=ghost_client, dedup_cache=dedup_cache)
+        handler.dedup_enabled = True
+        handler.concurrency = 4
+        handler.process_workers = 0
+        yield handler
+        handler.close()
+    
+    @pytest.fixture
+    def sample_image_data(self):
+        """Create sample image data"""
+        buffer = io.BytesIO()
+        Image.new('RGB', (100, 100), color='red').save(buffer, format='JPEG')
+        return buffer.getvalue()
+    
+    def _image_response(self, image_bytes, headers=None, chunk_size=1024):
+        response = Mock()
+        response.headers = headers if headers is not None else {'content-type': 'image/jpeg'}
+        response.raise_for_status = Mock()
+        response.iter_content = Mock(side_effect=lambda chunk_size=chunk_size: (
+            image_bytes[i:i + chunk_size] for i in range(0, len(image_bytes), chunk_size)
+        ))
+        return response
+    
+    def test_results_keep_input_order_and_isolate_failures(self, pipeline_handler, sample_image_data):
+        """Test one failing image does not affect the others or their order"""
+        urls = [f'https://i.redd.it/image{i}.jpg' for i in range(6)]
+        
+        def fake_get(url, **kwargs):
+            if url.endswith('image3.jpg'):
+                raise requests.exceptions.ConnectionError("reset")
+            return self._image_response(sample_image_data)
+        
+        with patch.object(pipeline_handler._get_http_session(), 'get', side_effect=fake_get):
+            cdn_urls = pipeline_handler.process_images(urls)
+        
+        assert cdn_urls[3] is None
+        for index in (0, 1, 2, 4, 5):
+            assert cdn_urls[index].startswith(f"https://cdn.ghost.io/image{index}_")
+    
+    def test_content_urls_replaced(self, pipeline_handler, sample_image_data):
+        """Test process_content_images maps every image through the pipeline"""
+        content = "![a](https://i.redd.it/one.jpg) and https://i.imgur.com/two.png"
+        
+        with patch.object(pipeline_handler._get_http_session(), 'get',
+                          return_value=self._image_response(sample_image_data)):
+            updated_content, url_mapping = pipeline_handler.process_content_images(content)
+        
+        assert list(url_mapping) == ['https://i.redd.it/one.jpg', 'https://i.imgur.com/two.png']
+        assert 'https://i.redd.it/one.jpg' not in updated_content
+    
+    def test_process_pool_unavailable_falls_back_in_thread(self, pipeline_handler, sample_image_data):
+        """Test PIL work runs in-thread when worker processes cannot be started"""
+        pipeline_handler.process_workers = 1
+        broken_pool = Mock()
+        broken_pool.submit.side_effect = AssertionError("daemonic processes are not allowed to have children")
+        
+        with patch.object(pipeline_handler, '_get_process_pool', return_value=broken_pool), \
+                patch.object(pipeline_handler, '_disable_process_pool') as mock_disable:
+            processed_data, content_type = pipeline_handler._process_image_offloaded(sample_image_data, 'image/jpeg')
+        
+        assert content_type == 'image/webp'
+        assert processed_data
+        mock_disable.assert_called_once()
+    
+    def test_http_session_reused(self, pipeline_handler):
+        """Test downloads share one pooled session per process"""
+        assert pipeline_handler._get_http_session() is pipeline_handler._get_http_session()
+
+    def test_hosted_url_skips_download(self, pipeline_handler):
+        """Test a source URL already on Ghost is never downloaded or uploaded"""
+        pipeline_handler.dedup_cache.get_by_url.return_value = "https://cdn.ghost.io/cached.jpg"
+        
+        with patch.object(pipeline_handler._get_http_session(), 'get') as mock_get:
+            cdn_url = pipeline_handler.process_and_upload_image('https://i.redd.it/seen.jpg', post_id='post-1')
+        
+        assert cdn_url == "https://cdn.ghost.io/cached.jpg"
+        mock_get.assert_not_called()
+        pipeline_handler.ghost_client.upload_image.assert_not_called()
+        pipeline_handler.dedup_cache.store.assert_called_once_with(
+            'https://i.redd.it/seen.jpg', "https://cdn.ghost.io/cached.jpg", post_id='post-1'
+        )
+    
+    def test_identical_bytes_skip_upload(self, pipeline_handler, sample_image_data):
+        """Test the same image under a new URL is matched by content hash"""
+        pipeline_handler.dedup_cache.get_by_hash.return_value = "https://cdn.ghost.io/same.jpg"
+        
+        with patch.object(pipeline_handler._get_http_session(), 'get',
+                          return_value=self._image_response(sample_image_data)):
+            cdn_url = pipeline_handler.process_and_upload_image('https://i.imgur.com/mirror.jpg')
+        
+        assert cdn_url == "https://cdn.ghost.io/same.jpg"
+        pipeline_handler.ghost_client.upload_image.assert_not_called()
+        sha256 = pipeline_handler.dedup_cache.get_by_hash.call_args.args[0]
+        assert sha256 == hashlib.sha256(sample_image_data).hexdigest()
+    
+    def test_new_image_recorded(self, pipeline_handler, sample_image_data):
+        """Test uploads are stored under both source URL and content hash"""
+        with patch.object(pipeline_handler._get_http_session(), 'get',
+                          return_value=self._image_response(sample_image_data)):
+            cdn_url = pipeline_handler.process_and_upload_image('https://i.redd.it/new.jpg', post_id='post-2')
+        
+        sha256 = hashlib.sha256(sample_image_data).hexdigest()
+        assert sha256[:8] in cdn_url
+        args, kwargs = pipeline_handler.dedup_cache.store.call_args
+        assert args == ('https://i.redd.it/new.jpg', cdn_url)
+        assert kwargs['sha256'] == sha256
+        assert kwargs['post_id'] == 'post-2'
+
+    def test_download_rejects_declared_size_before_body(self, pipeline_handler):
+        """Test an oversized Content-Length is rejected without reading the body"""
+        response = self._image_response(b'', headers={
+            'content-type': 'image/jpeg',
+            'content-length': str(pipeline_handler.max_image_size + 1)
+        })
+        
+        with patch.object(pipeline_handler._get_http_session(), 'get', return_value=response):
+            with pytest.raises(ImageDownloadError, match="Image too large"):
+                pipeline_handler.download_image('https://i.redd.it/huge.jpg')
+        
+        response.iter_content.assert_not_called()
+        response.close.assert_called_once()
+    
+    def test_download_stops_at_size_cap(self, pipeline_handler, sample_image_data):
+        """Test a body without Content-Length is cut off at max_image_size"""
+        pipeline_handler.max_image_size = 2048
+        body = sample_image_data + b'\0' * 10000
+        
+        with patch.object(pipeline_handler._get_http_session(), 'get', return_value=self._image_response(body)):
+            with pytest.raises(ImageDownloadError, match="Image too large"):
+                pipeline_handler.download_image('https://i.redd.it/chunked.jpg')
+    
+    def test_download_rejects_non_image_bytes(self, pipeline_handler):
+        """Test magic bytes override a lying Content-Type"""
+        body = b'<!DOCTYPE html><html>' + b'x' * 5000
+        
+        with patch.object(pipeline_handler._get_http_session(), 'get', return_value=self._image_response(body)):
+            with pytest.raises(ImageDownloadError, match="Unsupported image data"):
+                pipeline_handler.download_image('https://i.redd.it/fake.jpg')
+    
+    def test_download_sniffs_generic_content_type(self, pipeline_handler):
+        """Test octet-stream responses are typed from their magic bytes"""
+        buffer = io.BytesIO()
+        Image.new('RGBA', (20, 20)).save(buffer, format='PNG')
+        response = self._image_response(buffer.getvalue(), headers={'content-type': 'application/octet-stream'})
+        
+        with patch.object(pipeline_handler._get_http_session(), 'get', return_value=response) as mock_get:
+            data, content_type = pipeline_handler.download_image('https://i.imgur.com/abc')
+        
+        assert content_type == 'image/png'
+        assert data == buffer.getvalue()
+        assert mock_get.call_args.kwargs['stream'] is True
+
+    def test_transparent_png_keeps_alpha_as_webp(self, pipeline_handler):
+        """Test WebP output keeps transparency instead of flattening it"""
+        buffer = io.BytesIO()
+        Image.new('RGBA', (100, 100), color=(255, 0, 0, 128)).save(buffer, format='PNG')
+        
+        processed_data, content_type = pipeline_handler.process_image(buffer.getvalue(), 'image/png')
+        
+        assert content_type == 'image/webp'
+        assert Image.open(io.BytesIO(processed_data)).mode == 'RGBA'
+    
+    def test_pixel_budget_and_rotation(self, pipeline_handler):
+        """Test output fits the pixel budget and EXIF rotation swaps the bounds"""
+        pipeline_handler.max_pixels = 500_000
+        image = Image.new('RGB', (4000, 3000), color='green')
+        exif = image.getexif()
+        exif[0x0112] = 6  # rotate 90 degrees on display
+        buffer = io.BytesIO()
+        image.save(buffer, format='JPEG', exif=exif.tobytes())
+        
+        processed_data, _ = pipeline_handler.process_image(buffer.getvalue(), 'image/jpeg')
+        
+        width, height = Image.open(io.BytesIO(processed_data)).size
+        assert height > width
+        assert width * height <= 500_000
+        assert height <= pipeline_handler.max_dimensions[0]
+    
+    def test_upload_sends_output_content_type(self, pipeline_handler, sample_image_data):
+        """Test Ghost receives the transcoded format's content type"""
+        with patch.object(pipeline_handler._get_http_session(), 'get',
+                          return_value=self._image_response(sample_image_data)):
+            cdn_url = pipeline_handler.process_and_upload_image('https://i.redd.it/typed.jpg')
+        
+        assert cdn_url.endswith('.webp')
+        assert pipeline_handler.ghost_client.upload_image.call_args.args[2] == 'image/webp'
+
+
+class TestImageUrlScanner:
+    """Test single-pass image URL extraction and replacement"""
+    
+    @pytest.fixture
+    def handler(self):
+        """Create ImageHandler without external services"""
+        return ImageHandler(ghost_client=None, dedup_cache=Mock())
+    
+    def test_urls_in_document_order(self, handler):
+        """Test markdown, HTML and bare URLs come back in the order they appear"""
+        content = (
+            "https://i.redd.it/first.jpg then <IMG SRC='https://imgur.com/second.png'> "
+            "and ![alt](https://i.redd.it/third.gif) HTTPS://example.com/fourth.WEBP"
+        )
+        
+        assert handler.extract_image_urls(content) == [
+            'https://i.redd.it/first.jpg',
+            'https://imgur.com/second.png',
+            'https://i.redd.it/third.gif',
+            'HTTPS://example.com/fourth.WEBP'
+        ]
+    
+    def test_host_without_path_is_not_image(self, handler):
+        """Test an extension in the hostname does not count as an image path"""
+        assert not handler.is_image_url('https://foo.png')
+        assert handler.is_image_url('https://x.com/g.jpg;params')
+        assert handler.is_image_url('/relative/photo.jpeg?w=100')
+    
+    def test_replace_handles_prefix_urls(self, handler):
+        """Test one-pass replacement never rewrites part of a longer URL"""
+        content = "https://i.redd.it/a.jpg and https://i.redd.it/a.jpg?w=640"
+        mapping = {
+            'https://i.redd.it/a.jpg': 'https://cdn.ghost.io/a.webp',
+            'https://i.redd.it/a.jpg?w=640': 'https://cdn.ghost.io/a-640.webp'
+        }
+        
+        assert handler.replace_image_urls(content, mapping) == (
+            "https://cdn.ghost.io/a.webp and https://cdn.ghost.io/a-640.webp"
+        )
@@ -0,0 +1,60 @@
+"""
+Unit tests for the per-process pooled database engine
+"""
+import os
+
+import pytest
+from unittest.mock import Mock, patch
+
+import app.infrastructure as infrastructure
+
+
+class TestDatabaseEngine:
+    """Test get_database engine reuse across calls and forks"""
+
+    @pytest.fixture(autouse=True)
+    def reset_engine(self):
+        """Reset module-level engine state around each test"""
+        infrastructure._database_engine = None
+        infrastructure._database_engine_pid = None
+        infrastructure._session_factory = None
+        infrastructure._engine_creations = 0
+        infrastructure._worker_process = False
+        with patch.object(infrastructure, 'create_engine', side_effect=lambda *a, **kw: Mock()) as mock_create, \
+                patch.object(infrastructure, '_record_engine_creation'):
+            yield mock_create
+        infrastructure._database_engine = None
+        infrastructure._database_engine_pid = None
+        infrastructure._session_factory = None
+        infrastructure._worker_process = False
+
+    def test_engine_created_once_per_process(self, reset_engine):
+        """Test repeated sessions reuse one engine"""
+        first = infrastructure.get_database()
+        infrastructure.get_database_session()
+        infrastructure.get_db_session()
+
+        assert infrastructure.get_database() is first
+        assert reset_engine.call_count == 1
+        assert infrastructure.get_database_stats()["engine_creations"] == 1
+
+    def test_engine_recreated_after_fork(self, reset_engine):
+        """Test an engine inherited from another pid is dropped without closing connections"""
+        inherited = infrastructure.get_database()
+        infrastructure._database_engine_pid = os.getpid() + 1
+
+        engine = infrastructure.get_database()
+
+        assert engine is not inherited
+        inherited.dispose.assert_called_once_with(close=False)
+        assert reset_engine.call_count == 2
+
+    def test_worker_process_uses_small_pool(self, reset_engine):
+        """Test prefork children get the worker pool sizing"""
+        infrastructure.configure_worker_database()
+        infrastructure.get_database()
+
+        settings = infrastructure.get_settings()
+        kwargs = reset_engine.call_args.kwargs
+        assert kwargs["pool_size"] == settings.worker_database_pool_size
+        assert kwargs["max_overflow"] == settings.worker_database_max_overflow
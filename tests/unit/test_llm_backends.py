@@ -0,0 +1,78 @@
+"""
+Unit tests for the deterministic mock LLM backend
+"""
+import json
+
+import openai
+import pytest
+
+from workers.nlp_pipeline.llm_backends import LLMBackend, MockLLMBackend, MockLLMConfig
+from workers.nlp_pipeline.openai_client import ANALYSIS_PROMPT_PREFIX, TAG_EXTRACTION_PROMPT_PREFIX
+
+
+def _messages(prefix, body="post body"):
+    return [{"role": "system", "content": prefix}, {"role": "user", "content": body}]
+
+
+class TestMockLLMBackend:
+    """Test MockLLMBackend output shape, determinism and fault injection"""
+
+    def _backend(self, **overrides):
+        config = MockLLMConfig(time_scale=0, **overrides)
+        return MockLLMBackend(config)
+
+    def test_same_seed_same_output(self):
+        """Test two backends with the same seed produce identical completions"""
+        first = self._backend().create_chat_completion("gpt-4o-mini", _messages("summarize"), 100)
+        second = self._backend().create_chat_completion("gpt-4o-mini", _messages("summarize"), 100)
+
+        assert first.choices[0].message.content == second.choices[0].message.content
+        assert first.usage.total_tokens == second.usage.total_tokens
+
+    def test_analysis_output_is_valid_json(self):
+        """Test analysis prompts get schema-shaped JSON"""
+        response = self._backend().create_chat_completion(
+            "gpt-4o-mini", _messages(ANALYSIS_PROMPT_PREFIX), 800
+        )
+
+        data = json.loads(response.choices[0].message.content)
+        assert data["pain_points"] and data["product_ideas"]
+
+    def test_streamed_tags_reassemble(self):
+        """Test stream chunks concatenate to the tag list and end with usage"""
+        chunks = list(self._backend().create_chat_completion(
+            "gpt-4o-mini", _messages(TAG_EXTRACTION_PROMPT_PREFIX), 200, stream=True
+        ))
+
+        text = "".join(c.choices[0].delta.content for c in chunks if c.choices)
+        assert 3 <= len(text.split(",")) <= 5
+        assert chunks[-1].usage.total_tokens > 0
+
+    def test_rate_limit_injection(self):
+        """Test injected 429s raise RateLimitError and are counted"""
+        backend = self._backend(rate_limit_rate=1.0)
+
+        with pytest.raises(openai.RateLimitError):
+            backend.create_chat_completion("gpt-4o-mini", _messages("summarize"), 100)
+        assert backend.stats()["rate_limited"] == 1
+
+    def test_retry_gets_fresh_draw(self):
+        """Test a repeated request is not doomed to repeat the same fault"""
+        backend = self._backend(rate_limit_rate=0.5)
+        outcomes = set()
+        for _ in range(20):
+            try:
+                backend.create_chat_completion("gpt-4o-mini", _messages("summarize"), 100)
+                outcomes.add("ok")
+            except openai.RateLimitError:
+                outcomes.add("429")
+
+        assert outcomes == {"ok", "429"}
+
+    def test_backend_interface_is_abstract(self):
+        """Test a backend without create_chat_completion cannot be instantiated"""
+        class IncompleteBackend(LLMBackend):
+            name = "incomplete"
+
+        with pytest.raises(TypeError):
+            IncompleteBackend()
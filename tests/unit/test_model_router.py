@@ -0,0 +1,78 @@
+"""
+Unit tests for per-request OpenAI model routing
+"""
+from decimal import Decimal
+
+import pytest
+
+from workers.nlp_pipeline.model_router import (
+    ModelRouter,
+    ERROR_TIMEOUT,
+    ERROR_API
+)
+
+
+class TestModelRouter:
+    """Test ModelRouter routing and failover decisions"""
+
+    @pytest.fixture
+    def router(self):
+        """Create router with small health thresholds"""
+        router = ModelRouter(
+            "gpt-4o-mini",
+            "gpt-4o",
+            {"gpt-4o-mini": Decimal("0.00015"), "gpt-4o": Decimal("0.005")}
+        )
+        router.min_samples = 4
+        router.max_error_rate = 0.5
+        router.max_p95_latency_ms = 10000
+        router.long_prompt_tokens = 1000
+        router.max_escalation_share = 0.2
+        return router
+
+    def test_short_prompts_use_primary(self, router):
+        """Test cheap model is the default for every operation"""
+        assert router.route("summary", 200) == "gpt-4o-mini"
+        assert router.route("analysis", 200) == "gpt-4o-mini"
+
+    def test_long_analysis_uses_fallback(self, router):
+        """Test long analysis prompts go to the stronger model"""
+        assert router.route("analysis", 5000) == "gpt-4o"
+        assert router.route("summary", 5000) == "gpt-4o-mini"
+
+    def test_timeout_retries_same_model_once(self, router):
+        """Test timeouts never escalate to the expensive model"""
+        assert router.failover("gpt-4o-mini", ERROR_TIMEOUT, 1) == "gpt-4o-mini"
+        assert router.failover("gpt-4o-mini", ERROR_TIMEOUT, 2) is None
+
+    def test_api_error_escalates_within_share(self, router):
+        """Test API errors fail over while the fallback share is low"""
+        for _ in range(10):
+            router.record("gpt-4o-mini", 500, ok=True)
+
+        assert router.failover("gpt-4o-mini", ERROR_API, 1) == "gpt-4o"
+
+    def test_escalation_capped_during_incident(self, router):
+        """Test fallback traffic is capped when the primary keeps failing"""
+        for _ in range(8):
+            router.record("gpt-4o-mini", 500, ok=False, error_kind=ERROR_API)
+        for _ in range(4):
+            router.record("gpt-4o", 900, ok=True)
+
+        assert router.route("summary", 200) == "gpt-4o-mini"
+        assert router.failover("gpt-4o-mini", ERROR_API, 1) is None
+
+    def test_snapshot_reports_percentiles_and_cost(self, router):
+        """Test exported per-model latency percentiles and cost counters"""
+        for latency in range(100, 1100, 100):
+            router.record("gpt-4o-mini", latency, ok=True, total_tokens=100, cost_usd=Decimal("0.001"))
+        router.record("gpt-4o-mini", 30000, ok=False, error_kind=ERROR_TIMEOUT)
+
+        stats = router.snapshot()["gpt-4o-mini"]
+
+        assert stats["calls"] == 11
+        assert stats["errors"] == {ERROR_TIMEOUT: 1}
+        assert stats["p50_latency_ms"] in (500, 600)
+        assert stats["p95_latency_ms"] == 1000
+        assert stats["total_tokens"] == 1000
+        assert stats["cost_usd"] == pytest.approx(0.01)
@@ -100,7 +100,7 @@ class TestPost:
         assert "Subreddit is required" in errors
         assert "Score must be non-negative" in errors
         assert "Comments count must be non-negative" in errors
-        assert "Status must be one of: collected, processing, processed, published, failed" in errors
+        assert "Status must be one of: collected, processing, processed, published, failed, skipped" in errors
         assert "Takedown status must be one of: active, takedown_pending, removed" in errors
         assert "Processing attempts must be non-negative" in errors
         assert "Tags must be a list with 3-5 items if provided" in errors
@@ -55,7 +55,7 @@ class TestPostValidation:
             "Subreddit is required",
             "Score must be non-negative",
             "Comments count must be non-negative",
-            "Status must be one of: collected, processing, processed, published, failed",
+            "Status must be one of: collected, processing, processed, published, failed, skipped",
             "Takedown status must be one of: active, takedown_pending, removed",
             "Processing attempts must be non-negative",
             "Tags must be a list with 3-5 items if provided"
@@ -0,0 +1,148 @@
+"""
+Unit tests for streamed OpenAI completions and their usage accounting
+"""
+import json
+from unittest.mock import Mock
+
+import pytest
+from openai.types import CompletionUsage
+from openai.types.chat import ChatCompletionChunk
+from openai.types.chat.chat_completion_chunk import Choice, ChoiceDelta
+from openai.types.completion_usage import PromptTokensDetails
+
+from workers.nlp_pipeline.openai_client import OpenAIClient
+from workers.nlp_pipeline.stream_validation import (
+    JSONObjectStreamValidator,
+    StreamValidationError,
+    TagListStreamValidator
+)
+
+
+def _chunk(content=None, usage=None, finish_reason=None):
+    choices = []
+    if content is not None or finish_reason:
+        choices = [Choice(index=0, delta=ChoiceDelta(content=content), finish_reason=finish_reason)]
+    return ChatCompletionChunk(
+        id="chunk",
+        object="chat.completion.chunk",
+        created=0,
+        model="gpt-4o-mini",
+        choices=choices,
+        usage=usage
+    )
+
+
+class FakeStream:
+    """Chunk iterator that records how far it was read and whether it was closed"""
+
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.consumed = 0
+        self.closed = False
+
+    def __iter__(self):
+        for chunk in self.chunks:
+            self.consumed += 1
+            yield chunk
+
+    def close(self):
+        self.closed = True
+
+
+USAGE = CompletionUsage(
+    prompt_tokens=1200,
+    completion_tokens=40,
+    total_tokens=1240,
+    prompt_tokens_details=PromptTokensDetails(cached_tokens=1024)
+)
+
+
+class TestStreamChatCompletion:
+    """Test the stream is drained for usage after the validator completes"""
+
+    @pytest.fixture
+    def client(self, monkeypatch):
+        """Client with a mocked backend, rate limiter and ledger"""
+        monkeypatch.setattr("workers.nlp_pipeline.openai_client.settings.openai_streaming_enabled", True)
+        client = OpenAIClient()
+        client._client = Mock()
+        client._rate_limiter = Mock()
+        client._rate_limiter.estimate_tokens.return_value = 100
+        client._ledger = Mock()
+        return client
+
+    def _run(self, client, stream, validator_factory):
+        if isinstance(stream, list):
+            client._client.create_chat_completion.side_effect = stream
+        else:
+            client._client.create_chat_completion.return_value = stream
+        messages = [{"role": "system", "content": "prefix"}, {"role": "user", "content": "post"}]
+        return client._create_chat_completion("analysis", "post-1", messages, 800, validator_factory=validator_factory)
+
+    def test_usage_chunk_after_json_close_is_recorded(self, client):
+        """Test exact usage (with cached tokens) is recorded, not the chars/3 estimate"""
+        body = json.dumps({"pain_points": [], "product_ideas": []})
+        stream = FakeStream([_chunk(body[:10]), _chunk(body[10:]), _chunk("\n"), _chunk(usage=USAGE)])
+
+        response, _ = self._run(client, stream, lambda: JSONObjectStreamValidator(max_chars=1000))
+
+        assert response.choices[0].message.content == body
+        assert stream.consumed == 4 and stream.closed
+        record = client._ledger.record.call_args.kwargs
+        assert (record["input_tokens"], record["output_tokens"], record["cached_tokens"]) == (1200, 40, 1024)
+        client._rate_limiter.reconcile.assert_called_once_with(client._rate_limiter.acquire.return_value, 1240)
+
+    def test_tags_beyond_limit_ignored_but_stream_drained(self, client):
+        """Test tags after the limit are dropped while the usage chunk is still read"""
+        stream = FakeStream([_chunk("a, b, "), _chunk("c, d"), _chunk(", e"), _chunk(usage=USAGE)])
+
+        response, _ = self._run(client, stream, lambda: TagListStreamValidator(max_chars=800, max_tags=3))
+
+        assert response.choices[0].message.content == "a, b, c, d"
+        assert client._ledger.record.call_args.kwargs["cached_tokens"] == 1024
+
+    def test_invalid_output_closes_stream_early(self, client):
+        """Test a rejected generation is cancelled without reading the rest"""
+        stream = FakeStream([_chunk("Sure! "), _chunk("{}"), _chunk(usage=USAGE)])
+        client._client.create_chat_completion.return_value = stream
+
+        with pytest.raises(StreamValidationError):
+            client._stream_chat_completion(
+                "gpt-4o-mini", [{"role": "user", "content": "post"}], 800, JSONObjectStreamValidator(max_chars=1000)
+            )
+        assert stream.consumed == 1 and stream.closed
+
+    def test_finish_reason_is_carried_through(self, client):
+        """Test the model's finish reason is reported, not a hard-coded "stop" """
+        stream = FakeStream([_chunk("a, b, c"), _chunk(finish_reason="content_filter"), _chunk(usage=USAGE)])
+
+        response, _ = self._run(client, stream, lambda: TagListStreamValidator(max_chars=800, max_tags=5))
+
+        assert response.choices[0].finish_reason == "content_filter"
+
+    def test_truncated_output_is_returned_without_retry(self, client):
+        """Test output cut off at max_tokens goes to the parse fallback instead of failing"""
+        stream = FakeStream([_chunk('{"pain_points": ['), _chunk(finish_reason="length"), _chunk(usage=USAGE)])
+
+        response, _ = self._run(client, stream, lambda: JSONObjectStreamValidator(max_chars=1000))
+
+        assert client._client.create_chat_completion.call_count == 1
+        assert response.choices[0].finish_reason == "length"
+        assert response.choices[0].message.content == '{"pain_points": ['
+        client._rate_limiter.release.assert_not_called()
+
+    def test_last_output_returned_when_retries_run_out(self, client, monkeypatch):
+        """Test cancelled generations count toward usage and the last output is returned"""
+        monkeypatch.setattr("workers.nlp_pipeline.openai_client.settings.openai_stream_retries", 1)
+        streams = [
+            FakeStream([_chunk("Sure! "), _chunk("{}")]),
+            FakeStream([_chunk('{"a": '), _chunk(finish_reason="stop"), _chunk(usage=USAGE)])
+        ]
+        client._rate_limiter.estimate_tokens.side_effect = lambda *texts, **kwargs: sum(len(t) for t in texts)
+
+        response, _ = self._run(client, streams, lambda: JSONObjectStreamValidator(max_chars=1000))
+
+        assert client._client.create_chat_completion.call_count == 2
+        assert response.choices[0].message.content == '{"a": '
+        # First generation: prompt (10 chars) plus the streamed "Sure! " (6 chars), estimated
+        client._rate_limiter.reconcile.assert_called_once_with(client._rate_limiter.acquire.return_value, 1240 + 16)
@@ -0,0 +1,181 @@
+"""
+Unit tests for the local pre-classifier gating OpenAI processing
+"""
+import logging
+import uuid
+from unittest.mock import Mock
+
+import pytest
+
+from app.models.post import Post
+from workers.nlp_pipeline import tasks
+from workers.nlp_pipeline.pre_classifier import GateResult, PostPreClassifier
+
+
+def _post(title, content, subreddit="startups", score=10, label=None):
+    post = {
+        "id": str(uuid.uuid4()),
+        "title": title,
+        "content": content,
+        "subreddit": subreddit,
+        "score": score,
+        "num_comments": score // 2
+    }
+    if label is not None:
+        post["label"] = label
+    return post
+
+
+class TestPostPreClassifier:
+    """Test PostPreClassifier training and gating"""
+
+    @pytest.fixture
+    def classifier(self, tmp_path):
+        """Create classifier with its model under a temp directory"""
+        classifier = PostPreClassifier(model_path=str(tmp_path / "model.joblib"))
+        classifier.threshold = 0.5
+        classifier.skip_threshold = 0.2
+        return classifier
+
+    @pytest.fixture
+    def samples(self):
+        """Separable history: SaaS pain points published, memes not"""
+        published = [
+            _post(f"Customers churn from our SaaS pricing {i}", "billing pain point tool", score=200, label=1)
+            for i in range(60)
+        ]
+        ignored = [
+            _post(f"Funny meme lol {i}", "", subreddit="memes", score=1, label=0)
+            for i in range(60)
+        ]
+        return published + ignored
+
+    def test_untrained_model_lets_everything_through(self, classifier):
+        """Test gating is fail-open before the first training run"""
+        posts = [_post("anything", "")]
+
+        result = classifier.gate(posts)
+
+        assert result.process == [posts[0]["id"]]
+        assert result.scores == {}
+
+    def test_train_reports_held_out_metrics(self, classifier, samples, monkeypatch):
+        """Test training writes the model and precision/recall on the held-out split"""
+        monkeypatch.setattr(
+            "workers.nlp_pipeline.pre_classifier.settings.pre_classifier_min_samples", 10
+        )
+
+        result = classifier.train(samples)
+
+        assert result["status"] == "completed"
+        assert result["test_size"] == 24
+        assert result["precision"] >= 0.9
+        assert result["recall"] >= 0.9
+        assert classifier.get_metrics()["recall"] == result["recall"]
+
+    def test_gate_splits_by_score(self, classifier, samples, monkeypatch):
+        """Test high scorers are processed and low scorers skipped"""
+        monkeypatch.setattr(
+            "workers.nlp_pipeline.pre_classifier.settings.pre_classifier_min_samples", 10
+        )
+        classifier.train(samples)
+        good = _post("Our SaaS pricing makes customers churn", "billing pain point tool", score=150)
+        bad = _post("Funny meme lol", "", subreddit="memes", score=0)
+
+        result = classifier.gate([good, bad])
+
+        assert result.process == [good["id"]]
+        assert result.skip == [bad["id"]]
+
+    def test_train_skips_with_too_few_samples(self, classifier, samples):
+        """Test training is skipped when a class has too few examples"""
+        result = classifier.train(samples[:5])
+
+        assert result["status"] == "skipped"
+        assert result["reason"] == "Not enough labeled posts per class"
+
+    def test_skipped_result_can_be_logged_as_extra(self, classifier, samples, caplog):
+        """Test the skipped result has no keys that clash with LogRecord attributes"""
+        result = classifier.train(samples[:5])
+
+        with caplog.at_level(logging.INFO):
+            logging.getLogger(__name__).info("Pre-classifier training finished", extra=result)
+
+        assert caplog.records[-1].reason == result["reason"]
+
+
+
+class TestGatePosts:
+    """Test the pre-classifier gate in the enqueue path"""
+
+    @pytest.fixture
+    def posts(self):
+        """Candidate posts as loaded by gate_posts"""
+        return [
+            Post(id=uuid.uuid4(), title=title, content="", subreddit="startups", score=1, num_comments=0)
+            for title in ("Funny meme lol", "Our churn doubled", "Pricing page feedback")
+        ]
+
+    @pytest.fixture
+    def session(self, posts, monkeypatch):
+        """DB session returning the candidates"""
+        session = Mock()
+        session.query.return_value.filter.return_value.all.return_value = posts
+        monkeypatch.setattr(tasks, "get_database_session", lambda: session)
+        monkeypatch.setattr(tasks.settings, "pre_classifier_enabled", True)
+        return session
+
+    @staticmethod
+    def _gate(monkeypatch, **decision):
+        classifier = Mock()
+        classifier.gate.return_value = GateResult(**decision)
+        monkeypatch.setattr(tasks, "get_pre_classifier", lambda: classifier)
+        return classifier
+
+    def test_rejects_are_skipped_in_one_update(self, posts, session, monkeypatch):
+        """Test skipped posts get one status UPDATE and a processing log each"""
+        skip_id, keep_id, delay_id = (str(post.id) for post in posts)
+        classifier = self._gate(
+            monkeypatch, process=[keep_id], delay=[delay_id], skip=[skip_id], scores={skip_id: 0.05}
+        )
+
+        gate = tasks.gate_posts([skip_id, keep_id, delay_id])
+
+        assert len(classifier.gate.call_args.args[0]) == 3
+        session.query.return_value.filter.return_value.update.assert_called_once()
+        update = session.query.return_value.filter.return_value.update.call_args.args[0]
+        assert update[Post.status] == "skipped"
+        logs = session.add_all.call_args.args[0]
+        assert [(log.status, log.post_id) for log in logs] == [("skipped", posts[0].id)]
+        session.commit.assert_called_once()
+        assert (gate.process, gate.delay) == ([keep_id], [delay_id])
+
+    def test_batch_trigger_enqueues_only_survivors(self, posts, session, monkeypatch):
+        """Test skipped posts never reach the process queue and delayed ones wait"""
+        skip_id, keep_id, delay_id = (str(post.id) for post in posts)
+        self._gate(monkeypatch, process=[keep_id], delay=[delay_id], skip=[skip_id])
+        delay = Mock(return_value=Mock(id="task-1"))
+        apply_async = Mock(return_value=Mock(id="task-2"))
+        monkeypatch.setattr(tasks.batch_process_posts, "delay", delay)
+        monkeypatch.setattr(tasks.batch_process_posts, "apply_async", apply_async)
+
+        assert tasks.trigger_batch_processing([skip_id, keep_id, delay_id]) == "task-1"
+        delay.assert_called_once_with([keep_id])
+        assert apply_async.call_args.kwargs["args"] == [[delay_id]]
+        assert apply_async.call_args.kwargs["countdown"] == tasks.settings.pre_classifier_delay_seconds
+
+    def test_single_trigger_skips_rejected_post(self, posts, session, monkeypatch):
+        """Test a rejected post is not enqueued at all"""
+        post_id = str(posts[0].id)
+        self._gate(monkeypatch, skip=[post_id])
+        delay = Mock(side_effect=AssertionError("enqueued"))
+        monkeypatch.setattr(tasks.process_content_with_ai, "delay", delay)
+
+        assert tasks.trigger_post_processing(post_id) is None
+
+    def test_disabled_gate_passes_everything_without_db(self, monkeypatch):
+        """Test nothing is loaded or scored with the pre-classifier off"""
+        monkeypatch.setattr(tasks.settings, "pre_classifier_enabled", False)
+        monkeypatch.setattr(tasks, "get_database_session", Mock(side_effect=AssertionError("DB used")))
+
+        assert tasks.gate_posts(["a", "b"]).process == ["a", "b"]
@@ -0,0 +1,75 @@
+"""
+Unit tests for per-post NLP stage checkpoints
+"""
+from decimal import Decimal
+
+import pytest
+
+from workers.nlp_pipeline.stage_checkpoints import StageCheckpointStore
+
+
+class FakeRedis:
+    """In-memory stand-in for the hash commands used by the store"""
+
+    def __init__(self):
+        self.hashes = {}
+        self.ttls = {}
+
+    def pipeline(self, transaction=True):
+        return self
+
+    def hset(self, key, field, value):
+        self.hashes.setdefault(key, {})[field] = value
+
+    def expire(self, key, ttl):
+        self.ttls[key] = ttl
+
+    def execute(self):
+        return []
+
+    def hgetall(self, key):
+        return dict(self.hashes.get(key, {}))
+
+    def delete(self, key):
+        self.hashes.pop(key, None)
+
+
+class TestStageCheckpointStore:
+    """Test StageCheckpointStore save/load/clear"""
+
+    @pytest.fixture
+    def store(self):
+        """Create store backed by an in-memory Redis"""
+        store = StageCheckpointStore()
+        store.redis_client = FakeRedis()
+        return store
+
+    def test_saved_stage_is_resumed(self, store):
+        """Test a finished stage comes back with its cost as Decimal"""
+        store.save("post-1", "hash-a", "summary", {"summary": "요약", "cost_usd": Decimal("0.000123")})
+
+        loaded = store.load("post-1", "hash-a")
+
+        assert list(loaded) == ["summary"]
+        assert loaded["summary"]["cost_usd"] == Decimal("0.000123")
+
+    def test_changed_content_hash_starts_fresh(self, store):
+        """Test checkpoints never leak across content versions"""
+        store.save("post-1", "hash-a", "tags", {"tags": ["개발"]})
+
+        assert store.load("post-1", "hash-b") == {}
+
+    def test_clear_removes_all_stages(self, store):
+        """Test checkpoints are dropped after the DB update"""
+        store.save("post-1", "hash-a", "summary", {"summary": "x"})
+        store.save("post-1", "hash-a", "analysis", {"analysis": {}})
+
+        store.clear("post-1", "hash-a")
+
+        assert store.load("post-1", "hash-a") == {}
+
+    def test_checkpoint_has_ttl(self, store):
+        """Test abandoned checkpoints expire"""
+        store.save("post-1", "hash-a", "summary", {"summary": "x"})
+
+        assert store.redis_client.ttls["nlp_checkpoint:post-1:hash-a"] == store.ttl
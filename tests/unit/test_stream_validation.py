@@ -0,0 +1,78 @@
+"""
+Unit tests for incremental validation of streamed completions
+"""
+import json
+
+import pytest
+
+from workers.nlp_pipeline.stream_validation import (
+    JSONObjectStreamValidator,
+    StreamValidationError,
+    TagListStreamValidator
+)
+
+
+def _feed_chunks(validator, text, size=7):
+    """Feed text in small deltas like a stream; return True if stopped early"""
+    for i in range(0, len(text), size):
+        if validator.feed(text[i:i + size]):
+            return True
+    return False
+
+
+class TestJSONObjectStreamValidator:
+    """Test early rejection of streamed JSON analysis output"""
+
+    def test_valid_object_completes(self):
+        """Test a well-formed object is reported complete when it closes"""
+        text = json.dumps({"pain_points": [{"description": "a, b {x}"}], "product_ideas": []})
+        validator = JSONObjectStreamValidator(max_chars=1000, max_array_items={"pain_points": 2})
+
+        assert _feed_chunks(validator, text) is True
+        validator.finish(text)
+
+    def test_non_json_prefix_rejected_immediately(self):
+        """Test prose output is rejected on the first character"""
+        validator = JSONObjectStreamValidator(max_chars=1000)
+
+        with pytest.raises(StreamValidationError):
+            validator.feed("Sure! Here is")
+
+    def test_array_bound_exceeded_mid_stream(self):
+        """Test a bounded array is rejected as soon as the extra item starts"""
+        text = '{"pain_points": [{"d": 1}, {"d": 2}, {"d": 3'
+        validator = JSONObjectStreamValidator(max_chars=1000, max_array_items={"pain_points": 2})
+
+        with pytest.raises(StreamValidationError, match="pain_points"):
+            _feed_chunks(validator, text)
+
+    def test_mismatched_bracket_rejected(self):
+        """Test structural errors are caught before the end of output"""
+        validator = JSONObjectStreamValidator(max_chars=1000)
+
+        with pytest.raises(StreamValidationError):
+            validator.feed('{"a": [1, 2}')
+
+    def test_length_cap(self):
+        """Test output longer than the cap is cancelled"""
+        validator = JSONObjectStreamValidator(max_chars=10)
+
+        with pytest.raises(StreamValidationError):
+            _feed_chunks(validator, '{"analysis_notes": "' + "x" * 50)
+
+
+class TestTagListStreamValidator:
+    """Test streamed tag list handling"""
+
+    def test_stops_after_max_tags(self):
+        """Test reading stops once enough complete tags were received"""
+        validator = TagListStreamValidator(max_chars=800, max_tags=3)
+
+        assert _feed_chunks(validator, "개발, 파이썬, 웹개발, 기술, 튜토리얼", size=3) is True
+
+    def test_prose_rejected(self):
+        """Test a sentence instead of tags is cancelled"""
+        validator = TagListStreamValidator(max_chars=800, max_tag_chars=30)
+
+        with pytest.raises(StreamValidationError):
+            _feed_chunks(validator, "Here are some tags that describe this Reddit post well")
@@ -0,0 +1,120 @@
+"""
+Unit tests for bulk Korean summary quality scoring
+"""
+import json
+import uuid
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+
+import numpy as np
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from workers.nlp_pipeline import tasks
+from workers.nlp_pipeline.summary_quality import SummaryQualityScorer
+
+
+GOOD_SUMMARY = (
+    "작성자는 소규모 SaaS 팀에서 매주 청구서 정산에 많은 시간을 쓰고 있다고 설명합니다. "
+    "기존 도구는 반복 작업을 자동화하지 못해 수작업이 늘어났습니다. "
+    "댓글에서는 자동화 스크립트와 외부 서비스 도입을 추천했습니다."
+)
+
+
+class TestSummaryQualityScorer:
+    """Test SummaryQualityScorer batch checks"""
+
+    @pytest.fixture
+    def scorer(self):
+        """Create scorer without a language ID model"""
+        scorer = SummaryQualityScorer(langid_model_path="/nonexistent/lid.176.ftz")
+        scorer.min_chars = 40
+        scorer.max_chars = 1500
+        scorer.min_hangul_ratio = 0.5
+        scorer.min_sentences = 2
+        scorer.max_sentences = 8
+        return scorer
+
+    def test_good_summary_passes(self, scorer):
+        """Test a well-formed Korean summary is not flagged"""
+        report = scorer.score([GOOD_SUMMARY])
+
+        assert report.flagged_indices == []
+        assert report.scores[0] > 0.8
+
+    def test_flags_each_failure_in_one_batch(self, scorer):
+        """Test empty, English, truncated and short summaries are flagged"""
+        summaries = [
+            GOOD_SUMMARY,
+            None,
+            "The author explains that reconciling invoices takes hours every week. They want automation.",
+            GOOD_SUMMARY[:-20],
+            "짧은 요약입니다."
+        ]
+
+        report = scorer.score(summaries)
+
+        assert report.flagged_indices == [1, 2, 3, 4]
+        assert "empty" in report.reasons[1]
+        assert "not_korean" in report.reasons[2]
+        assert "truncated" in report.reasons[3]
+        assert "too_short" in report.reasons[4]
+        assert report.scores[1] == 0.0
+
+    def test_sentence_count_bounds(self, scorer):
+        """Test summaries with too many sentences are flagged"""
+        report = scorer.score(["이것은 문장입니다. " * 12])
+
+        assert "sentence_count" in report.reasons[0]
+
+    def test_empty_batch(self, scorer):
+        """Test scoring nothing returns an empty report"""
+        assert scorer.score([]).flagged_indices == []
+
+
+class TestCheckSummaryQualityWatermark:
+    """Test the quality scan resumes from an (updated_at, id) keyset watermark"""
+
+    @pytest.fixture
+    def redis_sync(self, monkeypatch):
+        """Redis holding a watermark on a timestamp shared by several posts"""
+        store = {"summary_quality:watermark": json.dumps({
+            "updated_at": "2026-10-18T12:00:00",
+            "id": "00000000-0000-0000-0000-000000000002"
+        })}
+        redis_sync = Mock()
+        redis_sync.get.side_effect = store.get
+        redis_sync.set.side_effect = store.__setitem__
+        redis_sync.store = store
+        monkeypatch.setattr(tasks.settings, "summary_quality_enabled", True)
+        return redis_sync
+
+    def test_scan_continues_after_last_id_on_shared_timestamp(self, redis_sync, monkeypatch):
+        """Test rows tied on updated_at past the batch boundary are still selected"""
+        shared = datetime(2026, 10, 18, 12, 0, 0)
+        rows = [
+            SimpleNamespace(id=uuid.UUID(int=3), summary_ko="요약", updated_at=shared),
+            SimpleNamespace(id=uuid.UUID(int=4), summary_ko="요약", updated_at=shared)
+        ]
+        session = Mock()
+        query = session.query.return_value
+        query.filter.return_value.order_by.return_value.limit.return_value.all.return_value = rows
+        monkeypatch.setattr(tasks, "get_database_session", lambda: session)
+        scorer = Mock()
+        scorer.score.return_value = SimpleNamespace(flagged_indices=[], reasons=[[], []], scores=np.array([1.0, 1.0]))
+
+        with patch("redis.from_url", return_value=redis_sync), \
+                patch("workers.nlp_pipeline.summary_quality.get_summary_quality_scorer", return_value=scorer):
+            result = tasks.check_summary_quality(batch_size=2)
+
+        keyset = query.filter.call_args.args[1].compile(dialect=postgresql.dialect())
+        assert str(keyset).startswith("(posts.updated_at, posts.id) >")
+        assert keyset.params["param_2"] == uuid.UUID(int=2)
+        order = [str(column) for column in query.filter.return_value.order_by.call_args.args]
+        assert order == ["Post.updated_at", "Post.id"]
+        assert result["checked"] == 2
+        assert json.loads(redis_sync.store["summary_quality:watermark"]) == {
+            "updated_at": "2026-10-18T12:00:00",
+            "id": str(uuid.UUID(int=4))
+        }
@@ -0,0 +1,57 @@
+"""
+Unit tests for the embedding-based tag vocabulary index
+"""
+import numpy as np
+import pytest
+from unittest.mock import Mock
+
+from workers.nlp_pipeline.tag_index import TagVocabularyIndex
+
+
+VECTORS = {
+    "Python": [1.0, 0.0, 0.0],
+    "Docker": [0.0, 1.0, 0.0],
+    "Marketing": [0.0, 0.0, 1.0],
+    "python": [0.9, 0.1, 0.0],
+    "containers": [0.2, 1.0, 0.0],
+    "banana": [-1.0, -1.0, -1.0],
+}
+
+
+class TestTagVocabularyIndex:
+    """Test TagVocabularyIndex similarity mapping"""
+
+    @pytest.fixture
+    def index(self):
+        """Create index over a tiny vocabulary with fake embeddings"""
+        index = TagVocabularyIndex(similarity_threshold=0.5, top_k=2)
+        index.DEFAULT_TAGS = ["Python", "Docker", "Marketing"]
+        index.redis_client = None
+        index._embedding_service = Mock()
+        index._embedding_service.embed.side_effect = lambda texts: np.array(
+            [VECTORS[t] for t in texts], dtype=np.float32
+        )
+        return index
+
+    def test_maps_keywords_to_nearest_tags(self, index):
+        """Test keywords map to the most similar canonical tags in score order"""
+        assert index.map_keywords(["python", "containers"]) == ["Python", "Docker"]
+
+    def test_threshold_filters_unrelated_keywords(self, index):
+        """Test keywords below the similarity threshold produce no tags"""
+        assert index.map_keywords(["banana"]) == []
+
+    def test_max_tags_limits_result(self, index):
+        """Test result is capped at max_tags"""
+        assert index.map_keywords(["python", "containers"], max_tags=1) == ["Python"]
+
+    def test_index_built_once_per_version(self, index):
+        """Test tag matrix is not re-embedded while the version is unchanged"""
+        index.map_keywords(["python"])
+        index.map_keywords(["containers"])
+
+        tag_builds = [
+            call for call in index._embedding_service.embed.call_args_list
+            if call[0][0] == ["Docker", "Marketing", "Python"]
+        ]
+        assert len(tag_builds) == 1
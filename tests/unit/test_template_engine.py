@@ -4,13 +4,15 @@ Unit tests for Template Engine
 
 import pytest
 import json
-from unittest.mock import patch, mock_open
+import re
+from unittest.mock import Mock, patch, mock_open
 from pathlib import Path
 
 from workers.publisher.template_engine import (
     TemplateEngine,
     TemplateType,
-    get_template_engine
+    get_template_engine,
+    sanitize_html
 )
 
 
@@ -387,4 +389,272 @@ class TestTemplateType:
         assert len(types) == 3
         assert TemplateType.ARTICLE in types
         assert TemplateType.LIST in types
-        assert TemplateType.QA in types
\ No newline at end of file
+        assert TemplateType.QA in types
+
+
+class TestRenderPipeline:
+    """Test Markdown rendering, sanitizing and the rendered HTML cache"""
+    
+    @pytest.fixture
+    def engine(self):
+        """Template engine with Redis unavailable (local LRU only)"""
+        engine = TemplateEngine()
+        engine._render_cache.clear_local()
+        redis_client = Mock()
+        redis_client.get.side_effect = ConnectionError("redis down")
+        redis_client.set.side_effect = ConnectionError("redis down")
+        engine._render_cache._redis_client = redis_client
+        return engine
+    
+    def test_sanitize_drops_scripts_and_handlers(self):
+        """Test scripts, styles and event handlers are removed in one pass"""
+        html = '<p onclick="x()" ONMOUSEOVER=\'y()\'>Hi</p><script>alert(1)</script><style>p{}</style>'
+        
+        assert sanitize_html(html) == '<p>Hi</p>'
+    
+    def test_sanitize_unknown_tags_keep_text(self):
+        """Test non-allowlisted tags are unwrapped and their text escaped"""
+        html = '<p><font color="red">a &lt;b&gt;</font></p><iframe src="x">gone</iframe>'
+        
+        assert sanitize_html(html) == '<p>a &lt;b&gt;</p>'
+    
+    def test_sanitize_unsafe_urls(self):
+        """Test javascript: and data: URLs are dropped, http(s) and relative kept"""
+        html = (
+            '<a href="javascript:alert(1)">x</a>'
+            '<a href=" JaVaScRiPt:alert(1)">y</a>'
+            '<img src="data:image/png;base64,AAAA">'
+            '<a href="https://example.com/a?b=1&amp;c=2">ok</a>'
+            '<a href="/r/python">rel</a>'
+        )
+        
+        result = sanitize_html(html)
+        
+        assert 'javascript' not in result.lower()
+        assert 'data:' not in result
+        assert '<a href="https://example.com/a?b=1&amp;c=2">ok</a>' in result
+        assert '<a href="/r/python">rel</a>' in result
+    
+    def test_sanitize_balances_tags(self):
+        """Test stray closing tags are dropped and open tags closed"""
+        assert sanitize_html('</div><p><strong>bold') == '<p><strong>bold</strong></p>'
+        assert sanitize_html('<ul><li>a</ul>') == '<ul><li>a</li></ul>'
+    
+    def test_sanitize_preserves_pre_whitespace(self):
+        """Test whitespace is collapsed except inside code blocks"""
+        html = '<p>a   \n  b</p>\n<pre><code class="language-python">if x:\n    y()\n</code></pre>'
+        
+        assert sanitize_html(html) == (
+            '<p>a b</p> <pre><code class="language-python">if x:\n    y()\n</code></pre>'
+        )
+    
+    def test_markdown_features(self, engine):
+        """Test tables, fenced code and line breaks render"""
+        text = (
+            "| a | b |\n|---|--:|\n| 1 | 2 |\n\n"
+            "```python\nprint('hi')\n```\n\n"
+            "line one\nline two"
+        )
+        
+        html = engine.markdown_to_html(text)
+        
+        assert '<table>' in html and '<td' in html
+        assert 'class="language-python"' in html
+        assert "print(&#x27;hi&#x27;)" in html or "print('hi')" in html
+        assert '<br>' in html
+    
+    def test_markdown_raw_html_is_not_executable(self, engine):
+        """Test raw HTML in Reddit markdown cannot inject scripts or handlers"""
+        html = engine.markdown_to_html('<script>alert(1)</script>\n\n<img src=x onerror=alert(1)>')
+        
+        assert '<script' not in html
+        assert not re.search(r'<[^>]*onerror', html)
+    
+    def test_raw_html_same_on_both_backends(self, engine):
+        """Test allowlisted raw HTML survives and unsafe parts are stripped with either backend"""
+        text = 'Hello <b>world</b> <span onclick="x()">there</span>\n\n<div>block</div>'
+        
+        outputs = [engine.markdown_to_html(text)]
+        engine._markdown_it = None
+        outputs.append(engine._clean_html(engine._render_markdown(text)))
+        
+        for html in outputs:
+            assert '<b>world</b>' in html
+            assert '<span>there</span>' in html
+            assert '<div>block</div>' in html
+            assert '&lt;b&gt;' not in html
+    
+    def test_render_cache_hit_skips_rendering(self, engine):
+        """Test the same content_hash is rendered once"""
+        with patch.object(engine, '_render_markdown', wraps=engine._render_markdown) as render:
+            first = engine.markdown_to_html('# Title\n\nBody', content_hash='abc123')
+            second = engine.markdown_to_html('# Title\n\nBody', content_hash='abc123')
+        
+        assert first == second
+        assert render.call_count == 1
+    
+    def test_render_cache_new_hash_rerenders(self, engine):
+        """Test edited content (new content_hash) is rendered again"""
+        engine.markdown_to_html('old body', content_hash='hash-1')
+        
+        assert 'new body' in engine.markdown_to_html('new body', content_hash='hash-2')
+    
+    def test_render_cache_shared_through_redis(self, engine):
+        """Test HTML rendered by another worker is served from Redis"""
+        redis_client = Mock()
+        redis_client.get.return_value = '<p>from redis</p>'
+        engine._render_cache._redis_client = redis_client
+        
+        with patch.object(engine, '_render_markdown') as render:
+            html = engine.markdown_to_html('anything', content_hash='shared')
+        
+        assert html == '<p>from redis</p>'
+        render.assert_not_called()
+        assert redis_client.get.call_args[0][0].endswith(':shared')
+    
+    def test_render_article_passes_content_hash(self, engine):
+        """Test render_article reuses cached content for an unchanged post"""
+        post_data = {
+            'title': 'Post',
+            'content': 'Some **bold** text',
+            'reddit_url': 'https://reddit.com/r/test/1'
+        }
+        
+        with patch.object(engine, '_render_markdown', wraps=engine._render_markdown) as render:
+            first = engine.render_article(post_data, content_hash='post-hash')
+            second = engine.render_article(post_data, content_hash='post-hash')
+        
+        assert first == second
+        assert render.call_count == 1
+
+
+class TestTemplateSelection:
+    """Test per-subreddit and per-post-type template selection"""
+    
+    @pytest.fixture
+    def templates_dir(self, tmp_path):
+        """Templates directory with the shipped types and one subreddit override"""
+        (tmp_path / "article.hbs").write_text('<article class="a">{{title}}</article>')
+        (tmp_path / "list.hbs").write_text('<ol>{{#each items}}<li>{{this}}</li>{{/each}}</ol>')
+        (tmp_path / "qa.hbs").write_text(
+            '<div class="qa">{{#each top_answers}}<div>{{score}}:{{{content}}}</div>{{/each}}</div>'
+        )
+        (tmp_path / "subreddits").mkdir()
+        (tmp_path / "subreddits" / "python.hbs").write_text('<article class="py">{{title}}</article>')
+        return tmp_path
+    
+    @pytest.fixture
+    def engine(self, templates_dir):
+        """Engine over the temporary templates with no background reloader"""
+        with patch('workers.publisher.template_engine.settings') as mock_settings:
+            mock_settings.template_reload_enabled = False
+            mock_settings.template_reload_interval = 0
+            mock_settings.template_type_detection = True
+            mock_settings.template_subreddit_map = "AskReddit:qa, news:missing"
+            engine = TemplateEngine(templates_dir=str(templates_dir))
+            yield engine
+    
+    def test_available_templates(self, engine):
+        """Test every .hbs is compiled at construction"""
+        assert engine.get_available_templates() == ['article', 'list', 'qa', 'subreddits/python']
+    
+    def test_subreddit_map_wins(self, engine):
+        """Test TEMPLATE_SUBREDDIT_MAP selects a template regardless of post type"""
+        assert engine.select_template({'subreddit': 'askreddit', 'title': 'News today'}) == 'qa'
+    
+    def test_subreddit_template_file(self, engine):
+        """Test templates/subreddits/<name>.hbs is used for that subreddit"""
+        assert engine.select_template({'subreddit': 'Python', 'title': 'Why is the GIL?'}) == 'subreddits/python'
+    
+    def test_missing_mapped_template_falls_through(self, engine):
+        """Test a mapping to an unknown template falls back to type detection"""
+        assert engine.select_template({'subreddit': 'news', 'title': 'Daily update'}) == 'article'
+    
+    def test_post_type_selection(self, engine):
+        """Test question and list posts get their own templates"""
+        assert engine.select_template({'title': 'How do I learn Rust?'}) == 'qa'
+        assert engine.select_template({
+            'title': 'Top 5 editors',
+            'content': '1. Vim\n2. Emacs\n3. VS Code'
+        }) == 'list'
+        assert engine.select_template({'title': '10 years of Python', 'content': 'A story.'}) == 'article'
+    
+    def test_post_type_detection_disabled(self, templates_dir):
+        """Test question and list posts keep the article template unless detection is enabled"""
+        with patch('workers.publisher.template_engine.settings') as mock_settings:
+            mock_settings.template_reload_enabled = False
+            mock_settings.template_type_detection = False
+            mock_settings.template_subreddit_map = ""
+            engine = TemplateEngine(templates_dir=str(templates_dir))
+            
+            assert engine.select_template({'title': 'How do I learn Rust?'}) == 'article'
+            assert engine.select_template({
+                'title': 'Top 5 editors',
+                'content': '1. Vim\n2. Emacs\n3. VS Code'
+            }) == 'article'
+    
+    def test_render_list_post(self, engine):
+        """Test list posts render extracted items"""
+        html = engine.render_article({
+            'title': 'Top 3 tools',
+            'content': '- git\n- make\n- grep',
+            'reddit_url': 'https://reddit.com/r/x/1'
+        })
+        
+        assert '<li>git</li><li>make</li><li>grep</li>' in html
+        assert 'https://reddit.com/r/x/1' in html
+    
+    def test_render_qa_post(self, engine):
+        """Test Q&A posts render answers from Markdown"""
+        html = engine.render_article({
+            'title': 'What is a monad?',
+            'top_answers': [{'content': 'A **monoid**', 'score': 12}]
+        })
+        
+        assert '12:<p>A <strong>monoid</strong></p>' in html
+    
+    @pytest.mark.parametrize('post', [
+        {'title': 'How do I pick a database?', 'content': 'Postgres or **SQLite**?'},
+        {'title': 'Top 3 databases', 'content': '1. Postgres\n2. **SQLite**\n3. MySQL'},
+    ])
+    def test_shipped_type_templates_keep_article_sections(self, post):
+        """Test the shipped qa/list templates keep insights and the original body"""
+        with patch('workers.publisher.template_engine.settings') as mock_settings:
+            mock_settings.template_reload_enabled = False
+            mock_settings.template_type_detection = True
+            mock_settings.template_subreddit_map = ""
+            engine = TemplateEngine(templates_dir="templates")
+        engine._render_cache = Mock(get=Mock(return_value=None))
+        
+        html = engine.render_article({
+            **post,
+            'summary_ko': '요약 내용',
+            'pain_points': ['slow migrations'],
+            'product_ideas': ['schema diff tool'],
+            'reddit_url': 'https://reddit.com/r/x/1'
+        })
+        
+        assert engine.select_template(post) in ('qa', 'list')
+        assert '요약 내용' in html
+        assert '<li>slow migrations</li>' in html
+        assert '<li>schema diff tool</li>' in html
+        assert '<strong>SQLite</strong>' in html
+    
+    def test_explicit_template_name(self, engine):
+        """Test render_article honours an explicit template name"""
+        html = engine.render_article({'title': 'Hello', 'subreddit': 'python'}, template_name='article')
+        
+        assert '<article class="a">Hello</article>' in html
+    
+    def test_builtin_article_without_templates_dir(self, tmp_path):
+        """Test the built-in article template is used when no files exist"""
+        with patch('workers.publisher.template_engine.settings') as mock_settings:
+            mock_settings.template_reload_enabled = False
+            mock_settings.template_type_detection = True
+            mock_settings.template_subreddit_map = ""
+            engine = TemplateEngine(templates_dir=str(tmp_path / "none"))
+        
+        html = engine.render_article({'title': 'Hello', 'content': 'Body'})
+        
+        assert engine.get_available_templates() == ['article']
+        assert 'reddit-article' in html and 'Hello' in html
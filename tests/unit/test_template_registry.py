@@ -0,0 +1,106 @@
+"""
+Unit tests for the compiled template registry
+"""
+
+import os
+import time
+
+import pytest
+
+from workers.publisher.template_registry import TemplateRegistry
+
+
+def write_template(path, source, bump=0):
+    """Write a template and move its mtime forward so the change is always visible"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(source, encoding="utf-8")
+    stamp = time.time() + bump
+    os.utime(path, (stamp, stamp))
+
+
+class TestTemplateRegistry:
+    """Test TemplateRegistry compilation and reloading"""
+
+    @pytest.fixture
+    def templates_dir(self, tmp_path):
+        """Templates directory with a top-level and a nested template"""
+        write_template(tmp_path / "article.hbs", "<h1>{{title}}</h1>")
+        write_template(tmp_path / "subreddits" / "python.hbs", "<h2>{{title}}</h2>")
+        (tmp_path / "base.html").write_text("not a template")
+        return tmp_path
+
+    def test_compiles_all_templates_by_relative_name(self, templates_dir):
+        """Test every .hbs is compiled and named by its relative path"""
+        registry = TemplateRegistry(templates_dir)
+
+        assert registry.names() == ["article", "subreddits/python"]
+        assert registry.get("article")({"title": "Hi"}) == "<h1>Hi</h1>"
+        assert registry.get("subreddits/python")({"title": "Py"}) == "<h2>Py</h2>"
+        assert registry.get("missing") is None
+
+    def test_reload_recompiles_only_changed_files(self, templates_dir):
+        """Test unchanged templates keep their compiled function"""
+        registry = TemplateRegistry(templates_dir)
+        python_template = registry.get("subreddits/python")
+
+        write_template(templates_dir / "article.hbs", "<h1>v2 {{title}}</h1>", bump=5)
+
+        assert registry.reload() == ["article"]
+        assert registry.get("article")({"title": "Hi"}) == "<h1>v2 Hi</h1>"
+        assert registry.get("subreddits/python") is python_template
+        assert registry.reload() == []
+
+    def test_reload_picks_up_new_and_deleted_files(self, templates_dir):
+        """Test added templates appear and deleted ones disappear"""
+        registry = TemplateRegistry(templates_dir)
+
+        write_template(templates_dir / "qa.hbs", "<p>{{title}}?</p>")
+        (templates_dir / "subreddits" / "python.hbs").unlink()
+
+        assert registry.reload() == ["qa"]
+        assert registry.names() == ["article", "qa"]
+
+    def test_broken_template_keeps_last_good_version(self, templates_dir):
+        """Test a template that fails to compile does not replace the working one"""
+        registry = TemplateRegistry(templates_dir)
+
+        write_template(templates_dir / "article.hbs", "<h1>{{#if title}}x{{/each}}</h1>", bump=5)
+
+        assert registry.reload() == []
+        assert registry.get("article")({"title": "Hi"}) == "<h1>Hi</h1>"
+
+    def test_builtin_used_until_file_exists(self, tmp_path):
+        """Test builtin fallbacks are shadowed by a template file of the same name"""
+        registry = TemplateRegistry(tmp_path)
+        registry.register_builtin("article", "builtin {{title}}")
+
+        assert registry.get("article")({"title": "a"}) == "builtin a"
+
+        write_template(tmp_path / "article.hbs", "file {{title}}")
+        registry.reload()
+
+        assert registry.get("article")({"title": "a"}) == "file a"
+
+    def test_background_reloader(self, templates_dir):
+        """Test the watcher thread swaps in changed templates without a reload call"""
+        registry = TemplateRegistry(templates_dir, reload_interval=0.05)
+        try:
+            assert registry.get("article")({"title": "Hi"}) == "<h1>Hi</h1>"
+
+            write_template(templates_dir / "article.hbs", "<h1>new {{title}}</h1>", bump=5)
+
+            deadline = time.time() + 5
+            while time.time() < deadline:
+                if registry.get("article")({"title": "Hi"}) == "<h1>new Hi</h1>":
+                    break
+                time.sleep(0.02)
+            assert registry.get("article")({"title": "Hi"}) == "<h1>new Hi</h1>"
+        finally:
+            registry.close()
+
+    def test_no_watcher_when_disabled(self, templates_dir):
+        """Test reload_interval=0 never starts a thread"""
+        registry = TemplateRegistry(templates_dir, reload_interval=0)
+        registry.get("article")
+
+        assert registry._watcher_pid is None
@@ -0,0 +1,176 @@
+"""
+Unit tests for the buffered token usage ledger
+"""
+import uuid
+from decimal import Decimal
+from unittest.mock import Mock, patch
+
+import pytest
+from sqlalchemy.exc import IntegrityError, OperationalError
+
+from workers.nlp_pipeline.token_ledger import TokenUsageLedger
+
+
+DB_DOWN = OperationalError("INSERT", {}, Exception("db down"))
+
+
+class TestTokenUsageLedger:
+    """Test TokenUsageLedger buffering and bulk flush"""
+
+    @pytest.fixture
+    def mock_session(self):
+        """Mock database session returned by get_database_session"""
+        session = Mock()
+        with patch('workers.nlp_pipeline.token_ledger.get_database_session', return_value=session):
+            yield session
+
+    @pytest.fixture
+    def ledger(self, mock_session):
+        """Create ledger with small flush size and no background thread"""
+        ledger = TokenUsageLedger(flush_size=3, flush_interval=3600)
+        ledger._ensure_flusher = Mock()
+        return ledger
+
+    def _record(self, ledger, post_id=None):
+        ledger.record(
+            post_id=post_id or str(uuid.uuid4()),
+            service="openai",
+            model="gpt-4o-mini",
+            input_tokens=100,
+            output_tokens=50,
+            cost_usd=Decimal("0.0000225")
+        )
+
+    def test_records_are_buffered_until_flush_size(self, ledger, mock_session):
+        """Test records stay in memory below the flush size"""
+        self._record(ledger)
+        self._record(ledger)
+
+        assert ledger.pending() == 2
+        mock_session.execute.assert_not_called()
+
+    def test_flush_size_triggers_single_insert(self, ledger, mock_session):
+        """Test reaching flush size issues one INSERT for all records"""
+        for _ in range(3):
+            self._record(ledger)
+
+        assert ledger.pending() == 0
+        assert mock_session.execute.call_count == 1
+        mock_session.commit.assert_called_once()
+
+    def test_invalid_post_id_is_skipped(self, ledger):
+        """Test non-UUID ids (health checks) never reach the buffer"""
+        self._record(ledger, post_id="health_check_test")
+
+        assert ledger.pending() == 0
+
+    def test_flush_failure_rolls_back(self, ledger, mock_session):
+        """Test a failed bulk insert is rolled back and reported as 0 written"""
+        mock_session.execute.side_effect = DB_DOWN
+        self._record(ledger)
+
+        assert ledger.flush() == 0
+        mock_session.rollback.assert_called_once()
+        mock_session.close.assert_called_once()
+
+    def test_failed_flush_keeps_records_for_retry(self, ledger, mock_session):
+        """Test records from a failed INSERT are written by the next flush"""
+        mock_session.execute.side_effect = [DB_DOWN, None]
+        self._record(ledger)
+        self._record(ledger)
+
+        assert ledger.flush() == 0
+        assert ledger.pending() == 2
+
+        assert ledger.flush() == 2
+        assert ledger.pending() == 0
+
+    def test_requeued_records_stay_ahead_of_new_ones(self, ledger, mock_session):
+        """Test retried records keep their order in front of newer records"""
+        mock_session.execute.side_effect = DB_DOWN
+        first = str(uuid.uuid4())
+        self._record(ledger, post_id=first)
+        ledger.flush()
+
+        self._record(ledger)
+
+        assert str(ledger._buffer[0]["post_id"]) == first
+        assert ledger.pending() == 2
+
+    def test_failed_flush_suppresses_size_trigger(self, ledger, mock_session):
+        """Test new records do not retry the INSERT on every call while the DB is down"""
+        mock_session.execute.side_effect = DB_DOWN
+        for _ in range(3):
+            self._record(ledger)
+        assert mock_session.execute.call_count == 1
+
+        for _ in range(3):
+            self._record(ledger)
+
+        assert mock_session.execute.call_count == 1
+        assert ledger.pending() == 6
+
+    def test_requeue_is_capped(self, mock_session):
+        """Test the retry buffer drops the oldest records beyond max_buffer"""
+        ledger = TokenUsageLedger(flush_size=100, flush_interval=3600, max_buffer=3)
+        ledger._ensure_flusher = Mock()
+        mock_session.execute.side_effect = DB_DOWN
+        for _ in range(5):
+            self._record(ledger)
+
+        ledger.flush()
+
+        assert ledger.pending() == 3
+
+    def test_shutdown_flushes_remaining(self, ledger, mock_session):
+        """Test shutdown writes whatever is still buffered"""
+        self._record(ledger)
+
+        assert ledger.shutdown() == 1
+        assert ledger.pending() == 0
+
+    def test_prompt_cache_fields_are_buffered(self, ledger):
+        """Test cached token count and prompt version are kept per record"""
+        ledger.record(
+            post_id=str(uuid.uuid4()),
+            service="openai",
+            model="gpt-4o-mini",
+            input_tokens=1200,
+            output_tokens=50,
+            cost_usd=Decimal("0.0001"),
+            cached_tokens=1024,
+            prompt_version="2",
+            latency_ms=850
+        )
+
+        assert ledger._buffer[0]["cached_tokens"] == 1024
+        assert ledger._buffer[0]["prompt_version"] == "2"
+
+    def test_rejected_batch_drops_only_failing_rows(self, ledger, mock_session):
+        """Test an integrity error falls back to row inserts and drops only the bad row"""
+        fk_violation = IntegrityError("INSERT", {}, Exception("violates foreign key constraint"))
+        mock_session.execute.side_effect = [fk_violation, None, fk_violation, None]
+        for _ in range(3):
+            self._record(ledger)
+
+        assert mock_session.execute.call_count == 4
+        assert ledger.pending() == 0
+        assert not ledger._flush_failed
+
+    def test_row_fallback_requeues_on_connection_loss(self, ledger, mock_session):
+        """Test rows not yet written are kept when the DB goes away mid-fallback"""
+        fk_violation = IntegrityError("INSERT", {}, Exception("violates foreign key constraint"))
+        mock_session.execute.side_effect = [fk_violation, None, DB_DOWN]
+        for _ in range(3):
+            self._record(ledger)
+
+        assert ledger.pending() == 2
+        assert ledger._flush_failed
+
+    def test_unexpected_error_does_not_requeue(self, ledger, mock_session):
+        """Test only connection/operational errors keep the batch for retry"""
+        mock_session.execute.side_effect = ValueError("bad record")
+        self._record(ledger)
+
+        assert ledger.flush() == 0
+        assert ledger.pending() == 0
@@ -0,0 +1,128 @@
+"""
+Unit tests for the distributed OpenAI token rate limiter
+"""
+import pytest
+from unittest.mock import Mock, patch
+
+from workers.nlp_pipeline.token_rate_limiter import (
+    TokenRateLimiter,
+    TokenReservation,
+    TokenBudgetExceededError,
+    TokenRateLimitTimeout
+)
+
+
+class TestTokenRateLimiter:
+    """Test TokenRateLimiter reservation logic"""
+
+    @pytest.fixture
+    def limiter(self):
+        """Create limiter with mocked Redis scripts"""
+        limiter = TokenRateLimiter(tpm_limit=1000, daily_limit=10000, max_wait_seconds=1)
+        limiter._redis_client = Mock()
+        limiter._reserve = Mock()
+        limiter._adjust = Mock()
+        limiter._penalize = Mock()
+        return limiter
+
+    def test_no_redis_connection_at_construction(self):
+        """Test creating the limiter (at import) never contacts Redis"""
+        with patch('workers.nlp_pipeline.token_rate_limiter.redis.from_url') as from_url:
+            TokenRateLimiter()
+
+        from_url.assert_not_called()
+
+    def test_unreachable_redis_allows_untracked_reservation(self):
+        """Test a Redis outage lets the call through without counters"""
+        limiter = TokenRateLimiter(tpm_limit=1000, daily_limit=10000, max_wait_seconds=1)
+        with patch('workers.nlp_pipeline.token_rate_limiter.settings.redis_url', 'redis://127.0.0.1:1/0'):
+            reservation, wait_seconds = limiter.try_reserve(500)
+
+        assert not reservation.is_tracked
+        assert wait_seconds == 0.0
+
+    def test_penalize_sets_cooldown_in_one_script(self, limiter):
+        """Test the longest-cooldown check and SET run atomically in Redis"""
+        limiter.penalize(2.5)
+
+        limiter._penalize.assert_called_once_with(keys=["openai_tpm:cooldown"], args=[2500])
+        limiter._redis_client.pttl.assert_not_called()
+        limiter._redis_client.set.assert_not_called()
+
+    def test_estimate_tokens_includes_completion_budget(self, limiter):
+        """Test estimate counts prompt characters plus max_tokens"""
+        assert limiter.estimate_tokens("a" * 30, "b" * 30, max_tokens=100) == 120
+
+    def test_try_reserve_success(self, limiter):
+        """Test successful reservation returns tracked reservation"""
+        limiter._reserve.return_value = [1, 500]
+
+        reservation, wait_seconds = limiter.try_reserve(500)
+
+        assert reservation is not None
+        assert reservation.tokens == 500
+        assert reservation.is_tracked
+        assert wait_seconds == 0.0
+
+    def test_try_reserve_over_daily_budget(self, limiter):
+        """Test daily budget overflow raises instead of waiting"""
+        limiter._reserve.return_value = [-1, 9900]
+
+        with pytest.raises(TokenBudgetExceededError):
+            limiter.try_reserve(500)
+
+    def test_try_reserve_cooldown_wait(self, limiter):
+        """Test cooldown returns remaining wait in seconds"""
+        limiter._reserve.return_value = [0, 2500]
+
+        reservation, wait_seconds = limiter.try_reserve(500)
+
+        assert reservation is None
+        assert wait_seconds == 2.5
+
+    @patch('workers.nlp_pipeline.token_rate_limiter.time.sleep')
+    def test_acquire_waits_then_reserves(self, mock_sleep, limiter):
+        """Test acquire sleeps while the TPM window is full"""
+        limiter._reserve.side_effect = [[0, 100], [1, 500]]
+
+        reservation = limiter.acquire(500)
+
+        assert reservation.tokens == 500
+        mock_sleep.assert_called_once()
+
+    @patch('workers.nlp_pipeline.token_rate_limiter.time.sleep')
+    def test_acquire_times_out(self, mock_sleep, limiter):
+        """Test acquire gives up after max wait"""
+        limiter._reserve.return_value = [0, 100]
+        limiter.max_wait_seconds = 0
+
+        with pytest.raises(TokenRateLimitTimeout):
+            limiter.acquire(500)
+
+    def test_reconcile_applies_delta(self, limiter):
+        """Test reconcile adjusts counters by actual - reserved"""
+        reservation = TokenReservation("r1", 500, "openai_tpm:1", "usage:20250101", 0.0)
+
+        limiter.reconcile(reservation, 320)
+
+        limiter._adjust.assert_called_once_with(
+            keys=["openai_tpm:1", "usage:20250101"], args=[-180]
+        )
+
+    def test_release_returns_all_tokens(self, limiter):
+        """Test release gives back the full reservation"""
+        reservation = TokenReservation("r1", 500, "openai_tpm:1", "usage:20250101", 0.0)
+
+        limiter.release(reservation)
+
+        limiter._adjust.assert_called_once_with(
+            keys=["openai_tpm:1", "usage:20250101"], args=[-500]
+        )
+
+    def test_untracked_reservation_skips_redis(self, limiter):
+        """Test reservations made without Redis are not reconciled"""
+        reservation = TokenReservation("r1", 500, None, None, 0.0)
+
+        limiter.reconcile(reservation, 100)
+
+        limiter._adjust.assert_not_called()
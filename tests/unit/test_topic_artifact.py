@@ -0,0 +1,155 @@
+"""
+Unit tests for the lazily loaded BERTopic safetensors artifact
+"""
+import json
+
+import numpy as np
+import pytest
+from safetensors.numpy import save_file
+from scipy.sparse import csr_matrix
+from sklearn.cluster import MiniBatchKMeans
+from sklearn.decomposition import IncrementalPCA
+from sklearn.feature_extraction.text import CountVectorizer
+
+from workers.nlp_pipeline.topic_artifact import (
+    ESTIMATOR_STATE_FILE,
+    TopicArtifact,
+    load_estimator_state,
+    mmap_safetensor,
+    save_estimator_state
+)
+
+
+class TestTopicArtifact:
+    """Test lazy, memory-mapped loading of a saved topic model"""
+
+    @pytest.fixture
+    def artifact_path(self, tmp_path):
+        """Artifact in BERTopic's safetensors layout with an outlier topic and two topics"""
+        save_file(
+            {"topic_embeddings": np.array([[1, 1, 0], [1, 0, 0], [0, 1, 0]], dtype=np.float32)},
+            str(tmp_path / "topic_embeddings.safetensors")
+        )
+        save_file(
+            {
+                "data": np.array([0.5, 0.25], dtype=np.float64),
+                "indices": np.array([0, 1], dtype=np.int32),
+                "indptr": np.array([0, 0, 1, 2], dtype=np.int32),
+                "shape": np.array([3, 2], dtype=np.int64),
+                "diag": np.array([1.0, 1.0], dtype=np.float64),
+            },
+            str(tmp_path / "ctfidf.safetensors")
+        )
+        (tmp_path / "topics.json").write_text(json.dumps({
+            "topic_representations": {"-1": [["the", 0.1]], "0": [["python", 0.9]], "1": [["rust", 0.8]]},
+            "topic_labels": {"-1": "-1_the", "0": "0_python", "1": "1_rust"},
+            "topic_sizes": {"-1": 3, "0": 10, "1": 7},
+            "_outliers": 1
+        }))
+        (tmp_path / "ctfidf_config.json").write_text(json.dumps({
+            "ctfidf_model": {"bm25_weighting": False, "reduce_frequent_words": False},
+            "vectorizer_model": {
+                "params": {"ngram_range": [1, 1], "decay": 0.01},
+                "vocab": {"python": 0, "rust": 1}
+            }
+        }))
+        return tmp_path
+
+    def test_nothing_is_read_on_open(self, artifact_path):
+        """Test opening an artifact does not touch its files"""
+        (artifact_path / "topics.json").unlink()
+
+        TopicArtifact(str(artifact_path))
+
+    def test_topic_embeddings_are_memory_mapped(self, artifact_path):
+        """Test topic embeddings come from a read-only memory map"""
+        embeddings = TopicArtifact(str(artifact_path)).topic_embeddings_
+
+        assert isinstance(embeddings, np.memmap)
+        assert embeddings.shape == (3, 3)
+        assert embeddings[1].tolist() == [1.0, 0.0, 0.0]
+        with pytest.raises(ValueError):
+            embeddings[0, 0] = 2.0
+
+    def test_transform_assigns_most_similar_topic(self, artifact_path):
+        """Test documents get the topic id of the closest embedding, outliers offset"""
+        artifact = TopicArtifact(str(artifact_path))
+
+        topics, probabilities = artifact.transform(
+            ["py", "rs"], embeddings=np.array([[2, 0, 0], [0, 3, 0]], dtype=np.float32)
+        )
+
+        assert topics == [0, 1]
+        assert probabilities.tolist() == pytest.approx([1.0, 1.0])
+        assert artifact.get_topic(0) == [["python", 0.9]]
+        assert artifact.get_topic(5) is False
+        assert artifact.topic_labels_[1] == "1_rust"
+
+    def test_ctfidf_and_vectorizer_loaded_on_demand(self, artifact_path):
+        """Test c-TF-IDF and the vocabulary are rebuilt only when accessed"""
+        artifact = TopicArtifact(str(artifact_path))
+
+        assert artifact.c_tf_idf_.shape == (3, 2)
+        assert artifact.c_tf_idf_.toarray()[1].tolist() == [0.5, 0.0]
+        counts = artifact.vectorizer_model.transform(["python python rust"]).toarray()
+        assert counts.tolist() == [[2, 1]]
+
+    def test_mmap_safetensor_reads_named_tensor(self, tmp_path):
+        """Test the header offsets select the right tensor"""
+        path = str(tmp_path / "t.safetensors")
+        save_file({"a": np.arange(4, dtype=np.int64), "b": np.ones((2, 2), dtype=np.float16)}, path)
+
+        assert mmap_safetensor(path, "a").tolist() == [0, 1, 2, 3]
+        assert mmap_safetensor(path, "b").dtype == np.float16
+
+
+class TestEstimatorState:
+    """Test online estimators are saved as arrays + JSON and continue fitting after a reload"""
+
+    @pytest.fixture
+    def batches(self):
+        rng = np.random.RandomState(0)
+        return [rng.normal(size=(40, 8)) for _ in range(3)]
+
+    def _estimators(self):
+        return {
+            "umap_model": IncrementalPCA(n_components=3),
+            "hdbscan_model": MiniBatchKMeans(n_clusters=4, random_state=42, n_init=1)
+        }
+
+    def _partial_fit(self, estimators, batch):
+        reduced = estimators["umap_model"].partial_fit(batch).transform(batch)
+        estimators["hdbscan_model"].partial_fit(reduced)
+        return reduced
+
+    def test_restored_estimators_continue_like_the_originals(self, tmp_path, batches):
+        """Test partial_fit after a save/load gives the same model as without one"""
+        original = self._estimators()
+        for batch in batches[:2]:
+            self._partial_fit(original, batch)
+
+        save_estimator_state(str(tmp_path), original, {"note": "kept"})
+        restored = self._estimators()
+        extra = load_estimator_state(str(tmp_path), restored)
+
+        reduced = self._partial_fit(original, batches[2])
+        assert np.allclose(self._partial_fit(restored, batches[2]), reduced)
+        assert np.allclose(restored["hdbscan_model"].cluster_centers_, original["hdbscan_model"].cluster_centers_)
+        assert restored["hdbscan_model"].predict(reduced).tolist() == original["hdbscan_model"].predict(reduced).tolist()
+        assert restored["umap_model"].n_samples_seen_ == 120
+        assert extra == {"note": "kept"}
+
+    def test_vocabulary_and_sparse_counts_round_trip(self, tmp_path):
+        """Test a vocabulary dict and a sparse bag-of-words survive as JSON + CSR arrays"""
+        vectorizer = CountVectorizer().fit(["python rust", "rust go"])
+        vectorizer.X_ = csr_matrix(np.array([[1, 0, 2], [0, 3, 0]]))
+
+        save_estimator_state(str(tmp_path), {"vectorizer_model": vectorizer}, {})
+        restored = CountVectorizer()
+        load_estimator_state(str(tmp_path), {"vectorizer_model": restored})
+
+        assert restored.vocabulary_ == vectorizer.vocabulary_
+        assert restored.X_.toarray().tolist() == [[1, 0, 2], [0, 3, 0]]
+        assert restored.transform(["go go python"]).toarray().tolist() == [[2, 1, 0]]
+        assert not list(tmp_path.glob("*.pkl")) and not list(tmp_path.glob("*.joblib"))
+        assert "vocabulary_" in (tmp_path / ESTIMATOR_STATE_FILE).read_text()
@@ -7,12 +7,13 @@ from datetime import datetime, timezone
 from typing import List, Dict, Any, Optional
 
 from celery.exceptions import Retry, MaxRetriesExceededError
-from sqlalchemy import create_engine, select, and_
-from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy import select, and_
+from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError, IntegrityError
 
 from app.celery_app import celery_app
 from app.config import get_settings
+from app.infrastructure import get_database_session, get_database_stats
 from app.models.post import Post
 from app.models.processing_log import ProcessingLog
 from app.transaction_manager import transaction_with_tracking, get_state_manager
@@ -23,14 +24,9 @@ from workers.collector.budget_manager import get_budget_manager
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
-# Initialize synchronous database session
-engine = create_engine(settings.database_url)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-
-
 def get_db_session() -> Session:
-    """Get synchronous database session"""
-    return SessionLocal()
+    """Get synchronous database session (shared per-process pooled engine)"""
+    return get_database_session()
 
 
 @celery_app.task(
@@ -379,7 +375,8 @@ def health_check(self) -> Dict[str, Any]:
                 result = session.execute(select(Post.id).limit(1))
                 health_status["checks"]["database"] = {
                     "status": "healthy",
-                    "connected": True
+                    "connected": True,
+                    **get_database_stats()
                 }
             finally:
                 session.close()
@@ -21,7 +21,12 @@ from .tasks import (
     process_content_with_ai,
     batch_process_posts,
     train_bertopic_model,
+    update_topic_model_incremental,
+    train_pre_classifier,
+    check_summary_quality,
+    resummarize_posts,
     health_check_nlp_services,
+    gate_posts,
     trigger_post_processing,
     trigger_batch_processing,
     trigger_model_training,
@@ -48,9 +53,14 @@ __all__ = [
     'process_content_with_ai',
     'batch_process_posts',
     'train_bertopic_model',
+    'update_topic_model_incremental',
+    'train_pre_classifier',
+    'check_summary_quality',
+    'resummarize_posts',
     'health_check_nlp_services',
     
     # Task utilities
+    'gate_posts',
     'trigger_post_processing',
     'trigger_batch_processing', 
     'trigger_model_training',
@@ -2,8 +2,10 @@
 Analysis engine for pain points and product ideas extraction
 """
 import asyncio
+import functools
 import logging
-from typing import Dict, Any, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Callable, List, Optional, Tuple
 import json
 from datetime import datetime
 from dataclasses import dataclass, asdict
@@ -86,6 +88,80 @@ class AnalysisResult:
         )
 
 
+class AIMDConcurrencyLimiter:
+    """
+    Adaptive concurrency limit for OpenAI calls (additive increase, multiplicative decrease)
+    - Grows by one slot after a full window of successful calls at the current limit
+    - Shrinks by decrease_factor on each rate limit signal, never below min_limit
+    - The learned limit survives across event loops (one asyncio.run per Celery task)
+    """
+    
+    def __init__(
+        self,
+        initial_limit: int,
+        min_limit: int,
+        max_limit: int,
+        decrease_factor: float = 0.5
+    ):
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.decrease_factor = decrease_factor
+        
+        self._limit = min(max(initial_limit, self.min_limit), self.max_limit)
+        self._in_flight = 0
+        self._successes = 0
+        self._condition: Optional[asyncio.Condition] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+    
+    @property
+    def limit(self) -> int:
+        """Current concurrency limit"""
+        return self._limit
+    
+    def _get_condition(self) -> asyncio.Condition:
+        """Condition bound to the running event loop"""
+        loop = asyncio.get_running_loop()
+        if self._condition is None or self._loop is not loop:
+            self._condition = asyncio.Condition()
+            self._loop = loop
+            self._in_flight = 0
+        return self._condition
+    
+    async def acquire(self) -> None:
+        """Wait for a free slot under the current limit"""
+        condition = self._get_condition()
+        async with condition:
+            await condition.wait_for(lambda: self._in_flight < self._limit)
+            self._in_flight += 1
+    
+    async def release(self, rate_limited: bool = False) -> None:
+        """Free a slot and adjust the limit from the call outcome"""
+        condition = self._get_condition()
+        async with condition:
+            self._in_flight -= 1
+            
+            if rate_limited:
+                self._limit = max(self.min_limit, int(self._limit * self.decrease_factor))
+                self._successes = 0
+                logger.warning(f"Rate limited, analysis concurrency reduced to {self._limit}")
+            else:
+                self._successes += 1
+                if self._successes >= self._limit and self._limit < self.max_limit:
+                    self._limit += 1
+                    self._successes = 0
+            
+            condition.notify_all()
+    
+    def stats(self) -> Dict[str, Any]:
+        """Get limiter state for health checks"""
+        return {
+            "limit": self._limit,
+            "in_flight": self._in_flight,
+            "min_limit": self.min_limit,
+            "max_limit": self.max_limit
+        }
+
+
 class AnalysisEngine:
     """Engine for extracting pain points and product ideas from Reddit posts"""
     
@@ -104,6 +180,80 @@ class AnalysisEngine:
         self._valid_frequencies = ["자주", "가끔", "드물게"]
         self._valid_feasibilities = ["높음", "보통", "낮음"]
         self._valid_market_potentials = ["높음", "보통", "낮음"]
+        
+        # The OpenAI client is synchronous; calls run on a thread pool bounded by AIMD
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._limiter = AIMDConcurrencyLimiter(
+            initial_limit=settings.analysis_initial_concurrency,
+            min_limit=settings.analysis_min_concurrency,
+            max_limit=settings.analysis_max_concurrency
+        )
+        self._seen_rate_limit_events = 0
+    
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Thread pool for blocking OpenAI calls (created lazily, after worker fork)"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self._limiter.max_limit,
+                thread_name_prefix="analysis"
+            )
+        return self._executor
+    
+    async def _run_openai(self, func: Callable[..., Dict[str, Any]], **kwargs: Any) -> Dict[str, Any]:
+        """
+        Run a synchronous OpenAI client call off the event loop under the AIMD limit
+        
+        A new 429 seen by the client during the call shrinks the limit once.
+        """
+        openai_client = get_openai_client()
+        await self._limiter.acquire()
+        
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), functools.partial(func, **kwargs))
+        finally:
+            events = openai_client.rate_limit_events
+            rate_limited = events > self._seen_rate_limit_events
+            self._seen_rate_limit_events = max(self._seen_rate_limit_events, events)
+            await self._limiter.release(rate_limited=rate_limited)
+    
+    async def _analyze(
+        self,
+        post_title: str,
+        post_content: str,
+        post_id: str
+    ) -> Tuple[AnalysisResult, Dict[str, Any]]:
+        """
+        Call OpenAI and validate the analysis
+        
+        Returns:
+            Tuple of (AnalysisResult, raw OpenAI response with token usage)
+        """
+        openai_client = get_openai_client()
+        
+        analysis_response = await self._run_openai(
+            openai_client.analyze_pain_points_and_ideas,
+            post_title=post_title,
+            post_content=post_content,
+            post_id=post_id,
+            max_tokens=800
+        )
+        
+        return await self._build_analysis_result(analysis_response, post_id), analysis_response
+    
+    async def _build_analysis_result(self, analysis_response: Dict[str, Any], post_id: str) -> AnalysisResult:
+        """Validate a raw OpenAI analysis response into an AnalysisResult"""
+        raw_analysis = analysis_response.get("analysis", {})
+        validated_result = await self._validate_and_clean_analysis(raw_analysis, post_id)
+        
+        return AnalysisResult(
+            post_id=post_id,
+            pain_points=validated_result["pain_points"],
+            product_ideas=validated_result["product_ideas"],
+            confidence_score=validated_result["confidence_score"],
+            analysis_notes=validated_result["analysis_notes"],
+            analyzed_at=datetime.utcnow().isoformat()
+        )
     
     async def analyze_post(
         self, 
@@ -133,30 +283,7 @@ class AnalysisEngine:
                     logger.debug(f"Retrieved analysis from cache for post {post_id}")
                     return AnalysisResult.from_dict(cached_result)
             
-            # Get OpenAI client
-            openai_client = get_openai_client()
-            
-            # Perform analysis using OpenAI
-            analysis_response = await openai_client.analyze_pain_points_and_ideas(
-                post_title=post_title,
-                post_content=post_content,
-                post_id=post_id,
-                max_tokens=800
-            )
-            
-            # Extract and validate analysis data
-            raw_analysis = analysis_response.get("analysis", {})
-            validated_result = await self._validate_and_clean_analysis(raw_analysis, post_id)
-            
-            # Create analysis result
-            result = AnalysisResult(
-                post_id=post_id,
-                pain_points=validated_result["pain_points"],
-                product_ideas=validated_result["product_ideas"],
-                confidence_score=validated_result["confidence_score"],
-                analysis_notes=validated_result["analysis_notes"],
-                analyzed_at=datetime.utcnow().isoformat()
-            )
+            result, analysis_response = await self._analyze(post_title, post_content, post_id)
             
             # Cache the result
             if use_cache:
@@ -342,35 +469,63 @@ class AnalysisEngine:
             logger.warning(f"Failed to validate product idea: {e}")
             return None
     
+    async def _get_cached_analyses(self, post_ids: List[str]) -> Dict[str, AnalysisResult]:
+        """Look up cached analyses for a whole batch in one round trip"""
+        try:
+            keys = [f"{self._cache_prefix}:{post_id}" for post_id in post_ids]
+            cached = await redis_client.cache_mget(keys)
+            return {
+                post_id: AnalysisResult.from_dict(data)
+                for post_id, data in zip(post_ids, cached)
+                if data
+            }
+        except Exception as e:
+            logger.warning(f"Batch analysis cache lookup failed: {e}")
+            return {}
+    
+    async def _cache_analyses(self, results: List[AnalysisResult]) -> None:
+        """Write new analyses back in one pipelined round trip"""
+        if not results:
+            return
+        try:
+            await redis_client.cache_mset(
+                {f"{self._cache_prefix}:{r.post_id}": r.to_dict() for r in results},
+                ttl=self._cache_ttl
+            )
+        except Exception as e:
+            logger.warning(f"Batch analysis cache write failed: {e}")
+    
     async def batch_analyze_posts(
         self, 
         posts: List[Dict[str, str]], 
-        max_concurrent: int = 3
+        max_concurrent: Optional[int] = None
     ) -> List[AnalysisResult]:
         """
         Analyze multiple posts concurrently
         
         Args:
             posts: List of post dictionaries with 'id', 'title', 'content'
-            max_concurrent: Maximum concurrent analyses
+            max_concurrent: Optional hard cap on top of the adaptive limit
         
         Returns:
             List of AnalysisResult objects
         """
         try:
-            semaphore = asyncio.Semaphore(max_concurrent)
+            cached = await self._get_cached_analyses([post["id"] for post in posts])
+            semaphore = asyncio.Semaphore(max_concurrent or max(len(posts), 1))
             
             async def analyze_single_post(post_data: Dict[str, str]) -> Optional[AnalysisResult]:
-                async with semaphore:
-                    try:
-                        return await self.analyze_post(
-                            post_title=post_data["title"],
-                            post_content=post_data["content"],
-                            post_id=post_data["id"]
+                if post_data["id"] in cached:
+                    return cached[post_data["id"]]
+                try:
+                    async with semaphore:
+                        result, _ = await self._analyze(
+                            post_data["title"], post_data["content"], post_data["id"]
                         )
-                    except Exception as e:
-                        logger.error(f"Failed to analyze post {post_data['id']}: {e}")
-                        return None
+                    return result
+                except Exception as e:
+                    logger.error(f"Failed to analyze post {post_data['id']}: {e}")
+                    return None
             
             # Create tasks for all posts
             tasks = [analyze_single_post(post) for post in posts]
@@ -386,12 +541,16 @@ class AnalysisEngine:
                 elif isinstance(result, Exception):
                     logger.error(f"Batch analysis exception: {result}")
             
+            await self._cache_analyses([r for r in valid_results if r.post_id not in cached])
+            
             logger.info(
                 f"Batch analysis completed: {len(valid_results)}/{len(posts)} successful",
                 extra={
                     "total_posts": len(posts),
                     "successful_analyses": len(valid_results),
-                    "failed_analyses": len(posts) - len(valid_results)
+                    "cached_analyses": len(cached),
+                    "failed_analyses": len(posts) - len(valid_results),
+                    "concurrency_limit": self._limiter.limit
                 }
             )
             
@@ -401,6 +560,88 @@ class AnalysisEngine:
             logger.error(f"Failed to perform batch analysis: {e}")
             return []
     
+    async def process_posts(
+        self,
+        posts: List[Dict[str, Any]],
+        on_stage_complete: Optional[Callable[[str, str, Dict[str, Any]], None]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Run summary, tag extraction and analysis for a batch of posts concurrently
+        
+        Args:
+            posts: List of post dictionaries with 'id', 'title', 'content' and an
+                optional 'completed' mapping of stage -> checkpointed result
+            on_stage_complete: Called with (post_id, stage, result) as each new
+                stage result arrives, even if a sibling stage later fails
+        
+        Returns:
+            One dict per post (input order) with 'post_id' and either
+            'summary', 'tags', 'analysis', 'analysis_response' or 'error'
+        """
+        openai_client = get_openai_client()
+        cached = await self._get_cached_analyses([post["id"] for post in posts])
+        
+        async def process_single_post(post_data: Dict[str, Any]) -> Dict[str, Any]:
+            post_id = post_data["id"]
+            completed = post_data.get("completed") or {}
+            kwargs = {
+                "post_title": post_data["title"],
+                "post_content": post_data["content"],
+                "post_id": post_id
+            }
+            
+            async def run_stage(stage: str, func: Callable[..., Dict[str, Any]]) -> Dict[str, Any]:
+                if stage in completed:
+                    return completed[stage]
+                result = await self._run_openai(func, **kwargs)
+                if on_stage_complete:
+                    on_stage_complete(post_id, stage, result)
+                return result
+            
+            async def analyze() -> Tuple[AnalysisResult, Dict[str, Any]]:
+                if "analysis" in completed:
+                    response = completed["analysis"]
+                    return await self._build_analysis_result(response, post_id), response
+                if post_id in cached:
+                    return cached[post_id], {}
+                response = await run_stage("analysis", openai_client.analyze_pain_points_and_ideas)
+                return await self._build_analysis_result(response, post_id), response
+            
+            try:
+                summary, tags, (analysis, analysis_response) = await asyncio.gather(
+                    run_stage("summary", openai_client.generate_korean_summary),
+                    run_stage("tags", openai_client.extract_tags_llm),
+                    analyze()
+                )
+                return {
+                    "post_id": post_id,
+                    "summary": summary,
+                    "tags": tags,
+                    "analysis": analysis,
+                    "analysis_response": analysis_response
+                }
+            except Exception as e:
+                logger.error(f"Failed to process post {post_id}: {e}")
+                return {"post_id": post_id, "error": str(e)}
+        
+        results = await asyncio.gather(*(process_single_post(post) for post in posts))
+        
+        await self._cache_analyses([
+            r["analysis"] for r in results
+            if "analysis" in r and r["post_id"] not in cached
+        ])
+        
+        logger.info(
+            f"Batch processing completed: {len([r for r in results if 'error' not in r])}/{len(posts)} successful",
+            extra={
+                "total_posts": len(posts),
+                "cached_analyses": len(cached),
+                "concurrency_limit": self._limiter.limit
+            }
+        )
+        
+        return results
+    
     async def get_analysis_statistics(self, days: int = 7) -> Dict[str, Any]:
         """
         Get analysis statistics for the last N days
@@ -458,7 +699,8 @@ class AnalysisEngine:
                 "test_product_ideas_count": len(test_result.product_ideas),
                 "test_confidence_score": test_result.confidence_score,
                 "cache_enabled": True,
-                "validation_rules_loaded": True
+                "validation_rules_loaded": True,
+                "concurrency": self._limiter.stats()
             }
             
         except Exception as e:
@@ -3,20 +3,29 @@ BERTopic client for topic modeling and keyword extraction
 """
 import asyncio
 import logging
-from typing import Dict, Any, List, Tuple, Optional
-import pickle
+from typing import Dict, Any, List, Tuple, Optional, Union
+import json
 import os
+import shutil
 from datetime import datetime, timedelta
 
 import numpy as np
 from bertopic import BERTopic
+from bertopic._bertopic import TopicMapper
+from bertopic.backend._utils import select_backend
 from sentence_transformers import SentenceTransformer
+from sklearn.cluster import MiniBatchKMeans
+from sklearn.decomposition import IncrementalPCA
 from sklearn.feature_extraction.text import CountVectorizer
+from bertopic.vectorizers import OnlineCountVectorizer
 from umap import UMAP
 from hdbscan import HDBSCAN
 
 from app.config import get_settings
 from app.redis_client import redis_client
+from .embedding_service import get_embedding_service
+from .tag_index import get_tag_index
+from .topic_artifact import TopicArtifact, load_estimator_state, save_estimator_state
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
@@ -25,11 +34,24 @@ settings = get_settings()
 class BERTopicClient:
     """BERTopic client for topic modeling and keyword extraction"""
     
+    # Bump when the artifact layout changes; older artifacts are ignored
+    ARTIFACT_FORMAT_VERSION = 1
+    
     def __init__(self):
-        self._model: Optional[BERTopic] = None
+        self._model: Optional[Union[BERTopic, TopicArtifact]] = None
         self._embedding_model: Optional[SentenceTransformer] = None
+        self._embedding_service = get_embedding_service()
+        self._tag_index = get_tag_index()
         self._is_trained = False
-        self._model_path = "models/bertopic_model.pkl"
+        
+        # Versioned safetensors artifacts: <model_dir>/<version>/ + CURRENT pointer
+        self._model_dir = settings.bertopic_model_dir
+        self._current_pointer = os.path.join(self._model_dir, "CURRENT")
+        self._legacy_model_path = "models/bertopic_model.pkl"
+        self._keep_versions = 3
+        self._inference_only = settings.bertopic_inference_only
+        self._loaded_from_artifact = False
+        
         self._min_topic_size = 5
         self._n_gram_range = (1, 3)
         self._top_k_words = 10
@@ -38,18 +60,28 @@ class BERTopicClient:
         self._cache_ttl = 3600  # 1 hour
         self._topic_cache_prefix = "bertopic_topics"
         self._keyword_cache_prefix = "bertopic_keywords"
+        
+        # Incremental training: the online model state is saved with each artifact it
+        # publishes and reloaded by whichever worker process runs the next update
+        self._online_model: Optional[BERTopic] = None
+        self._online_version: Optional[str] = None  # artifact version the online model matches
+        self._online_n_clusters = settings.bertopic_online_clusters
+        self._assignments_key = "bertopic_assignments"  # post_id -> {topic_id, content_hash}
     
     async def initialize(self) -> None:
         """Initialize BERTopic model and components"""
         try:
-            # Initialize sentence transformer for embeddings
-            self._embedding_model = SentenceTransformer('all-MiniLM-L6-v2')
-            
-            # Try to load existing model
-            if os.path.exists(self._model_path):
-                await self._load_model()
-                logger.info("Loaded existing BERTopic model")
+            # Try to load the current model artifact
+            artifact_path = self._get_current_artifact_path()
+            if artifact_path:
+                await self._load_model(artifact_path)
+                logger.info(f"Loaded BERTopic model artifact {artifact_path}")
             else:
+                if os.path.exists(self._legacy_model_path):
+                    logger.warning(
+                        f"Ignoring legacy pickled model {self._legacy_model_path}; "
+                        "retrain to create a safetensors artifact"
+                    )
                 await self._create_new_model()
                 logger.info("Created new BERTopic model")
             
@@ -62,6 +94,9 @@ class BERTopicClient:
     async def _create_new_model(self) -> None:
         """Create a new BERTopic model with optimized settings"""
         try:
+            # Reuse the process-wide sentence transformer from the embedding service
+            self._embedding_model = self._embedding_service.model
+            
             # UMAP for dimensionality reduction
             umap_model = UMAP(
                 n_neighbors=15,
@@ -100,47 +135,189 @@ class BERTopicClient:
             )
             
             self._is_trained = False
+            self._loaded_from_artifact = False
             
         except Exception as e:
             logger.error(f"Failed to create BERTopic model: {e}")
             raise
     
-    async def _load_model(self) -> None:
-        """Load existing BERTopic model from disk"""
+    def _create_online_model(self) -> BERTopic:
+        """Create a BERTopic model with online-capable components for partial_fit"""
+        return BERTopic(
+            embedding_model=self._embedding_model,
+            umap_model=IncrementalPCA(n_components=5),
+            hdbscan_model=MiniBatchKMeans(n_clusters=self._online_n_clusters, random_state=42),
+            vectorizer_model=OnlineCountVectorizer(
+                ngram_range=self._n_gram_range,
+                stop_words="english",
+                decay=0.01
+            ),
+            top_k_words=self._top_k_words,
+            language="english",
+            verbose=False
+        )
+    
+    def _get_current_version(self) -> Optional[str]:
+        """Get the version the CURRENT pointer names, if any"""
+        try:
+            with open(self._current_pointer) as f:
+                version = f.read().strip()
+        except FileNotFoundError:
+            return None
+        return version or None
+    
+    def _get_current_artifact_path(self) -> Optional[str]:
+        """Get the directory of the current model artifact, if any"""
+        version = self._get_current_version()
+        if not version:
+            return None
+        
+        artifact_path = os.path.join(self._model_dir, version)
+        return artifact_path if os.path.isdir(artifact_path) else None
+    
+    @staticmethod
+    def _online_components(model: BERTopic) -> Dict[str, Any]:
+        """Estimators whose fitted state partial_fit continues from"""
+        return {
+            "umap_model": model.umap_model,
+            "hdbscan_model": model.hdbscan_model,
+            "vectorizer_model": model.vectorizer_model
+        }
+    
+    def _save_online_state(self, artifact_path: str) -> Dict[str, str]:
+        """
+        Save the online model state next to the artifact as arrays + JSON (no pickle)
+        
+        IncrementalPCA/MiniBatchKMeans arrays, the OnlineCountVectorizer vocabulary
+        and bag-of-words, and the topic representations/sizes/mapping. c-TF-IDF and
+        topic embeddings are recomputed by the next partial_fit.
+        """
+        model = self._online_model
+        return save_estimator_state(artifact_path, self._online_components(model), {
+            "topic_representations": {
+                str(topic): [[word, float(score)] for word, score in words]
+                for topic, words in model.topic_representations_.items()
+            },
+            "topic_labels": {str(topic): label for topic, label in model.topic_labels_.items()},
+            "topic_sizes": {str(topic): int(size) for topic, size in model.topic_sizes_.items()},
+            "topic_mappings": [[int(topic) for topic in row] for row in model.topic_mapper_.mappings_]
+        })
+    
+    def _load_online_state(self) -> Optional[BERTopic]:
+        """Rebuild the online model saved with the current artifact, if it has one"""
+        artifact_path = self._get_current_artifact_path()
+        if not artifact_path:
+            return None
+        
+        with open(os.path.join(artifact_path, "manifest.json")) as f:
+            manifest = json.load(f)
+        
+        if not manifest.get("online_state") or manifest.get("embedding_model") != self._embedding_service.model_name:
+            return None
+        
+        model = self._create_online_model()
+        topics = load_estimator_state(artifact_path, self._online_components(model))
+        model.topic_representations_ = {
+            int(topic): [(word, score) for word, score in words]
+            for topic, words in topics["topic_representations"].items()
+        }
+        model.topic_labels_ = {int(topic): label for topic, label in topics["topic_labels"].items()}
+        model.topic_sizes_ = {int(topic): size for topic, size in topics["topic_sizes"].items()}
+        model.topic_mapper_ = TopicMapper([])
+        model.topic_mapper_.mappings_ = topics["topic_mappings"]
+        # partial_fit only selects the backend on a first fit
+        model.embedding_model = select_backend(self._embedding_model, language=model.language)
+        return model
+    
+    async def _load_model(self, artifact_path: str) -> None:
+        """
+        Open model artifact from disk (no pickle)
+        
+        Only the manifest is read here. Topic embeddings are memory-mapped and
+        c-TF-IDF/vocabulary read on first use (TopicArtifact). UMAP and HDBSCAN
+        are not part of the artifact: inference assigns topics by similarity to
+        the topic embeddings, and training rebuilds them.
+        """
         try:
-            with open(self._model_path, 'rb') as f:
-                model_data = pickle.load(f)
+            with open(os.path.join(artifact_path, "manifest.json")) as f:
+                manifest = json.load(f)
+            
+            if manifest.get("format_version") != self.ARTIFACT_FORMAT_VERSION:
+                raise ValueError(f"Unsupported artifact format {manifest.get('format_version')}")
             
-            self._model = model_data['model']
-            self._is_trained = model_data.get('is_trained', False)
+            if manifest.get("embedding_model") != self._embedding_service.model_name:
+                raise ValueError(
+                    f"Artifact embedding model {manifest.get('embedding_model')} does not match "
+                    f"{self._embedding_service.model_name}"
+                )
             
-            # Update embedding model reference
-            if self._embedding_model:
-                self._model.embedding_model = self._embedding_model
+            # Inference-only workers embed through the cache and skip loading the transformer
+            if not self._inference_only:
+                self._embedding_model = self._embedding_service.model
+            
+            self._model = TopicArtifact(artifact_path)
+            self._is_trained = manifest.get("is_trained", False)
+            self._loaded_from_artifact = True
             
         except Exception as e:
             logger.error(f"Failed to load BERTopic model: {e}")
             raise
     
-    async def _save_model(self) -> None:
-        """Save BERTopic model to disk"""
+    async def _save_model(self, save_online_state: bool = False) -> Optional[str]:
+        """
+        Save BERTopic model as a new versioned safetensors artifact
+        
+        Returns the new version, or None if saving failed
+        """
         try:
-            # Create models directory if it doesn't exist
-            os.makedirs(os.path.dirname(self._model_path), exist_ok=True)
+            version = datetime.utcnow().strftime("v%Y%m%d%H%M%S")
+            artifact_path = os.path.join(self._model_dir, version)
+            os.makedirs(self._model_dir, exist_ok=True)
+            
+            # Topic embeddings (safetensors), c-TF-IDF + vocabulary, topic labels (JSON)
+            self._model.save(
+                artifact_path,
+                serialization="safetensors",
+                save_ctfidf=True,
+                save_embedding_model=False
+            )
             
-            model_data = {
-                'model': self._model,
-                'is_trained': self._is_trained,
-                'saved_at': datetime.utcnow().isoformat()
+            manifest = {
+                "format_version": self.ARTIFACT_FORMAT_VERSION,
+                "version": version,
+                "embedding_model": self._embedding_service.model_name,
+                "is_trained": self._is_trained,
+                "num_topics": len(self._model.get_topic_info()) - 1,
+                "saved_at": datetime.utcnow().isoformat()
             }
+            if save_online_state:
+                manifest["online_state"] = self._save_online_state(artifact_path)
+            with open(os.path.join(artifact_path, "manifest.json"), "w") as f:
+                json.dump(manifest, f, indent=2)
             
-            with open(self._model_path, 'wb') as f:
-                pickle.dump(model_data, f)
+            # Atomically switch the CURRENT pointer so readers never see a partial artifact
+            tmp_pointer = f"{self._current_pointer}.tmp"
+            with open(tmp_pointer, "w") as f:
+                f.write(version)
+            os.replace(tmp_pointer, self._current_pointer)
             
-            logger.info(f"BERTopic model saved to {self._model_path}")
+            self._prune_old_artifacts()
+            
+            logger.info(f"BERTopic model saved to {artifact_path}")
+            return version
             
         except Exception as e:
             logger.error(f"Failed to save BERTopic model: {e}")
+            return None
+    
+    def _prune_old_artifacts(self) -> None:
+        """Keep only the most recent model artifacts"""
+        versions = sorted(
+            entry for entry in os.listdir(self._model_dir)
+            if entry.startswith("v") and os.path.isdir(os.path.join(self._model_dir, entry))
+        )
+        for version in versions[:-self._keep_versions]:
+            shutil.rmtree(os.path.join(self._model_dir, version), ignore_errors=True)
     
     async def train_model(self, documents: List[str]) -> Dict[str, Any]:
         """
@@ -159,10 +336,15 @@ class BERTopicClient:
             if len(documents) < self._min_topic_size * 2:
                 raise ValueError(f"Need at least {self._min_topic_size * 2} documents for training")
             
+            # Loaded artifacts carry no UMAP/HDBSCAN; start from fresh components
+            if self._loaded_from_artifact:
+                await self._create_new_model()
+            
             logger.info(f"Training BERTopic model on {len(documents)} documents")
             
-            # Fit the model
-            topics, probabilities = self._model.fit_transform(documents)
+            # Fit the model on cached embeddings (only unseen documents are embedded)
+            embeddings = self._embedding_service.embed(documents)
+            topics, probabilities = self._model.fit_transform(documents, embeddings=embeddings)
             
             # Get topic information
             topic_info = self._model.get_topic_info()
@@ -193,6 +375,154 @@ class BERTopicClient:
             logger.error(f"Failed to train BERTopic model: {e}")
             raise
     
+    async def partial_train(self, posts: List[Tuple[str, str]]) -> Dict[str, Any]:
+        """
+        Update the topic model incrementally with newly processed posts
+        
+        Uses BERTopic partial_fit with IncrementalPCA, MiniBatchKMeans and
+        OnlineCountVectorizer instead of refitting UMAP+HDBSCAN on the whole
+        corpus, then invalidates cached topics only for posts whose topic
+        assignment changed. The online model continues from the state saved
+        with the current artifact, so updates accumulate across worker
+        processes; a full retrain (no saved state) starts a new online model.
+        
+        Args:
+            posts: List of (post_id, text) tuples not yet seen by the model
+        
+        Returns:
+            Dictionary with update results
+        """
+        try:
+            if len(posts) < self._online_n_clusters:
+                return {
+                    "status": "skipped",
+                    "reason": f"Need at least {self._online_n_clusters} documents per partial fit",
+                    "num_documents": len(posts)
+                }
+            
+            # Continue from the latest published state unless this process already holds it
+            current_version = self._get_current_version()
+            if self._online_model is None or self._online_version != current_version:
+                self._embedding_model = self._embedding_service.model
+                self._online_model = self._load_online_state()
+                if self._online_model is None:
+                    logger.info("No saved online topic model state, starting a new online model")
+                    self._online_model = self._create_online_model()
+            
+            texts = [text for _, text in posts]
+            embeddings = self._embedding_service.embed(texts)
+            
+            logger.info(f"Partially fitting BERTopic model on {len(posts)} documents")
+            self._online_model.partial_fit(texts, embeddings=embeddings)
+            
+            # Serve the updated model and publish it as a new artifact for inference workers
+            self._model = self._online_model
+            self._is_trained = True
+            self._loaded_from_artifact = False
+            version = await self._save_model(save_online_state=True)
+            if version is None:
+                # Without a saved state the next run would lose this batch; keep the watermark
+                self._online_model = None
+                raise RuntimeError("Failed to save incrementally updated BERTopic model")
+            self._online_version = version
+            
+            changed_post_ids = await self._invalidate_changed_assignments()
+            
+            update_results = {
+                "status": "completed",
+                "num_documents": len(posts),
+                "num_topics": len(self._model.get_topic_info()) - 1,
+                "reassigned_posts": len(changed_post_ids),
+                "updated_at": datetime.utcnow().isoformat()
+            }
+            
+            logger.info(
+                f"BERTopic incremental update completed: {update_results['reassigned_posts']} posts reassigned",
+                extra=update_results
+            )
+            
+            return update_results
+            
+        except Exception as e:
+            logger.error(f"Failed to partially train BERTopic model: {e}")
+            raise
+    
+    def _assign_topics(self, embeddings: np.ndarray) -> List[int]:
+        """Assign topics by cosine similarity to topic embeddings (as loaded artifacts do)"""
+        topic_ids = sorted(self._model.topic_representations_.keys())
+        topic_embeddings = np.asarray(self._model.topic_embeddings_, dtype=np.float32)
+        
+        doc_norm = embeddings / np.clip(np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12, None)
+        topic_norm = topic_embeddings / np.clip(np.linalg.norm(topic_embeddings, axis=1, keepdims=True), 1e-12, None)
+        
+        best = np.argmax(doc_norm @ topic_norm.T, axis=1)
+        return [topic_ids[i] for i in best]
+    
+    async def _invalidate_changed_assignments(self) -> List[str]:
+        """Drop cached topic results only for posts whose assigned topic changed"""
+        assignments = await redis_client.hgetall(self._assignments_key)
+        if not assignments:
+            return []
+        
+        post_ids = await self._prune_assignments(list(assignments))
+        if not post_ids:
+            return []
+        
+        cached_embeddings = self._embedding_service.get_cached(
+            [assignments[post_id]["content_hash"] for post_id in post_ids]
+        )
+        
+        # Posts whose embedding is no longer cached cannot be re-scored; leave them to TTL
+        scored = [
+            post_id for post_id in post_ids
+            if assignments[post_id]["content_hash"] in cached_embeddings
+        ]
+        if not scored:
+            return []
+        
+        new_topics = self._assign_topics(np.vstack([
+            cached_embeddings[assignments[post_id]["content_hash"]] for post_id in scored
+        ]))
+        
+        changed = [
+            (post_id, topic_id) for post_id, topic_id in zip(scored, new_topics)
+            if assignments[post_id]["topic_id"] != topic_id
+        ]
+        
+        if changed:
+            await redis_client.delete(*[
+                f"cache:{self._topic_cache_prefix}:{post_id}" for post_id, _ in changed
+            ])
+            await redis_client.hdel(self._assignments_key, *[post_id for post_id, _ in changed])
+        
+        return [post_id for post_id, _ in changed]
+    
+    async def _prune_assignments(self, post_ids: List[str], chunk_size: int = 1000) -> List[str]:
+        """Drop tracked assignments whose cached topic result has expired; returns the live ones"""
+        live, expired = [], []
+        for start in range(0, len(post_ids), chunk_size):
+            chunk = post_ids[start:start + chunk_size]
+            cached = await redis_client.cache_mget([f"{self._topic_cache_prefix}:{post_id}" for post_id in chunk])
+            for post_id, result in zip(chunk, cached):
+                (live if result is not None else expired).append(post_id)
+        
+        if expired:
+            await redis_client.hdel(self._assignments_key, *expired)
+        return live
+    
+    async def _track_assignments(self, results: Dict[str, Dict[str, Any]], texts: Dict[str, str]) -> None:
+        """Remember which topic each cached post was assigned for selective invalidation"""
+        await redis_client.hset(self._assignments_key, {
+            post_id: {
+                "topic_id": result["topic_representation"]["topic_id"],
+                "content_hash": self._embedding_service.content_hash(texts[post_id])
+            }
+            for post_id, result in results.items()
+        })
+        # Entries are only useful while their cached results live, which is at most
+        # one cache TTL after the last write
+        await redis_client.expire(self._assignments_key, self._cache_ttl)
+    
     async def extract_topics(
         self, 
         text: str, 
@@ -226,44 +556,20 @@ class BERTopicClient:
             if not self._is_trained:
                 logger.warning("BERTopic model not trained, results may be suboptimal")
             
-            # Transform the text
-            topics, probabilities = self._model.transform([text])
+            # Transform the text using the on-disk embedding cache
+            embeddings = self._embedding_service.embed([text])
+            topics, probabilities = self._model.transform([text], embeddings=embeddings)
             topic_id = topics[0]
-            topic_prob = probabilities[0] if probabilities is not None else None
+            topic_prob = self._get_topic_probability(probabilities, 0)
             
-            # Get topic keywords
-            if topic_id != -1:  # Not an outlier
-                topic_words = self._model.get_topic(topic_id)
-                topic_label = self._model.topic_labels_.get(topic_id, f"Topic {topic_id}")
-            else:
-                topic_words = []
-                topic_label = "Outlier"
-            
-            # Extract top keywords
-            keywords = [word for word, score in topic_words[:5]] if topic_words else []
-            
-            # Get topic representation
-            topic_representation = {
-                "topic_id": int(topic_id),
-                "topic_label": topic_label,
-                "keywords": keywords,
-                "probability": float(topic_prob) if topic_prob is not None else None,
-                "is_outlier": topic_id == -1
-            }
-            
-            result = {
-                "post_id": post_id,
-                "topic_representation": topic_representation,
-                "extracted_keywords": keywords,
-                "confidence_score": float(topic_prob) if topic_prob is not None else 0.0,
-                "model_trained": self._is_trained,
-                "extracted_at": datetime.utcnow().isoformat()
-            }
+            result = self._build_topic_result(post_id, topic_id, topic_prob)
+            keywords = result["extracted_keywords"]
             
             # Cache the result
             if use_cache:
                 cache_key = f"{self._topic_cache_prefix}:{post_id}"
                 await redis_client.cache_set(cache_key, result, ttl=self._cache_ttl)
+                await self._track_assignments({post_id: result}, {post_id: text})
             
             logger.info(
                 f"Extracted topics for post {post_id}",
@@ -281,6 +587,129 @@ class BERTopicClient:
             logger.error(f"Failed to extract topics for post {post_id}: {e}")
             raise
     
+    @staticmethod
+    def _get_topic_probability(probabilities: Optional[np.ndarray], index: int) -> Optional[float]:
+        """Get the assigned topic probability for one document of a transform call"""
+        if probabilities is None:
+            return None
+        prob = np.asarray(probabilities[index])
+        if prob.ndim == 0:
+            return float(prob)
+        # calculate_probabilities=True returns the full topic distribution per document
+        return float(prob.max()) if prob.size else None
+    
+    def _build_topic_result(
+        self,
+        post_id: str,
+        topic_id: int,
+        topic_prob: Optional[float]
+    ) -> Dict[str, Any]:
+        """Build the cached topic result for one document"""
+        topic_id = int(topic_id)  # numpy ints are not JSON serializable
+        
+        # Get topic keywords
+        if topic_id != -1:  # Not an outlier
+            topic_words = self._model.get_topic(topic_id)
+            topic_label = self._model.topic_labels_.get(topic_id, f"Topic {topic_id}")
+        else:
+            topic_words = []
+            topic_label = "Outlier"
+        
+        # Extract top keywords
+        keywords = [word for word, score in topic_words[:5]] if topic_words else []
+        
+        # Get topic representation
+        topic_representation = {
+            "topic_id": topic_id,
+            "topic_label": topic_label,
+            "keywords": keywords,
+            "probability": topic_prob,
+            "is_outlier": topic_id == -1
+        }
+        
+        return {
+            "post_id": post_id,
+            "topic_representation": topic_representation,
+            "extracted_keywords": keywords,
+            "confidence_score": topic_prob if topic_prob is not None else 0.0,
+            "model_trained": self._is_trained,
+            "extracted_at": datetime.utcnow().isoformat()
+        }
+    
+    async def extract_topics_batch(
+        self,
+        posts: List[Tuple[str, str]],
+        use_cache: bool = True
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Extract topics for many posts with one cache lookup and one transform
+        
+        Args:
+            posts: List of (post_id, text) tuples
+            use_cache: Whether to use Redis cache
+        
+        Returns:
+            Dictionary of post_id -> topic analysis result
+        """
+        try:
+            if not self._model:
+                await self.initialize()
+            
+            if not posts:
+                return {}
+            
+            results: Dict[str, Dict[str, Any]] = {}
+            
+            # Check cache for the whole batch with a single MGET
+            if use_cache:
+                cache_keys = [f"{self._topic_cache_prefix}:{post_id}" for post_id, _ in posts]
+                cached_results = await redis_client.cache_mget(cache_keys)
+                for (post_id, _), cached_result in zip(posts, cached_results):
+                    if cached_result:
+                        results[post_id] = cached_result
+            
+            misses = [(post_id, text) for post_id, text in posts if post_id not in results]
+            
+            if misses:
+                if not self._is_trained:
+                    logger.warning("BERTopic model not trained, results may be suboptimal")
+                
+                # One embedding pass and one transform over all cache misses
+                texts = [text for _, text in misses]
+                embeddings = self._embedding_service.embed(texts)
+                topics, probabilities = self._model.transform(texts, embeddings=embeddings)
+                
+                new_results = {}
+                for i, (post_id, _) in enumerate(misses):
+                    new_results[post_id] = self._build_topic_result(
+                        post_id, topics[i], self._get_topic_probability(probabilities, i)
+                    )
+                
+                # Write all new results back in one pipelined round trip
+                if use_cache:
+                    await redis_client.cache_mset(
+                        {f"{self._topic_cache_prefix}:{post_id}": result for post_id, result in new_results.items()},
+                        ttl=self._cache_ttl
+                    )
+                    await self._track_assignments(new_results, dict(misses))
+                
+                results.update(new_results)
+            
+            logger.info(
+                f"Extracted topics for {len(posts)} posts",
+                extra={
+                    "total_posts": len(posts),
+                    "cache_hits": len(posts) - len(misses),
+                    "transformed": len(misses)
+                }
+            )
+            
+            return results
+            
+        except Exception as e:
+            logger.error(f"Failed to extract topics for batch of {len(posts)} posts: {e}")
+            raise
+    
     async def extract_keywords(
         self, 
         text: str, 
@@ -402,74 +831,11 @@ class BERTopicClient:
             if not keywords:
                 return []
             
-            # Tag mapping rules
-            tag_mappings = {
-                # Technology
-                "ai": "Artificial Intelligence",
-                "ml": "Machine Learning", 
-                "python": "Python",
-                "javascript": "JavaScript",
-                "react": "React",
-                "api": "API",
-                "database": "Database",
-                "cloud": "Cloud Computing",
-                "aws": "AWS",
-                "docker": "Docker",
-                
-                # Business
-                "startup": "Startup",
-                "business": "Business",
-                "marketing": "Marketing",
-                "product": "Product Management",
-                "saas": "SaaS",
-                "revenue": "Revenue",
-                "growth": "Growth",
-                
-                # Development
-                "code": "Programming",
-                "development": "Software Development",
-                "programming": "Programming",
-                "software": "Software",
-                "web": "Web Development",
-                "mobile": "Mobile Development",
-                
-                # General
-                "problem": "Problem Solving",
-                "solution": "Solutions",
-                "tool": "Tools",
-                "productivity": "Productivity",
-                "automation": "Automation"
-            }
-            
-            # Convert keywords to tags
-            tags = []
-            for keyword in keywords[:max_tags * 2]:  # Get more keywords to filter from
-                keyword_lower = keyword.lower().strip()
-                
-                # Direct mapping
-                if keyword_lower in tag_mappings:
-                    tag = tag_mappings[keyword_lower]
-                    if tag not in tags:
-                        tags.append(tag)
-                
-                # Partial matching
-                elif len(keyword_lower) > 3:
-                    for key, value in tag_mappings.items():
-                        if key in keyword_lower or keyword_lower in key:
-                            if value not in tags:
-                                tags.append(value)
-                            break
-                    else:
-                        # Use keyword as-is if no mapping found
-                        formatted_keyword = keyword.title().replace('_', ' ').replace('-', ' ')
-                        if formatted_keyword not in tags and len(formatted_keyword) > 2:
-                            tags.append(formatted_keyword)
-                
-                if len(tags) >= max_tags:
-                    break
+            # Nearest canonical tags by embedding similarity (one batched matmul)
+            tags = self._tag_index.map_keywords(keywords[:max_tags * 2], max_tags=max_tags)
             
-            # Ensure we have at least some tags
-            if not tags and keywords:
+            # Use keywords as-is if nothing is similar enough
+            if not tags:
                 tags = [kw.title().replace('_', ' ').replace('-', ' ') for kw in keywords[:max_tags]]
             
             return tags[:max_tags]
@@ -492,8 +858,9 @@ class BERTopicClient:
             info = {
                 "status": "initialized",
                 "is_trained": self._is_trained,
-                "model_path": self._model_path,
-                "model_exists": os.path.exists(self._model_path),
+                "model_path": self._get_current_artifact_path(),
+                "model_exists": self._get_current_artifact_path() is not None,
+                "inference_only": self._inference_only,
                 "min_topic_size": self._min_topic_size,
                 "n_gram_range": self._n_gram_range,
                 "top_k_words": self._top_k_words
@@ -529,6 +896,9 @@ class BERTopicClient:
                 await redis_client.delete(*all_keys)
                 logger.info(f"Cleared {len(all_keys)} BERTopic cache entries")
             
+            # Tracked assignments only describe the cached results just cleared
+            await redis_client.delete(self._assignments_key)
+            
         except Exception as e:
             logger.error(f"Failed to clear BERTopic cache: {e}")
     
@@ -544,12 +914,13 @@ class BERTopicClient:
                 "status": "healthy",
                 "model_initialized": self._model is not None,
                 "embedding_model_loaded": self._embedding_model is not None,
+                "embedding_cache": self._embedding_service.stats(),
                 "is_trained": self._is_trained,
-                "model_file_exists": os.path.exists(self._model_path)
+                "model_file_exists": self._get_current_artifact_path() is not None
             }
             
             # Test basic functionality
-            if self._model and self._embedding_model:
+            if self._model and (self._embedding_model or self._inference_only):
                 try:
                     # Test with a simple document
                     test_result = await self.extract_topics("test document", "health_check", use_cache=False)
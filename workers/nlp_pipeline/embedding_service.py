@@ -0,0 +1,227 @@
+"""
+Shared sentence-embedding service with a persistent on-disk cache
+Embeddings are stored in an append-only float16 matrix indexed by content_hash
+"""
+import fcntl
+import hashlib
+import json
+import logging
+import os
+import threading
+from typing import Dict, Any, List, Optional, Sequence
+
+import numpy as np
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+class EmbeddingService:
+    """
+    Batched CPU sentence embeddings shared by every topic-modeling consumer
+    - One SentenceTransformer per process, loaded lazily on the first cache miss
+    - embeddings.f16: raw float16 rows, memory-mapped read-only
+    - hashes.txt: one content_hash per line, line number == matrix row
+    - Appends are serialized across processes with an flock; the hash line is
+      written after the row, so readers never see a hash without its vector
+    - Before appending, both files are truncated to the indexed rows so an append
+      interrupted by a crash (orphan rows, partial hash line) cannot misalign rows
+    """
+
+    def __init__(
+        self,
+        model_name: Optional[str] = None,
+        cache_dir: Optional[str] = None,
+        batch_size: Optional[int] = None
+    ):
+        self.model_name = model_name or settings.embedding_model_name
+        self.batch_size = batch_size or settings.embedding_batch_size
+
+        # One cache directory per model so vectors never mix across models
+        base_dir = cache_dir or settings.embedding_cache_dir
+        self._cache_dir = os.path.join(base_dir, self.model_name.replace("/", "_"))
+        self._matrix_path = os.path.join(self._cache_dir, "embeddings.f16")
+        self._hashes_path = os.path.join(self._cache_dir, "hashes.txt")
+        self._meta_path = os.path.join(self._cache_dir, "meta.json")
+        self._lock_path = os.path.join(self._cache_dir, ".lock")
+
+        self._model = None
+        self._dim: Optional[int] = None
+        self._index: Dict[str, int] = {}
+        self._hashes_offset = 0  # bytes of hashes.txt already indexed
+        self._matrix: Optional[np.memmap] = None
+        self._lock = threading.Lock()
+
+    @property
+    def model(self):
+        """Lazily loaded SentenceTransformer (CPU)"""
+        if self._model is None:
+            from sentence_transformers import SentenceTransformer
+
+            self._model = SentenceTransformer(self.model_name, device="cpu")
+            logger.info(f"Loaded embedding model {self.model_name}")
+        return self._model
+
+    @property
+    def dimension(self) -> int:
+        """Embedding dimension, read from cache metadata before loading the model"""
+        if self._dim is None:
+            if os.path.exists(self._meta_path):
+                with open(self._meta_path) as f:
+                    self._dim = int(json.load(f)["dimension"])
+            else:
+                self._dim = int(self.model.get_sentence_embedding_dimension())
+        return self._dim
+
+    @staticmethod
+    def content_hash(text: str) -> str:
+        """Hash used as the cache key for a document"""
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def _refresh_index(self) -> None:
+        """Pick up rows appended by this or other processes since the last read"""
+        if not os.path.exists(self._hashes_path):
+            return
+
+        size = os.path.getsize(self._hashes_path)
+        if size == self._hashes_offset:
+            return
+
+        with open(self._hashes_path, "rb") as f:
+            f.seek(self._hashes_offset)
+            chunk = f.read(size - self._hashes_offset)
+
+        # Only index complete lines; a partial trailing line is read next time
+        complete = chunk[:chunk.rfind(b"\n") + 1]
+        for line in complete.decode("ascii").splitlines():
+            self._index.setdefault(line, len(self._index))
+        self._hashes_offset += len(complete)
+
+        rows = len(self._index)
+        if rows:
+            self._matrix = np.memmap(
+                self._matrix_path, dtype=np.float16, mode="r", shape=(rows, self.dimension)
+            )
+
+    def get_cached(self, content_hashes: Sequence[str]) -> Dict[str, np.ndarray]:
+        """Get cached embeddings (float32) for the hashes that are present"""
+        with self._lock:
+            self._refresh_index()
+            return {
+                h: np.asarray(self._matrix[self._index[h]], dtype=np.float32)
+                for h in content_hashes
+                if h in self._index
+            }
+
+    def embed(
+        self,
+        texts: Sequence[str],
+        content_hashes: Optional[Sequence[str]] = None
+    ) -> np.ndarray:
+        """
+        Embed documents, computing only those not already cached on disk
+
+        Args:
+            texts: Documents to embed
+            content_hashes: Optional precomputed hashes (e.g. posts.content_hash)
+
+        Returns:
+            float32 matrix of shape (len(texts), dimension) in input order
+        """
+        if not texts:
+            return np.zeros((0, self.dimension), dtype=np.float32)
+
+        hashes = list(content_hashes) if content_hashes else [self.content_hash(t) for t in texts]
+        found = self.get_cached(hashes)
+
+        # Deduplicate misses so repeated documents are embedded once
+        missing: Dict[str, str] = {}
+        for text, h in zip(texts, hashes):
+            if h not in found and h not in missing:
+                missing[h] = text
+
+        if missing:
+            miss_hashes = list(missing)
+            vectors = self.model.encode(
+                [missing[h] for h in miss_hashes],
+                batch_size=self.batch_size,
+                convert_to_numpy=True,
+                show_progress_bar=False
+            ).astype(np.float32)
+
+            self._append(miss_hashes, vectors)
+            found.update(zip(miss_hashes, vectors))
+
+            logger.debug(
+                f"Embedded {len(miss_hashes)} documents ({len(texts) - len(miss_hashes)} cached)"
+            )
+
+        return np.vstack([found[h] for h in hashes])
+
+    def _append(self, content_hashes: List[str], vectors: np.ndarray) -> None:
+        """Append new rows to the on-disk cache under an inter-process lock"""
+        try:
+            os.makedirs(self._cache_dir, exist_ok=True)
+
+            with self._lock, open(self._lock_path, "w") as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    if not os.path.exists(self._meta_path):
+                        self._dim = int(vectors.shape[1])
+                        with open(self._meta_path, "w") as f:
+                            json.dump({"model_name": self.model_name, "dimension": self._dim}, f)
+
+                    # Another process may have stored some of these meanwhile
+                    self._refresh_index()
+                    new_rows = [i for i, h in enumerate(content_hashes) if h not in self._index]
+                    if not new_rows:
+                        return
+
+                    self._truncate_to_index()
+
+                    with open(self._matrix_path, "ab") as f:
+                        f.write(vectors[new_rows].astype(np.float16).tobytes())
+                        f.flush()
+                        os.fsync(f.fileno())
+
+                    with open(self._hashes_path, "ab") as f:
+                        f.write("".join(f"{content_hashes[i]}\n" for i in new_rows).encode("ascii"))
+
+                    self._refresh_index()
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+        except OSError as e:
+            # Cache is an optimization; embeddings are still returned to the caller
+            logger.error(f"Failed to persist embeddings to {self._cache_dir}: {e}")
+
+    def _truncate_to_index(self) -> None:
+        """Drop rows and hash bytes past the indexed entries (caller holds the flock)"""
+        matrix_bytes = len(self._index) * self.dimension * np.dtype(np.float16).itemsize
+        for path, size in ((self._matrix_path, matrix_bytes), (self._hashes_path, self._hashes_offset)):
+            if os.path.exists(path) and os.path.getsize(path) > size:
+                logger.warning(f"Truncating {path} to {size} bytes after an interrupted append")
+                os.truncate(path, size)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get cache statistics for health checks"""
+        with self._lock:
+            self._refresh_index()
+            return {
+                "model_name": self.model_name,
+                "model_loaded": self._model is not None,
+                "cached_embeddings": len(self._index),
+                "cache_dir": self._cache_dir,
+                "batch_size": self.batch_size
+            }
+
+
+# Global embedding service instance
+embedding_service = EmbeddingService()
+
+
+def get_embedding_service() -> EmbeddingService:
+    """Get the global embedding service instance"""
+    return embedding_service
@@ -0,0 +1,307 @@
+"""
+Pluggable chat completion backends for OpenAIClient
+- OpenAIBackend: the real OpenAI API
+- MockLLMBackend: deterministic in-process mock for offline load testing
+"""
+import hashlib
+import json
+import logging
+import math
+import random
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Dict, Any, Iterator, List, Optional, Union
+
+import httpx
+import openai
+from openai import OpenAI
+from openai.types import CompletionUsage
+from openai.types.chat import ChatCompletion, ChatCompletionChunk, ChatCompletionMessage
+from openai.types.chat.chat_completion import Choice
+from openai.types.chat.chat_completion_chunk import Choice as ChunkChoice, ChoiceDelta
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+class LLMBackend(ABC):
+    """Interface used by OpenAIClient for chat completions"""
+
+    name = "base"
+
+    @abstractmethod
+    def create_chat_completion(
+        self,
+        model: str,
+        messages: List[Dict[str, str]],
+        max_tokens: int,
+        stream: bool = False,
+        **params: Any
+    ) -> Union[ChatCompletion, Iterator[ChatCompletionChunk]]:
+        """
+        Create a chat completion (same arguments/results as chat.completions.create)
+
+        Returns:
+            ChatCompletion, or a closable iterator of ChatCompletionChunk when stream=True
+        """
+
+    def stats(self) -> Dict[str, Any]:
+        """Backend statistics for health checks and benchmarks"""
+        return {"backend": self.name}
+
+
+class OpenAIBackend(LLMBackend):
+    """OpenAI API backend"""
+
+    name = "openai"
+
+    def __init__(self, api_key: Optional[str]):
+        if not api_key:
+            raise ValueError("OpenAI API key not found in environment variables")
+        self._client = OpenAI(api_key=api_key)
+
+    def create_chat_completion(
+        self,
+        model: str,
+        messages: List[Dict[str, str]],
+        max_tokens: int,
+        stream: bool = False,
+        **params: Any
+    ) -> Union[ChatCompletion, Iterator[ChatCompletionChunk]]:
+        return self._client.chat.completions.create(
+            model=model,
+            messages=messages,
+            max_tokens=max_tokens,
+            stream=stream,
+            **params
+        )
+
+
+@dataclass
+class MockLLMConfig:
+    """Behavior of the mock backend"""
+    latency_median_ms: float = 800.0
+    latency_sigma: float = 0.5  # lognormal shape; p95 ~= median * e^(1.645 * sigma)
+    rate_limit_rate: float = 0.0  # probability of a 429 per call
+    timeout_rate: float = 0.0  # probability of a timeout per call
+    completion_tokens: int = 300  # mean output tokens (capped by max_tokens)
+    retry_after_seconds: float = 1.0
+    time_scale: float = 1.0  # multiply all sleeps (0 = no sleeping)
+    seed: int = 42
+
+    @classmethod
+    def from_settings(cls) -> "MockLLMConfig":
+        return cls(
+            latency_median_ms=settings.mock_llm_latency_median_ms,
+            latency_sigma=settings.mock_llm_latency_sigma,
+            rate_limit_rate=settings.mock_llm_rate_limit_rate,
+            timeout_rate=settings.mock_llm_timeout_rate,
+            completion_tokens=settings.mock_llm_completion_tokens,
+            seed=settings.mock_llm_seed
+        )
+
+
+class _MockStream:
+    """Closable chunk iterator mimicking openai.Stream"""
+
+    def __init__(self, chunks: List[ChatCompletionChunk]):
+        self._chunks = iter(chunks)
+        self.closed = False
+
+    def __iter__(self) -> Iterator[ChatCompletionChunk]:
+        for chunk in self._chunks:
+            if self.closed:
+                return
+            yield chunk
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class MockLLMBackend(LLMBackend):
+    """
+    Deterministic mock backend (no network, no tokens spent)
+    - Each call is seeded from (seed, request hash, repeat count), so a run is
+      reproducible and a retried request gets a fresh draw
+    - Latency ~ lognormal(median, sigma); 429s/timeouts injected at fixed rates
+    - Output matches the operation: JSON analysis, comma-separated tags or a summary
+    """
+
+    name = "mock"
+
+    CHARS_PER_TOKEN = 4
+
+    def __init__(self, config: Optional[MockLLMConfig] = None):
+        self.config = config or MockLLMConfig.from_settings()
+        self._lock = threading.Lock()
+        self._request_counts: Dict[str, int] = {}
+        self._stats = {
+            "calls": 0,
+            "rate_limited": 0,
+            "timeouts": 0,
+            "completed": 0,
+            "prompt_tokens": 0,
+            "completion_tokens": 0
+        }
+
+    def _rng(self, model: str, messages: List[Dict[str, str]]) -> random.Random:
+        """Deterministic RNG for this request and attempt"""
+        request_hash = hashlib.sha256(
+            json.dumps([model, messages], sort_keys=True, ensure_ascii=False).encode("utf-8")
+        ).hexdigest()
+        with self._lock:
+            repeat = self._request_counts.get(request_hash, 0)
+            self._request_counts[request_hash] = repeat + 1
+            self._stats["calls"] += 1
+        return random.Random(f"{self.config.seed}:{request_hash}:{repeat}")
+
+    def _sleep(self, seconds: float) -> None:
+        if self.config.time_scale > 0:
+            time.sleep(seconds * self.config.time_scale)
+
+    def _count(self, key: str, value: int = 1) -> None:
+        with self._lock:
+            self._stats[key] += value
+
+    def _content(self, messages: List[Dict[str, str]], rng: random.Random, completion_tokens: int) -> str:
+        """Operation-shaped output (detected from the static system prompt)"""
+        from .openai_client import ANALYSIS_PROMPT_PREFIX, TAG_EXTRACTION_PROMPT_PREFIX
+
+        system = messages[0]["content"] if messages else ""
+        if system == ANALYSIS_PROMPT_PREFIX:
+            return json.dumps({
+                "meta": {"version": "1.0", "confidence_score": round(rng.uniform(0.5, 0.95), 2)},
+                "pain_points": [
+                    {
+                        "description": f"모의 페인 포인트 {i + 1}: 반복 작업에 시간이 많이 듭니다",
+                        "category": rng.choice(["기술적", "사용성", "비용", "시간"]),
+                        "severity": rng.choice(["높음", "보통", "낮음"]),
+                        "frequency": rng.choice(["자주", "가끔", "드물게"])
+                    }
+                    for i in range(rng.randint(1, 3))
+                ],
+                "product_ideas": [
+                    {
+                        "title": f"모의 아이디어 {i + 1}",
+                        "description": "반복 작업을 자동화하는 간단한 도구를 제공합니다",
+                        "target_pain_point": "반복 작업에 시간이 많이 듭니다",
+                        "feasibility": rng.choice(["높음", "보통", "낮음"]),
+                        "market_potential": rng.choice(["높음", "보통", "낮음"])
+                    }
+                    for i in range(rng.randint(1, 2))
+                ],
+                "analysis_notes": "mock analysis"
+            }, ensure_ascii=False)
+
+        if system == TAG_EXTRACTION_PROMPT_PREFIX:
+            tags = ["개발", "프로그래밍", "스타트업", "자동화", "생산성", "도구", "ai", "saas"]
+            return ", ".join(rng.sample(tags, rng.randint(3, 5)))
+
+        # Summary: filler sized to the drawn completion token count
+        sentence = "이 게시글은 사용자가 겪는 문제와 해결 방법을 설명합니다. "
+        return (sentence * math.ceil(completion_tokens * self.CHARS_PER_TOKEN / len(sentence)))[
+            :completion_tokens * self.CHARS_PER_TOKEN
+        ].strip()
+
+    def create_chat_completion(
+        self,
+        model: str,
+        messages: List[Dict[str, str]],
+        max_tokens: int,
+        stream: bool = False,
+        **params: Any
+    ) -> Union[ChatCompletion, Iterator[ChatCompletionChunk]]:
+        rng = self._rng(model, messages)
+        request = httpx.Request("POST", "https://mock.invalid/v1/chat/completions")
+        latency = rng.lognormvariate(math.log(self.config.latency_median_ms / 1000), self.config.latency_sigma)
+
+        fault = rng.random()
+        if fault < self.config.rate_limit_rate:
+            self._count("rate_limited")
+            self._sleep(min(latency, 0.05))
+            response = httpx.Response(
+                429,
+                request=request,
+                headers={"retry-after": str(self.config.retry_after_seconds * self.config.time_scale)}
+            )
+            raise openai.RateLimitError("Mock rate limit", response=response, body=None)
+
+        if fault < self.config.rate_limit_rate + self.config.timeout_rate:
+            self._count("timeouts")
+            self._sleep(params.get("timeout") or 30)
+            raise openai.APITimeoutError(request=request)
+
+        self._sleep(latency)
+
+        completion_tokens = max(1, min(max_tokens, int(rng.gauss(self.config.completion_tokens, self.config.completion_tokens * 0.2))))
+        content = self._content(messages, rng, completion_tokens)
+        prompt_tokens = math.ceil(sum(len(m["content"]) for m in messages) / self.CHARS_PER_TOKEN)
+        completion_tokens = math.ceil(len(content) / self.CHARS_PER_TOKEN)
+        usage = CompletionUsage(
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            total_tokens=prompt_tokens + completion_tokens
+        )
+
+        self._count("completed")
+        self._count("prompt_tokens", prompt_tokens)
+        self._count("completion_tokens", completion_tokens)
+
+        completion_id = f"mock-{rng.getrandbits(32):08x}"
+        created = int(time.time())
+
+        if stream:
+            pieces = [content[i:i + 16] for i in range(0, len(content), 16)]
+            chunks = [
+                ChatCompletionChunk(
+                    id=completion_id,
+                    object="chat.completion.chunk",
+                    created=created,
+                    model=model,
+                    choices=[ChunkChoice(index=0, delta=ChoiceDelta(content=piece))]
+                )
+                for piece in pieces
+            ]
+            chunks.append(ChatCompletionChunk(
+                id=completion_id,
+                object="chat.completion.chunk",
+                created=created,
+                model=model,
+                choices=[],
+                usage=usage
+            ))
+            return _MockStream(chunks)
+
+        return ChatCompletion(
+            id=completion_id,
+            object="chat.completion",
+            created=created,
+            model=model,
+            choices=[
+                Choice(
+                    index=0,
+                    finish_reason="stop",
+                    message=ChatCompletionMessage(role="assistant", content=content)
+                )
+            ],
+            usage=usage
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"backend": self.name, **self._stats}
+
+
+def create_llm_backend(name: Optional[str] = None, api_key: Optional[str] = None) -> LLMBackend:
+    """Create the configured backend ('openai' or 'mock')"""
+    name = (name or settings.llm_backend).lower()
+    if name == "mock":
+        logger.warning("Using mock LLM backend - no real OpenAI calls will be made")
+        return MockLLMBackend()
+    if name == "openai":
+        return OpenAIBackend(api_key)
+    raise ValueError(f"Unknown LLM backend: {name}")
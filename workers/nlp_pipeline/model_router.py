@@ -0,0 +1,210 @@
+"""
+Per-request model routing for OpenAI calls
+Picks the model from task type, prompt size and recent per-model latency/error rate
+"""
+import logging
+import threading
+import time
+from collections import deque
+from decimal import Decimal
+from typing import Deque, Dict, Any, Optional, Tuple
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# Error kinds reported by OpenAIClient
+ERROR_TIMEOUT = "timeout"
+ERROR_CONNECTION = "connection"
+ERROR_API = "api"
+ERROR_OTHER = "other"
+
+
+def _percentile(ordered: list, pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return float(ordered[index])
+
+
+class ModelStats:
+    """
+    Sliding window of recent calls plus lifetime counters for one model
+    - Window: (timestamp, latency_ms, ok) for the last `window_seconds`
+    - Counters: calls, errors by kind, tokens and cost since process start
+    """
+
+    def __init__(self, window_seconds: int, max_samples: int = 1000):
+        self.window_seconds = window_seconds
+        self._samples: Deque[Tuple[float, int, bool]] = deque(maxlen=max_samples)
+        self.calls = 0
+        self.errors: Dict[str, int] = {}
+        self.total_tokens = 0
+        self.cost_usd = Decimal("0")
+
+    def _trim(self, now: float) -> None:
+        cutoff = now - self.window_seconds
+        while self._samples and self._samples[0][0] < cutoff:
+            self._samples.popleft()
+
+    def add(self, latency_ms: int, ok: bool, error_kind: Optional[str], tokens: int, cost_usd: Decimal) -> None:
+        now = time.monotonic()
+        self._trim(now)
+        self._samples.append((now, latency_ms, ok))
+        self.calls += 1
+        if not ok:
+            kind = error_kind or ERROR_OTHER
+            self.errors[kind] = self.errors.get(kind, 0) + 1
+        self.total_tokens += tokens
+        self.cost_usd += cost_usd
+
+    def window(self) -> Dict[str, Any]:
+        """Error rate and latency percentiles over the sliding window"""
+        self._trim(time.monotonic())
+        samples = len(self._samples)
+        failures = sum(1 for _, _, ok in self._samples if not ok)
+        latencies = sorted(latency for _, latency, ok in self._samples if ok)
+        return {
+            "samples": samples,
+            "error_rate": round(failures / samples, 4) if samples else 0.0,
+            "p50_latency_ms": _percentile(latencies, 50),
+            "p95_latency_ms": _percentile(latencies, 95)
+        }
+
+
+class ModelRouter:
+    """
+    Chooses the model for each OpenAI call and decides failover
+    - Default: the cheap primary model for every operation
+    - Long analysis prompts go to the stronger model (when it is healthy)
+    - A model is unhealthy when its windowed error rate or p95 latency is over limit
+    - Escalation to a more expensive model is capped by its share of recent
+      calls, so a provider incident cannot move all traffic onto it
+    - Timeouts and connection errors never escalate; they retry the same model
+      once and then fail so the Celery retry backs off
+    """
+
+    def __init__(self, primary_model: str, fallback_model: str, cost_per_1k: Dict[str, Decimal]):
+        self.primary_model = primary_model
+        self.fallback_model = fallback_model
+        self.cost_per_1k = cost_per_1k
+
+        self.window_seconds = settings.model_router_window_seconds
+        self.min_samples = settings.model_router_min_samples
+        self.max_error_rate = settings.model_router_max_error_rate
+        self.max_p95_latency_ms = settings.model_router_max_p95_latency_ms
+        self.long_prompt_tokens = settings.model_router_long_prompt_tokens
+        self.max_escalation_share = settings.model_router_max_escalation_share
+
+        self._stats: Dict[str, ModelStats] = {}
+        self._lock = threading.Lock()
+
+    def _get_stats(self, model: str) -> ModelStats:
+        if model not in self._stats:
+            self._stats[model] = ModelStats(self.window_seconds)
+        return self._stats[model]
+
+    def _cost(self, model: str) -> Decimal:
+        return self.cost_per_1k.get(model, Decimal("0.001"))
+
+    def _is_healthy(self, model: str) -> bool:
+        window = self._get_stats(model).window()
+        if window["samples"] < self.min_samples:
+            return True
+        return (
+            window["error_rate"] < self.max_error_rate
+            and window["p95_latency_ms"] <= self.max_p95_latency_ms
+        )
+
+    def _escalation_allowed(self, model: str) -> bool:
+        """Whether another call may go to `model` within its share of recent traffic"""
+        windows = [stats.window()["samples"] for stats in self._stats.values()]
+        total = sum(windows)
+        if total < self.min_samples:
+            return True
+        return self._get_stats(model).window()["samples"] / total < self.max_escalation_share
+
+    def route(self, operation: str, prompt_tokens: int) -> str:
+        """
+        Pick the model for a call
+
+        Args:
+            operation: summary / tag extraction / analysis
+            prompt_tokens: Estimated prompt tokens
+
+        Returns:
+            Model name
+        """
+        with self._lock:
+            if (
+                operation == "analysis"
+                and prompt_tokens >= self.long_prompt_tokens
+                and self._is_healthy(self.fallback_model)
+                and self._escalation_allowed(self.fallback_model)
+            ):
+                return self.fallback_model
+
+            if not self._is_healthy(self.primary_model) and self._is_healthy(self.fallback_model):
+                if self._cost(self.fallback_model) <= self._cost(self.primary_model) \
+                        or self._escalation_allowed(self.fallback_model):
+                    logger.info(f"Primary model {self.primary_model} unhealthy, routing {operation} to {self.fallback_model}")
+                    return self.fallback_model
+
+            return self.primary_model
+
+    def failover(self, model: str, error_kind: str, attempt: int) -> Optional[str]:
+        """
+        Pick the model for the next attempt after a failed call
+
+        Args:
+            model: Model that just failed
+            error_kind: ERROR_TIMEOUT / ERROR_CONNECTION / ERROR_API / ERROR_OTHER
+            attempt: Number of attempts made so far (1 after the first failure)
+
+        Returns:
+            Model to retry with, or None to give up
+        """
+        if attempt >= 2:
+            return None
+
+        if error_kind in (ERROR_TIMEOUT, ERROR_CONNECTION):
+            return model
+
+        other = self.fallback_model if model == self.primary_model else self.primary_model
+        with self._lock:
+            if not self._is_healthy(other):
+                return None
+            if self._cost(other) > self._cost(model) and not self._escalation_allowed(other):
+                logger.warning(f"Not escalating to {other}: over {self.max_escalation_share:.0%} of recent calls")
+                return None
+        return other
+
+    def record(
+        self,
+        model: str,
+        latency_ms: int,
+        ok: bool,
+        error_kind: Optional[str] = None,
+        total_tokens: int = 0,
+        cost_usd: Decimal = Decimal("0")
+    ) -> None:
+        """Record the outcome of one call"""
+        with self._lock:
+            self._get_stats(model).add(latency_ms, ok, error_kind, total_tokens, cost_usd)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Per-model window stats and counters (health checks / benchmarks)"""
+        with self._lock:
+            return {
+                model: {
+                    **stats.window(),
+                    "healthy": self._is_healthy(model),
+                    "calls": stats.calls,
+                    "errors": dict(stats.errors),
+                    "total_tokens": stats.total_tokens,
+                    "cost_usd": float(stats.cost_usd)
+                }
+                for model, stats in self._stats.items()
+            }
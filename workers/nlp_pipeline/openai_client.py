@@ -3,25 +3,110 @@ OpenAI GPT-4o-mini/GPT-4o client for Reddit Ghost Publisher MVP
 Simplified implementation with fallback support and cost tracking
 """
 import logging
-from typing import Dict, Any, Optional, Tuple
+from typing import Dict, Any, Callable, List, Optional, Tuple
 from decimal import Decimal
 from datetime import datetime, timedelta
 import json
 import os
+import threading
+import time
 
 import openai
-from openai import OpenAI
-from openai.types.chat import ChatCompletion
+from openai.types import CompletionUsage
+from openai.types.chat import ChatCompletion, ChatCompletionMessage
+from openai.types.chat.chat_completion import Choice
 
 from app.config import get_settings
 from app.redis_client import redis_client
+from .llm_backends import LLMBackend, create_llm_backend
+from .model_router import ModelRouter, ERROR_TIMEOUT, ERROR_CONNECTION, ERROR_API, ERROR_OTHER
+from .stream_validation import (
+    StreamValidationError,
+    StreamValidator,
+    JSONObjectStreamValidator,
+    TagListStreamValidator
+)
+from .token_ledger import get_token_ledger
+from .token_rate_limiter import get_token_rate_limiter
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
+# Bump whenever any static prompt prefix below changes (recorded in token_usage)
+PROMPT_VERSION = "2"
+
+# Static prompt prefixes: identical bytes on every call so provider-side prompt
+# caching can reuse them; only the post payload (last user message) varies.
+SUMMARY_PROMPT_PREFIX = """당신은 Reddit 게시글을 한국어로 요약하는 전문가입니다. 정확하고 간결하며 이해하기 쉬운 요약을 제공합니다.
+
+사용자가 보내는 Reddit 게시글(제목, 내용)을 한국어로 요약해주세요.
+
+요약 요구사항:
+1. 핵심 내용을 3-5문장으로 간결하게 요약
+2. 자연스러운 한국어로 작성
+3. 원문의 맥락과 톤을 유지
+4. 기술적 용어는 한국어로 번역하되 필요시 영어 병기
+5. 객관적이고 중립적인 톤 유지
+
+요약만 출력하세요."""
+
+TAG_EXTRACTION_PROMPT_PREFIX = """당신은 Reddit 게시글에서 검색 최적화된 태그를 추출하는 전문가입니다. 일관된 표기 규칙을 따라 3-5개의 태그를 제공합니다.
+
+사용자가 보내는 Reddit 게시글(제목, 내용)에서 3-5개의 태그를 추출해주세요.
+
+태그 추출 요구사항:
+1. 3개에서 5개의 태그 추출
+2. 모든 태그는 소문자로 작성
+3. 한글 태그 우선, 필요시 영어 사용
+4. 검색 최적화를 위한 키워드 선택
+5. 일관된 표기 규칙 적용 (띄어쓰기 없이, 하이픈 사용 가능)
+6. 쉼표로 구분하여 나열
+
+예시: 개발, 프로그래밍, 웹개발, 기술, 튜토리얼
+
+태그만 출력하세요."""
+
+ANALYSIS_PROMPT_PREFIX = """당신은 Reddit 게시글에서 사용자의 페인 포인트와 제품 아이디어를 추출하는 분석 전문가입니다. 정확한 JSON 형태로 결과를 제공합니다.
+
+사용자가 보내는 Reddit 게시글(제목, 내용)을 분석하여 사용자의 페인 포인트와 잠재적 제품 아이디어를 추출해주세요.
+
+다음 JSON 스키마에 맞춰 결과를 제공해주세요:
+
+{
+  "meta": {
+    "version": "1.0",
+    "confidence_score": 0.85
+  },
+  "pain_points": [
+    {
+      "description": "페인 포인트 설명",
+      "category": "카테고리 (기술적/사용성/비용/시간/기타)",
+      "severity": "심각도 (높음/보통/낮음)",
+      "frequency": "빈도 (자주/가끔/드물게)"
+    }
+  ],
+  "product_ideas": [
+    {
+      "title": "제품 아이디어 제목",
+      "description": "제품 아이디어 설명",
+      "target_pain_point": "해결하는 페인 포인트",
+      "feasibility": "실현 가능성 (높음/보통/낮음)",
+      "market_potential": "시장 잠재력 (높음/보통/낮음)"
+    }
+  ],
+  "analysis_notes": "분석 과정에서의 추가 노트"
+}
+
+분석 기준:
+1. 명시적으로 언급된 문제점과 불만사항 식별
+2. 암시적으로 드러나는 니즈와 개선점 파악
+3. 실현 가능한 제품/서비스 아이디어 도출
+4. 시장성과 기술적 실현 가능성 고려
+5. meta.version 필드는 반드시 포함"""
+
 
 class OpenAIClient:
-    """Simplified OpenAI client with GPT-4o-mini primary and GPT-4o fallback"""
+    """OpenAI client with per-request model routing (GPT-4o-mini primary, GPT-4o fallback)"""
     
     # Internal cost map (per 1K tokens)
     COST_PER_1K_TOKENS = {
@@ -29,22 +114,42 @@ class OpenAIClient:
         'gpt-4o': Decimal('0.005')          # $5.00/1M input tokens  
     }
     
+    # Cached prompt tokens are billed at half the input rate
+    CACHED_INPUT_COST_RATIO = Decimal('0.5')
+    
+    # Schema bounds enforced while analysis output streams (AnalysisEngine keeps at most these)
+    ANALYSIS_ARRAY_LIMITS = {"pain_points": 10, "product_ideas": 8}
+    
     def __init__(self):
-        self._client: Optional[OpenAI] = None
+        self._client: Optional[LLMBackend] = None
         self._api_key = os.getenv('OPENAI_API_KEY')
         self._daily_token_limit = int(os.getenv('OPENAI_DAILY_TOKENS_LIMIT', '100000'))
         
-        # Model configuration: primary + fallback
-        self._primary_model = 'gpt-4o-mini'
-        self._fallback_model = 'gpt-4o'
+        # Model configuration: primary + fallback, chosen per request by the router
+        self._primary_model = settings.openai_primary_model
+        self._fallback_model = settings.openai_fallback_model
+        self._router = ModelRouter(self._primary_model, self._fallback_model, self.COST_PER_1K_TOKENS)
+        
+        # Shared TPM/daily reservation limiter (waits on 429 instead of escalating)
+        self._rate_limiter = get_token_rate_limiter()
+        self._rate_limit_retries = settings.openai_rate_limit_retries
+        
+        # 429s seen by this process; concurrent callers use it as a backoff signal
+        self._rate_limit_events = 0
+        self._rate_limit_events_lock = threading.Lock()
+        
+        # Buffered per-call usage ledger (bulk inserted into token_usage)
+        self._ledger = get_token_ledger()
     
-    def initialize(self) -> None:
-        """Initialize OpenAI client (synchronous for MVP)"""
-        if not self._api_key:
-            raise ValueError("OpenAI API key not found in environment variables")
+    def initialize(self, backend: Optional[LLMBackend] = None) -> None:
+        """
+        Initialize the completion backend (synchronous for MVP)
         
-        self._client = OpenAI(api_key=self._api_key)
-        logger.info("OpenAI client initialized successfully")
+        Args:
+            backend: Explicit backend (e.g. MockLLMBackend); defaults to LLM_BACKEND
+        """
+        self._client = backend or create_llm_backend(api_key=self._api_key)
+        logger.info(f"OpenAI client initialized successfully ({self._client.name} backend)")
     
     def check_daily_token_usage(self) -> Tuple[int, bool]:
         """
@@ -134,48 +239,309 @@ class OpenAIClient:
         except Exception as e:
             logger.error(f"Failed to send token budget alert: {e}")
     
-    def _update_token_usage(self, tokens_used: int) -> None:
-        """Update daily token usage counter with UTC 00:00 auto reset"""
+    def _get_rate_limit_wait(self, error: Exception, retry_count: int) -> float:
+        """Get wait time for a 429 from Retry-After header or exponential backoff"""
         try:
-            today = datetime.utcnow().strftime("%Y%m%d")
-            cache_key = f"usage:{today}"
-            
-            # Increment counter
-            redis_client.incr(cache_key, tokens_used)
-            
-            # Set expiry to end of day UTC if key is new
-            ttl = redis_client.ttl(cache_key)
-            if ttl == -1:  # Key exists but no expiry set
-                tomorrow = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1)
-                seconds_until_tomorrow = int((tomorrow - datetime.utcnow()).total_seconds())
-                redis_client.expire(cache_key, seconds_until_tomorrow)
+            retry_after = error.response.headers.get("retry-after")
+            if retry_after:
+                return float(retry_after)
+        except (AttributeError, ValueError):
+            pass
+        return min(settings.backoff_max, settings.backoff_min * (settings.backoff_base ** retry_count))
+    
+    def _stream_chat_completion(
+        self,
+        model: str,
+        messages: list,
+        max_tokens: int,
+        validator: StreamValidator,
+        **params: Any
+    ) -> ChatCompletion:
+        """
+        Stream a completion through an incremental validator
+        
+        The stream is closed early only when the validator raises
+        StreamValidationError. Once it reports the output complete, later
+        deltas are ignored but the stream is drained, because the exact usage
+        (with cached prompt tokens) arrives in the final chunk.
+        A StreamValidationError carries the output received so far as .response.
+        
+        Returns:
+            ChatCompletion assembled from the streamed deltas
+        """
+        parts = []
+        usage = None
+        finish_reason = None
+        complete = False
+        
+        stream = self._client.create_chat_completion(
+            model=model,
+            messages=messages,
+            max_tokens=max_tokens,
+            timeout=30,
+            stream=True,
+            stream_options={"include_usage": True},
+            **params
+        )
+        try:
+            try:
+                for chunk in stream:
+                    if chunk.usage:
+                        usage = chunk.usage
+                    if chunk.choices and chunk.choices[0].finish_reason:
+                        finish_reason = chunk.choices[0].finish_reason
+                    if complete or not chunk.choices or not chunk.choices[0].delta.content:
+                        continue
+                    
+                    delta = chunk.choices[0].delta.content
+                    parts.append(delta)
+                    complete = validator.feed(delta)
+            finally:
+                stream.close()
             
-        except Exception as e:
-            logger.error(f"Failed to update token usage: {e}")
+            validator.finish("".join(parts))
+        except StreamValidationError as e:
+            e.response = self._assemble_stream_response(model, messages, "".join(parts), usage, finish_reason)
+            raise
+        
+        return self._assemble_stream_response(model, messages, "".join(parts), usage, finish_reason)
+    
+    def _assemble_stream_response(
+        self,
+        model: str,
+        messages: list,
+        text: str,
+        usage: Optional[CompletionUsage],
+        finish_reason: Optional[str]
+    ) -> ChatCompletion:
+        """Build a ChatCompletion from streamed text, estimating usage if no usage chunk arrived"""
+        if usage is None:
+            prompt_tokens = self._rate_limiter.estimate_tokens(*(m["content"] for m in messages))
+            completion_tokens = self._rate_limiter.estimate_tokens(text)
+            usage = CompletionUsage(
+                prompt_tokens=prompt_tokens,
+                completion_tokens=completion_tokens,
+                total_tokens=prompt_tokens + completion_tokens
+            )
+        
+        return ChatCompletion(
+            id=f"stream-{int(time.time() * 1000)}",
+            object="chat.completion",
+            created=int(time.time()),
+            model=model,
+            choices=[
+                Choice(
+                    index=0,
+                    # A stream cancelled before the model finished was stopped by us
+                    finish_reason=finish_reason or "stop",
+                    message=ChatCompletionMessage(role="assistant", content=text)
+                )
+            ],
+            usage=usage
+        )
+    
+    def _create_chat_completion(
+        self,
+        operation: str,
+        post_id: str,
+        messages: list,
+        max_tokens: int,
+        validator_factory: Optional[Callable[[], StreamValidator]] = None,
+        **params: Any
+    ) -> Tuple[ChatCompletion, str]:
+        """
+        Create chat completion with token reservation and routed model selection
+        
+        The model router picks the model per request. Rate limit errors wait
+        (fleet-wide cooldown) and retry the same model; timeouts and connection
+        errors retry the same model once; API errors may fail over to the other
+        model within the router's escalation cap.
+        With a validator_factory (and streaming enabled) the output is validated
+        while it streams; invalid generations are cancelled and retried at once.
+        Truncated output, or invalid output once retries run out, is returned
+        as is for the caller's parse fallback.
+        
+        Returns:
+            Tuple of (response, model_used)
+        """
+        if not self._client:
+            self.initialize()
+        
+        # Reserve estimated tokens atomically against TPM window and daily budget
+        estimated_tokens = self._rate_limiter.estimate_tokens(
+            *(message["content"] for message in messages), max_tokens=max_tokens
+        )
+        reservation = self._rate_limiter.acquire(estimated_tokens)
+        
+        prompt_tokens = self._rate_limiter.estimate_tokens(*(message["content"] for message in messages))
+        current_model = self._router.route(operation, prompt_tokens)
+        attempt = 0  # failed attempts (rate limits and cancelled streams excluded)
+        rate_limit_retries = 0
+        stream_retries = 0
+        wasted_tokens = 0  # prompt + streamed completion tokens of cancelled generations
+        stream = validator_factory is not None and settings.openai_streaming_enabled
+        
+        try:
+            while True:
+                error_kind = None
+                
+                try:
+                    logger.debug(f"Attempting {current_model} for {operation} {post_id} (attempt {attempt + 1})")
+                    
+                    call_started = time.monotonic()
+                    if stream:
+                        response = self._stream_chat_completion(
+                            current_model, messages, max_tokens, validator_factory(), **params
+                        )
+                    else:
+                        response = self._client.create_chat_completion(
+                            model=current_model,
+                            messages=messages,
+                            max_tokens=max_tokens,
+                            timeout=30,
+                            **params
+                        )
+                    latency_ms = int((time.monotonic() - call_started) * 1000)
+                    
+                except StreamValidationError as e:
+                    # Output cut off at max_tokens would be cut off again; so would the last retry.
+                    # Hand the output to the caller's parse fallback instead of failing the post.
+                    truncated = e.response.choices[0].finish_reason == "length"
+                    if truncated or stream_retries >= settings.openai_stream_retries:
+                        logger.warning(
+                            f"Using invalid {operation} output for {post_id} from {current_model} "
+                            f"after {stream_retries} retries (truncated: {truncated}): {e}"
+                        )
+                        response = e.response
+                        latency_ms = int((time.monotonic() - call_started) * 1000)
+                    else:
+                        # Bad generation detected mid-stream: retry right away, no backoff
+                        stream_retries += 1
+                        wasted_tokens += e.response.usage.total_tokens
+                        logger.warning(
+                            f"Cancelled invalid {operation} stream for {post_id} with {current_model} "
+                            f"({stream_retries}/{settings.openai_stream_retries}): {e}"
+                        )
+                        continue
+                    
+                except openai.RateLimitError as e:
+                    # Wait for the TPM window on the same model rather than paying for the fallback
+                    if rate_limit_retries >= self._rate_limit_retries:
+                        raise Exception(f"Rate limited for {operation} after {rate_limit_retries} retries: {e}")
+                    
+                    wait_seconds = self._get_rate_limit_wait(e, rate_limit_retries)
+                    rate_limit_retries += 1
+                    logger.warning(
+                        f"Rate limit error with {current_model} for {operation} {post_id}, "
+                        f"waiting {wait_seconds:.1f}s ({rate_limit_retries}/{self._rate_limit_retries}): {e}"
+                    )
+                    self._rate_limiter.penalize(wait_seconds)
+                    with self._rate_limit_events_lock:
+                        self._rate_limit_events += 1
+                    time.sleep(wait_seconds)
+                    continue
+                    
+                except openai.APITimeoutError as e:
+                    logger.warning(f"Timeout error with {current_model} for {operation} {post_id}: {e}")
+                    error_kind, last_error = ERROR_TIMEOUT, e
+                    
+                except openai.APIConnectionError as e:
+                    logger.warning(f"Connection error with {current_model} for {operation} {post_id}: {e}")
+                    error_kind, last_error = ERROR_CONNECTION, e
+                    
+                except openai.APIError as e:
+                    logger.error(f"API error with {current_model} for {operation} {post_id}: {e}")
+                    if "model_not_found" in str(e).lower():
+                        raise Exception(f"API error in {operation}: {e}")
+                    error_kind, last_error = ERROR_API, e
+                    
+                except Exception as e:
+                    logger.error(f"Unexpected error with {current_model} for {operation} {post_id}: {e}")
+                    error_kind, last_error = ERROR_OTHER, e
+                
+                if error_kind:
+                    self._router.record(
+                        current_model,
+                        int((time.monotonic() - call_started) * 1000),
+                        ok=False,
+                        error_kind=error_kind
+                    )
+                    attempt += 1
+                    next_model = self._router.failover(current_model, error_kind, attempt)
+                    if next_model is None:
+                        raise Exception(f"{operation} failed after {attempt} attempts ({error_kind}): {last_error}")
+                    logger.info(f"Retrying {operation} {post_id} with {next_model} after {error_kind} on {current_model}")
+                    current_model = next_model
+                    continue
+                
+                logger.info(f"Used model {current_model} for {operation} {post_id}")
+                
+                # Replace the estimate with actual usage
+                self._rate_limiter.reconcile(reservation, response.usage.total_tokens + wasted_tokens)
+                cached_tokens = self._get_cached_tokens(response)
+                cost = self._calculate_cost(response.usage.total_tokens, current_model, cached_tokens)
+                self._router.record(
+                    current_model,
+                    latency_ms,
+                    ok=True,
+                    total_tokens=response.usage.total_tokens,
+                    cost_usd=cost
+                )
+                self._ledger.record(
+                    post_id=post_id,
+                    service="openai",
+                    model=current_model,
+                    input_tokens=response.usage.prompt_tokens,
+                    output_tokens=response.usage.completion_tokens,
+                    cost_usd=cost,
+                    cached_tokens=cached_tokens,
+                    prompt_version=PROMPT_VERSION,
+                    latency_ms=latency_ms
+                )
+                return response, current_model
+                
+        except Exception:
+            self._rate_limiter.release(reservation)
+            raise
     
-    def _calculate_cost(self, total_tokens: int, model: str) -> Decimal:
-        """Calculate cost using internal cost map"""
+    @property
+    def model_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-model latency percentiles, error rates and cost counters"""
+        return self._router.snapshot()
+    
+    @property
+    def rate_limit_events(self) -> int:
+        """Number of 429 responses received by this process"""
+        return self._rate_limit_events
+    
+    def _calculate_cost(self, total_tokens: int, model: str, cached_tokens: int = 0) -> Decimal:
+        """Calculate cost using internal cost map (cached prompt tokens are discounted)"""
         cost_per_1k = self.COST_PER_1K_TOKENS.get(model, Decimal('0.001'))
-        return (Decimal(total_tokens) / 1000) * cost_per_1k
+        billable_tokens = Decimal(total_tokens) - Decimal(cached_tokens) * (1 - self.CACHED_INPUT_COST_RATIO)
+        return (billable_tokens / 1000) * cost_per_1k
+    
+    @staticmethod
+    def _get_cached_tokens(response: ChatCompletion) -> int:
+        """Prompt tokens served from the provider's prompt cache"""
+        details = getattr(response.usage, "prompt_tokens_details", None)
+        return int(getattr(details, "cached_tokens", 0) or 0)
+    
+    def _build_messages(self, prompt_prefix: str, title: str, content: str) -> List[Dict[str, str]]:
+        """
+        Build chat messages as static prefix + variable post payload
+        
+        The system message is byte-identical across calls (cacheable prefix);
+        the post title/content always come last in the user message.
+        """
+        return [
+            {"role": "system", "content": prompt_prefix},
+            {"role": "user", "content": f"제목: {title}\n\n내용:\n{content}"}
+        ]
+    
+    def _get_korean_summary_prompt(self, title: str, content: str) -> List[Dict[str, str]]:
+        """Generate Korean summary messages (static prefix + post payload)"""
+        return self._build_messages(SUMMARY_PROMPT_PREFIX, title, content)
     
-    def _get_korean_summary_prompt(self, title: str, content: str) -> str:
-        """Generate Korean summary prompt template"""
-        return f"""다음 Reddit 게시글을 한국어로 요약해주세요:
-
-제목: {title}
-
-내용:
-{content}
-
-요약 요구사항:
-1. 핵심 내용을 3-5문장으로 간결하게 요약
-2. 자연스러운 한국어로 작성
-3. 원문의 맥락과 톤을 유지
-4. 기술적 용어는 한국어로 번역하되 필요시 영어 병기
-5. 객관적이고 중립적인 톤 유지
-
-요약:"""
-
     def generate_korean_summary(
         self, 
         post_title: str, 
@@ -195,106 +561,29 @@ class OpenAIClient:
         Returns:
             Dictionary with summary and token usage info
         """
-        if not self._client:
-            self.initialize()
-        
         # Check daily token limit
         current_usage, is_over_limit = self.check_daily_token_usage()
         if is_over_limit:
             raise Exception(f"Daily token limit exceeded: {current_usage}/{self._daily_token_limit}")
         
-        # Prepare Korean summary prompt
-        prompt = self._get_korean_summary_prompt(post_title, post_content)
-        
-        # Try primary model first (GPT-4o-mini) with enhanced error handling
-        model_used = None
-        response = None
-        fallback_attempted = False
-        
-        for attempt in range(2):  # Primary + fallback attempt
-            current_model = self._primary_model if attempt == 0 else self._fallback_model
-            
-            try:
-                logger.debug(f"Attempting {current_model} for post {post_id} (attempt {attempt + 1})")
-                
-                response = self._client.chat.completions.create(
-                    model=current_model,
-                    messages=[
-                        {
-                            "role": "system",
-                            "content": "당신은 Reddit 게시글을 한국어로 요약하는 전문가입니다. 정확하고 간결하며 이해하기 쉬운 요약을 제공합니다."
-                        },
-                        {
-                            "role": "user", 
-                            "content": prompt
-                        }
-                    ],
-                    max_tokens=max_tokens,
-                    temperature=0.3,
-                    timeout=30  # Add timeout
-                )
-                
-                model_used = current_model
-                if attempt == 0:
-                    logger.info(f"Used primary model {self._primary_model} for post {post_id}")
-                else:
-                    logger.info(f"Used fallback model {self._fallback_model} for post {post_id}")
-                    fallback_attempted = True
-                break
-                
-            except openai.RateLimitError as e:
-                logger.warning(f"Rate limit error with {current_model} for post {post_id}: {e}")
-                if attempt == 0:  # Try fallback on rate limit
-                    logger.info(f"Rate limit on primary model, trying fallback {self._fallback_model}")
-                    continue
-                else:
-                    # Both models rate limited, raise the error
-                    raise Exception(f"Both models rate limited: {e}")
-                    
-            except openai.APIError as e:
-                logger.error(f"API error with {current_model} for post {post_id}: {e}")
-                if attempt == 0 and "model_not_found" not in str(e).lower():
-                    logger.info(f"API error on primary model, trying fallback {self._fallback_model}")
-                    continue
-                else:
-                    raise Exception(f"API error: {e}")
-                    
-            except openai.APITimeoutError as e:
-                logger.warning(f"Timeout error with {current_model} for post {post_id}: {e}")
-                if attempt == 0:
-                    logger.info(f"Timeout on primary model, trying fallback {self._fallback_model}")
-                    continue
-                else:
-                    raise Exception(f"Timeout on both models: {e}")
-                    
-            except openai.APIConnectionError as e:
-                logger.warning(f"Connection error with {current_model} for post {post_id}: {e}")
-                if attempt == 0:
-                    logger.info(f"Connection error on primary model, trying fallback {self._fallback_model}")
-                    continue
-                else:
-                    raise Exception(f"Connection error on both models: {e}")
-                    
-            except Exception as e:
-                logger.error(f"Unexpected error with {current_model} for post {post_id}: {e}")
-                if attempt == 0:
-                    logger.info(f"Unexpected error on primary model, trying fallback {self._fallback_model}")
-                    continue
-                else:
-                    raise Exception(f"Both models failed: {e}")
+        # Prepare Korean summary messages (static prefix first for prompt caching)
+        messages = self._get_korean_summary_prompt(post_title, post_content)
         
-        if not response or not model_used:
-            raise Exception("Failed to get response from both primary and fallback models")
+        response, model_used = self._create_chat_completion(
+            "summary",
+            post_id,
+            messages=messages,
+            max_tokens=max_tokens,
+            temperature=0.3
+        )
         
         # Extract response data
         summary = response.choices[0].message.content.strip()
         total_tokens = response.usage.total_tokens
+        cached_tokens = self._get_cached_tokens(response)
         
         # Calculate cost using internal cost map
-        cost = self._calculate_cost(total_tokens, model_used)
-        
-        # Update token usage tracking
-        self._update_token_usage(total_tokens)
+        cost = self._calculate_cost(total_tokens, model_used, cached_tokens)
         
         logger.info(
             f"Generated Korean summary for post {post_id}",
@@ -302,6 +591,7 @@ class OpenAIClient:
                 "post_id": post_id,
                 "model": model_used,
                 "total_tokens": total_tokens,
+                "cached_tokens": cached_tokens,
                 "cost_usd": float(cost),
                 "summary_length": len(summary)
             }
@@ -311,6 +601,7 @@ class OpenAIClient:
             "summary": summary,
             "model": model_used,
             "total_tokens": total_tokens,
+            "cached_tokens": cached_tokens,
             "cost_usd": cost
         }
     
@@ -333,92 +624,27 @@ class OpenAIClient:
         Returns:
             Dictionary with tags and token usage info
         """
-        if not self._client:
-            self.initialize()
-        
         # Check daily token limit
         current_usage, is_over_limit = self.check_daily_token_usage()
         if is_over_limit:
             raise Exception(f"Daily token limit exceeded: {current_usage}/{self._daily_token_limit}")
         
-        # Prepare tag extraction prompt
-        prompt = self._get_tag_extraction_prompt(post_title, post_content)
-        
-        # Try primary model first (GPT-4o-mini) with enhanced error handling
-        model_used = None
-        response = None
+        # Prepare tag extraction messages (static prefix first for prompt caching)
+        messages = self._get_tag_extraction_prompt(post_title, post_content)
         
-        for attempt in range(2):  # Primary + fallback attempt
-            current_model = self._primary_model if attempt == 0 else self._fallback_model
-            
-            try:
-                logger.debug(f"Attempting {current_model} for tag extraction {post_id} (attempt {attempt + 1})")
-                
-                response = self._client.chat.completions.create(
-                    model=current_model,
-                    messages=[
-                        {
-                            "role": "system",
-                            "content": "당신은 Reddit 게시글에서 검색 최적화된 태그를 추출하는 전문가입니다. 일관된 표기 규칙을 따라 3-5개의 태그를 제공합니다."
-                        },
-                        {
-                            "role": "user", 
-                            "content": prompt
-                        }
-                    ],
-                    max_tokens=max_tokens,
-                    temperature=0.2,
-                    timeout=30
-                )
-                
-                model_used = current_model
-                if attempt == 0:
-                    logger.info(f"Used primary model {self._primary_model} for tag extraction {post_id}")
-                else:
-                    logger.info(f"Used fallback model {self._fallback_model} for tag extraction {post_id}")
-                break
-                
-            except openai.RateLimitError as e:
-                logger.warning(f"Rate limit error with {current_model} for tag extraction {post_id}: {e}")
-                if attempt == 0:
-                    continue
-                else:
-                    raise Exception(f"Both models rate limited for tag extraction: {e}")
-                    
-            except openai.APIError as e:
-                logger.error(f"API error with {current_model} for tag extraction {post_id}: {e}")
-                if attempt == 0 and "model_not_found" not in str(e).lower():
-                    continue
-                else:
-                    raise Exception(f"API error in tag extraction: {e}")
-                    
-            except openai.APITimeoutError as e:
-                logger.warning(f"Timeout error with {current_model} for tag extraction {post_id}: {e}")
-                if attempt == 0:
-                    continue
-                else:
-                    raise Exception(f"Timeout on both models for tag extraction: {e}")
-                    
-            except openai.APIConnectionError as e:
-                logger.warning(f"Connection error with {current_model} for tag extraction {post_id}: {e}")
-                if attempt == 0:
-                    continue
-                else:
-                    raise Exception(f"Connection error on both models for tag extraction: {e}")
-                    
-            except Exception as e:
-                logger.error(f"Unexpected error with {current_model} for tag extraction {post_id}: {e}")
-                if attempt == 0:
-                    continue
-                else:
-                    raise Exception(f"Both models failed for tag extraction: {e}")
-        
-        if not response or not model_used:
-            raise Exception("Failed to get response from both models for tag extraction")
+        response, model_used = self._create_chat_completion(
+            "tag extraction",
+            post_id,
+            messages=messages,
+            max_tokens=max_tokens,
+            validator_factory=lambda: TagListStreamValidator(max_chars=max_tokens * 4, max_tags=5),
+            temperature=0.2
+        )
         
         # Extract and parse tags
         tags_text = response.choices[0].message.content.strip()
         total_tokens = response.usage.total_tokens
+        cached_tokens = self._get_cached_tokens(response)
         
         # Parse tags from response (expecting comma-separated format)
         tags = []
@@ -436,10 +662,7 @@ class OpenAIClient:
                     tags.append(generic_tag)
         
         # Calculate cost using internal cost map
-        cost = self._calculate_cost(total_tokens, model_used)
-        
-        # Update token usage tracking
-        self._update_token_usage(total_tokens)
+        cost = self._calculate_cost(total_tokens, model_used, cached_tokens)
         
         logger.info(
             f"Extracted tags for post {post_id}",
@@ -447,6 +670,7 @@ class OpenAIClient:
                 "post_id": post_id,
                 "model": model_used,
                 "total_tokens": total_tokens,
+                "cached_tokens": cached_tokens,
                 "cost_usd": float(cost),
                 "tags_count": len(tags),
                 "tags": tags
@@ -457,29 +681,13 @@ class OpenAIClient:
             "tags": tags,
             "model": model_used,
             "total_tokens": total_tokens,
+            "cached_tokens": cached_tokens,
             "cost_usd": cost
         }
     
-    def _get_tag_extraction_prompt(self, title: str, content: str) -> str:
-        """Generate tag extraction prompt template"""
-        return f"""다음 Reddit 게시글에서 3-5개의 태그를 추출해주세요:
-
-제목: {title}
-
-내용:
-{content}
-
-태그 추출 요구사항:
-1. 3개에서 5개의 태그 추출
-2. 모든 태그는 소문자로 작성
-3. 한글 태그 우선, 필요시 영어 사용
-4. 검색 최적화를 위한 키워드 선택
-5. 일관된 표기 규칙 적용 (띄어쓰기 없이, 하이픈 사용 가능)
-6. 쉼표로 구분하여 나열
-
-예시: 개발, 프로그래밍, 웹개발, 기술, 튜토리얼
-
-태그:"""
+    def _get_tag_extraction_prompt(self, title: str, content: str) -> List[Dict[str, str]]:
+        """Generate tag extraction messages (static prefix + post payload)"""
+        return self._build_messages(TAG_EXTRACTION_PROMPT_PREFIX, title, content)
     
     def analyze_pain_points_and_ideas(
         self,
@@ -500,93 +708,31 @@ class OpenAIClient:
         Returns:
             Dictionary with analysis results and token usage info
         """
-        if not self._client:
-            self.initialize()
-        
         # Check daily token limit
         current_usage, is_over_limit = self.check_daily_token_usage()
         if is_over_limit:
             raise Exception(f"Daily token limit exceeded: {current_usage}/{self._daily_token_limit}")
         
-        # Prepare analysis prompt
-        prompt = self._get_pain_points_analysis_prompt(post_title, post_content)
-        
-        # Try primary model first (GPT-4o-mini) with enhanced error handling
-        model_used = None
-        response = None
-        
-        for attempt in range(2):  # Primary + fallback attempt
-            current_model = self._primary_model if attempt == 0 else self._fallback_model
-            
-            try:
-                logger.debug(f"Attempting {current_model} for analysis {post_id} (attempt {attempt + 1})")
-                
-                response = self._client.chat.completions.create(
-                    model=current_model,
-                    messages=[
-                        {
-                            "role": "system",
-                            "content": "당신은 Reddit 게시글에서 사용자의 페인 포인트와 제품 아이디어를 추출하는 분석 전문가입니다. 정확한 JSON 형태로 결과를 제공합니다."
-                        },
-                        {
-                            "role": "user",
-                            "content": prompt
-                        }
-                    ],
-                    max_tokens=max_tokens,
-                    temperature=0.2,
-                    response_format={"type": "json_object"},
-                    timeout=30
-                )
-                
-                model_used = current_model
-                if attempt == 0:
-                    logger.info(f"Used primary model {self._primary_model} for analysis {post_id}")
-                else:
-                    logger.info(f"Used fallback model {self._fallback_model} for analysis {post_id}")
-                break
-                
-            except openai.RateLimitError as e:
-                logger.warning(f"Rate limit error with {current_model} for analysis {post_id}: {e}")
-                if attempt == 0:
-                    continue
-                else:
-                    raise Exception(f"Both models rate limited for analysis: {e}")
-                    
-            except openai.APIError as e:
-                logger.error(f"API error with {current_model} for analysis {post_id}: {e}")
-                if attempt == 0 and "model_not_found" not in str(e).lower():
-                    continue
-                else:
-                    raise Exception(f"API error in analysis: {e}")
-                    
-            except openai.APITimeoutError as e:
-                logger.warning(f"Timeout error with {current_model} for analysis {post_id}: {e}")
-                if attempt == 0:
-                    continue
-                else:
-                    raise Exception(f"Timeout on both models for analysis: {e}")
-                    
-            except openai.APIConnectionError as e:
-                logger.warning(f"Connection error with {current_model} for analysis {post_id}: {e}")
-                if attempt == 0:
-                    continue
-                else:
-                    raise Exception(f"Connection error on both models for analysis: {e}")
-                    
-            except Exception as e:
-                logger.error(f"Unexpected error with {current_model} for analysis {post_id}: {e}")
-                if attempt == 0:
-                    continue
-                else:
-                    raise Exception(f"Both models failed for analysis: {e}")
-        
-        if not response or not model_used:
-            raise Exception("Failed to get response from both models for analysis")
+        # Prepare analysis messages (static prefix first for prompt caching)
+        messages = self._get_pain_points_analysis_prompt(post_title, post_content)
+        
+        response, model_used = self._create_chat_completion(
+            "analysis",
+            post_id,
+            messages=messages,
+            max_tokens=max_tokens,
+            validator_factory=lambda: JSONObjectStreamValidator(
+                max_chars=max_tokens * 4,
+                max_array_items=self.ANALYSIS_ARRAY_LIMITS
+            ),
+            temperature=0.2,
+            response_format={"type": "json_object"}
+        )
         
         # Extract and parse response
         analysis_text = response.choices[0].message.content.strip()
         total_tokens = response.usage.total_tokens
+        cached_tokens = self._get_cached_tokens(response)
         
         # Parse JSON response with schema validation
         try:
@@ -599,10 +745,7 @@ class OpenAIClient:
             analysis_data = self._get_fallback_analysis_schema()
         
         # Calculate cost using internal cost map
-        cost = self._calculate_cost(total_tokens, model_used)
-        
-        # Update token usage tracking
-        self._update_token_usage(total_tokens)
+        cost = self._calculate_cost(total_tokens, model_used, cached_tokens)
         
         logger.info(
             f"Analyzed pain points for post {post_id}",
@@ -610,6 +753,7 @@ class OpenAIClient:
                 "post_id": post_id,
                 "model": model_used,
                 "total_tokens": total_tokens,
+                "cached_tokens": cached_tokens,
                 "cost_usd": float(cost),
                 "pain_points_count": len(analysis_data.get("pain_points", [])),
                 "product_ideas_count": len(analysis_data.get("product_ideas", []))
@@ -620,52 +764,13 @@ class OpenAIClient:
             "analysis": analysis_data,
             "model": model_used,
             "total_tokens": total_tokens,
+            "cached_tokens": cached_tokens,
             "cost_usd": cost
         }
     
-    def _get_pain_points_analysis_prompt(self, title: str, content: str) -> str:
-        """Generate pain points analysis prompt template with JSON schema"""
-        return f"""다음 Reddit 게시글을 분석하여 사용자의 페인 포인트와 잠재적 제품 아이디어를 추출해주세요:
-
-제목: {title}
-
-내용:
-{content}
-
-다음 JSON 스키마에 맞춰 결과를 제공해주세요:
-
-{{
-  "meta": {{
-    "version": "1.0",
-    "analysis_date": "{datetime.utcnow().isoformat()}",
-    "confidence_score": 0.85
-  }},
-  "pain_points": [
-    {{
-      "description": "페인 포인트 설명",
-      "category": "카테고리 (기술적/사용성/비용/시간/기타)",
-      "severity": "심각도 (높음/보통/낮음)",
-      "frequency": "빈도 (자주/가끔/드물게)"
-    }}
-  ],
-  "product_ideas": [
-    {{
-      "title": "제품 아이디어 제목",
-      "description": "제품 아이디어 설명",
-      "target_pain_point": "해결하는 페인 포인트",
-      "feasibility": "실현 가능성 (높음/보통/낮음)",
-      "market_potential": "시장 잠재력 (높음/보통/낮음)"
-    }}
-  ],
-  "analysis_notes": "분석 과정에서의 추가 노트"
-}}
-
-분석 기준:
-1. 명시적으로 언급된 문제점과 불만사항 식별
-2. 암시적으로 드러나는 니즈와 개선점 파악
-3. 실현 가능한 제품/서비스 아이디어 도출
-4. 시장성과 기술적 실현 가능성 고려
-5. meta.version 필드는 반드시 포함"""
+    def _get_pain_points_analysis_prompt(self, title: str, content: str) -> List[Dict[str, str]]:
+        """Generate pain points analysis messages (static JSON schema prefix + post payload)"""
+        return self._build_messages(ANALYSIS_PROMPT_PREFIX, title, content)
     
     def _validate_analysis_schema(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Validate and ensure JSON schema compliance"""
@@ -740,7 +845,10 @@ class OpenAIClient:
                 "daily_token_limit": self._daily_token_limit,
                 "over_limit": is_over_limit,
                 "primary_model": self._primary_model,
-                "fallback_model": self._fallback_model
+                "fallback_model": self._fallback_model,
+                "models": self._router.snapshot(),
+                "backend": self._client.stats(),
+                "rate_limiter": self._rate_limiter.get_usage()
             }
             
         except Exception as e:
@@ -0,0 +1,247 @@
+"""
+Local pre-classifier that gates which posts are sent to OpenAI
+Hashed bag-of-words logistic regression trained on our own posts history
+"""
+import json
+import logging
+import os
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Dict, Any, List, Optional, Sequence
+
+import joblib
+import numpy as np
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import precision_score, recall_score
+from sklearn.model_selection import train_test_split
+
+from app.config import get_settings
+from app.infrastructure import get_database_session
+from app.models.post import Post
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+@dataclass
+class GateResult:
+    """Posts split by pre-classifier score"""
+    process: List[str] = field(default_factory=list)
+    delay: List[str] = field(default_factory=list)
+    skip: List[str] = field(default_factory=list)
+    scores: Dict[str, float] = field(default_factory=dict)
+
+
+class PostPreClassifier:
+    """
+    CPU classifier predicting whether a post is worth the three GPT calls
+    - Features: hashed word 1-2 grams of title/body plus subreddit and
+      score/comment bucket tokens (no vocabulary to persist)
+    - Labels: published = 1; failed, or processed but never published
+      after `pre_classifier_unpublished_days` = 0
+    - Without a trained model every post passes (gating is fail-open)
+    """
+
+    def __init__(self, model_path: Optional[str] = None):
+        self.model_path = model_path or settings.pre_classifier_model_path
+        self.metrics_path = os.path.splitext(self.model_path)[0] + ".metrics.json"
+
+        self.threshold = settings.pre_classifier_threshold
+        self.skip_threshold = settings.pre_classifier_skip_threshold
+
+        self._vectorizer = HashingVectorizer(
+            n_features=2 ** 18,
+            ngram_range=(1, 2),
+            alternate_sign=False,
+            norm="l2"
+        )
+        self._model: Optional[LogisticRegression] = None
+        self._model_mtime: Optional[float] = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _bucket(value: int) -> int:
+        """Log2 bucket so raw score/comment counts become a few tokens"""
+        return int(np.log2(max(value, 0) + 1))
+
+    def _document(self, post: Dict[str, Any]) -> str:
+        """Flatten a post into the text fed to the hashing vectorizer"""
+        body = (post.get("content") or "")[:2000]
+        return " ".join([
+            post.get("title") or "",
+            body,
+            f"__sub_{(post.get('subreddit') or '').lower()}",
+            f"__score_{self._bucket(post.get('score') or 0)}",
+            f"__comments_{self._bucket(post.get('num_comments') or 0)}",
+            "__has_body" if body.strip() else "__no_body"
+        ])
+
+    def _load(self) -> Optional[LogisticRegression]:
+        """Load (or reload after retraining) the model from disk"""
+        try:
+            mtime = os.path.getmtime(self.model_path)
+        except OSError:
+            return None
+
+        with self._lock:
+            if self._model is None or mtime != self._model_mtime:
+                try:
+                    self._model = joblib.load(self.model_path)
+                    self._model_mtime = mtime
+                    logger.info(f"Loaded pre-classifier from {self.model_path}")
+                except Exception as e:
+                    logger.error(f"Failed to load pre-classifier: {e}")
+                    return None
+            return self._model
+
+    def score_batch(self, posts: Sequence[Dict[str, Any]]) -> Optional[np.ndarray]:
+        """
+        Score posts in one vectorized pass
+
+        Returns:
+            Probability that each post gets published, or None if no model is trained
+        """
+        model = self._load()
+        if model is None or not posts:
+            return None
+
+        features = self._vectorizer.transform([self._document(p) for p in posts])
+        return model.predict_proba(features)[:, 1]
+
+    def gate(self, posts: Sequence[Dict[str, Any]]) -> GateResult:
+        """
+        Split posts into process / delay / skip by score
+
+        Args:
+            posts: Dicts with id, title, content, subreddit, score, num_comments
+
+        Returns:
+            GateResult with post ids per decision
+        """
+        result = GateResult()
+        scores = self.score_batch(posts)
+
+        if scores is None:
+            result.process = [str(p["id"]) for p in posts]
+            return result
+
+        for post, score in zip(posts, scores):
+            post_id = str(post["id"])
+            result.scores[post_id] = round(float(score), 4)
+            if score >= self.threshold:
+                result.process.append(post_id)
+            elif score >= self.skip_threshold:
+                result.delay.append(post_id)
+            else:
+                result.skip.append(post_id)
+
+        logger.info(
+            f"Pre-classifier gate: {len(result.process)} process, "
+            f"{len(result.delay)} delay, {len(result.skip)} skip"
+        )
+        return result
+
+    def _load_training_data(self) -> List[Dict[str, Any]]:
+        """Labeled posts from history"""
+        cutoff = datetime.utcnow() - timedelta(days=settings.pre_classifier_unpublished_days)
+
+        session = get_database_session()
+        try:
+            rows = session.query(
+                Post.title, Post.content, Post.subreddit, Post.score,
+                Post.num_comments, Post.status, Post.updated_at
+            ).filter(Post.status.in_(['published', 'failed', 'processed'])).all()
+        finally:
+            session.close()
+
+        samples = []
+        for row in rows:
+            if row.status == 'processed' and row.updated_at and row.updated_at > cutoff:
+                continue  # may still be published
+            sample = dict(row._mapping)
+            sample["label"] = 1 if row.status == 'published' else 0
+            samples.append(sample)
+        return samples
+
+    def train(self, samples: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+        """
+        Train on posts history and report precision/recall on a held-out split
+
+        Args:
+            samples: Optional labeled posts (defaults to the posts table)
+
+        Returns:
+            Dictionary with training status and held-out metrics
+        """
+        samples = samples if samples is not None else self._load_training_data()
+        labels = np.array([s["label"] for s in samples])
+
+        positives = int(labels.sum())
+        negatives = len(labels) - positives
+        if min(positives, negatives) < settings.pre_classifier_min_samples:
+            return {
+                "status": "skipped",
+                # Not "message": callers log results with extra=, which rejects LogRecord attributes
+                "reason": "Not enough labeled posts per class",
+                "positives": positives,
+                "negatives": negatives
+            }
+
+        features = self._vectorizer.transform([self._document(s) for s in samples])
+        x_train, x_test, y_train, y_test = train_test_split(
+            features, labels, test_size=0.2, stratify=labels, random_state=42
+        )
+
+        model = LogisticRegression(max_iter=1000, class_weight="balanced")
+        model.fit(x_train, y_train)
+
+        # Held-out metrics at the configured operating threshold
+        predicted = model.predict_proba(x_test)[:, 1] >= self.threshold
+        metrics = {
+            "trained_at": datetime.utcnow().isoformat(),
+            "threshold": self.threshold,
+            "train_size": int(x_train.shape[0]),
+            "test_size": int(x_test.shape[0]),
+            "positives": positives,
+            "negatives": negatives,
+            "precision": round(float(precision_score(y_test, predicted, zero_division=0)), 4),
+            "recall": round(float(recall_score(y_test, predicted, zero_division=0)), 4),
+            "gated_fraction": round(float(1 - predicted.mean()), 4)
+        }
+
+        # Write to a temp file and swap so workers never load a partial model
+        os.makedirs(os.path.dirname(self.model_path) or ".", exist_ok=True)
+        tmp_path = f"{self.model_path}.tmp"
+        joblib.dump(model, tmp_path)
+        os.replace(tmp_path, self.model_path)
+        with open(self.metrics_path, "w") as f:
+            json.dump(metrics, f, indent=2)
+
+        with self._lock:
+            self._model = model
+            self._model_mtime = os.path.getmtime(self.model_path)
+
+        logger.info(
+            f"Pre-classifier trained: precision={metrics['precision']} "
+            f"recall={metrics['recall']} on {metrics['test_size']} held-out posts"
+        )
+        return {"status": "completed", **metrics}
+
+    def get_metrics(self) -> Optional[Dict[str, Any]]:
+        """Held-out metrics from the last training run"""
+        try:
+            with open(self.metrics_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+
+# Global pre-classifier instance
+pre_classifier = PostPreClassifier()
+
+
+def get_pre_classifier() -> PostPreClassifier:
+    """Get the global pre-classifier instance"""
+    return pre_classifier
@@ -0,0 +1,105 @@
+"""
+Per-post NLP stage checkpoints so retries resume instead of re-paying for OpenAI calls
+"""
+import json
+import logging
+from decimal import Decimal
+from typing import Dict, Any
+
+import redis
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+class StageCheckpointStore:
+    """
+    Redis hash per (post_id, content_hash) holding finished stage results
+    - Fields: summary / tags / analysis (JSON of the OpenAIClient result dict)
+    - Written as soon as a stage returns; cleared after the DB update commits
+    - Keyed by content_hash so edited posts never reuse stale results
+    """
+
+    STAGES = ("summary", "tags", "analysis")
+
+    def __init__(self):
+        self.ttl = settings.nlp_checkpoint_ttl
+        self.key_prefix = "nlp_checkpoint"
+
+        # Initialize Redis connection
+        try:
+            self.redis_client = redis.from_url(settings.redis_url, decode_responses=True)
+            self.redis_client.ping()  # Test connection
+        except Exception as e:
+            logger.error(f"Failed to connect to Redis for NLP checkpoints: {e}")
+            self.redis_client = None
+
+    def _key(self, post_id: str, content_hash: str) -> str:
+        return f"{self.key_prefix}:{post_id}:{content_hash}"
+
+    def load(self, post_id: str, content_hash: str) -> Dict[str, Dict[str, Any]]:
+        """
+        Get finished stage results for a post
+
+        Returns:
+            Mapping of stage name -> result dict (cost_usd restored as Decimal)
+        """
+        if not self.redis_client:
+            return {}
+
+        try:
+            raw = self.redis_client.hgetall(self._key(post_id, content_hash))
+        except redis.RedisError as e:
+            logger.warning(f"Failed to load NLP checkpoints for post {post_id}: {e}")
+            return {}
+
+        results = {}
+        for stage, payload in raw.items():
+            if stage not in self.STAGES:
+                continue
+            try:
+                result = json.loads(payload)
+            except ValueError:
+                continue
+            if "cost_usd" in result:
+                result["cost_usd"] = Decimal(str(result["cost_usd"]))
+            results[stage] = result
+
+        if results:
+            logger.info(f"Resuming post {post_id} with checkpointed stages: {sorted(results)}")
+        return results
+
+    def save(self, post_id: str, content_hash: str, stage: str, result: Dict[str, Any]) -> None:
+        """Checkpoint one finished stage result"""
+        if not self.redis_client:
+            return
+
+        key = self._key(post_id, content_hash)
+        try:
+            pipe = self.redis_client.pipeline(transaction=False)
+            pipe.hset(key, stage, json.dumps(result, default=str, ensure_ascii=False))
+            pipe.expire(key, self.ttl)
+            pipe.execute()
+        except redis.RedisError as e:
+            logger.warning(f"Failed to checkpoint {stage} for post {post_id}: {e}")
+
+    def clear(self, post_id: str, content_hash: str) -> None:
+        """Drop checkpoints once results are stored in the database"""
+        if not self.redis_client:
+            return
+
+        try:
+            self.redis_client.delete(self._key(post_id, content_hash))
+        except redis.RedisError as e:
+            logger.warning(f"Failed to clear NLP checkpoints for post {post_id}: {e}")
+
+
+# Global checkpoint store instance
+stage_checkpoints = StageCheckpointStore()
+
+
+def get_stage_checkpoints() -> StageCheckpointStore:
+    """Get the global NLP stage checkpoint store"""
+    return stage_checkpoints
@@ -0,0 +1,166 @@
+"""
+Incremental validators for streamed OpenAI completions
+Detect invalid or out-of-bounds output while it is still being generated
+"""
+import json
+from typing import Dict, List, Optional
+
+
+class StreamValidationError(Exception):
+    """Streamed output is provably invalid; the generation should be cancelled"""
+
+    # Completion assembled from the output received so far (set by the client)
+    response = None
+
+
+class StreamValidator:
+    """
+    Base validator fed with streamed text deltas
+    - feed() returns True once the output is complete (stop reading early)
+    - feed()/finish() raise StreamValidationError as soon as output is invalid
+    """
+
+    def __init__(self, max_chars: int):
+        self.max_chars = max_chars
+        self._chars = 0
+
+    def feed(self, delta: str) -> bool:
+        """Consume a text delta; True if no further output is needed"""
+        self._chars += len(delta)
+        if self._chars > self.max_chars:
+            raise StreamValidationError(f"Output exceeded {self.max_chars} characters")
+        return False
+
+    def finish(self, text: str) -> None:
+        """Validate the complete output"""
+        pass
+
+
+class JSONObjectStreamValidator(StreamValidator):
+    """
+    Single-pass JSON structure checker for a top-level object
+    - Rejects a non-'{' start, mismatched brackets and trailing content
+    - Bounds the length of selected top-level arrays (e.g. pain_points <= 10)
+    """
+
+    _CLOSERS = {"}": "{", "]": "["}
+
+    def __init__(self, max_chars: int, max_array_items: Optional[Dict[str, int]] = None):
+        super().__init__(max_chars)
+        self.max_array_items = max_array_items or {}
+
+        self._stack: List[str] = []
+        self._in_string = False
+        self._escaped = False
+        self._string_chars: List[str] = []
+        self._last_string: Optional[str] = None
+        self._current_key: Optional[str] = None
+        self._array_key: Optional[str] = None
+        self._array_items = 0
+        self._expect_item = False
+        self._started = False
+        self._closed = False
+
+    def feed(self, delta: str) -> bool:
+        super().feed(delta)
+        for char in delta:
+            self._consume(char)
+        return self._closed
+
+    def _consume(self, char: str) -> None:
+        if self._in_string:
+            if self._escaped:
+                self._escaped = False
+            elif char == "\\":
+                self._escaped = True
+            elif char == '"':
+                self._in_string = False
+                self._last_string = "".join(self._string_chars)
+            else:
+                self._string_chars.append(char)
+            return
+
+        if char.isspace():
+            return
+
+        if self._closed:
+            raise StreamValidationError("Content after the top-level JSON object")
+
+        if not self._started:
+            if char != "{":
+                raise StreamValidationError(f"Expected '{{' at start of output, got {char!r}")
+            self._started = True
+
+        depth = len(self._stack)
+
+        # A new element of a bounded top-level array starts at depth 2
+        if self._array_key and depth == 2 and self._expect_item and char not in "]":
+            self._array_items += 1
+            self._expect_item = False
+            if self._array_items > self.max_array_items[self._array_key]:
+                raise StreamValidationError(
+                    f"'{self._array_key}' exceeds {self.max_array_items[self._array_key]} items"
+                )
+
+        if char == '"':
+            self._in_string = True
+            self._string_chars = []
+        elif char == ":" and depth == 1:
+            self._current_key = self._last_string
+        elif char == "," and depth == 2 and self._array_key:
+            self._expect_item = True
+        elif char in "{[":
+            if char == "[" and depth == 1 and self._current_key in self.max_array_items:
+                self._array_key = self._current_key
+                self._array_items = 0
+                self._expect_item = True
+            self._stack.append(char)
+        elif char in "}]":
+            if not self._stack or self._stack[-1] != self._CLOSERS[char]:
+                raise StreamValidationError(f"Mismatched {char!r} in JSON output")
+            self._stack.pop()
+            if len(self._stack) == 1 and char == "]":
+                self._array_key = None
+            if not self._stack:
+                self._closed = True
+
+    def finish(self, text: str) -> None:
+        if not self._closed:
+            raise StreamValidationError("JSON output ended before the object was closed")
+        try:
+            json.loads(text)
+        except json.JSONDecodeError as e:
+            raise StreamValidationError(f"Invalid JSON output: {e}")
+
+
+class TagListStreamValidator(StreamValidator):
+    """
+    Validator for comma-separated tag output
+    - Stops as soon as max_tags complete tags were received
+    - Rejects prose (a single "tag" longer than max_tag_chars or spanning lines)
+    """
+
+    def __init__(self, max_chars: int, max_tags: int = 5, max_tag_chars: int = 30):
+        super().__init__(max_chars)
+        self.max_tags = max_tags
+        self.max_tag_chars = max_tag_chars
+        self._text: List[str] = []
+
+    def feed(self, delta: str) -> bool:
+        super().feed(delta)
+        self._text.append(delta)
+
+        parts = "".join(self._text).split(",")
+        complete, current = parts[:-1], parts[-1]
+
+        for tag in complete + [current]:
+            if len(tag.strip()) > self.max_tag_chars:
+                raise StreamValidationError(f"Tag longer than {self.max_tag_chars} characters")
+        if "\n" in current.strip():
+            raise StreamValidationError("Tag output spans multiple lines")
+
+        return len([tag for tag in complete if tag.strip()]) >= self.max_tags
+
+    def finish(self, text: str) -> None:
+        if not any(tag.strip() for tag in text.split(",")):
+            raise StreamValidationError("No tags in output")
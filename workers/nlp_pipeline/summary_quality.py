@@ -0,0 +1,164 @@
+"""
+Batch quality scoring for Korean summaries (summary_ko)
+Flags empty, non-Korean, truncated or badly sized summaries for re-summarization
+"""
+import logging
+import os
+import re
+import threading
+from dataclasses import dataclass, field
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# Precompiled character-class scans (one C-level pass per summary each)
+HANGUL_RE = re.compile(r"[가-힣ᄀ-ᇿ㄰-㆏]")
+LETTER_RE = re.compile(r"[^\W\d_]")
+SENTENCE_END_RE = re.compile(r"[.!?。]+(?=\s|$)")
+COMPLETE_ENDING_RE = re.compile(r"(?:[.!?。…\"'”’)」』\]]|[다요음함임됨])\s*$")
+
+LANGID_LABEL_PREFIX = "__label__"
+
+
+@dataclass
+class SummaryQualityReport:
+    """Per-summary scores and the reasons each flagged summary failed"""
+    scores: np.ndarray
+    flagged: np.ndarray
+    reasons: List[List[str]] = field(default_factory=list)
+
+    @property
+    def flagged_indices(self) -> List[int]:
+        return [int(i) for i in np.flatnonzero(self.flagged)]
+
+
+class _FastTextLanguageID:
+    """Lazily loaded fastText language-ID model (lid.176.ftz); optional"""
+
+    def __init__(self, model_path: str):
+        self.model_path = model_path
+        self._model = None
+        self._unavailable = False
+        self._lock = threading.Lock()
+
+    def _load(self):
+        with self._lock:
+            if self._model is None and not self._unavailable:
+                try:
+                    import fasttext
+                except ImportError:
+                    logger.info("fasttext not installed; summary language ID disabled")
+                    self._unavailable = True
+                    return None
+                if not os.path.exists(self.model_path):
+                    logger.info(f"Language ID model not found at {self.model_path}; summary language ID disabled")
+                    self._unavailable = True
+                    return None
+                self._model = fasttext.load_model(self.model_path)
+            return self._model
+
+    def predict(self, texts: Sequence[str]) -> Optional[Tuple[List[str], np.ndarray]]:
+        """
+        Top language per text in one batched call
+
+        Returns:
+            (language codes, confidences), or None if no model is available
+        """
+        model = self._load()
+        if model is None:
+            return None
+        labels, probs = model.predict([text.replace("\n", " ") for text in texts], k=1)
+        languages = [label[0][len(LANGID_LABEL_PREFIX):] if label else "" for label in labels]
+        return languages, np.array([p[0] if len(p) else 0.0 for p in probs], dtype=float)
+
+
+class SummaryQualityScorer:
+    """
+    Vectorized validator for batches of Korean summaries
+    - Hangul ratio: Hangul characters / all letters (English terms are allowed)
+    - Length bounds in characters and sentence-count bounds
+    - Truncation: text does not end in a sentence terminator or Korean ending
+    - Language ID (when a local fastText model is present): top language must be Korean
+    """
+
+    def __init__(self, langid_model_path: Optional[str] = None):
+        self.min_chars = settings.summary_min_chars
+        self.max_chars = settings.summary_max_chars
+        self.min_hangul_ratio = settings.summary_min_hangul_ratio
+        self.min_sentences = settings.summary_min_sentences
+        self.max_sentences = settings.summary_max_sentences
+        self.langid_min_confidence = settings.summary_langid_min_confidence
+        self._langid = _FastTextLanguageID(langid_model_path or settings.summary_langid_model_path)
+
+    @staticmethod
+    def _features(summaries: Sequence[str]) -> Tuple[np.ndarray, ...]:
+        """Raw counts per summary (lengths, Hangul, letters, sentences, complete ending)"""
+        texts = [(s or "").strip() for s in summaries]
+        lengths = np.fromiter((len(t) for t in texts), dtype=np.int64, count=len(texts))
+        hangul = np.fromiter((len(HANGUL_RE.findall(t)) for t in texts), dtype=np.int64, count=len(texts))
+        letters = np.fromiter((len(LETTER_RE.findall(t)) for t in texts), dtype=np.int64, count=len(texts))
+        sentences = np.fromiter((len(SENTENCE_END_RE.findall(t)) for t in texts), dtype=np.int64, count=len(texts))
+        complete = np.fromiter((bool(COMPLETE_ENDING_RE.search(t)) for t in texts), dtype=bool, count=len(texts))
+        # A trailing sentence without punctuation still counts as a sentence
+        unterminated = np.fromiter((bool(t) and t[-1] not in ".!?。" for t in texts), dtype=bool, count=len(texts))
+        sentences = sentences + unterminated
+        return lengths, hangul, letters, sentences, complete
+
+    def score(self, summaries: Sequence[str]) -> SummaryQualityReport:
+        """
+        Score a batch of summaries
+
+        Args:
+            summaries: summary_ko values (None/empty allowed)
+
+        Returns:
+            SummaryQualityReport with a 0-1 score per summary and flags
+        """
+        if not summaries:
+            return SummaryQualityReport(scores=np.array([]), flagged=np.array([], dtype=bool))
+
+        lengths, hangul, letters, sentences, complete = self._features(summaries)
+        hangul_ratio = np.divide(hangul, letters, out=np.zeros(len(lengths)), where=letters > 0)
+
+        checks = {
+            "empty": lengths == 0,
+            "not_korean": hangul_ratio < self.min_hangul_ratio,
+            "too_short": (lengths > 0) & (lengths < self.min_chars),
+            "too_long": lengths > self.max_chars,
+            "sentence_count": (sentences < self.min_sentences) | (sentences > self.max_sentences),
+            "truncated": (lengths > 0) & ~complete
+        }
+
+        prediction = self._langid.predict([s or "" for s in summaries])
+        if prediction is not None:
+            languages, confidences = prediction
+            is_korean = np.array([language == "ko" for language in languages])
+            checks["langid"] = (lengths > 0) & ~is_korean & (confidences >= self.langid_min_confidence)
+
+        failures = np.vstack(list(checks.values()))
+        flagged = failures.any(axis=0)
+
+        # Soft score for reporting: Hangul ratio weighted by passed checks
+        scores = np.round(np.clip(hangul_ratio, 0, 1) * (1 - failures.mean(axis=0)), 4)
+        scores[checks["empty"]] = 0.0
+
+        names = list(checks)
+        reasons = [
+            [names[row] for row in np.flatnonzero(failures[:, column])]
+            for column in range(failures.shape[1])
+        ]
+        return SummaryQualityReport(scores=scores, flagged=flagged, reasons=reasons)
+
+
+# Global scorer instance
+summary_quality_scorer = SummaryQualityScorer()
+
+
+def get_summary_quality_scorer() -> SummaryQualityScorer:
+    """Get the global summary quality scorer"""
+    return summary_quality_scorer
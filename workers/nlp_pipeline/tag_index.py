@@ -0,0 +1,167 @@
+"""
+Embedding-based tag vocabulary index for mapping keywords to Ghost tags
+"""
+import logging
+import threading
+from typing import Dict, Any, List, Optional
+
+import numpy as np
+import redis
+
+from app.config import get_settings
+from .embedding_service import get_embedding_service
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+class TagVocabularyIndex:
+    """
+    Pre-embedded canonical tag names stored as a row-normalized matrix
+    - Keyword -> tag mapping is one matrix multiply plus top-k per keyword
+    - Vocabulary = built-in canonical tags + Ghost tags published by
+      the publisher's GhostTagIndex on sync and tag creation (Redis set + version counter)
+    - Rebuilt only when the published vocabulary version changes
+    """
+
+    # Redis keys written by the publisher when Ghost tags are synced or created
+    # (TAG_VOCABULARY_KEY / TAG_VOCABULARY_VERSION_KEY in workers.publisher.ghost_tag_index)
+    VOCABULARY_KEY = "ghost:tag_vocabulary"
+    VERSION_KEY = "ghost:tag_vocabulary:version"
+
+    # Canonical tags available before any Ghost tags are synced
+    DEFAULT_TAGS = [
+        "Artificial Intelligence", "Machine Learning", "Python", "JavaScript", "React",
+        "API", "Database", "Cloud Computing", "AWS", "Docker",
+        "Startup", "Business", "Marketing", "Product Management", "SaaS", "Revenue", "Growth",
+        "Programming", "Software Development", "Software", "Web Development", "Mobile Development",
+        "Problem Solving", "Solutions", "Tools", "Productivity", "Automation"
+    ]
+
+    def __init__(
+        self,
+        similarity_threshold: Optional[float] = None,
+        top_k: Optional[int] = None
+    ):
+        self.similarity_threshold = (
+            similarity_threshold if similarity_threshold is not None
+            else settings.tag_similarity_threshold
+        )
+        self.top_k = top_k or settings.tag_mapping_top_k
+
+        self._embedding_service = get_embedding_service()
+        self._tag_names: List[str] = []
+        self._matrix: Optional[np.ndarray] = None
+        self._version: Optional[str] = None
+        self._lock = threading.Lock()
+
+        # Initialize Redis connection
+        try:
+            self.redis_client = redis.from_url(settings.redis_url, decode_responses=True)
+            self.redis_client.ping()  # Test connection
+        except Exception as e:
+            logger.error(f"Failed to connect to Redis for tag vocabulary: {e}")
+            self.redis_client = None
+
+    @staticmethod
+    def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+        """L2-normalize rows so dot products are cosine similarities"""
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        return matrix / np.clip(norms, 1e-12, None)
+
+    def _get_published_version(self) -> Optional[str]:
+        """Get the vocabulary version published by the metadata processor"""
+        if not self.redis_client:
+            return None
+        try:
+            return self.redis_client.get(self.VERSION_KEY)
+        except redis.RedisError as e:
+            logger.warning(f"Failed to read tag vocabulary version: {e}")
+            return self._version
+
+    def _load_vocabulary(self) -> List[str]:
+        """Merge built-in canonical tags with published Ghost tags (case-insensitive)"""
+        names = {tag.lower(): tag for tag in self.DEFAULT_TAGS}
+
+        if self.redis_client:
+            try:
+                for tag in self.redis_client.smembers(self.VOCABULARY_KEY):
+                    names.setdefault(tag.lower(), tag)
+            except redis.RedisError as e:
+                logger.warning(f"Failed to load Ghost tag vocabulary: {e}")
+
+        return sorted(names.values())
+
+    def refresh(self, force: bool = False) -> bool:
+        """
+        Rebuild the tag matrix if the published vocabulary changed
+
+        Returns:
+            True if the index was rebuilt
+        """
+        version = self._get_published_version()
+
+        with self._lock:
+            if not force and self._matrix is not None and version == self._version:
+                return False
+
+            tag_names = self._load_vocabulary()
+            self._matrix = self._normalize_rows(self._embedding_service.embed(tag_names))
+            self._tag_names = tag_names
+            self._version = version
+
+        logger.info(f"Tag vocabulary index built with {len(tag_names)} tags (version {version})")
+        return True
+
+    def map_keywords(self, keywords: List[str], max_tags: int = 5) -> List[str]:
+        """
+        Map keywords to the most similar canonical tags
+
+        Args:
+            keywords: Keywords from topic extraction
+            max_tags: Maximum number of tags to return
+
+        Returns:
+            Tag names ordered by best similarity, above the threshold
+        """
+        keywords = [kw.strip() for kw in keywords if kw and kw.strip()]
+        if not keywords:
+            return []
+
+        self.refresh()
+        with self._lock:
+            matrix, tag_names = self._matrix, self._tag_names
+
+        # (keywords x tags) cosine similarity in one batched multiply
+        similarities = self._normalize_rows(self._embedding_service.embed(keywords)) @ matrix.T
+
+        # Top-k tags per keyword, then best score per tag across keywords
+        k = min(self.top_k, len(tag_names))
+        top_idx = np.argpartition(-similarities, k - 1, axis=1)[:, :k]
+        best_scores: Dict[int, float] = {}
+        for row, cols in enumerate(top_idx):
+            for col in cols:
+                score = float(similarities[row, col])
+                if score >= self.similarity_threshold and score > best_scores.get(col, -1.0):
+                    best_scores[col] = score
+
+        ranked = sorted(best_scores.items(), key=lambda item: item[1], reverse=True)
+        return [tag_names[col] for col, _ in ranked[:max_tags]]
+
+    def stats(self) -> Dict[str, Any]:
+        """Get index statistics for health checks"""
+        return {
+            "tags_indexed": len(self._tag_names),
+            "version": self._version,
+            "similarity_threshold": self.similarity_threshold,
+            "top_k": self.top_k
+        }
+
+
+# Global tag index instance
+tag_index = TagVocabularyIndex()
+
+
+def get_tag_index() -> TagVocabularyIndex:
+    """Get the global tag vocabulary index"""
+    return tag_index
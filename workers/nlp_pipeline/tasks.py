@@ -2,21 +2,28 @@
 Celery tasks for NLP pipeline processing (MVP simplified)
 """
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Tuple
 from datetime import datetime
+from decimal import Decimal
 import hashlib
 import json
+from uuid import UUID
 
 from celery import Task
+from celery.signals import worker_process_shutdown
+from sqlalchemy import tuple_
 from sqlalchemy.orm import Session
 
 from app.celery_app import celery_app
 from app.config import get_settings
-from app.infrastructure import get_database_session
+from app.infrastructure import get_database_session, get_db_session
 from app.models.post import Post
 from app.models.processing_log import ProcessingLog
 from app.transaction_manager import transaction_with_tracking, get_state_manager
 from .openai_client import get_openai_client
+from .pre_classifier import GateResult, get_pre_classifier
+from .stage_checkpoints import get_stage_checkpoints
+from .token_ledger import get_token_ledger
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
@@ -28,6 +35,14 @@ BACKOFF_MIN = 2  # seconds
 BACKOFF_MAX = 8  # seconds
 
 
+@worker_process_shutdown.connect
+def flush_token_ledger(**kwargs) -> None:
+    """Flush buffered token usage records before the worker process exits"""
+    written = get_token_ledger().shutdown()
+    if written:
+        logger.info(f"Flushed {written} token usage records on worker shutdown")
+
+
 class NLPTask(Task):
     """Base task class for NLP processing with simplified error handling"""
     
@@ -58,6 +73,159 @@ class NLPTask(Task):
         logger.info(f"NLP task {self.name} completed successfully for post {post_id}")
 
 
+def _compute_content_hash(post: Post) -> str:
+    """Generate content_hash = sha256(title+body+media_urls)"""
+    media_urls = json.dumps(post.media_urls or [], sort_keys=True) if hasattr(post, 'media_urls') else ""
+    content_for_hash = f"{post.title}{post.content}{media_urls}"
+    return hashlib.sha256(content_for_hash.encode('utf-8')).hexdigest()
+
+
+def _gate_input(post) -> Dict[str, Any]:
+    """Fields the pre-classifier scores a post on"""
+    return {
+        "id": str(post.id),
+        "title": post.title,
+        "content": post.content or "",
+        "subreddit": post.subreddit,
+        "score": post.score,
+        "num_comments": post.num_comments
+    }
+
+
+def _mark_skipped(session: Session, post_ids: list, scores: Dict[str, float]) -> None:
+    """Mark posts the pre-classifier rejected as skipped in one UPDATE, with processing logs (caller commits)"""
+    session.query(Post).filter(Post.id.in_(post_ids)).update(
+        {Post.status: 'skipped', Post.updated_at: datetime.utcnow()},
+        synchronize_session=False
+    )
+    session.add_all([
+        ProcessingLog(
+            post_id=post_id,
+            service_name='nlp_pipeline',
+            status='skipped',
+            error_message=f"Skipped by pre-classifier (score {scores.get(str(post_id))})"
+        )
+        for post_id in post_ids
+    ])
+
+
+def gate_posts(post_ids: list) -> GateResult:
+    """
+    Score candidate posts with the pre-classifier before they are enqueued
+    
+    Rejected posts are marked skipped here; callers enqueue only
+    gate.process (now) and gate.delay (after PRE_CLASSIFIER_DELAY_SECONDS).
+    With the pre-classifier disabled every post is returned in gate.process.
+    """
+    if not settings.pre_classifier_enabled:
+        return GateResult(process=[str(post_id) for post_id in post_ids])
+    
+    session = get_database_session()
+    try:
+        rows = session.query(
+            Post.id, Post.title, Post.content, Post.subreddit, Post.score, Post.num_comments
+        ).filter(Post.id.in_(post_ids)).all()
+        gate = get_pre_classifier().gate([_gate_input(row) for row in rows])
+        
+        if gate.skip:
+            skipped = set(gate.skip)
+            _mark_skipped(session, [row.id for row in rows if str(row.id) in skipped], gate.scores)
+            session.commit()
+    finally:
+        session.close()
+    
+    logger.info(
+        f"Pre-classifier gated {len(post_ids)} posts: {len(gate.process)} queued, "
+        f"{len(gate.delay)} delayed, {len(gate.skip)} skipped"
+    )
+    return gate
+
+
+def _store_ai_results(
+    post_id: str,
+    summary_result: Dict[str, Any],
+    tags_result: Dict[str, Any],
+    analysis_result: Dict[str, Any],
+    pain_points: list,
+    product_ideas: list,
+    processing_time_ms: int,
+    operation_name: str
+) -> Tuple[int, Decimal]:
+    """
+    Store AI results on the post with a processing log in one tracked transaction
+    
+    Returns:
+        Tuple of (total_tokens, total_cost) across the three calls
+    """
+    with transaction_with_tracking(
+        post_id=post_id,
+        service_name="nlp_pipeline", 
+        operation_name=operation_name
+    ) as (session, tracker):
+        
+        state_manager = get_state_manager(session, tracker)
+        
+        post = session.query(Post).filter(Post.id == post_id).first()
+        if not post:
+            raise ValueError(f"Post {post_id} not found during update")
+        
+        # Capture old state for rollback tracking
+        old_state = {
+            'summary_ko': post.summary_ko,
+            'tags': post.tags,
+            'pain_points': post.pain_points,
+            'product_ideas': post.product_ideas,
+            'status': post.status,
+            'updated_at': post.updated_at
+        }
+        
+        # Update post with AI results
+        post.summary_ko = summary_result.get('summary')
+        post.tags = tags_result.get('tags')
+        post.pain_points = pain_points
+        post.product_ideas = product_ideas
+        post.status = 'processed'
+        post.updated_at = datetime.utcnow()
+        
+        # Track the update
+        state_manager.update_entity(post, "post", post_id, old_state)
+        
+        # Calculate totals for logging
+        total_tokens = (summary_result.get('total_tokens', 0) + 
+                       tags_result.get('total_tokens', 0) + 
+                       analysis_result.get('total_tokens', 0))
+        total_cost = (summary_result.get('cost_usd', 0) + 
+                     tags_result.get('cost_usd', 0) + 
+                     analysis_result.get('cost_usd', 0))
+        
+        # Add processing log
+        processing_log = ProcessingLog(
+            post_id=post_id,
+            service_name='nlp_pipeline',
+            status='success',
+            processing_time_ms=processing_time_ms,
+            metadata={
+                'total_tokens': total_tokens,
+                'total_cost': float(total_cost),
+                'models_used': {
+                    'summary': summary_result.get('model'),
+                    'tags': tags_result.get('model'),
+                    'analysis': analysis_result.get('model')
+                }
+            }
+        )
+        
+        state_manager.create_entity(processing_log, "processing_log", f"nlp_{post_id}")
+        
+        # Check consistency before commit
+        consistency_result = state_manager.check_consistency()
+        if consistency_result.get("status") != "passed":
+            logger.error(f"Consistency check failed for post {post_id}: {consistency_result}")
+            raise Exception(f"Consistency check failed: {consistency_result}")
+    
+    return total_tokens, total_cost
+
+
 @celery_app.task(
     bind=True,
     base=NLPTask,
@@ -69,7 +237,7 @@ def process_content_with_ai(self, post_id: str) -> Dict[str, Any]:
     Main Celery task for processing Reddit post content with AI (동기 I/O)
     
     Args:
-        post_id: ID of the post to process
+        post_id: ID of the post to process (gated by the caller, see gate_posts)
     
     Returns:
         Dictionary with processing results
@@ -86,10 +254,7 @@ def process_content_with_ai(self, post_id: str) -> Dict[str, Any]:
             if not post:
                 raise ValueError(f"Post {post_id} not found in database")
             
-            # Generate content_hash = sha256(title+body+media_urls)
-            media_urls = json.dumps(post.media_urls or [], sort_keys=True) if hasattr(post, 'media_urls') else ""
-            content_for_hash = f"{post.title}{post.content}{media_urls}"
-            content_hash = hashlib.sha256(content_for_hash.encode('utf-8')).hexdigest()
+            content_hash = _compute_content_hash(post)
             
             # Update post with content_hash and status
             post.content_hash = content_hash
@@ -103,87 +268,40 @@ def process_content_with_ai(self, post_id: str) -> Dict[str, Any]:
         if not openai_client._client:
             openai_client.initialize()
         
-        # Process with AI (Korean summary, tags, analysis)
-        summary_result = openai_client.generate_korean_summary(
-            post.title, post.content, post_id
-        )
+        # Process with AI (Korean summary, tags, analysis), resuming from checkpoints
+        checkpoints = get_stage_checkpoints()
+        stage_results = checkpoints.load(post_id, content_hash)
+        resumed_stages = sorted(stage_results)
         
-        tags_result = openai_client.extract_tags_llm(
-            post.title, post.content, post_id
-        )
+        stage_calls = {
+            "summary": openai_client.generate_korean_summary,
+            "tags": openai_client.extract_tags_llm,
+            "analysis": openai_client.analyze_pain_points_and_ideas
+        }
+        for stage, call in stage_calls.items():
+            if stage in stage_results:
+                continue
+            stage_results[stage] = call(post.title, post.content, post_id)
+            checkpoints.save(post_id, content_hash, stage, stage_results[stage])
         
-        analysis_result = openai_client.analyze_pain_points_and_ideas(
-            post.title, post.content, post_id
-        )
+        summary_result = stage_results["summary"]
+        tags_result = stage_results["tags"]
+        analysis_result = stage_results["analysis"]
         
         # Update database with results using transaction management
         processing_time_ms = int((datetime.utcnow() - start_time).total_seconds() * 1000)
         
-        with transaction_with_tracking(
-            post_id=post_id,
-            service_name="nlp_pipeline", 
+        total_tokens, total_cost = _store_ai_results(
+            post_id,
+            summary_result,
+            tags_result,
+            analysis_result,
+            pain_points=analysis_result.get('analysis', {}).get('pain_points', []),
+            product_ideas=analysis_result.get('analysis', {}).get('product_ideas', []),
+            processing_time_ms=processing_time_ms,
             operation_name="process_content_with_ai"
-        ) as (session, tracker):
-            
-            state_manager = get_state_manager(session, tracker)
-            
-            post = session.query(Post).filter(Post.id == post_id).first()
-            if not post:
-                raise ValueError(f"Post {post_id} not found during update")
-            
-            # Capture old state for rollback tracking
-            old_state = {
-                'summary_ko': post.summary_ko,
-                'tags': post.tags,
-                'pain_points': post.pain_points,
-                'product_ideas': post.product_ideas,
-                'status': post.status,
-                'updated_at': post.updated_at
-            }
-            
-            # Update post with AI results
-            post.summary_ko = summary_result.get('summary')
-            post.tags = tags_result.get('tags')
-            post.pain_points = analysis_result.get('analysis', {}).get('pain_points', [])
-            post.product_ideas = analysis_result.get('analysis', {}).get('product_ideas', [])
-            post.status = 'processed'
-            post.updated_at = datetime.utcnow()
-            
-            # Track the update
-            state_manager.update_entity(post, "post", post_id, old_state)
-            
-            # Calculate totals for logging
-            total_tokens = (summary_result.get('total_tokens', 0) + 
-                           tags_result.get('total_tokens', 0) + 
-                           analysis_result.get('total_tokens', 0))
-            total_cost = (summary_result.get('cost_usd', 0) + 
-                         tags_result.get('cost_usd', 0) + 
-                         analysis_result.get('cost_usd', 0))
-            
-            # Add processing log
-            processing_log = ProcessingLog(
-                post_id=post_id,
-                service_name='nlp_pipeline',
-                status='success',
-                processing_time_ms=processing_time_ms,
-                metadata={
-                    'total_tokens': total_tokens,
-                    'total_cost': float(total_cost),
-                    'models_used': {
-                        'summary': summary_result.get('model'),
-                        'tags': tags_result.get('model'),
-                        'analysis': analysis_result.get('model')
-                    }
-                }
-            )
-            
-            state_manager.create_entity(processing_log, "processing_log", f"nlp_{post_id}")
-            
-            # Check consistency before commit
-            consistency_result = state_manager.check_consistency()
-            if consistency_result.get("status") != "passed":
-                logger.error(f"Consistency check failed for post {post_id}: {consistency_result}")
-                raise Exception(f"Consistency check failed: {consistency_result}")
+        )
+        checkpoints.clear(post_id, content_hash)
         
         # Totals already calculated above for logging
         
@@ -194,7 +312,8 @@ def process_content_with_ai(self, post_id: str) -> Dict[str, Any]:
                 "processing_time_ms": processing_time_ms,
                 "total_tokens": total_tokens,
                 "total_cost": float(total_cost),
-                "content_hash": content_hash
+                "content_hash": content_hash,
+                "resumed_stages": resumed_stages
             }
         )
         
@@ -204,7 +323,8 @@ def process_content_with_ai(self, post_id: str) -> Dict[str, Any]:
             "processing_time_ms": processing_time_ms,
             "total_tokens": total_tokens,
             "total_cost": float(total_cost),
-            "content_hash": content_hash
+            "content_hash": content_hash,
+            "resumed_stages": resumed_stages
         }
         
     except Exception as e:
@@ -259,9 +379,16 @@ def process_content_with_ai(self, post_id: str) -> Dict[str, Any]:
 
 
 # Utility functions for manual task triggering
-def trigger_post_processing(post_id: str) -> str:
-    """Trigger processing for a specific post"""
-    task = process_content_with_ai.delay(post_id)
+def trigger_post_processing(post_id: str) -> Optional[str]:
+    """Trigger processing for a specific post unless the pre-classifier skips it"""
+    gate = gate_posts([post_id])
+    if gate.process:
+        task = process_content_with_ai.delay(post_id)
+    elif gate.delay:
+        # Low-confidence posts run later, behind higher scorers
+        task = process_content_with_ai.apply_async(args=[post_id], countdown=settings.pre_classifier_delay_seconds)
+    else:
+        return None
     return task.id
 
 
@@ -291,31 +418,96 @@ def get_nlp_task_status(task_id: str) -> Dict[str, Any]:
 )
 def batch_process_posts(self, post_ids: list) -> Dict[str, Any]:
     """
-    Batch process multiple posts with AI
+    Batch process multiple posts with AI in one worker
+    
+    Posts run concurrently through the analysis engine (thread pool with an
+    adaptive concurrency limit); posts that fail are re-queued individually
+    so they keep the per-post retry policy.
     
     Args:
-        post_ids: List of post IDs to process
+        post_ids: List of post IDs to process (gated by the caller, see gate_posts)
     
     Returns:
         Dictionary with batch processing results
     """
+    import asyncio
+    from app.redis_client import init_redis, close_redis
+    from .analysis_engine import get_analysis_engine
+    
     try:
         logger.info(f"Starting batch processing for {len(post_ids)} posts")
+        start_time = datetime.utcnow()
+        
+        session = get_database_session()
+        try:
+            posts = session.query(Post).filter(Post.id.in_(post_ids)).all()
+            to_process = [_gate_input(post) for post in posts]
+            content_hashes = {}
+            for post in posts:
+                post.content_hash = content_hashes[str(post.id)] = _compute_content_hash(post)
+                post.status = 'processing'
+            session.commit()
+        finally:
+            session.close()
+        
+        # Resume from stage checkpoints; checkpoint new stage results as they arrive
+        checkpoints = get_stage_checkpoints()
+        for post_data in to_process:
+            post_data["completed"] = checkpoints.load(post_data["id"], content_hashes[post_data["id"]])
+        
+        def _checkpoint(post_id: str, stage: str, result: Dict[str, Any]) -> None:
+            checkpoints.save(post_id, content_hashes[post_id], stage, result)
+        
+        async def _process_batch() -> list:
+            await init_redis()
+            try:
+                return await get_analysis_engine().process_posts(to_process, on_stage_complete=_checkpoint)
+            finally:
+                await close_redis()
+        
+        engine_results = {r["post_id"]: r for r in asyncio.run(_process_batch())} if to_process else {}
+        processing_time_ms = int((datetime.utcnow() - start_time).total_seconds() * 1000)
         
         results = []
-        for post_id in post_ids:
+        for post_id in map(str, post_ids):
             try:
-                result = process_content_with_ai.delay(post_id)
+                engine_result = engine_results.get(post_id)
+                if engine_result is None:
+                    raise ValueError(f"Post {post_id} not found in database")
+                
+                if "error" in engine_result:
+                    # Fall back to the single-post task; it resumes from the checkpointed stages
+                    task = process_content_with_ai.delay(post_id)
+                    results.append({
+                        "post_id": post_id,
+                        "task_id": task.id,
+                        "status": "requeued",
+                        "error": engine_result["error"]
+                    })
+                    continue
+                
+                analysis = engine_result["analysis"]
+                total_tokens, total_cost = _store_ai_results(
+                    post_id,
+                    engine_result["summary"],
+                    engine_result["tags"],
+                    engine_result["analysis_response"],
+                    pain_points=[pp.to_dict() for pp in analysis.pain_points],
+                    product_ideas=[pi.to_dict() for pi in analysis.product_ideas],
+                    processing_time_ms=processing_time_ms,
+                    operation_name="batch_process_posts"
+                )
+                checkpoints.clear(post_id, content_hashes[post_id])
                 results.append({
                     "post_id": post_id,
-                    "task_id": result.id,
-                    "status": "queued"
+                    "status": "completed",
+                    "total_tokens": total_tokens,
+                    "total_cost": float(total_cost)
                 })
             except Exception as e:
-                logger.error(f"Failed to queue processing for post {post_id}: {e}")
+                logger.error(f"Failed to process post {post_id} in batch: {e}")
                 results.append({
                     "post_id": post_id,
-                    "task_id": None,
                     "status": "failed",
                     "error": str(e)
                 })
@@ -323,8 +515,10 @@ def batch_process_posts(self, post_ids: list) -> Dict[str, Any]:
         return {
             "batch_id": self.request.id,
             "total_posts": len(post_ids),
-            "queued_posts": len([r for r in results if r["status"] == "queued"]),
+            "completed_posts": len([r for r in results if r["status"] == "completed"]),
+            "requeued_posts": len([r for r in results if r["status"] == "requeued"]),
             "failed_posts": len([r for r in results if r["status"] == "failed"]),
+            "processing_time_ms": processing_time_ms,
             "results": results
         }
         
@@ -356,6 +550,243 @@ def train_bertopic_model(self, documents: list) -> Dict[str, Any]:
     }
 
 
+@celery_app.task(
+    bind=True,
+    base=NLPTask,
+    queue='process'
+)
+def update_topic_model_incremental(self, max_documents: int = 1000) -> Dict[str, Any]:
+    """
+    Incrementally update the BERTopic model with posts processed since the last run
+    
+    Args:
+        max_documents: Maximum number of new posts per partial fit
+    
+    Returns:
+        Dictionary with update results
+    """
+    if not settings.bertopic_incremental_enabled:
+        return {"status": "skipped", "message": "Incremental topic updates disabled"}
+    
+    import asyncio
+    import redis
+    from app.redis_client import init_redis, close_redis
+    from .bertopic_client import get_bertopic_client
+    
+    watermark_key = "bertopic:incremental_watermark"
+    redis_sync = redis.from_url(settings.redis_url, decode_responses=True)
+    watermark = redis_sync.get(watermark_key)
+    since = datetime.fromisoformat(watermark) if watermark else datetime.min
+    
+    # Fetch newly processed posts in update order
+    session = get_database_session()
+    try:
+        rows = session.query(Post.id, Post.title, Post.content, Post.updated_at).filter(
+            Post.status.in_(['processed', 'published']),
+            Post.updated_at > since
+        ).order_by(Post.updated_at).limit(max_documents).all()
+    finally:
+        session.close()
+    
+    posts = [(str(row.id), f"{row.title}\n{row.content or ''}") for row in rows]
+    
+    async def _partial_train() -> Dict[str, Any]:
+        await init_redis()
+        try:
+            return await get_bertopic_client().partial_train(posts)
+        finally:
+            await close_redis()
+    
+    result = asyncio.run(_partial_train())
+    
+    # Advance the watermark only when the batch was actually learned
+    if result.get("status") == "completed":
+        redis_sync.set(watermark_key, json.dumps({"updated_at": rows[-1].updated_at.isoformat(), "id": str(rows[-1].id)}))
+    
+    logger.info(f"Incremental topic update finished: {result.get('status')}", extra=result)
+    return result
+
+
+@celery_app.task(
+    bind=True,
+    base=NLPTask,
+    queue='process'
+)
+def train_pre_classifier(self) -> Dict[str, Any]:
+    """
+    Retrain the local pre-classifier from posts history
+    
+    Returns:
+        Dictionary with training status and held-out precision/recall
+    """
+    if not settings.pre_classifier_enabled:
+        return {"status": "skipped", "message": "Pre-classifier disabled"}
+    
+    result = get_pre_classifier().train()
+    logger.info(f"Pre-classifier training finished: {result.get('status')}", extra=result)
+    return result
+
+
+@celery_app.task(
+    bind=True,
+    base=NLPTask,
+    queue='process'
+)
+def check_summary_quality(self, batch_size: int = None) -> Dict[str, Any]:
+    """
+    Score summaries of processed (not yet published) posts in bulk and send
+    low-quality ones back for re-summarization
+    
+    Runs on a schedule so the publish path never pays for the check. Posts
+    are scanned in (updated_at, id) order from a keyset watermark, so rows
+    sharing a timestamp at the batch boundary are picked up by the next run;
+    re-summarized posts are updated and therefore re-checked.
+    
+    Args:
+        batch_size: Maximum posts scored per run
+    
+    Returns:
+        Dictionary with checked/flagged counts and failure reasons
+    """
+    if not settings.summary_quality_enabled:
+        return {"status": "skipped", "message": "Summary quality checks disabled"}
+    
+    import redis
+    from collections import Counter
+    from .summary_quality import get_summary_quality_scorer
+    
+    batch_size = batch_size or settings.summary_quality_batch_size
+    watermark_key = "summary_quality:watermark"
+    attempts_key = "summary_quality:resummarize_attempts"
+    redis_sync = redis.from_url(settings.redis_url, decode_responses=True)
+    watermark = json.loads(redis_sync.get(watermark_key) or "null")
+    since = (
+        (datetime.fromisoformat(watermark["updated_at"]), UUID(watermark["id"]))
+        if watermark else (datetime.min, UUID(int=0))
+    )
+    
+    session = get_database_session()
+    try:
+        rows = session.query(Post.id, Post.summary_ko, Post.updated_at).filter(
+            Post.status == 'processed',
+            tuple_(Post.updated_at, Post.id) > since
+        ).order_by(Post.updated_at, Post.id).limit(batch_size).all()
+    finally:
+        session.close()
+    
+    if not rows:
+        return {"status": "completed", "checked": 0, "flagged": 0}
+    
+    report = get_summary_quality_scorer().score([row.summary_ko for row in rows])
+    flagged = [rows[i] for i in report.flagged_indices]
+    reasons = Counter(reason for i in report.flagged_indices for reason in report.reasons[i])
+    
+    # Bound re-summarization per post; give up (failed) after the max attempts
+    resummarize_ids, give_up_ids = [], []
+    if flagged:
+        flagged_ids = [str(row.id) for row in flagged]
+        attempts = redis_sync.hmget(attempts_key, flagged_ids)
+        for post_id, count in zip(flagged_ids, attempts):
+            if int(count or 0) >= settings.summary_max_resummarize:
+                give_up_ids.append(post_id)
+            else:
+                resummarize_ids.append(post_id)
+        
+        pipe = redis_sync.pipeline(transaction=False)
+        for post_id in resummarize_ids:
+            pipe.hincrby(attempts_key, post_id, 1)
+        pipe.expire(attempts_key, 7 * 24 * 3600)
+        pipe.execute()
+    
+    # Flag in bulk: 'processing' keeps flagged posts out of the publish queue
+    session = get_database_session()
+    try:
+        if resummarize_ids:
+            session.query(Post).filter(Post.id.in_(resummarize_ids)).update(
+                {"status": "processing"}, synchronize_session=False
+            )
+        if give_up_ids:
+            session.query(Post).filter(Post.id.in_(give_up_ids)).update(
+                {"status": "failed"}, synchronize_session=False
+            )
+            index_by_id = {str(row.id): i for i, row in enumerate(rows)}
+            session.add_all([
+                ProcessingLog(
+                    post_id=post_id,
+                    service_name='nlp_pipeline',
+                    status='failed',
+                    error_message=f"Summary quality check failed: {', '.join(report.reasons[index_by_id[post_id]])}",
+                    processing_time_ms=0
+                )
+                for post_id in give_up_ids
+            ])
+        session.commit()
+    finally:
+        session.close()
+    
+    chunk_size = settings.summary_resummarize_chunk_size
+    for start in range(0, len(resummarize_ids), chunk_size):
+        resummarize_posts.delay(resummarize_ids[start:start + chunk_size])
+    
+    redis_sync.set(watermark_key, json.dumps({"updated_at": rows[-1].updated_at.isoformat(), "id": str(rows[-1].id)}))
+    
+    result = {
+        "status": "completed",
+        "checked": len(rows),
+        "flagged": len(flagged),
+        "resummarize": len(resummarize_ids),
+        "failed": len(give_up_ids),
+        "mean_score": round(float(report.scores.mean()), 4),
+        "reasons": dict(reasons)
+    }
+    logger.info(f"Summary quality check: {len(flagged)}/{len(rows)} flagged", extra=result)
+    return result
+
+
+@celery_app.task(
+    bind=True,
+    base=NLPTask,
+    queue='process'
+)
+def resummarize_posts(self, post_ids: list) -> Dict[str, Any]:
+    """
+    Regenerate summary_ko for posts flagged by check_summary_quality
+    
+    Only the summary call is repeated; tags and analysis are kept. Posts return
+    to 'processed' either way, so the next quality run re-checks them.
+    
+    Args:
+        post_ids: Flagged post IDs
+    
+    Returns:
+        Dictionary with regenerated/failed counts
+    """
+    openai_client = get_openai_client()
+    if not openai_client._client:
+        openai_client.initialize()
+    
+    session = get_database_session()
+    try:
+        posts = session.query(Post).filter(Post.id.in_(post_ids)).all()
+        
+        regenerated, failed = 0, 0
+        for post in posts:
+            try:
+                result = openai_client.generate_korean_summary(post.title, post.content, str(post.id))
+                post.summary_ko = result["summary"]
+                regenerated += 1
+            except Exception as e:
+                logger.error(f"Re-summarization failed for post {post.id}: {e}")
+                failed += 1
+            post.status = 'processed'
+            session.commit()
+    finally:
+        session.close()
+    
+    logger.info(f"Re-summarized {regenerated} posts ({failed} failed)")
+    return {"status": "completed", "regenerated": regenerated, "failed": failed}
+
+
 @celery_app.task(
     bind=True,
     base=NLPTask,
@@ -421,10 +852,26 @@ def health_check_nlp_services(self) -> Dict[str, Any]:
         }
 
 
-def trigger_batch_processing(post_ids: list) -> str:
-    """Trigger batch processing for multiple posts"""
-    task = batch_process_posts.delay(post_ids)
-    return task.id
+def trigger_batch_processing(post_ids: list) -> Optional[str]:
+    """
+    Trigger batch processing for the posts the pre-classifier lets through
+    
+    Skipped posts are never enqueued; delayed posts go in a second batch that
+    runs after PRE_CLASSIFIER_DELAY_SECONDS.
+    
+    Returns:
+        Task id of the immediate batch, or None if no post was queued now
+    """
+    gate = gate_posts(post_ids)
+    if gate.delay:
+        delayed_task = batch_process_posts.apply_async(
+            args=[gate.delay], countdown=settings.pre_classifier_delay_seconds
+        )
+        logger.info(f"Delayed {len(gate.delay)} low-confidence posts to batch {delayed_task.id}")
+    
+    if not gate.process:
+        return None
+    return batch_process_posts.delay(gate.process).id
 
 
 def trigger_model_training(documents: list) -> str:
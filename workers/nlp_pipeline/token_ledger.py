@@ -0,0 +1,196 @@
+"""
+Buffered token usage ledger for OpenAI calls (MVP)
+Accumulates per-call usage in-process and bulk inserts into token_usage
+"""
+import logging
+import threading
+import time
+from decimal import Decimal
+from typing import Dict, Any, List, Optional
+from uuid import UUID
+
+from sqlalchemy import insert
+from sqlalchemy.exc import DataError, IntegrityError, InterfaceError, OperationalError
+
+from app.config import get_settings
+from app.infrastructure import get_database_session
+from app.models.token_usage import TokenUsage
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+class TokenUsageLedger:
+    """
+    In-process buffer of per-call token usage records
+    - Flushes with a single multi-row INSERT every N records or T seconds
+    - Background flusher covers idle periods; flush() is called on worker shutdown
+    - Records without a valid post UUID (e.g. health checks) are skipped
+    - A connection/operational failure puts the records back for the next flush (buffer capped at max_buffer)
+    - A rejected batch (integrity/data error) is retried row by row; only rows that fail are dropped
+    """
+
+    def __init__(
+        self,
+        flush_size: Optional[int] = None,
+        flush_interval: Optional[float] = None,
+        max_buffer: Optional[int] = None
+    ):
+        self.flush_size = flush_size or settings.token_ledger_flush_size
+        self.flush_interval = flush_interval or settings.token_ledger_flush_interval
+        self.max_buffer = max_buffer or settings.token_ledger_max_buffer
+
+        self._buffer: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+        self._flush_failed = False
+        self._flusher: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+
+    def record(
+        self,
+        post_id: str,
+        service: str,
+        model: str,
+        input_tokens: int,
+        output_tokens: int,
+        cost_usd: Decimal,
+        cached_tokens: int = 0,
+        prompt_version: Optional[str] = None,
+        latency_ms: Optional[int] = None
+    ) -> None:
+        """Buffer a usage record and flush when the size/time threshold is reached"""
+        try:
+            post_uuid = UUID(str(post_id))
+        except ValueError:
+            logger.debug(f"Skipping token usage record for non-post id {post_id}")
+            return
+
+        with self._lock:
+            self._buffer.append({
+                "post_id": post_uuid,
+                "service": service,
+                "model": model,
+                "input_tokens": input_tokens,
+                "output_tokens": output_tokens,
+                "cost_usd": cost_usd,
+                "cached_tokens": cached_tokens,
+                "prompt_version": prompt_version,
+                "latency_ms": latency_ms
+            })
+            # After a failed INSERT only the interval triggers retries, not every new record
+            should_flush = (
+                (len(self._buffer) >= self.flush_size and not self._flush_failed)
+                or time.monotonic() - self._last_flush >= self.flush_interval
+            )
+            self._ensure_flusher()
+
+        if should_flush:
+            self.flush()
+
+    def flush(self) -> int:
+        """
+        Write all buffered records with one multi-row INSERT
+
+        Returns:
+            Number of records written
+        """
+        with self._lock:
+            records, self._buffer = self._buffer, []
+            self._last_flush = time.monotonic()
+
+        if not records:
+            return 0
+
+        db = get_database_session()
+        try:
+            db.execute(insert(TokenUsage).values(records))
+            db.commit()
+            with self._lock:
+                self._flush_failed = False
+            logger.debug(f"Flushed {len(records)} token usage records")
+            return len(records)
+        except (IntegrityError, DataError) as e:
+            db.rollback()
+            logger.warning(f"Bulk insert of {len(records)} token usage records rejected, inserting row by row: {e}")
+            return self._insert_rows(db, records)
+        except (OperationalError, InterfaceError) as e:
+            db.rollback()
+            self._requeue(records)
+            logger.error(f"Failed to flush {len(records)} token usage records, will retry: {e}")
+            return 0
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Failed to flush {len(records)} token usage records, dropping them: {e}")
+            return 0
+        finally:
+            db.close()
+
+    def _insert_rows(self, db, records: List[Dict[str, Any]]) -> int:
+        """Insert records one by one, dropping those the database rejects"""
+        written = 0
+        for index, record in enumerate(records):
+            try:
+                db.execute(insert(TokenUsage).values([record]))
+                db.commit()
+                written += 1
+            except (IntegrityError, DataError) as e:
+                db.rollback()
+                logger.error(f"Dropping token usage record for post {record['post_id']}: {e}")
+            except (OperationalError, InterfaceError) as e:
+                db.rollback()
+                self._requeue(records[index:])
+                logger.error(f"Failed to flush {len(records) - index} token usage records, will retry: {e}")
+                return written
+
+        with self._lock:
+            self._flush_failed = False
+        return written
+
+    def _requeue(self, records: List[Dict[str, Any]]) -> None:
+        """Put unwritten records back ahead of newer ones, dropping the oldest beyond max_buffer"""
+        with self._lock:
+            self._buffer = records + self._buffer
+            self._flush_failed = True
+            overflow = len(self._buffer) - self.max_buffer
+            if overflow > 0:
+                del self._buffer[:overflow]
+                logger.error(f"Token usage buffer full, dropped {overflow} oldest records")
+
+    def pending(self) -> int:
+        """Number of buffered records not yet written"""
+        with self._lock:
+            return len(self._buffer)
+
+    def _ensure_flusher(self) -> None:
+        """Start the periodic flusher thread lazily (after any prefork)"""
+        if self._flusher and self._flusher.is_alive():
+            return
+
+        self._stop_event.clear()
+        self._flusher = threading.Thread(
+            target=self._run_flusher,
+            name="token-ledger-flusher",
+            daemon=True
+        )
+        self._flusher.start()
+
+    def _run_flusher(self) -> None:
+        """Flush buffered records every flush_interval seconds"""
+        while not self._stop_event.wait(self.flush_interval):
+            if self.pending():
+                self.flush()
+
+    def shutdown(self) -> int:
+        """Stop the flusher and write any remaining records"""
+        self._stop_event.set()
+        return self.flush()
+
+
+# Global ledger instance
+token_ledger = TokenUsageLedger()
+
+
+def get_token_ledger() -> TokenUsageLedger:
+    """Get token usage ledger instance"""
+    return token_ledger
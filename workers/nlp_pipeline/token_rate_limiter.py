@@ -0,0 +1,281 @@
+"""
+Distributed token-rate limiter for OpenAI calls (MVP)
+Reserves estimated tokens atomically against the TPM window and daily budget
+"""
+import logging
+import math
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, Any, Optional, Tuple
+
+import redis
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+class TokenBudgetExceededError(Exception):
+    """Raised when a reservation would exceed the daily token budget"""
+    pass
+
+
+class TokenRateLimitTimeout(Exception):
+    """Raised when a reservation could not be acquired within the max wait"""
+    pass
+
+
+@dataclass
+class TokenReservation:
+    """Tokens reserved ahead of an OpenAI call, reconciled after the response"""
+    reservation_id: str
+    tokens: int
+    minute_key: Optional[str]
+    daily_key: Optional[str]
+    reserved_at: float
+
+    @property
+    def is_tracked(self) -> bool:
+        """Whether the reservation is backed by Redis counters"""
+        return self.minute_key is not None and self.daily_key is not None
+
+
+class TokenRateLimiter:
+    """
+    Reservation-based token limiter shared by all NLP workers
+    - Reserves estimated tokens with a single Lua script (no check-then-increment race)
+    - Enforces both the tokens-per-minute window and the daily token budget
+    - Reconciles the reservation with actual usage after the response
+    - Honours a fleet-wide cooldown after an upstream 429
+    - Connects to Redis lazily; calls are allowed while Redis is unavailable
+    """
+
+    # KEYS: minute bucket, daily counter, cooldown flag
+    # ARGV: tokens, tpm limit, daily limit, minute ttl, daily ttl
+    # Returns {1, daily_total} on success, {0, wait_ms} to wait, {-1, daily_total} if over budget
+    RESERVE_SCRIPT = """
+local cooldown = redis.call('PTTL', KEYS[3])
+if cooldown > 0 then
+    return {0, cooldown}
+end
+local tokens = tonumber(ARGV[1])
+local daily = tonumber(redis.call('GET', KEYS[2]) or '0')
+if daily + tokens > tonumber(ARGV[3]) then
+    return {-1, daily}
+end
+local minute = tonumber(redis.call('GET', KEYS[1]) or '0')
+if minute > 0 and minute + tokens > tonumber(ARGV[2]) then
+    return {0, 0}
+end
+redis.call('INCRBY', KEYS[1], tokens)
+redis.call('EXPIRE', KEYS[1], ARGV[4])
+redis.call('INCRBY', KEYS[2], tokens)
+if redis.call('TTL', KEYS[2]) < 0 then
+    redis.call('EXPIRE', KEYS[2], ARGV[5])
+end
+return {1, daily + tokens}
+"""
+
+    # KEYS: counters touched by the reservation; ARGV: signed token delta
+    ADJUST_SCRIPT = """
+local delta = tonumber(ARGV[1])
+for _, key in ipairs(KEYS) do
+    if redis.call('EXISTS', key) == 1 then
+        local value = redis.call('INCRBY', key, delta)
+        if value < 0 then
+            redis.call('SET', key, 0, 'KEEPTTL')
+        end
+    end
+end
+return 1
+"""
+
+    # KEYS: cooldown flag; ARGV: cooldown ms
+    # Keeps the longest cooldown when several workers hit 429 at once
+    PENALIZE_SCRIPT = """
+local cooldown = tonumber(ARGV[1])
+if redis.call('PTTL', KEYS[1]) < cooldown then
+    redis.call('SET', KEYS[1], '1', 'PX', cooldown)
+end
+return 1
+"""
+
+    # Rough chars-per-token ratio; Korean prompts tokenize denser than English
+    CHARS_PER_TOKEN = 3
+
+    def __init__(
+        self,
+        tpm_limit: Optional[int] = None,
+        daily_limit: Optional[int] = None,
+        max_wait_seconds: Optional[float] = None
+    ):
+        self.tpm_limit = tpm_limit or settings.openai_tpm_limit
+        self.daily_limit = daily_limit or settings.openai_daily_tokens_limit
+        self.max_wait_seconds = (
+            max_wait_seconds if max_wait_seconds is not None
+            else settings.openai_rate_limit_max_wait
+        )
+
+        # Redis keys (daily key is shared with OpenAIClient.check_daily_token_usage)
+        self.minute_key_prefix = "openai_tpm"
+        self.daily_key_prefix = "usage"
+        self.cooldown_key = "openai_tpm:cooldown"
+
+        # Redis is connected on first use, not at import
+        self._redis_client = None
+        self._reserve = None
+        self._adjust = None
+        self._penalize = None
+
+    def _get_redis(self):
+        if self._redis_client is None:
+            self._redis_client = redis.from_url(settings.redis_url, decode_responses=True)
+            self._reserve = self._redis_client.register_script(self.RESERVE_SCRIPT)
+            self._adjust = self._redis_client.register_script(self.ADJUST_SCRIPT)
+            self._penalize = self._redis_client.register_script(self.PENALIZE_SCRIPT)
+        return self._redis_client
+
+    def _get_minute_key(self, now: float) -> str:
+        """Get Redis key for the current one-minute window"""
+        return f"{self.minute_key_prefix}:{int(now // 60)}"
+
+    def _get_daily_key(self) -> str:
+        """Get Redis key for today's token counter (UTC)"""
+        return f"{self.daily_key_prefix}:{datetime.utcnow().strftime('%Y%m%d')}"
+
+    @staticmethod
+    def _seconds_until_tomorrow() -> int:
+        """Seconds until UTC 00:00 for daily counter expiry"""
+        now = datetime.utcnow()
+        tomorrow = now.replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1)
+        return max(1, int((tomorrow - now).total_seconds()))
+
+    def estimate_tokens(self, *texts: str, max_tokens: int = 0) -> int:
+        """Estimate prompt + completion tokens for a request before sending it"""
+        prompt_chars = sum(len(text) for text in texts if text)
+        return math.ceil(prompt_chars / self.CHARS_PER_TOKEN) + max_tokens
+
+    def try_reserve(self, tokens: int) -> Tuple[Optional[TokenReservation], float]:
+        """
+        Try to reserve tokens once without blocking
+
+        Returns:
+            Tuple of (reservation or None, seconds to wait before retrying)
+
+        Raises:
+            TokenBudgetExceededError: if the daily budget cannot fit the reservation
+        """
+        now = time.time()
+        minute_key = self._get_minute_key(now)
+        daily_key = self._get_daily_key()
+
+        try:
+            self._get_redis()
+            status, value = self._reserve(
+                keys=[minute_key, daily_key, self.cooldown_key],
+                args=[tokens, self.tpm_limit, self.daily_limit, 120, self._seconds_until_tomorrow()]
+            )
+        except redis.RedisError as e:
+            # Allow the call if Redis is unavailable (same policy as the Reddit limiter)
+            logger.warning(f"Token reservation failed, allowing request: {e}")
+            return TokenReservation(uuid.uuid4().hex, tokens, None, None, now), 0.0
+
+        status, value = int(status), int(value)
+
+        if status == 1:
+            return TokenReservation(uuid.uuid4().hex, tokens, minute_key, daily_key, now), 0.0
+
+        if status == -1:
+            raise TokenBudgetExceededError(
+                f"Daily token limit exceeded: {value}+{tokens}/{self.daily_limit}"
+            )
+
+        # Cooldown returns remaining ms; a full window waits for the next minute
+        wait_seconds = value / 1000 if value > 0 else 60 - (now % 60)
+        return None, wait_seconds
+
+    def acquire(self, tokens: int) -> TokenReservation:
+        """
+        Reserve tokens, waiting for the TPM window instead of failing over
+
+        Raises:
+            TokenBudgetExceededError: if the daily budget cannot fit the reservation
+            TokenRateLimitTimeout: if the window did not free up within max_wait_seconds
+        """
+        deadline = time.monotonic() + self.max_wait_seconds
+
+        while True:
+            reservation, wait_seconds = self.try_reserve(tokens)
+            if reservation:
+                return reservation
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TokenRateLimitTimeout(
+                    f"Could not reserve {tokens} tokens within {self.max_wait_seconds}s"
+                )
+
+            sleep_for = min(wait_seconds, remaining) + 0.05
+            logger.info(f"OpenAI TPM window full, waiting {sleep_for:.1f}s for {tokens} tokens")
+            time.sleep(sleep_for)
+
+    def reconcile(self, reservation: TokenReservation, actual_tokens: int) -> None:
+        """Correct the reserved counters with the tokens actually reported by the API"""
+        delta = actual_tokens - reservation.tokens
+        if delta == 0 or not reservation.is_tracked:
+            return
+
+        try:
+            self._get_redis()
+            self._adjust(keys=[reservation.minute_key, reservation.daily_key], args=[delta])
+        except redis.RedisError as e:
+            logger.warning(f"Failed to reconcile token reservation {reservation.reservation_id}: {e}")
+
+    def release(self, reservation: TokenReservation) -> None:
+        """Return a reservation whose call never consumed tokens"""
+        self.reconcile(reservation, 0)
+
+    def penalize(self, seconds: float) -> None:
+        """Pause all workers after an upstream 429 (e.g. honour Retry-After)"""
+        if seconds <= 0:
+            return
+
+        try:
+            self._get_redis()
+            self._penalize(keys=[self.cooldown_key], args=[int(seconds * 1000)])
+        except redis.RedisError as e:
+            logger.warning(f"Failed to set OpenAI rate limit cooldown: {e}")
+
+    def get_usage(self) -> Dict[str, Any]:
+        """Get current window and daily usage for health checks"""
+        try:
+            client = self._get_redis()
+            now = time.time()
+            minute_tokens = int(client.get(self._get_minute_key(now)) or 0)
+            daily_tokens = int(client.get(self._get_daily_key()) or 0)
+            cooldown_ms = max(0, client.pttl(self.cooldown_key))
+
+            return {
+                "status": "ok",
+                "minute_tokens": minute_tokens,
+                "tpm_limit": self.tpm_limit,
+                "daily_tokens": daily_tokens,
+                "daily_limit": self.daily_limit,
+                "cooldown_seconds": round(cooldown_ms / 1000, 1)
+            }
+
+        except Exception as e:
+            logger.error(f"Error getting token rate limiter usage: {e}")
+            return {"status": "error", "error": str(e)}
+
+
+# Global instance
+token_rate_limiter = TokenRateLimiter()
+
+
+def get_token_rate_limiter() -> TokenRateLimiter:
+    """Get token rate limiter instance"""
+    return token_rate_limiter
@@ -0,0 +1,256 @@
+"""
+Lazily loaded, memory-mapped BERTopic safetensors artifact for inference
+Reads the files written by BERTopic.save(serialization="safetensors") on first use,
+and saves/restores fitted estimator state as plain arrays + JSON (no pickle)
+"""
+import json
+import logging
+import os
+import struct
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+from safetensors import safe_open
+from safetensors.numpy import load_file, save_file
+from scipy.sparse import csr_matrix, issparse
+from sklearn.feature_extraction.text import CountVectorizer
+
+logger = logging.getLogger(__name__)
+
+TOPICS_FILE = "topics.json"
+TOPIC_EMBEDDINGS_FILE = "topic_embeddings.safetensors"
+CTFIDF_FILE = "ctfidf.safetensors"
+CTFIDF_CONFIG_FILE = "ctfidf_config.json"
+ESTIMATOR_STATE_FILE = "online_state.json"
+ESTIMATOR_ARRAYS_FILE = "online_state.safetensors"
+
+SAFETENSORS_DTYPES = {
+    "F16": np.float16,
+    "F32": np.float32,
+    "F64": np.float64,
+    "I32": np.int32,
+    "I64": np.int64,
+}
+
+
+def mmap_safetensor(path: str, name: str) -> np.memmap:
+    """Memory-map one tensor of a safetensors file read-only (no copy into RAM)"""
+    with open(path, "rb") as f:
+        (header_size,) = struct.unpack("<Q", f.read(8))
+        header = json.loads(f.read(header_size))
+
+    info = header[name]
+    dtype = SAFETENSORS_DTYPES[info["dtype"]]
+    begin, _ = info["data_offsets"]
+    return np.memmap(
+        path,
+        dtype=dtype,
+        mode="r",
+        offset=8 + header_size + begin,
+        shape=tuple(info["shape"])
+    )
+
+
+def _is_fitted_attribute(name: str) -> bool:
+    """Fitted (name_) and private (_name) attributes; constructor params are rebuilt from code"""
+    return (name.endswith("_") or name.startswith("_")) and not name.startswith("__")
+
+
+def _json_value(value: Any) -> Tuple[bool, Any]:
+    """Convert a scalar or str-keyed numeric dict (e.g. a vocabulary) to JSON, if possible"""
+    if isinstance(value, np.generic):
+        return True, value.item()
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return True, value
+    if isinstance(value, dict) and all(
+        isinstance(k, str) and isinstance(v, (int, float, np.number)) for k, v in value.items()
+    ):
+        return True, {k: v.item() if isinstance(v, np.generic) else v for k, v in value.items()}
+    return False, None
+
+
+def save_estimator_state(directory: str, estimators: Dict[str, Any], extra: Dict[str, Any]) -> Dict[str, str]:
+    """
+    Save the fitted attributes of estimators as safetensors arrays plus JSON
+    - Dense arrays and sparse matrices (as CSR parts) go to the safetensors file
+    - Scalars, vocabularies and numpy RandomState positions go to the JSON file
+    - Anything else (e.g. nested objects) is left out and rebuilt by the estimator
+    Loading this state never executes code, unlike a pickle.
+    """
+    arrays: Dict[str, np.ndarray] = {}
+    state: Dict[str, Any] = {"estimators": {}, "extra": extra}
+
+    for prefix, estimator in estimators.items():
+        entry: Dict[str, Any] = {"values": {}, "arrays": [], "sparse": [], "random_states": {}}
+        for name, value in vars(estimator).items():
+            if not _is_fitted_attribute(name):
+                continue
+            key = f"{prefix}.{name}"
+            if issparse(value):
+                matrix = csr_matrix(value)
+                arrays[f"{key}.data"] = matrix.data
+                arrays[f"{key}.indices"] = matrix.indices
+                arrays[f"{key}.indptr"] = matrix.indptr
+                arrays[f"{key}.shape"] = np.array(matrix.shape, dtype=np.int64)
+                entry["sparse"].append(name)
+            elif isinstance(value, np.ndarray) and value.dtype != object:
+                arrays[key] = np.ascontiguousarray(value)
+                entry["arrays"].append(name)
+            elif isinstance(value, np.random.RandomState):
+                _, keys, pos, has_gauss, cached_gaussian = value.get_state()
+                arrays[key] = keys
+                entry["random_states"][name] = [int(pos), int(has_gauss), float(cached_gaussian)]
+            else:
+                supported, json_value = _json_value(value)
+                if supported:
+                    entry["values"][name] = json_value
+                else:
+                    logger.debug(f"Not saving {key} ({type(value).__name__})")
+        state["estimators"][prefix] = entry
+
+    save_file(arrays, os.path.join(directory, ESTIMATOR_ARRAYS_FILE))
+    with open(os.path.join(directory, ESTIMATOR_STATE_FILE), "w") as f:
+        json.dump(state, f)
+    return {"state": ESTIMATOR_STATE_FILE, "arrays": ESTIMATOR_ARRAYS_FILE}
+
+
+def load_estimator_state(directory: str, estimators: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Restore fitted attributes saved by save_estimator_state into freshly built estimators
+
+    Returns the extra JSON saved alongside them
+    """
+    with open(os.path.join(directory, ESTIMATOR_STATE_FILE)) as f:
+        state = json.load(f)
+    arrays = load_file(os.path.join(directory, ESTIMATOR_ARRAYS_FILE))
+
+    for prefix, estimator in estimators.items():
+        entry = state["estimators"][prefix]
+        for name, value in entry["values"].items():
+            setattr(estimator, name, value)
+        for name in entry["arrays"]:
+            setattr(estimator, name, arrays[f"{prefix}.{name}"])
+        for name in entry["sparse"]:
+            key = f"{prefix}.{name}"
+            setattr(estimator, name, csr_matrix(
+                (arrays[f"{key}.data"], arrays[f"{key}.indices"], arrays[f"{key}.indptr"]),
+                shape=tuple(int(n) for n in arrays[f"{key}.shape"])
+            ))
+        for name, (pos, has_gauss, cached_gaussian) in entry["random_states"].items():
+            random_state = np.random.RandomState()
+            random_state.set_state(("MT19937", arrays[f"{prefix}.{name}"], pos, has_gauss, cached_gaussian))
+            setattr(estimator, name, random_state)
+
+    return state["extra"]
+
+
+class TopicArtifact:
+    """
+    Inference view of a saved BERTopic model with the attributes BERTopicClient uses
+    - Nothing is read at construction; each part is loaded on first access
+    - topic_embeddings_: memory-mapped from the safetensors file
+    - c_tf_idf_: read with safe_open only when asked for
+    - vectorizer_model: rebuilt from the saved vocabulary only for keyword extraction
+    - transform: cosine similarity to the topic embeddings, as BERTopic does for
+      models loaded without UMAP/HDBSCAN
+    """
+
+    def __init__(self, artifact_path: str):
+        self.artifact_path = artifact_path
+        self._topics: Optional[Dict[str, Any]] = None
+        self._topic_embeddings: Optional[np.memmap] = None
+        self._c_tf_idf: Optional[csr_matrix] = None
+        self._vectorizer_model: Optional[CountVectorizer] = None
+
+    def _path(self, filename: str) -> str:
+        return os.path.join(self.artifact_path, filename)
+
+    def _load_json(self, filename: str) -> Dict[str, Any]:
+        with open(self._path(filename)) as f:
+            return json.load(f)
+
+    @property
+    def topics(self) -> Dict[str, Any]:
+        """Topic representations, labels and sizes (small JSON)"""
+        if self._topics is None:
+            self._topics = self._load_json(TOPICS_FILE)
+        return self._topics
+
+    @property
+    def topic_representations_(self) -> Dict[int, List[Tuple[str, float]]]:
+        return {int(k): v for k, v in self.topics["topic_representations"].items()}
+
+    @property
+    def topic_labels_(self) -> Dict[int, str]:
+        return {int(k): v for k, v in self.topics["topic_labels"].items()}
+
+    @property
+    def topic_sizes_(self) -> Dict[int, int]:
+        return {int(k): v for k, v in self.topics["topic_sizes"].items()}
+
+    @property
+    def _outliers(self) -> int:
+        return int(self.topics.get("_outliers", 0))
+
+    @property
+    def topic_embeddings_(self) -> np.memmap:
+        if self._topic_embeddings is None:
+            self._topic_embeddings = mmap_safetensor(self._path(TOPIC_EMBEDDINGS_FILE), "topic_embeddings")
+            logger.debug(f"Memory-mapped topic embeddings {self._topic_embeddings.shape}")
+        return self._topic_embeddings
+
+    @property
+    def c_tf_idf_(self) -> Optional[csr_matrix]:
+        if self._c_tf_idf is None and os.path.exists(self._path(CTFIDF_FILE)):
+            with safe_open(self._path(CTFIDF_FILE), framework="np") as f:
+                self._c_tf_idf = csr_matrix(
+                    (f.get_tensor("data"), f.get_tensor("indices"), f.get_tensor("indptr")),
+                    shape=tuple(int(n) for n in f.get_tensor("shape"))
+                )
+        return self._c_tf_idf
+
+    @property
+    def vectorizer_model(self) -> Optional[CountVectorizer]:
+        if self._vectorizer_model is None and os.path.exists(self._path(CTFIDF_CONFIG_FILE)):
+            config = self._load_json(CTFIDF_CONFIG_FILE)["vectorizer_model"]
+            # Online vectorizers save extra params (e.g. decay) CountVectorizer does not take
+            allowed = CountVectorizer().get_params()
+            params = {k: v for k, v in config["params"].items() if k in allowed}
+            if "ngram_range" in params:
+                params["ngram_range"] = tuple(params["ngram_range"])
+            vectorizer = CountVectorizer(**params)
+            vectorizer.vocabulary_ = config["vocab"]
+            self._vectorizer_model = vectorizer
+        return self._vectorizer_model
+
+    def transform(
+        self,
+        documents: Union[str, List[str]],
+        embeddings: np.ndarray
+    ) -> Tuple[List[int], np.ndarray]:
+        """Assign each document the topic with the most similar topic embedding"""
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        topic_embeddings = np.asarray(self.topic_embeddings_, dtype=np.float32)
+
+        doc_norm = embeddings / np.clip(np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12, None)
+        topic_norm = topic_embeddings / np.clip(np.linalg.norm(topic_embeddings, axis=1, keepdims=True), 1e-12, None)
+        similarity = doc_norm @ topic_norm.T
+
+        predictions = (np.argmax(similarity, axis=1) - self._outliers).tolist()
+        probabilities = np.max(similarity, axis=1)
+        return predictions, probabilities
+
+    def get_topic(self, topic_id: int) -> Union[List[Tuple[str, float]], bool]:
+        """Top words of a topic, or False if it does not exist (as BERTopic.get_topic)"""
+        return self.topic_representations_.get(int(topic_id), False)
+
+    def get_topic_info(self):
+        """Topic id, size and label per topic (as BERTopic.get_topic_info)"""
+        import pandas as pd  # only needed for model info; pandas ships with bertopic
+
+        sizes = self.topic_sizes_
+        labels = self.topic_labels_
+        return pd.DataFrame([
+            {"Topic": topic_id, "Count": sizes.get(topic_id, 0), "Name": labels.get(topic_id, f"Topic {topic_id}")}
+            for topic_id in sorted(self.topic_representations_)
+        ])
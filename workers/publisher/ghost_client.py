@@ -4,15 +4,20 @@ Ghost CMS API Client (MVP Synchronous Version)
 Handles communication with Ghost Admin API including:
 - JWT token generation from environment variables
 - Synchronous API calls with exponential backoff retry logic
+- Persistent keep-alive HTTP session (pooled, optionally HTTP/2) per process
 - Error handling for MVP requirements
 """
 
 import json
+import os
+import threading
 import time
 import random
+import httpx
 import jwt
 import requests
-from typing import Dict, Any, Optional, List
+from requests.adapters import HTTPAdapter
+from typing import Dict, Any, Optional, List, Union
 from datetime import datetime, timedelta
 import logging
 
@@ -20,6 +25,14 @@ from app.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Tags per page when listing tags (Ghost caps paginated limits at 100)
+TAG_PAGE_SIZE = 100
+
+# Transport errors from either HTTP backend (requests.Session or httpx.Client)
+TIMEOUT_ERRORS = (requests.exceptions.Timeout, httpx.TimeoutException)
+CONNECTION_ERRORS = (requests.exceptions.ConnectionError, httpx.TransportError)
+REQUEST_ERRORS = (requests.exceptions.RequestException, httpx.HTTPError)
+
 
 class GhostAPIError(Exception):
     """Base exception for Ghost API errors"""
@@ -90,6 +103,14 @@ class GhostClient:
         self._jwt_token = None
         self._jwt_expires_at = None
         
+        # Keep-alive session shared by all tasks in this worker process
+        self.pool_size = settings.ghost_http_pool_size
+        self.timeout = settings.ghost_http_timeout
+        self.http2 = settings.ghost_http2_enabled
+        self._session: Optional[Union[requests.Session, httpx.Client]] = None
+        self._session_pid: Optional[int] = None
+        self._session_lock = threading.Lock()
+        
         if not self.admin_key:
             raise GhostAuthError("GHOST_ADMIN_KEY environment variable not set")
         if not self.base_url:
@@ -166,13 +187,58 @@ class GhostClient:
             'Accept': 'application/json'
         }
     
+    def _create_session(self) -> Union[requests.Session, httpx.Client]:
+        """Create a pooled keep-alive session (httpx with HTTP/2 when enabled and available)"""
+        if self.http2:
+            try:
+                import h2  # noqa: F401 - required by httpx for HTTP/2
+                return httpx.Client(
+                    http2=True,
+                    timeout=self.timeout,
+                    limits=httpx.Limits(
+                        max_connections=self.pool_size,
+                        max_keepalive_connections=self.pool_size
+                    )
+                )
+            except ImportError:
+                logger.warning("GHOST_HTTP2_ENABLED is set but h2 is not installed; using HTTP/1.1 keep-alive")
+        
+        session = requests.Session()
+        # Retries are handled in _make_request_with_retry; the adapter only pools connections
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size, max_retries=0)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+    
+    def _get_session(self) -> Union[requests.Session, httpx.Client]:
+        """Get this process's session (recreated after fork, never shared across processes)"""
+        pid = os.getpid()
+        if self._session is None or self._session_pid != pid:
+            with self._session_lock:
+                if self._session is None or self._session_pid != pid:
+                    self._session = self._create_session()
+                    self._session_pid = pid
+                    logger.info(
+                        f"Ghost HTTP session created (pid={pid}, pool_size={self.pool_size}, "
+                        f"http2={isinstance(self._session, httpx.Client)})"
+                    )
+        return self._session
+    
+    def close(self) -> None:
+        """Close pooled connections"""
+        if self._session is not None and self._session_pid == os.getpid():
+            self._session.close()
+        self._session = None
+        self._session_pid = None
+    
     def _make_request_with_retry(
         self, 
         method: str, 
         endpoint: str, 
         data: Optional[Dict] = None,
         files: Optional[Dict] = None,
-        max_retries: int = 3
+        max_retries: int = 3,
+        params: Optional[Dict] = None
     ) -> Dict[str, Any]:
         """Make HTTP request to Ghost API with exponential backoff retry logic
         
@@ -190,13 +256,14 @@ class GhostClient:
             try:
                 logger.debug(f"Making Ghost API request: {method} {url} (attempt {attempt + 1})")
                 
-                response = requests.request(
+                response = self._get_session().request(
                     method=method,
                     url=url,
                     headers=headers,
+                    params=params,
                     json=data if not files else None,
                     files=files,
-                    timeout=30
+                    timeout=self.timeout
                 )
                 
                 # Enhanced rate limiting handling
@@ -282,7 +349,7 @@ class GhostClient:
                 else:
                     return {}
                     
-            except requests.exceptions.Timeout:
+            except TIMEOUT_ERRORS:
                 logger.warning(f"Ghost API timeout (attempt {attempt + 1}/{max_retries})")
                 if attempt < max_retries:
                     # Exponential backoff with jitter for timeouts
@@ -294,7 +361,7 @@ class GhostClient:
                     continue
                 raise GhostAPIError(f"Request timeout after {max_retries} retries")
                 
-            except requests.exceptions.ConnectionError as e:
+            except CONNECTION_ERRORS as e:
                 logger.error(f"Ghost API connection error (attempt {attempt + 1}/{max_retries}): {e}")
                 if attempt < max_retries:
                     # Longer backoff for connection errors
@@ -306,7 +373,7 @@ class GhostClient:
                     continue
                 raise GhostAPIError(f"Connection error after {max_retries} retries: {e}")
                 
-            except requests.exceptions.RequestException as e:
+            except REQUEST_ERRORS as e:
                 logger.error(f"Ghost API request error (attempt {attempt + 1}/{max_retries}): {e}")
                 if attempt < max_retries:
                     backoff_time = 2 ** attempt
@@ -410,12 +477,12 @@ class GhostClient:
         else:
             raise GhostAPIError("Unexpected response format from Ghost API")
     
-    def upload_image(self, image_data: bytes, filename: str) -> str:
+    def upload_image(self, image_data: bytes, filename: str, content_type: str = 'image/jpeg') -> str:
         """Upload image to Ghost Images API and return URL"""
         logger.info(f"Uploading image to Ghost: {filename}")
         
         files = {
-            'file': (filename, image_data, 'image/jpeg')
+            'file': (filename, image_data, content_type)
         }
         
         result = self._make_request_with_retry("POST", "images/upload/", files=files)
@@ -427,14 +494,34 @@ class GhostClient:
         else:
             raise GhostAPIError("Unexpected response format from image upload")
     
-    def get_tags(self) -> List[Dict[str, Any]]:
-        """Get all tags from Ghost"""
-        result = self._make_request_with_retry("GET", "tags/", data={"limit": "all"})
+    def get_tags(self, page_size: int = TAG_PAGE_SIZE) -> List[Dict[str, Any]]:
+        """Get all tags from Ghost, following pagination"""
+        tags = []
+        page = 1
+        
+        while page:
+            result = self._make_request_with_retry(
+                "GET", "tags/",
+                params={"limit": page_size, "page": page, "fields": "id,name,slug"}
+            )
+            tags.extend(result.get("tags", []))
+            
+            pagination = result.get("meta", {}).get("pagination", {})
+            next_page = pagination.get("next")
+            page = next_page if next_page and next_page > page else None
         
-        if "tags" in result:
-            return result["tags"]
-        else:
-            return []
+        logger.debug(f"Fetched {len(tags)} Ghost tags")
+        return tags
+    
+    def find_tag_by_name(self, name: str) -> Optional[Dict[str, Any]]:
+        """Look up a tag by exact name"""
+        escaped = name.replace("\\", "\\\\").replace("'", "\\'")
+        result = self._make_request_with_retry(
+            "GET", "tags/",
+            params={"filter": f"name:'{escaped}'", "limit": 1, "fields": "id,name,slug"}
+        )
+        tags = result.get("tags", [])
+        return tags[0] if tags else None
     
     def create_tag(self, name: str, description: str = "") -> Dict[str, Any]:
         """Create a new tag in Ghost"""
@@ -0,0 +1,290 @@
+"""
+Fleet-wide index of Ghost tags shared through Redis
+
+Holds lowercase tag name -> Ghost tag id in one Redis hash for all publisher
+workers. A full, paginated sync runs at most once per sync TTL across the
+fleet (SET NX lock) and rebuilds the hash, so tags deleted or renamed in
+Ghost drop out. Missing tags are claimed with SET NX, so each one is
+created by exactly one worker. The tags claimed for a post are created
+concurrently, and workers that lost a claim wait for the id to appear.
+
+Also publishes tag names to the shared vocabulary read by the NLP tag index.
+"""
+
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import redis
+
+from app.config import settings
+from workers.publisher.ghost_client import GhostAPIError, GhostClient, GhostValidationError
+
+logger = logging.getLogger(__name__)
+
+TAG_INDEX_KEY = "ghost:tags"  # hash: lowercase name -> tag id
+TAG_INDEX_SYNCED_KEY = "ghost:tags:synced"  # exists while the last full sync is fresh
+TAG_SYNC_LOCK_KEY = "ghost:tags:sync_lock"
+TAG_CLAIM_PREFIX = "ghost:tags:claim:"
+TAG_REBUILD_KEY = "ghost:tags:rebuild"  # staging hash renamed over the index by a full sync
+TAG_CREATED_KEY = "ghost:tags:created"  # hash: lowercase name -> "<id>:<unix time>" of recent creations
+
+# Shared Ghost tag vocabulary consumed by the NLP tag index
+TAG_VOCABULARY_KEY = "ghost:tag_vocabulary"
+TAG_VOCABULARY_VERSION_KEY = "ghost:tag_vocabulary:version"
+
+TAG_DESCRIPTION = "Auto-generated tag from Reddit content"
+SYNC_LOCK_TTL = 120  # seconds; longer than a full sync should ever take
+CLAIM_POLL_INTERVAL = 0.1
+CREATED_CLOCK_SKEW = 60  # seconds; tolerance between worker clocks when replaying creations
+
+
+class GhostTagIndex:
+    """Lowercase tag name -> Ghost tag id, shared by all workers (per-process fallback without Redis)"""
+
+    def __init__(self):
+        self.sync_ttl = settings.ghost_tag_sync_ttl
+        self.claim_ttl = settings.ghost_tag_claim_ttl
+        self.claim_wait = settings.ghost_tag_claim_wait
+        self.create_concurrency = settings.ghost_tag_create_concurrency
+        self._redis_client = None
+        # Only used while Redis is unreachable
+        self._local_tags: Dict[str, str] = {}
+        self._local_synced_at: Optional[float] = None
+
+    def _get_redis(self):
+        if self._redis_client is None:
+            self._redis_client = redis.from_url(settings.redis_url, decode_responses=True)
+        return self._redis_client
+
+    def _local_fresh(self) -> bool:
+        return self._local_synced_at is not None and time.monotonic() - self._local_synced_at < self.sync_ttl
+
+    def _store(self, mapping: Dict[str, str], created: bool = False) -> None:
+        """Merge name -> id pairs into the index; created tags are also logged for a concurrent sync"""
+        if not mapping:
+            return
+        self._local_tags.update(mapping)
+        try:
+            pipe = self._get_redis().pipeline(transaction=True)
+            pipe.hset(TAG_INDEX_KEY, mapping=mapping)
+            if created:
+                now = int(time.time())
+                pipe.hset(TAG_CREATED_KEY, mapping={name: f"{tag_id}:{now}" for name, tag_id in mapping.items()})
+            pipe.execute()
+        except Exception as e:
+            logger.warning(f"Ghost tag index Redis update failed: {e}")
+
+    def _rebuild(self, mapping: Dict[str, str], fetch_started: float) -> None:
+        """Replace the index with a full fetch, keeping tags created after the fetch started"""
+        redis_client = self._get_redis()
+        pipe = redis_client.pipeline(transaction=True)
+        pipe.delete(TAG_REBUILD_KEY)
+        if mapping:
+            pipe.hset(TAG_REBUILD_KEY, mapping=mapping)
+            pipe.rename(TAG_REBUILD_KEY, TAG_INDEX_KEY)
+        else:
+            pipe.delete(TAG_INDEX_KEY)
+        pipe.execute()
+
+        # Creations are logged together with their index write, so every tag created
+        # before the RENAME is replayed here and every later one went to the new hash
+        recent, stale = {}, []
+        for name, value in redis_client.hgetall(TAG_CREATED_KEY).items():
+            tag_id, _, created_at = value.rpartition(":")
+            if int(created_at) >= fetch_started - CREATED_CLOCK_SKEW:
+                recent[name] = tag_id
+            else:
+                stale.append(name)
+
+        pipe = redis_client.pipeline(transaction=True)
+        if recent:
+            pipe.hset(TAG_INDEX_KEY, mapping=recent)
+        if stale:
+            pipe.hdel(TAG_CREATED_KEY, *stale)
+        pipe.execute()
+
+    def _publish_vocabulary(self, tag_names: Iterable[str]) -> None:
+        """Add tags to the shared vocabulary and bump its version"""
+        tag_names = list(tag_names)
+        if not tag_names:
+            return
+        try:
+            redis_client = self._get_redis()
+            added = redis_client.sadd(TAG_VOCABULARY_KEY, *tag_names)
+            if added:
+                redis_client.incr(TAG_VOCABULARY_VERSION_KEY)
+                logger.info(f"Published {added} new Ghost tags to tag vocabulary")
+        except Exception as e:
+            logger.warning(f"Failed to publish Ghost tag vocabulary: {e}")
+
+    def sync(self, ghost_client: GhostClient) -> Dict[str, str]:
+        """Fetch every Ghost tag (all pages) and rebuild the index from them"""
+        fetch_started = time.time()
+        mapping = {}
+        for tag in ghost_client.get_tags():
+            name = (tag.get('name') or '').lower()
+            if name and tag.get('id'):
+                mapping[name] = tag['id']
+
+        self._local_tags = dict(mapping)
+        self._local_synced_at = time.monotonic()
+        try:
+            self._rebuild(mapping, fetch_started)
+            self._get_redis().set(TAG_INDEX_SYNCED_KEY, int(time.time()), ex=self.sync_ttl)
+        except Exception as e:
+            logger.warning(f"Ghost tag index Redis update failed: {e}")
+
+        self._publish_vocabulary(mapping)
+        logger.info(f"Synced {len(mapping)} Ghost tags to the shared tag index")
+        return mapping
+
+    def ensure_synced(self, ghost_client: GhostClient) -> None:
+        """Run a full sync if the shared index is stale and no other worker is already syncing"""
+        try:
+            redis_client = self._get_redis()
+            if redis_client.exists(TAG_INDEX_SYNCED_KEY):
+                return
+            if not redis_client.set(TAG_SYNC_LOCK_KEY, os.getpid(), nx=True, ex=SYNC_LOCK_TTL):
+                # Another worker is syncing; the current index is used meanwhile
+                return
+        except Exception as e:
+            logger.warning(f"Ghost tag index Redis unavailable, using per-process tags: {e}")
+            if not self._local_fresh():
+                self.sync(ghost_client)
+            return
+
+        try:
+            self.sync(ghost_client)
+        finally:
+            try:
+                redis_client.delete(TAG_SYNC_LOCK_KEY)
+            except Exception as e:
+                logger.warning(f"Failed to release Ghost tag sync lock: {e}")
+
+    def lookup(self, names: List[str]) -> Dict[str, str]:
+        """Ids of the given lowercase names that are in the index"""
+        if not names:
+            return {}
+        try:
+            ids = self._get_redis().hmget(TAG_INDEX_KEY, names)
+        except Exception as e:
+            logger.warning(f"Ghost tag index Redis lookup failed: {e}")
+            ids = [self._local_tags.get(name) for name in names]
+        return {name: tag_id for name, tag_id in zip(names, ids) if tag_id}
+
+    def get_all(self, ghost_client: GhostClient) -> Dict[str, str]:
+        """Whole index (syncing first if stale)"""
+        self.ensure_synced(ghost_client)
+        try:
+            return self._get_redis().hgetall(TAG_INDEX_KEY)
+        except Exception as e:
+            logger.warning(f"Ghost tag index Redis lookup failed: {e}")
+            return dict(self._local_tags)
+
+    def _claim(self, names: List[str]) -> Tuple[List[str], List[str]]:
+        """SET NX a creation claim per name; returns (claimed, claimed elsewhere)"""
+        try:
+            pipe = self._get_redis().pipeline(transaction=False)
+            for name in names:
+                pipe.set(TAG_CLAIM_PREFIX + name, os.getpid(), nx=True, ex=self.claim_ttl)
+            results = pipe.execute()
+        except Exception as e:
+            logger.warning(f"Ghost tag claim failed, creating without fleet coordination: {e}")
+            return list(names), []
+        claimed = [name for name, ok in zip(names, results) if ok]
+        others = [name for name, ok in zip(names, results) if not ok]
+        return claimed, others
+
+    def _release(self, names: List[str]) -> None:
+        if not names:
+            return
+        try:
+            self._get_redis().delete(*[TAG_CLAIM_PREFIX + name for name in names])
+        except Exception as e:
+            logger.warning(f"Failed to release Ghost tag claims: {e}")
+
+    def _create_one(self, ghost_client: GhostClient, name: str) -> Optional[str]:
+        try:
+            tag = ghost_client.create_tag(name=name, description=TAG_DESCRIPTION)
+            logger.info(f"Created new Ghost tag: {name}")
+            return tag.get('id')
+        except GhostValidationError:
+            # Already in Ghost but not yet in the index (e.g. created in the Ghost admin)
+            try:
+                tag = ghost_client.find_tag_by_name(name)
+                return tag.get('id') if tag else None
+            except GhostAPIError as e:
+                logger.warning(f"Failed to look up Ghost tag {name}: {e}")
+                return None
+        except GhostAPIError as e:
+            logger.warning(f"Failed to create Ghost tag {name}: {e}")
+            return None
+
+    def _wait_for(self, names: List[str]) -> Dict[str, str]:
+        """Poll the index for tags another worker is creating"""
+        found = {}
+        deadline = time.monotonic() + self.claim_wait
+        pending = list(names)
+        while pending:
+            found.update(self.lookup(pending))
+            pending = [name for name in pending if name not in found]
+            if not pending or time.monotonic() >= deadline:
+                break
+            time.sleep(CLAIM_POLL_INTERVAL)
+        if pending:
+            logger.warning(f"Ghost tags still being created elsewhere: {', '.join(pending)}")
+        return found
+
+    def create_missing(self, ghost_client: GhostClient, tag_names: List[str]) -> Dict[str, str]:
+        """
+        Make sure all tags exist in Ghost
+
+        Returns lowercase name -> id for every requested tag that exists: already
+        indexed, created by this call, or created by the worker holding its claim.
+        """
+        names = {}
+        for tag_name in tag_names:
+            if tag_name and tag_name.strip():
+                names.setdefault(tag_name.strip().lower(), tag_name.strip())
+        if not names:
+            return {}
+
+        try:
+            self.ensure_synced(ghost_client)
+        except GhostAPIError as e:
+            logger.error(f"Failed to sync Ghost tags: {e}")
+
+        known = self.lookup(list(names))
+        missing = [name for name in names if name not in known]
+        if not missing:
+            return known
+
+        claimed, others = self._claim(missing)
+
+        created = {}
+        if claimed:
+            workers = max(1, min(self.create_concurrency, len(claimed)))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ghost-tag") as pool:
+                tag_ids = list(pool.map(lambda name: self._create_one(ghost_client, names[name]), claimed))
+            created = {name: tag_id for name, tag_id in zip(claimed, tag_ids) if tag_id}
+
+            self._store(created, created=True)
+            self._publish_vocabulary(created)
+            # Failed creations may be retried by any worker straight away
+            self._release([name for name in claimed if name not in created])
+
+        waited = self._wait_for(others) if others else {}
+
+        return {**known, **created, **waited}
+
+
+# Global tag index instance
+ghost_tag_index = GhostTagIndex()
+
+
+def get_ghost_tag_index() -> GhostTagIndex:
+    """Get the global Ghost tag index"""
+    return ghost_tag_index
@@ -0,0 +1,155 @@
+"""
+Content-addressed dedup cache for images uploaded to Ghost
+
+Maps source URLs and content SHA-256 digests to Ghost CDN URLs so an image
+is downloaded, processed and uploaded at most once. Backed by the media_files
+table, with a Redis hot cache in front of it.
+"""
+
+import hashlib
+import logging
+from datetime import datetime
+from typing import Optional
+
+import redis
+from sqlalchemy import text
+
+from app.config import settings
+from app.infrastructure import get_database_session
+
+logger = logging.getLogger(__name__)
+
+URL_KEY_PREFIX = "image:url:"
+SHA256_KEY_PREFIX = "image:sha256:"
+
+
+def content_sha256(data: bytes) -> str:
+    """Hex SHA-256 of image bytes as downloaded"""
+    return hashlib.sha256(data).hexdigest()
+
+
+class ImageDedupCache:
+    """Source URL / content hash -> Ghost CDN URL lookups (Redis first, then media_files)"""
+
+    def __init__(self):
+        self.ttl = settings.image_cache_ttl
+        self._redis_client = None
+
+    def _get_redis(self):
+        if self._redis_client is None:
+            self._redis_client = redis.from_url(settings.redis_url, decode_responses=True)
+        return self._redis_client
+
+    @staticmethod
+    def _url_key(url: str) -> str:
+        # Source URLs can be long; hash them to keep keys bounded
+        return URL_KEY_PREFIX + hashlib.sha256(url.encode()).hexdigest()
+
+    def _cache_get(self, key: str) -> Optional[str]:
+        try:
+            return self._get_redis().get(key)
+        except Exception as e:
+            logger.warning(f"Image cache Redis lookup failed: {e}")
+            return None
+
+    def _cache_set(self, ghost_url: str, url: Optional[str] = None, sha256: Optional[str] = None) -> None:
+        try:
+            pipe = self._get_redis().pipeline(transaction=False)
+            if url:
+                pipe.set(self._url_key(url), ghost_url, ex=self.ttl)
+            if sha256:
+                pipe.set(SHA256_KEY_PREFIX + sha256, ghost_url, ex=self.ttl)
+            pipe.execute()
+        except Exception as e:
+            logger.warning(f"Image cache Redis update failed: {e}")
+
+    def _db_lookup(self, column: str, value: str) -> Optional[str]:
+        try:
+            with get_database_session() as session:
+                row = session.execute(
+                    text(f"""
+                    SELECT ghost_url FROM media_files
+                    WHERE {column} = :value AND ghost_url IS NOT NULL
+                    ORDER BY processed_at DESC NULLS LAST
+                    LIMIT 1
+                    """),
+                    {"value": value}
+                ).fetchone()
+                return row[0] if row else None
+        except Exception as e:
+            logger.warning(f"Image cache database lookup failed: {e}")
+            return None
+
+    def get_by_url(self, url: str) -> Optional[str]:
+        """Ghost URL previously uploaded for this source URL"""
+        ghost_url = self._cache_get(self._url_key(url))
+        if ghost_url:
+            return ghost_url
+
+        ghost_url = self._db_lookup("original_url", url)
+        if ghost_url:
+            self._cache_set(ghost_url, url=url)
+        return ghost_url
+
+    def get_by_hash(self, sha256: str) -> Optional[str]:
+        """Ghost URL previously uploaded for identical image bytes"""
+        ghost_url = self._cache_get(SHA256_KEY_PREFIX + sha256)
+        if ghost_url:
+            return ghost_url
+
+        ghost_url = self._db_lookup("content_sha256", sha256)
+        if ghost_url:
+            self._cache_set(ghost_url, sha256=sha256)
+        return ghost_url
+
+    def store(
+        self,
+        url: str,
+        ghost_url: str,
+        sha256: Optional[str] = None,
+        post_id: Optional[str] = None,
+        file_type: Optional[str] = None,
+        file_size: Optional[int] = None
+    ) -> None:
+        """
+        Remember an uploaded image
+
+        The media_files row needs a post; without post_id only Redis is updated.
+        """
+        self._cache_set(ghost_url, url=url, sha256=sha256)
+
+        if not post_id:
+            return
+
+        try:
+            with get_database_session() as session:
+                session.execute(
+                    text("""
+                    INSERT INTO media_files (post_id, original_url, ghost_url, content_sha256, file_type, file_size, processed_at)
+                    SELECT :post_id, :url, :ghost_url, :sha256, :file_type, :file_size, :processed_at
+                    WHERE NOT EXISTS (
+                        SELECT 1 FROM media_files WHERE post_id = :post_id AND original_url = :url
+                    )
+                    """),
+                    {
+                        "post_id": post_id,
+                        "url": url,
+                        "ghost_url": ghost_url,
+                        "sha256": sha256,
+                        "file_type": file_type,
+                        "file_size": file_size,
+                        "processed_at": datetime.utcnow()
+                    }
+                )
+                session.commit()
+        except Exception as e:
+            logger.warning(f"Failed to record media file for post {post_id}: {e}")
+
+
+# Global cache instance
+image_dedup_cache = ImageDedupCache()
+
+
+def get_image_dedup_cache() -> ImageDedupCache:
+    """Get the global image dedup cache"""
+    return image_dedup_cache
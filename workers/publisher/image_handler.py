@@ -3,20 +3,33 @@ Image Processing and Upload Handler for Ghost CMS (MVP Synchronous Version)
 
 Handles downloading Reddit media URLs locally and uploading to Ghost Images API
 with fallback to default OG image.
+
+Images in a post go through a bounded-concurrency pipeline: downloads and
+uploads run in a thread pool on pooled keep-alive sessions, and PIL work runs
+in a small process pool. Images already hosted on Ghost (same source URL or
+same bytes) are never transferred again.
 """
 
 import hashlib
 import mimetypes
+import multiprocessing
 import io
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from typing import Dict, List, Optional, Tuple
 from urllib.parse import urlparse
 import re
 import logging
+from functools import partial
 
 import requests
+from requests.adapters import HTTPAdapter
 from PIL import Image, ImageOps
 
 from workers.publisher.ghost_client import GhostClient, GhostAPIError
+from workers.publisher.image_cache import ImageDedupCache, content_sha256, get_image_dedup_cache
 from app.config import settings
 
 logger = logging.getLogger(__name__)
@@ -37,99 +50,250 @@ class ImageUploadError(ImageProcessingError):
     pass
 
 
+# Single-pass scanner: markdown ![alt](url), HTML <img src="url">, bare image URLs.
+# Every branch starts with a plain literal (!, <, h, H) so the engine can skip
+# ahead on a prefix charset instead of trying each branch at every position;
+# bare URLs are the whole match rather than a group for the same reason.
+_IMAGE_URL_TAIL = r'://[^\s<>"]+\.(?i:jpg|jpeg|png|gif|webp)(?:\?[^\s<>"]*)?'
+IMAGE_SCANNER_RE = re.compile(
+    r'!\[.*?\]\((?P<markdown>https?://[^\s\)]+)\)'
+    r'|<(?i:img)[^>]+(?i:src)=["\'](?P<html>[^"\']+)["\'][^>]*>'
+    r'|h(?i:ttps?)' + _IMAGE_URL_TAIL +
+    r'|H(?i:ttps?)' + _IMAGE_URL_TAIL
+)
+
+# Path ends in a supported extension (RFC 3986 split; ;params, ?query and #fragment ignored)
+IMAGE_PATH_RE = re.compile(
+    r'(?:[^:/?#]+:|(?![^:/?#]+:))(?://[^/?#]*(?=[/?#]|$)|(?!//))'
+    r'[^?#;]*\.(?:jpe?g|png|gif|webp)(?:;[^/?#]*)?(?:[?#]|$)',
+    re.IGNORECASE
+)
+
+# Reddit / Imgur image hosts
+IMAGE_HOST_RE = re.compile(
+    r'https?://(?:i\.redd\.it|preview\.redd\.it|external-preview\.redd\.it|i\.imgur\.com|imgur\.com)/'
+    r'.*\.(?:jpg|jpeg|png|gif|webp)',
+    re.IGNORECASE
+)
+
+FILENAME_EXTENSION_RE = re.compile(r'\.[^.]+$')
+FILENAME_UNSAFE_RE = re.compile(r'[^a-zA-Z0-9_-]')
+
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+# Headers some CDNs send for images; the magic bytes decide
+GENERIC_CONTENT_TYPES = {'application/octet-stream', 'binary/octet-stream'}
+
+# Leading bytes needed to identify every supported format
+SNIFF_BYTES = 12
+
+
+def sniff_image_type(data: bytes) -> Optional[str]:
+    """Identify a supported image format from its magic bytes"""
+    if data[:3] == b'\xff\xd8\xff':
+        return 'image/jpeg'
+    if data[:8] == b'\x89PNG\r\n\x1a\n':
+        return 'image/png'
+    if data[:6] in (b'GIF87a', b'GIF89a'):
+        return 'image/gif'
+    if data[:4] == b'RIFF' and data[8:12] == b'WEBP':
+        return 'image/webp'
+    return None
+
+
+OUTPUT_FORMATS = ('webp', 'avif', 'jpeg')
+
+# Stop reduce() at twice the target size so the final LANCZOS pass keeps quality
+REDUCING_GAP = 2
+
+EXIF_ORIENTATION_TAG = 0x0112
+
+
+def avif_supported() -> bool:
+    """Whether Pillow can encode AVIF (Pillow >= 11.3 or the pillow-avif-plugin)"""
+    try:
+        from PIL import features
+        if features.check('avif'):
+            return True
+    except (ImportError, ValueError):
+        pass
+    try:
+        import pillow_avif  # noqa: F401 - registers the AVIF plugin
+        return True
+    except ImportError:
+        return False
+
+
+def _fit_size(size: Tuple[int, int], bounds: Tuple[int, int], max_pixels: Optional[int]) -> Tuple[int, int]:
+    """Largest size within bounds and the pixel budget that keeps the aspect ratio"""
+    width, height = size
+    scale = min(1.0, bounds[0] / width, bounds[1] / height)
+    if max_pixels and width * height * scale * scale > max_pixels:
+        scale = (max_pixels / (width * height)) ** 0.5
+    return max(1, int(width * scale)), max(1, int(height * scale))
+
+
+def transcode_image(
+    image_data: bytes,
+    content_type: str,
+    max_dimensions: Tuple[int, int],
+    quality: int,
+    output_format: str = 'jpeg',
+    max_pixels: Optional[int] = None,
+    webp_method: int = 4,
+    avif_speed: int = 8
+) -> Tuple[bytes, str]:
+    """
+    Resize and re-encode image data (module-level so it can run in a worker process)
+    
+    Downscaling happens as early as possible: JPEGs decode straight to a
+    1/2-1/8 scale via draft(), reduce() does cheap integer box shrinking, and
+    only the last <2x step uses LANCZOS. Mode conversion and EXIF rotation run
+    on the small image.
+    """
+    # Open image with PIL (header only; pixels decode on first access)
+    image = Image.open(io.BytesIO(image_data))
+    
+    # Resize in stored orientation; EXIF rotations by 90 degrees swap the bounds
+    orientation = image.getexif().get(EXIF_ORIENTATION_TAG, 1)
+    bounds = max_dimensions[::-1] if orientation in (5, 6, 7, 8) else max_dimensions
+    target = _fit_size(image.size, bounds, max_pixels)
+    
+    if target != image.size and image.format == 'JPEG':
+        # Downscale-on-decode: DCT scaling to the smallest size still >= target
+        image.draft('RGB', target)
+    
+    # Normalize mode: keep alpha only for formats that support it
+    has_alpha = image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info)
+    image = image.convert('RGBA' if has_alpha else 'RGB') if image.mode not in ('RGB', 'RGBA') else image
+    
+    if target != image.size:
+        factor = int(min(image.size[0] / target[0], image.size[1] / target[1]) / REDUCING_GAP)
+        if factor >= 2:
+            image = image.reduce(factor)
+        logger.debug(f"Resizing image from {image.size} to {target}")
+        image = image.resize(target, Image.Resampling.LANCZOS)
+    
+    if image.mode == 'RGBA' and output_format == 'jpeg':
+        # Create white background for transparent images
+        background = Image.new('RGB', image.size, (255, 255, 255))
+        background.paste(image, mask=image.split()[-1])
+        image = background
+    
+    # Auto-orient based on EXIF data
+    image = ImageOps.exif_transpose(image)
+    
+    # Save to bytes
+    output = io.BytesIO()
+    
+    if output_format == 'webp':
+        image.save(output, format='WEBP', quality=quality, method=webp_method)
+        output_content_type = 'image/webp'
+    elif output_format == 'avif':
+        image.save(output, format='AVIF', quality=quality, speed=avif_speed)
+        output_content_type = 'image/avif'
+    elif content_type in ('image/png', 'image/gif'):
+        # Legacy JPEG mode: keep PNG; convert GIF to PNG to avoid animation issues
+        image.save(output, format='PNG', optimize=True)
+        output_content_type = 'image/png'
+    else:
+        image.save(output, format='JPEG', quality=quality, optimize=True)
+        output_content_type = 'image/jpeg'
+    
+    return output.getvalue(), output_content_type
+
+
+def _process_pool_context():
+    """forkserver where available: forking a threaded worker can deadlock on inherited locks"""
+    if 'forkserver' in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('forkserver')
+    return multiprocessing.get_context()
+
+
 class ImageHandler:
     """Handles image processing and upload for Ghost CMS (MVP Synchronous Version)"""
     
-    def __init__(self, ghost_client: Optional[GhostClient] = None):
+    def __init__(self, ghost_client: Optional[GhostClient] = None, dedup_cache: Optional[ImageDedupCache] = None):
         self.ghost_client = ghost_client
         
-        # Supported image formats
-        self.supported_formats = {'.jpg', '.jpeg', '.png', '.gif', '.webp'}
+        # Source URL / content hash -> Ghost URL cache
+        self.dedup_enabled = settings.image_dedup_enabled
+        self.dedup_cache = dedup_cache or get_image_dedup_cache()
         
         # Image processing settings
         self.max_image_size = 10 * 1024 * 1024  # 10MB
         self.max_dimensions = (1920, 1080)  # Max width/height for MVP
+        self.max_pixels = settings.image_max_pixels  # output pixel budget
         self.quality = 85  # JPEG quality
+        self.output_format = self._resolve_output_format(settings.image_output_format)
+        self.format_quality = {
+            'webp': settings.image_webp_quality,
+            'avif': settings.image_avif_quality,
+            'jpeg': self.quality
+        }
+        
+        # Pipeline concurrency
+        self.concurrency = max(1, settings.image_concurrency)
+        self.process_workers = settings.image_process_workers
+        self._http_session: Optional[requests.Session] = None
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+        self._pool_pid: Optional[int] = None
+        self._process_pool_disabled = False
+        self._pool_lock = threading.Lock()
         
         # Default OG image from environment
         self.default_og_image_url = settings.default_og_image_url
-        
-        # Reddit-specific URL patterns
-        self.reddit_image_patterns = [
-            r'https?://i\.redd\.it/.*\.(jpg|jpeg|png|gif|webp)',
-            r'https?://preview\.redd\.it/.*\.(jpg|jpeg|png|gif|webp)',
-            r'https?://external-preview\.redd\.it/.*\.(jpg|jpeg|png|gif|webp)',
-            r'https?://i\.imgur\.com/.*\.(jpg|jpeg|png|gif|webp)',
-            r'https?://imgur\.com/.*\.(jpg|jpeg|png|gif|webp)'
-        ]
     
     def is_image_url(self, url: str) -> bool:
         """Check if URL points to an image"""
         if not url:
             return False
         
-        # Check file extension
-        parsed_url = urlparse(url.lower())
-        path = parsed_url.path
-        
-        # Check for direct image extensions
-        for ext in self.supported_formats:
-            if path.endswith(ext):
-                return True
-        
-        # Check Reddit-specific patterns
-        for pattern in self.reddit_image_patterns:
-            if re.match(pattern, url, re.IGNORECASE):
-                return True
-        
-        return False
+        # Direct image extension on the path, or a known image host
+        return bool(IMAGE_PATH_RE.match(url) or IMAGE_HOST_RE.match(url))
     
     def extract_image_urls(self, content: str) -> List[str]:
-        """Extract image URLs from content"""
+        """Extract image URLs (markdown, HTML img, bare) in document order"""
         if not content:
             return []
         
-        image_urls = []
-        
-        # Find markdown image syntax: ![alt](url)
-        markdown_pattern = r'!\[.*?\]\((https?://[^\s\)]+)\)'
-        markdown_matches = re.findall(markdown_pattern, content)
-        image_urls.extend(markdown_matches)
-        
-        # Find HTML img tags: <img src="url">
-        html_pattern = r'<img[^>]+src=["\']([^"\']+)["\'][^>]*>'
-        html_matches = re.findall(html_pattern, content, re.IGNORECASE)
-        image_urls.extend(html_matches)
-        
-        # Find plain URLs that look like images
-        url_pattern = r'https?://[^\s<>"]+\.(?:jpg|jpeg|png|gif|webp)(?:\?[^\s<>"]*)?'
-        url_matches = re.findall(url_pattern, content, re.IGNORECASE)
-        image_urls.extend(url_matches)
-        
-        # Filter and validate URLs
-        valid_urls = []
-        for url in image_urls:
-            if self.is_image_url(url):
-                valid_urls.append(url)
-        
-        # Remove duplicates while preserving order
-        seen = set()
+        # One scan over the content; each match is markdown, html or bare
         unique_urls = []
-        for url in valid_urls:
-            if url not in seen:
-                seen.add(url)
+        seen = set()
+        found = 0
+        
+        for match in IMAGE_SCANNER_RE.finditer(content):
+            url = match.group(match.lastindex) if match.lastindex else match.group(0)
+            found += 1
+            if url in seen:
+                continue
+            seen.add(url)
+            if self.is_image_url(url):
                 unique_urls.append(url)
         
-        logger.debug(
-            "Extracted image URLs from content",
-            total_found=len(image_urls),
-            valid_urls=len(unique_urls)
-        )
+        logger.debug(f"Extracted image URLs from content: {len(unique_urls)} valid of {found} found")
         
         return unique_urls
     
+    def replace_image_urls(self, content: str, url_mapping: Dict[str, str]) -> str:
+        """Swap original URLs for Ghost URLs in one pass over the content"""
+        if not url_mapping:
+            return content
+        
+        # Longest first so a URL never matches as a prefix of a longer one
+        pattern = re.compile('|'.join(
+            re.escape(url) for url in sorted(url_mapping, key=len, reverse=True)
+        ))
+        return pattern.sub(lambda match: url_mapping[match.group(0)], content)
+    
     def download_image(self, url: str) -> Tuple[bytes, str]:
-        """Download image from URL locally and return data with content type"""
+        """
+        Stream image from URL and return data with content type
+        
+        Rejects on headers (Content-Type, Content-Length) before reading the body,
+        stops reading once max_image_size is exceeded, and takes the content type
+        from the file's magic bytes rather than the server's header.
+        """
         try:
             logger.debug(f"Downloading image: {url}")
             
@@ -137,107 +301,185 @@ class ImageHandler:
                 'User-Agent': 'Reddit-Ghost-Publisher/1.0 (Image Processor)'
             }
             
-            response = requests.get(url, headers=headers, timeout=30, allow_redirects=True)
-            response.raise_for_status()
-            
-            # Check content type
-            content_type = response.headers.get('content-type', '').lower()
-            if not content_type.startswith('image/'):
-                # Try to guess from URL
-                parsed_url = urlparse(url)
-                guessed_type, _ = mimetypes.guess_type(parsed_url.path)
-                if guessed_type and guessed_type.startswith('image/'):
-                    content_type = guessed_type
-                else:
-                    raise ImageDownloadError(f"URL does not point to an image: {content_type}")
+            response = self._get_http_session().get(
+                url, headers=headers, timeout=30, allow_redirects=True, stream=True
+            )
+            try:
+                response.raise_for_status()
+                
+                # Check content type
+                content_type = response.headers.get('content-type', '').lower()
+                if not content_type.startswith('image/') and content_type not in GENERIC_CONTENT_TYPES:
+                    # Try to guess from URL
+                    parsed_url = urlparse(url)
+                    guessed_type, _ = mimetypes.guess_type(parsed_url.path)
+                    if guessed_type and guessed_type.startswith('image/'):
+                        content_type = guessed_type
+                    else:
+                        raise ImageDownloadError(f"URL does not point to an image: {content_type}")
+                
+                # Check declared size before transferring the body
+                declared_length = response.headers.get('content-length')
+                if declared_length and declared_length.isdigit() and int(declared_length) > self.max_image_size:
+                    raise ImageDownloadError(f"Image too large: {declared_length} bytes")
+                
+                buffer = bytearray()
+                sniffed_type = None
+                for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                    buffer.extend(chunk)
+                    if len(buffer) > self.max_image_size:
+                        raise ImageDownloadError(f"Image too large: more than {self.max_image_size} bytes")
+                    if sniffed_type is None and len(buffer) >= SNIFF_BYTES:
+                        sniffed_type = sniff_image_type(buffer)
+                        if sniffed_type is None:
+                            raise ImageDownloadError(f"Unsupported image data (declared {content_type})")
+            finally:
+                response.close()
             
-            # Check file size
-            content_length = len(response.content)
-            if content_length > self.max_image_size:
-                raise ImageDownloadError(f"Image too large: {content_length} bytes")
+            if sniffed_type is None:
+                # Body shorter than SNIFF_BYTES
+                sniffed_type = sniff_image_type(buffer)
+                if sniffed_type is None:
+                    raise ImageDownloadError(f"Unsupported image data (declared {content_type})")
             
-            logger.info(f"Image downloaded successfully: {url} ({content_length} bytes)")
+            logger.info(f"Image downloaded successfully: {url} ({len(buffer)} bytes, {sniffed_type})")
             
-            return response.content, content_type
+            return bytes(buffer), sniffed_type
             
         except requests.exceptions.RequestException as e:
             logger.error(f"Failed to download image {url}: {e}")
             raise ImageDownloadError(f"Failed to download image: {e}")
     
+    @staticmethod
+    def _resolve_output_format(output_format: str) -> str:
+        output_format = (output_format or 'webp').lower()
+        if output_format not in OUTPUT_FORMATS:
+            logger.warning(f"Unknown IMAGE_OUTPUT_FORMAT {output_format!r}; using webp")
+            return 'webp'
+        if output_format == 'avif' and not avif_supported():
+            logger.warning("AVIF encoding not available in Pillow; using webp")
+            return 'webp'
+        return output_format
+    
+    def _transcode_options(self) -> Tuple:
+        """transcode_image arguments after image_data and content_type"""
+        return (
+            self.max_dimensions,
+            self.format_quality[self.output_format],
+            self.output_format,
+            self.max_pixels,
+            settings.image_webp_method,
+            settings.image_avif_speed
+        )
+    
     def process_image(self, image_data: bytes, content_type: str) -> Tuple[bytes, str]:
         """Process image data (resize, optimize, etc.)"""
         try:
-            # Open image with PIL
-            image = Image.open(io.BytesIO(image_data))
-            
-            # Convert to RGB if necessary (for JPEG output)
-            if image.mode in ('RGBA', 'LA', 'P'):
-                # Create white background for transparent images
-                background = Image.new('RGB', image.size, (255, 255, 255))
-                if image.mode == 'P':
-                    image = image.convert('RGBA')
-                background.paste(image, mask=image.split()[-1] if image.mode == 'RGBA' else None)
-                image = background
-            elif image.mode != 'RGB':
-                image = image.convert('RGB')
-            
-            # Auto-orient based on EXIF data
-            image = ImageOps.exif_transpose(image)
-            
-            # Resize if too large
-            if image.size[0] > self.max_dimensions[0] or image.size[1] > self.max_dimensions[1]:
-                logger.debug(
-                    "Resizing image",
-                    original_size=image.size,
-                    max_dimensions=self.max_dimensions
-                )
-                image.thumbnail(self.max_dimensions, Image.Resampling.LANCZOS)
-            
-            # Save to bytes
-            output = io.BytesIO()
-            
-            # Determine output format
-            if content_type in ('image/png', 'image/gif'):
-                # Keep original format for PNG/GIF
-                if content_type == 'image/png':
-                    image.save(output, format='PNG', optimize=True)
-                    output_content_type = 'image/png'
-                else:
-                    # For GIF, convert to PNG to avoid animation issues
-                    image.save(output, format='PNG', optimize=True)
-                    output_content_type = 'image/png'
-            else:
-                # Convert to JPEG for other formats
-                image.save(output, format='JPEG', quality=self.quality, optimize=True)
-                output_content_type = 'image/jpeg'
-            
-            processed_data = output.getvalue()
-            
-            logger.debug(
-                "Image processed successfully",
-                original_size=len(image_data),
-                processed_size=len(processed_data),
-                dimensions=image.size,
-                output_format=output_content_type
-            )
-            
-            return processed_data, output_content_type
-            
+            processed_data, output_content_type = transcode_image(image_data, content_type, *self._transcode_options())
+        except Exception as e:
+            logger.error(f"Failed to process image: {e}")
+            raise ImageProcessingError(f"Failed to process image: {e}")
+        
+        logger.debug(
+            f"Image processed successfully: {len(image_data)} -> {len(processed_data)} bytes "
+            f"({output_content_type})"
+        )
+        
+        return processed_data, output_content_type
+    
+    def _process_image_offloaded(self, image_data: bytes, content_type: str) -> Tuple[bytes, str]:
+        """Run process_image in the process pool, or in this thread if no pool is available"""
+        pool = self._get_process_pool()
+        if pool is None:
+            return self.process_image(image_data, content_type)
+        
+        try:
+            future = pool.submit(transcode_image, image_data, content_type, *self._transcode_options())
+        except (AssertionError, BrokenProcessPool, OSError, RuntimeError) as e:
+            # e.g. daemonic Celery prefork children may not start child processes
+            logger.warning(f"Image process pool unavailable, processing in-thread: {e}")
+            self._disable_process_pool()
+            return self.process_image(image_data, content_type)
+        
+        try:
+            return future.result()
+        except BrokenProcessPool as e:
+            logger.warning(f"Image process pool broke, processing in-thread: {e}")
+            self._disable_process_pool()
+            return self.process_image(image_data, content_type)
         except Exception as e:
-            logger.error("Failed to process image", error=str(e))
+            logger.error(f"Failed to process image: {e}")
             raise ImageProcessingError(f"Failed to process image: {e}")
     
-    def generate_filename(self, url: str, content_type: str) -> str:
-        """Generate a filename for the image"""
-        # Create hash of URL for uniqueness
-        url_hash = hashlib.md5(url.encode()).hexdigest()[:8]
+    def _reset_pools_after_fork(self) -> None:
+        """Drop sessions and pools inherited from a parent process (caller holds _pool_lock)"""
+        pid = os.getpid()
+        if self._pool_pid != pid:
+            self._http_session = None
+            self._process_pool = None
+            self._process_pool_disabled = False
+            self._pool_pid = pid
+    
+    def _get_http_session(self) -> requests.Session:
+        """Pooled keep-alive session for image downloads, one per process"""
+        with self._pool_lock:
+            self._reset_pools_after_fork()
+            if self._http_session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=self.concurrency)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                self._http_session = session
+            return self._http_session
+    
+    def _get_process_pool(self) -> Optional[ProcessPoolExecutor]:
+        """Process pool for PIL work, or None when disabled (IMAGE_PROCESS_WORKERS=0)"""
+        if self.process_workers <= 0:
+            return None
+        with self._pool_lock:
+            self._reset_pools_after_fork()
+            if self._process_pool_disabled:
+                return None
+            if self._process_pool is None:
+                self._process_pool = ProcessPoolExecutor(
+                    max_workers=self.process_workers,
+                    mp_context=_process_pool_context()
+                )
+            return self._process_pool
+    
+    def _disable_process_pool(self) -> None:
+        with self._pool_lock:
+            pool = self._process_pool
+            self._process_pool = None
+            self._process_pool_disabled = True
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+    
+    def close(self) -> None:
+        """Close the download session and stop worker processes"""
+        with self._pool_lock:
+            owned = self._pool_pid == os.getpid()
+            session, pool = self._http_session, self._process_pool
+            self._http_session = None
+            self._process_pool = None
+            self._pool_pid = None
+        if owned and session is not None:
+            session.close()
+        if owned and pool is not None:
+            pool.shutdown(wait=True)
+    
+    def generate_filename(self, url: str, content_type: str, sha256: Optional[str] = None) -> str:
+        """Generate a filename for the image (content hash when known, else URL hash)"""
+        # Create hash for uniqueness
+        url_hash = sha256[:8] if sha256 else hashlib.md5(url.encode()).hexdigest()[:8]
         
         # Get extension from content type
         extension_map = {
             'image/jpeg': '.jpg',
             'image/png': '.png',
             'image/gif': '.gif',
-            'image/webp': '.webp'
+            'image/webp': '.webp',
+            'image/avif': '.avif'
         }
         
         extension = extension_map.get(content_type, '.jpg')
@@ -250,15 +492,15 @@ class ImageHandler:
             # Use the last part of the path
             base_name = path_parts[-1]
             # Remove existing extension
-            base_name = re.sub(r'\.[^.]+$', '', base_name)
+            base_name = FILENAME_EXTENSION_RE.sub('', base_name)
             # Clean up the name
-            base_name = re.sub(r'[^a-zA-Z0-9_-]', '_', base_name)[:20]
+            base_name = FILENAME_UNSAFE_RE.sub('_', base_name)[:20]
         else:
             base_name = 'reddit_image'
         
         return f"{base_name}_{url_hash}{extension}"
     
-    def upload_to_ghost(self, image_data: bytes, filename: str) -> str:
+    def upload_to_ghost(self, image_data: bytes, filename: str, content_type: str = 'image/jpeg') -> str:
         """Upload image to Ghost Images API and return CDN URL"""
         if not self.ghost_client:
             raise ImageUploadError("Ghost client not initialized")
@@ -266,7 +508,7 @@ class ImageHandler:
         try:
             logger.debug(f"Uploading image to Ghost: {filename} ({len(image_data)} bytes)")
             
-            cdn_url = self.ghost_client.upload_image(image_data, filename)
+            cdn_url = self.ghost_client.upload_image(image_data, filename, content_type)
             
             logger.info(f"Image uploaded to Ghost successfully: {cdn_url}")
             
@@ -276,20 +518,46 @@ class ImageHandler:
             logger.error(f"Failed to upload image to Ghost {filename}: {e}")
             raise ImageUploadError(f"Failed to upload image to Ghost: {e}")
     
-    def process_and_upload_image(self, url: str) -> Optional[str]:
+    def process_and_upload_image(self, url: str, post_id: Optional[str] = None) -> Optional[str]:
         """Download, process, and upload a single image with fallback"""
         try:
+            # Already hosted under this source URL: no transfer at all
+            if self.dedup_enabled:
+                cached_url = self.dedup_cache.get_by_url(url)
+                if cached_url:
+                    logger.info(f"Image already on Ghost, skipping download: {url}")
+                    self.dedup_cache.store(url, cached_url, post_id=post_id)
+                    return cached_url
+            
             # Download image
             image_data, content_type = self.download_image(url)
             
-            # Process image
-            processed_data, processed_content_type = self.process_image(image_data, content_type)
+            # Same bytes already hosted under another URL: skip processing and upload
+            sha256 = content_sha256(image_data)
+            if self.dedup_enabled:
+                cached_url = self.dedup_cache.get_by_hash(sha256)
+                if cached_url:
+                    logger.info(f"Identical image already on Ghost, skipping upload: {url}")
+                    self.dedup_cache.store(url, cached_url, sha256=sha256, post_id=post_id)
+                    return cached_url
+            
+            # Process image (CPU-bound; runs in the process pool)
+            processed_data, processed_content_type = self._process_image_offloaded(image_data, content_type)
             
             # Generate filename
-            filename = self.generate_filename(url, processed_content_type)
+            filename = self.generate_filename(url, processed_content_type, sha256)
             
             # Upload to Ghost
-            cdn_url = self.upload_to_ghost(processed_data, filename)
+            cdn_url = self.upload_to_ghost(processed_data, filename, processed_content_type)
+            
+            if self.dedup_enabled:
+                self.dedup_cache.store(
+                    url, cdn_url,
+                    sha256=sha256,
+                    post_id=post_id,
+                    file_type=processed_content_type,
+                    file_size=len(processed_data)
+                )
             
             return cdn_url
             
@@ -300,7 +568,22 @@ class ImageHandler:
             logger.error(f"Unexpected error processing image {url}: {e}")
             return None
     
-    def process_content_images(self, content: str) -> Tuple[str, Dict[str, str]]:
+    def process_images(self, urls: List[str], post_id: Optional[str] = None) -> List[Optional[str]]:
+        """
+        Download, process and upload several images with bounded concurrency
+        
+        Returns CDN URLs in the same order as urls (None for images that failed)
+        """
+        process = partial(self.process_and_upload_image, post_id=post_id)
+        if len(urls) <= 1 or self.concurrency <= 1:
+            return [process(url) for url in urls]
+        
+        workers = min(self.concurrency, len(urls))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="image-pipeline") as executor:
+            # process_and_upload_image never raises, so one bad image cannot fail the batch
+            return list(executor.map(process, urls))
+    
+    def process_content_images(self, content: str, post_id: Optional[str] = None) -> Tuple[str, Dict[str, str]]:
         """Process all images in content and return updated content with URL mapping"""
         if not content:
             return content, {}
@@ -314,12 +597,11 @@ class ImageHandler:
         
         logger.info(f"Processing {len(image_urls)} images from content")
         
-        # Process images sequentially (MVP - no concurrency)
+        # Process images concurrently; results keep the order of image_urls
         url_mapping = {}
         successful_uploads = 0
         
-        for url in image_urls:
-            cdn_url = self.process_and_upload_image(url)
+        for url, cdn_url in zip(image_urls, self.process_images(image_urls, post_id)):
             if cdn_url:
                 url_mapping[url] = cdn_url
                 successful_uploads += 1
@@ -327,9 +609,7 @@ class ImageHandler:
         logger.info(f"Image processing completed: {successful_uploads}/{len(image_urls)} successful")
         
         # Replace URLs in content
-        updated_content = content
-        for original_url, cdn_url in url_mapping.items():
-            updated_content = updated_content.replace(original_url, cdn_url)
+        updated_content = self.replace_image_urls(content, url_mapping)
         
         return updated_content, url_mapping
     
@@ -352,7 +632,7 @@ class ImageHandler:
             
             logger.info(f"Processing feature image: {first_image_url}")
             
-            cdn_url = self.process_and_upload_image(first_image_url)
+            cdn_url = self.process_and_upload_image(first_image_url, post_data.get('id'))
             
             if cdn_url:
                 logger.info(f"Feature image processed successfully: {cdn_url}")
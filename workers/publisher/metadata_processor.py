@@ -8,10 +8,10 @@ import re
 import json
 import hashlib
 from typing import Dict, List, Optional, Any
-from datetime import datetime
 import logging
 
-from workers.publisher.ghost_client import GhostClient, GhostAPIError
+from workers.publisher.ghost_client import GhostClient
+from workers.publisher.ghost_tag_index import get_ghost_tag_index
 from app.config import settings
 
 logger = logging.getLogger(__name__)
@@ -22,9 +22,8 @@ class MetadataProcessor:
     
     def __init__(self, ghost_client: Optional[GhostClient] = None):
         self.ghost_client = ghost_client
-        self._tag_cache = {}
-        self._tag_cache_timestamp = None
-        self._cache_ttl = 3600  # 1 hour
+        # Tag name -> id index shared with every publisher worker through Redis
+        self.tag_index = get_ghost_tag_index()
         
         # Tag normalization rules for MVP (simplified)
         self.tag_normalizations = {
@@ -135,73 +134,26 @@ class MetadataProcessor:
         return content_hash
     
     def get_existing_ghost_tags(self) -> Dict[str, str]:
-        """Get existing tags from Ghost CMS with caching (MVP - synchronous)"""
-        now = datetime.now()
-        
-        # Check cache
-        if (self._tag_cache and self._tag_cache_timestamp and 
-            (now - self._tag_cache_timestamp).seconds < self._cache_ttl):
-            return self._tag_cache
-        
+        """Get existing Ghost tags (lowercase name -> id) from the shared tag index"""
         if not self.ghost_client:
             logger.warning("Ghost client not available for tag fetching")
             return {}
         
         try:
-            tags = self.ghost_client.get_tags()
-            
-            # Build name -> id mapping
-            tag_mapping = {}
-            for tag in tags:
-                tag_name = tag.get('name', '').lower()
-                tag_id = tag.get('id')
-                if tag_name and tag_id:
-                    tag_mapping[tag_name] = tag_id
-            
-            # Update cache
-            self._tag_cache = tag_mapping
-            self._tag_cache_timestamp = now
-            
-            logger.debug(f"Fetched {len(tag_mapping)} existing Ghost tags")
-            
-            return tag_mapping
-            
+            return self.tag_index.get_all(self.ghost_client)
         except Exception as e:
             logger.error(f"Failed to fetch Ghost tags: {e}")
             return {}
     
     def create_missing_tags(self, tag_names: List[str]) -> Dict[str, str]:
-        """Create missing tags in Ghost CMS (MVP - synchronous)"""
+        """Create missing tags in Ghost CMS, each at most once across workers
+        
+        Returns lowercase name -> id for all of tag_names that exist in Ghost.
+        """
         if not self.ghost_client:
             return {}
         
-        existing_tags = self.get_existing_ghost_tags()
-        created_tags = {}
-        
-        for tag_name in tag_names:
-            normalized_name = tag_name.lower()
-            
-            if normalized_name not in existing_tags:
-                try:
-                    # Create the tag
-                    created_tag = self.ghost_client.create_tag(
-                        name=tag_name,
-                        description=f"Auto-generated tag from Reddit content"
-                    )
-                    
-                    tag_id = created_tag.get('id')
-                    if tag_id:
-                        created_tags[normalized_name] = tag_id
-                        # Update cache
-                        self._tag_cache[normalized_name] = tag_id
-                        
-                        logger.info(f"Created new Ghost tag: {tag_name}")
-                
-                except GhostAPIError as e:
-                    logger.warning(f"Failed to create Ghost tag {tag_name}: {e}")
-                    continue
-        
-        return created_tags
+        return self.tag_index.create_missing(self.ghost_client, tag_names)
     
     def map_llm_tags_to_ghost(self, llm_tags: Any) -> List[str]:
         """Map LLM tags to Ghost tag names (MVP - simplified)"""
@@ -0,0 +1,91 @@
+"""
+Rendered HTML cache for post content
+
+Maps a post's content_hash to the sanitized HTML produced from its Markdown,
+so republishing or updating a post whose body has not changed skips Markdown
+rendering and sanitizing. A small in-process LRU sits in front of Redis, which
+shares entries between publisher workers.
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+import redis
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "render:html:"
+
+
+class RenderCache:
+    """content_hash -> rendered HTML (process LRU first, then Redis)"""
+
+    def __init__(self, namespace: str):
+        # namespace identifies the Markdown pipeline; changing it invalidates old entries
+        self.namespace = namespace
+        self.enabled = settings.template_render_cache_enabled
+        self.ttl = settings.template_render_cache_ttl
+        self.max_local = settings.template_render_cache_size
+        self._local: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._redis_client = None
+
+    def _get_redis(self):
+        if self._redis_client is None:
+            self._redis_client = redis.from_url(settings.redis_url, decode_responses=True)
+        return self._redis_client
+
+    def _key(self, content_hash: str) -> str:
+        return f"{KEY_PREFIX}{self.namespace}:{content_hash}"
+
+    def _remember(self, key: str, html: str) -> None:
+        if self.max_local <= 0:
+            return
+        with self._lock:
+            self._local[key] = html
+            self._local.move_to_end(key)
+            while len(self._local) > self.max_local:
+                self._local.popitem(last=False)
+
+    def get(self, content_hash: str) -> Optional[str]:
+        """Cached HTML for this content, or None"""
+        if not self.enabled or not content_hash:
+            return None
+
+        key = self._key(content_hash)
+        with self._lock:
+            html = self._local.get(key)
+            if html is not None:
+                self._local.move_to_end(key)
+                return html
+
+        try:
+            html = self._get_redis().get(key)
+        except Exception as e:
+            logger.warning(f"Render cache Redis lookup failed: {e}")
+            return None
+
+        if html is not None:
+            self._remember(key, html)
+        return html
+
+    def set(self, content_hash: str, html: str) -> None:
+        """Store rendered HTML for this content"""
+        if not self.enabled or not content_hash:
+            return
+
+        key = self._key(content_hash)
+        self._remember(key, html)
+        try:
+            self._get_redis().set(key, html, ex=self.ttl)
+        except Exception as e:
+            logger.warning(f"Render cache Redis update failed: {e}")
+
+    def clear_local(self) -> None:
+        """Drop the in-process entries (Redis entries expire on their own)"""
+        with self._lock:
+            self._local.clear()
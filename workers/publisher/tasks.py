@@ -11,11 +11,11 @@ import hashlib
 
 from celery import current_task
 from celery.exceptions import Retry
-from sqlalchemy.orm import sessionmaker
-from sqlalchemy import create_engine, text
+from sqlalchemy import text
 
 from app.celery_app import celery_app
 from app.config import settings
+from app.infrastructure import get_database_session
 from app.transaction_manager import transaction_with_tracking, get_state_manager
 from workers.publisher.ghost_client import get_ghost_client, GhostClient, GhostPost, GhostAPIError
 from workers.publisher.template_engine import get_template_engine
@@ -39,10 +39,7 @@ def log_processing_step(
 ):
     """Log a processing step to the database (MVP - synchronous)"""
     try:
-        engine = create_engine(settings.database_url)
-        Session = sessionmaker(bind=engine)
-        
-        with Session() as session:
+        with get_database_session() as session:
             session.execute(
                 text("""
                 INSERT INTO processing_logs (post_id, service_name, status, error_message, processing_time_ms, created_at)
@@ -66,10 +63,7 @@ def log_processing_step(
 def update_post_status(post_id: str, **kwargs):
     """Update post fields in database (MVP - synchronous)"""
     try:
-        engine = create_engine(settings.database_url)
-        Session = sessionmaker(bind=engine)
-        
-        with Session() as session:
+        with get_database_session() as session:
             # Update post with provided fields
             update_fields = {"updated_at": datetime.utcnow()}
             update_fields.update(kwargs)
@@ -92,10 +86,7 @@ def update_post_status(post_id: str, **kwargs):
 def get_post_data(post_id: str) -> Dict[str, Any]:
     """Get post data from database"""
     try:
-        engine = create_engine(settings.database_url)
-        Session = sessionmaker(bind=engine)
-        
-        with Session() as session:
+        with get_database_session() as session:
             result = session.execute(
                 text("SELECT * FROM posts WHERE id = :post_id"),
                 {"post_id": post_id}
@@ -164,7 +155,7 @@ def publish_to_ghost(self, post_id: str) -> Dict[str, Any]:
         logger.debug(f"Processing images for post: {post_id}")
         
         content = post_data.get('content', '')
-        updated_content, image_mapping = image_handler.process_content_images(content)
+        updated_content, image_mapping = image_handler.process_content_images(content, post_id)
         
         # Get feature image (with fallback to default OG image)
         feature_image_url = image_handler.get_feature_image(post_data)
@@ -182,7 +173,7 @@ def publish_to_ghost(self, post_id: str) -> Dict[str, Any]:
         # 6. Render content using Article template
         logger.debug(f"Rendering template for post: {post_id}")
         
-        rendered_html = template_engine.render_article(post_data)
+        rendered_html = template_engine.render_article(post_data, metadata.get('content_hash'))
         
         # 7. Create Ghost post object
         ghost_post = GhostPost(
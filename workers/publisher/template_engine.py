@@ -1,73 +1,80 @@
 """
 Content Template System for Ghost CMS Publishing (MVP Version)
 
-Handles Article template rendering, Markdown to HTML conversion,
-and automatic source attribution for Reddit content.
+Handles template selection (per subreddit or post type) and rendering,
+Markdown to HTML conversion, and automatic source attribution for Reddit content.
 """
 
+import hashlib
+import html as html_lib
 import re
-from typing import Dict, Any
+import threading
+from enum import Enum
+from html.parser import HTMLParser
+from typing import Dict, Any, List, Optional
 from pathlib import Path
 import logging
 
 import markdown
-from pybars import Compiler
 
 from app.config import settings
+from workers.publisher.render_cache import RenderCache
+from workers.publisher.template_registry import TemplateRegistry
+
+try:
+    from markdown_it import MarkdownIt
+except ImportError:  # optional faster CommonMark backend
+    MarkdownIt = None
 
 logger = logging.getLogger(__name__)
 
+# Bump when the Markdown pipeline or sanitizer output changes to invalidate cached HTML
+RENDER_PIPELINE_VERSION = 2
 
-class TemplateEngine:
-    """Simplified template engine for Ghost CMS content (MVP - Article template only)"""
-    
-    def __init__(self, templates_dir: str = "templates"):
-        self.templates_dir = Path(templates_dir)
-        self.compiler = Compiler()
-        self._article_template = None
-        self._markdown = markdown.Markdown(
-            extensions=[
-                'markdown.extensions.extra',
-                'markdown.extensions.codehilite',
-                'markdown.extensions.nl2br'
-            ],
-            extension_configs={
-                'codehilite': {
-                    'css_class': 'highlight',
-                    'use_pygments': True
-                }
-            }
-        )
-        
-        # Load article template on initialization
-        self._load_article_template()
-    
-    def _load_article_template(self):
-        """Load the Article template (MVP - single template only)"""
-        try:
-            template_file = self.templates_dir / "article.hbs"
-            
-            if template_file.exists():
-                with open(template_file, 'r', encoding='utf-8') as f:
-                    template_content = f.read()
-                
-                # Compile the template
-                self._article_template = self.compiler.compile(template_content)
-                
-                logger.info(f"Article template loaded successfully: {template_file}")
-            else:
-                logger.warning(f"Article template file not found: {template_file}")
-                # Create a default template if file doesn't exist
-                self._create_default_template()
-                
-        except Exception as e:
-            logger.error(f"Failed to load article template: {e}")
-            # Create a fallback template
-            self._create_default_template()
-    
-    def _create_default_template(self):
-        """Create a default article template if none exists"""
-        default_template = '''
+ALLOWED_TAGS = frozenset({
+    'a', 'abbr', 'b', 'blockquote', 'br', 'code', 'dd', 'del', 'div', 'dl', 'dt',
+    'em', 'figcaption', 'figure', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'hr', 'i',
+    'img', 'li', 'ol', 'p', 'pre', 's', 'span', 'strong', 'sub', 'sup', 'table',
+    'tbody', 'td', 'tfoot', 'th', 'thead', 'tr', 'ul'
+})
+ALLOWED_ATTRIBUTES = {
+    'a': frozenset({'href', 'title', 'rel', 'target'}),
+    'abbr': frozenset({'title'}),
+    'code': frozenset({'class'}),
+    'div': frozenset({'class'}),
+    'img': frozenset({'src', 'alt', 'title', 'width', 'height', 'loading'}),
+    'ol': frozenset({'start'}),
+    'pre': frozenset({'class'}),
+    'span': frozenset({'class'}),
+    'td': frozenset({'style', 'colspan', 'rowspan'}),
+    'th': frozenset({'style', 'colspan', 'rowspan'}),
+}
+URL_ATTRIBUTES = frozenset({'href', 'src'})
+VOID_TAGS = frozenset({'br', 'hr', 'img'})
+# Dropped together with everything inside them
+DROP_CONTENT_TAGS = frozenset({'script', 'style', 'iframe', 'object', 'embed', 'noscript', 'template', 'textarea'})
+
+SAFE_URL_RE = re.compile(r'^(?:https?:|mailto:|[^:/?#]*(?:[/?#]|$))', re.IGNORECASE)
+TABLE_ALIGN_RE = re.compile(r'^\s*text-align\s*:\s*(?:left|right|center)\s*;?\s*$', re.IGNORECASE)
+WHITESPACE_RE = re.compile(r'\s+')
+
+QUESTION_TITLE_RE = re.compile(
+    r'\?\s*$|^\s*(?:\[[^\]]*\]\s*)?(?:how|what|why|when|where|which|who|is|are|can|could|should|does|eli5)\b',
+    re.IGNORECASE
+)
+LIST_TITLE_RE = re.compile(r'^\s*(?:top\s+)?\d+\s+\w', re.IGNORECASE)
+LIST_ITEM_RE = re.compile(r'^\s*(?:\d+[.)]|[-*+])\s+(.+?)\s*$', re.MULTILINE)
+MIN_LIST_ITEMS = 3
+
+
+class TemplateType(Enum):
+    """Built-in post types, each rendered with templates/<value>.hbs"""
+    ARTICLE = "article"
+    LIST = "list"
+    QA = "qa"
+
+
+DEFAULT_ARTICLE_TEMPLATE = '''
 <article class="reddit-article">
     <header>
         <h1>{{title}}</h1>
@@ -118,56 +125,221 @@ class TemplateEngine:
         {{/if}}
     </div>
 </article>
-        '''
+'''.strip()
+
+
+class _AllowlistSanitizer(HTMLParser):
+    """Single-pass HTML sanitizer: keeps allowlisted tags/attributes, escapes text, balances tags"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.out = []
+        self.open_tags = []
+        self.drop_depth = 0
+        self.pre_depth = 0
+
+    def _attributes(self, tag, attrs):
+        allowed = ALLOWED_ATTRIBUTES.get(tag)
+        if not allowed:
+            return ''
+        parts = []
+        for name, value in attrs:
+            if name not in allowed:
+                continue
+            value = value or ''
+            if name in URL_ATTRIBUTES and not SAFE_URL_RE.match(value.strip()):
+                continue
+            if name == 'style' and not TABLE_ALIGN_RE.match(value):
+                continue
+            parts.append(f' {name}="{html_lib.escape(value, quote=True)}"')
+        return ''.join(parts)
+
+    def handle_starttag(self, tag, attrs):
+        if tag in DROP_CONTENT_TAGS:
+            self.drop_depth += 1
+            return
+        if self.drop_depth or tag not in ALLOWED_TAGS:
+            return
+        self.out.append(f'<{tag}{self._attributes(tag, attrs)}>')
+        if tag in VOID_TAGS:
+            return
+        self.open_tags.append(tag)
+        if tag == 'pre':
+            self.pre_depth += 1
+
+    def handle_startendtag(self, tag, attrs):
+        if tag in DROP_CONTENT_TAGS or self.drop_depth or tag not in ALLOWED_TAGS:
+            return
+        self.out.append(f'<{tag}{self._attributes(tag, attrs)}>')
+        if tag not in VOID_TAGS:
+            self.out.append(f'</{tag}>')
+
+    def handle_endtag(self, tag):
+        if tag in DROP_CONTENT_TAGS:
+            self.drop_depth = max(self.drop_depth - 1, 0)
+            return
+        if self.drop_depth or tag not in self.open_tags:
+            return
+        # Close anything left open inside this element
+        while self.open_tags:
+            open_tag = self.open_tags.pop()
+            self.out.append(f'</{open_tag}>')
+            if open_tag == 'pre':
+                self.pre_depth -= 1
+            if open_tag == tag:
+                break
+
+    def handle_data(self, data):
+        if self.drop_depth:
+            return
+        if not self.pre_depth:
+            data = WHITESPACE_RE.sub(' ', data)
+        self.out.append(html_lib.escape(data, quote=False))
+
+    def result(self):
+        self.close()
+        while self.open_tags:
+            self.out.append(f'</{self.open_tags.pop()}>')
+        return ''.join(self.out).strip()
+
+
+def sanitize_html(html: str) -> str:
+    """Allowlist-sanitize HTML in one pass (drops scripts, event handlers and unsafe URLs)"""
+    if not html:
+        return ""
+    parser = _AllowlistSanitizer()
+    parser.feed(html)
+    return parser.result()
+
+
+class TemplateEngine:
+    """Template engine for Ghost CMS content: picks a compiled template per subreddit or post type"""
+    
+    def __init__(self, templates_dir: str = "templates"):
+        self.templates_dir = Path(templates_dir)
+        
+        # markdown-it renders are stateless and safe to share between threads;
+        # python-markdown keeps per-document state, so it gets one instance per thread
+        self._markdown_it = None
+        self._markdown_local = threading.local()
+        if MarkdownIt is not None:
+            # Raw HTML passes through to the allowlist sanitizer, as with python-markdown
+            self._markdown_it = MarkdownIt('commonmark', {'breaks': True, 'html': True}).enable(['table', 'strikethrough'])
+        self.markdown_backend = 'markdown-it' if self._markdown_it else 'python-markdown'
+        self._render_cache = RenderCache(f"{self.markdown_backend}-v{RENDER_PIPELINE_VERSION}")
         
-        self._article_template = self.compiler.compile(default_template.strip())
-        logger.info("Default article template created")
+        # Every .hbs under templates_dir is compiled here, not per render
+        reload_interval = settings.template_reload_interval if settings.template_reload_enabled else 0
+        self.registry = TemplateRegistry(self.templates_dir, reload_interval=reload_interval)
+        if not self.registry.has(TemplateType.ARTICLE.value):
+            logger.warning(f"Article template not found in {self.templates_dir}; using the built-in default until one is added")
+        self.registry.register_builtin(TemplateType.ARTICLE.value, DEFAULT_ARTICLE_TEMPLATE)
+        
+        self.subreddit_templates = self._parse_subreddit_map(settings.template_subreddit_map)
+    
+    @staticmethod
+    def _parse_subreddit_map(value: str) -> Dict[str, str]:
+        """Parse "askreddit:qa,python:subreddits/python" into {subreddit: template name}"""
+        mapping = {}
+        for pair in (value or '').split(','):
+            subreddit, sep, name = pair.partition(':')
+            if sep and subreddit.strip() and name.strip():
+                mapping[subreddit.strip().lower()] = name.strip()
+        return mapping
+    
+    def _detect_template_type(self, post_data: Dict[str, Any]) -> TemplateType:
+        """Guess the post type from its title and body"""
+        title = post_data.get('title') or ''
+        
+        if QUESTION_TITLE_RE.search(title):
+            return TemplateType.QA
+        
+        if LIST_TITLE_RE.match(title):
+            if len(LIST_ITEM_RE.findall(post_data.get('content') or '')) >= MIN_LIST_ITEMS:
+                return TemplateType.LIST
+        
+        return TemplateType.ARTICLE
     
-    def markdown_to_html(self, markdown_text: str) -> str:
-        """Convert Markdown text to HTML"""
+    def select_template(self, post_data: Dict[str, Any]) -> str:
+        """Template name for a post
+        
+        Order: TEMPLATE_SUBREDDIT_MAP, templates/subreddits/<subreddit>.hbs,
+        the detected post type (when enabled and its template exists), article.
+        """
+        subreddit = (post_data.get('subreddit') or '').lower()
+        if subreddit:
+            mapped = self.subreddit_templates.get(subreddit)
+            if mapped:
+                if self.registry.has(mapped):
+                    return mapped
+                logger.warning(f"Template '{mapped}' mapped to r/{subreddit} not found")
+            
+            name = f"subreddits/{subreddit}"
+            if self.registry.has(name):
+                return name
+        
+        if settings.template_type_detection:
+            name = self._detect_template_type(post_data).value
+            if self.registry.has(name):
+                return name
+        
+        return TemplateType.ARTICLE.value
+    
+    def get_available_templates(self) -> List[str]:
+        """Names of the templates that can currently be rendered"""
+        return self.registry.names()
+    
+    def reload_templates(self) -> List[str]:
+        """Recompile changed templates now instead of waiting for the reloader"""
+        return self.registry.reload()
+    
+    def _get_python_markdown(self) -> markdown.Markdown:
+        md = getattr(self._markdown_local, 'md', None)
+        if md is None:
+            # Fenced code keeps its language class; highlighting is left to the Ghost theme
+            md = markdown.Markdown(extensions=['markdown.extensions.extra', 'markdown.extensions.nl2br'])
+            self._markdown_local.md = md
+        return md
+    
+    def _render_markdown(self, markdown_text: str) -> str:
+        if self._markdown_it is not None:
+            return self._markdown_it.render(markdown_text)
+        md = self._get_python_markdown()
+        md.reset()
+        return md.convert(markdown_text)
+    
+    def markdown_to_html(self, markdown_text: str, content_hash: Optional[str] = None) -> str:
+        """Convert Markdown text to sanitized HTML, reusing cached output for the same content
+        
+        content_hash identifies the post body (see MetadataProcessor.generate_content_hash);
+        without it the Markdown text itself is hashed.
+        """
         if not markdown_text:
             return ""
         
+        cache_key = content_hash or hashlib.sha256(markdown_text.encode('utf-8')).hexdigest()
+        cached = self._render_cache.get(cache_key)
+        if cached is not None:
+            logger.debug(f"Rendered HTML cache hit: {cache_key[:8]}...")
+            return cached
+        
         try:
-            # Reset the markdown instance to clear any previous state
-            self._markdown.reset()
+            html = self._clean_html(self._render_markdown(markdown_text))
             
-            # Convert markdown to HTML
-            html = self._markdown.convert(markdown_text)
-            
-            # Clean up the HTML
-            html = self._clean_html(html)
-            
-            logger.debug(
-                "Markdown converted to HTML",
-                input_length=len(markdown_text),
-                output_length=len(html)
-            )
-            
-            return html
+            logger.debug(f"Markdown converted to HTML ({self.markdown_backend}): {len(markdown_text)} -> {len(html)} chars")
             
         except Exception as e:
-            logger.error("Failed to convert markdown to HTML", error=str(e))
-            # Return the original text wrapped in a paragraph as fallback
-            return f"<p>{markdown_text}</p>"
-    
-    def _clean_html(self, html: str) -> str:
-        """Clean and sanitize HTML content"""
-        # Remove any script tags for security
-        html = re.sub(r'<script[^>]*>.*?</script>', '', html, flags=re.DOTALL | re.IGNORECASE)
-        
-        # Remove any style tags
-        html = re.sub(r'<style[^>]*>.*?</style>', '', html, flags=re.DOTALL | re.IGNORECASE)
-        
-        # Remove any onclick or other event handlers
-        html = re.sub(r'\s*on\w+\s*=\s*["\'][^"\']*["\']', '', html, flags=re.IGNORECASE)
-        
-        # Clean up extra whitespace
-        html = re.sub(r'\s+', ' ', html)
-        html = html.strip()
+            logger.error(f"Failed to convert markdown to HTML: {e}")
+            # Return the original text escaped and wrapped in a paragraph as fallback
+            return f"<p>{html_lib.escape(markdown_text)}</p>"
         
+        self._render_cache.set(cache_key, html)
         return html
     
+    def _clean_html(self, html: str) -> str:
+        """Clean and sanitize HTML content (single allowlist pass)"""
+        return sanitize_html(html)
+    
     def _add_source_attribution(self, content: str, reddit_url: str) -> str:
         """Add fixed source attribution as required by MVP
         
@@ -183,8 +355,24 @@ class TemplateEngine:
         # Always append at the end
         return content + source_html
     
-    def _prepare_template_data(self, post_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Prepare data for Article template rendering (MVP - single template)"""
+    def _extract_list_items(self, content: str) -> List[str]:
+        """List items from numbered/bulleted lines, else from paragraphs"""
+        if not content:
+            return []
+        
+        items = LIST_ITEM_RE.findall(content)
+        if items:
+            return items
+        
+        return [paragraph.strip() for paragraph in content.split('\n\n') if paragraph.strip()]
+    
+    def _prepare_template_data(
+        self,
+        post_data: Dict[str, Any],
+        template_type: TemplateType = TemplateType.ARTICLE,
+        content_hash: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Prepare data for template rendering (common fields plus list items or answers by type)"""
         # Base data for article template
         template_data = {
             'title': post_data.get('title', ''),
@@ -198,7 +386,7 @@ class TemplateEngine:
         # Convert content from markdown to HTML if needed
         raw_content = post_data.get('content', '')
         if raw_content:
-            template_data['content'] = self.markdown_to_html(raw_content)
+            template_data['content'] = self.markdown_to_html(raw_content, content_hash)
         
         # Process pain points and product ideas (JSON fields from DB)
         pain_points = post_data.get('pain_points')
@@ -227,42 +415,68 @@ class TemplateEngine:
                 product_ideas = list(product_ideas.values()) if product_ideas else []
             template_data['product_ideas'] = product_ideas
         
+        if template_type == TemplateType.LIST:
+            template_data['items'] = self._extract_list_items(raw_content)
+        elif template_type == TemplateType.QA:
+            template_data['top_answers'] = [
+                {
+                    'content': self.markdown_to_html(answer.get('content', '')),
+                    'score': answer.get('score', 0)
+                }
+                for answer in post_data.get('top_answers') or []
+            ]
+        
         return template_data
     
-    def render_article(self, post_data: Dict[str, Any]) -> str:
-        """Render content using the Article template (MVP - single template only)"""
+    def render_article(
+        self,
+        post_data: Dict[str, Any],
+        content_hash: Optional[str] = None,
+        template_name: Optional[str] = None
+    ) -> str:
+        """Render a post with its selected template (or template_name)
+        
+        Pass the post's content_hash to reuse HTML rendered for an unchanged body.
+        """
         try:
-            if not self._article_template:
-                raise ValueError("Article template not available")
+            name = template_name or self.select_template(post_data)
+            template = self.registry.get(name)
+            if template is None:
+                raise ValueError(f"Template not available: {name}")
+            
+            try:
+                template_type = TemplateType(name)
+            except ValueError:
+                template_type = self._detect_template_type(post_data)
             
             # Prepare template data
-            template_data = self._prepare_template_data(post_data)
+            template_data = self._prepare_template_data(post_data, template_type, content_hash)
             
             # Render the template
-            rendered_content = self._article_template(template_data)
+            rendered_content = template(template_data)
             
             # Add fixed source attribution
             reddit_url = post_data.get('reddit_url', post_data.get('url', ''))
             final_content = self._add_source_attribution(rendered_content, reddit_url)
             
-            logger.info(f"Article template rendered successfully: {post_data.get('title', '')[:50]}")
+            logger.info(f"Template '{name}' rendered successfully: {post_data.get('title', '')[:50]}")
             
             return final_content
             
         except Exception as e:
-            logger.error(f"Failed to render article template: {e}")
+            logger.error(f"Failed to render template: {e}")
             
             # Fallback to simple HTML
-            return self._create_fallback_content(post_data)
+            return self._create_fallback_content(post_data, content_hash)
     
-    def _create_fallback_content(self, post_data: Dict[str, Any]) -> str:
+    def _create_fallback_content(self, post_data: Dict[str, Any], content_hash: Optional[str] = None) -> str:
         """Create simple fallback content when template rendering fails"""
         title = post_data.get('title', 'Untitled')
         content = post_data.get('content', '')
         summary = post_data.get('summary_ko', '')
         reddit_url = post_data.get('reddit_url', post_data.get('url', ''))
         
-        html_content = self.markdown_to_html(content) if content else ""
+        html_content = self.markdown_to_html(content, content_hash) if content else ""
         
         fallback_html = f"""
 <article class="reddit-fallback">
@@ -276,12 +490,10 @@ class TemplateEngine:
         return self._add_source_attribution(fallback_html, reddit_url)
 
 
-# Singleton instance for MVP
-_template_engine = None
+# Created at import so templates are compiled once in the Celery parent
+# and inherited by forked workers, never on the publish path
+_template_engine = TemplateEngine()
 
 def get_template_engine() -> TemplateEngine:
     """Get singleton template engine instance"""
-    global _template_engine
-    if _template_engine is None:
-        _template_engine = TemplateEngine()
     return _template_engine
\ No newline at end of file
@@ -0,0 +1,149 @@
+"""
+Compiled Handlebars template registry
+
+Compiles every .hbs file under the templates directory and serves the compiled
+pybars functions by name: the path relative to the directory without the
+extension, e.g. "article" or "subreddits/python". Compiled functions are cached
+by (path, mtime, size). A daemon thread polls the files and recompiles changed
+ones in the background, then swaps in a new mapping. Renders never wait on
+compilation and always see a complete set of templates.
+"""
+
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from pybars import Compiler
+
+logger = logging.getLogger(__name__)
+
+TEMPLATE_SUFFIX = ".hbs"
+
+
+class CompiledTemplate(NamedTuple):
+    """A compiled template and the file version it was compiled from"""
+    name: str
+    path: Path
+    stamp: Tuple[int, int]  # (st_mtime_ns, st_size)
+    render: Callable
+
+
+class TemplateRegistry:
+    """Name -> compiled pybars template, hot-reloaded from disk"""
+
+    def __init__(self, templates_dir, reload_interval: float = 0):
+        self.templates_dir = Path(templates_dir)
+        self.reload_interval = reload_interval
+        self._compiler = Compiler()
+        # Serializes compiles (the pybars compiler is not reentrant) and reloads
+        self._compile_lock = threading.Lock()
+        self._templates: Dict[str, CompiledTemplate] = {}
+        self._builtins: Dict[str, Callable] = {}
+        self._failed: Dict[Path, Tuple[int, int]] = {}
+        self._watcher_lock = threading.Lock()
+        self._watcher_pid: Optional[int] = None
+        self._stop = threading.Event()
+
+        self.reload()
+
+    def _scan(self) -> Dict[str, Tuple[Path, Tuple[int, int]]]:
+        found = {}
+        if not self.templates_dir.is_dir():
+            return found
+        for path in sorted(self.templates_dir.rglob(f"*{TEMPLATE_SUFFIX}")):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            name = path.relative_to(self.templates_dir).with_suffix("").as_posix()
+            found[name] = (path, (stat.st_mtime_ns, stat.st_size))
+        return found
+
+    def _compile_file(self, name: str, path: Path, stamp: Tuple[int, int]) -> Optional[CompiledTemplate]:
+        try:
+            source = path.read_text(encoding="utf-8")
+            render = self._compiler.compile(source)
+        except Exception as e:
+            if self._failed.get(path) != stamp:
+                logger.error(f"Failed to compile template {path}: {e}")
+                self._failed[path] = stamp
+            return None
+        self._failed.pop(path, None)
+        return CompiledTemplate(name, path, stamp, render)
+
+    def reload(self) -> List[str]:
+        """Compile new and modified templates, drop deleted ones; returns the names compiled"""
+        with self._compile_lock:
+            current = self._templates
+            updated = {}
+            compiled = []
+
+            for name, (path, stamp) in self._scan().items():
+                entry = current.get(name)
+                if entry is not None and entry.path == path and entry.stamp == stamp:
+                    updated[name] = entry
+                    continue
+
+                new_entry = self._compile_file(name, path, stamp)
+                if new_entry is not None:
+                    updated[name] = new_entry
+                    compiled.append(name)
+                elif entry is not None:
+                    # Keep serving the last version that compiled
+                    updated[name] = entry
+
+            removed = sorted(set(current) - set(updated))
+            if compiled or removed:
+                # Single reference swap: renders see either the old or the new mapping
+                self._templates = updated
+                if compiled:
+                    logger.info(f"Templates compiled: {', '.join(compiled)}")
+                if removed:
+                    logger.info(f"Templates removed: {', '.join(removed)}")
+            return compiled
+
+    def register_builtin(self, name: str, source: str) -> None:
+        """Compile a fallback used while no file with this name exists"""
+        with self._compile_lock:
+            self._builtins[name] = self._compiler.compile(source)
+
+    def _ensure_watcher(self) -> None:
+        # One watcher per process: threads do not survive a prefork
+        if self.reload_interval <= 0 or self._watcher_pid == os.getpid():
+            return
+        with self._watcher_lock:
+            pid = os.getpid()
+            if self._watcher_pid == pid:
+                return
+            self._stop = threading.Event()
+            threading.Thread(target=self._watch, args=(self._stop,), name="template-reloader", daemon=True).start()
+            self._watcher_pid = pid
+
+    def _watch(self, stop: threading.Event) -> None:
+        while not stop.wait(self.reload_interval):
+            try:
+                self.reload()
+            except Exception as e:
+                logger.error(f"Template reload failed: {e}")
+
+    def get(self, name: str) -> Optional[Callable]:
+        """Compiled template by name (file first, then builtin), or None"""
+        self._ensure_watcher()
+        entry = self._templates.get(name)
+        if entry is not None:
+            return entry.render
+        return self._builtins.get(name)
+
+    def has(self, name: str) -> bool:
+        return name in self._templates or name in self._builtins
+
+    def names(self) -> List[str]:
+        """Names of all templates that can be rendered"""
+        return sorted(set(self._templates) | set(self._builtins))
+
+    def close(self) -> None:
+        """Stop the background reloader"""
+        self._stop.set()
+        self._watcher_pid = None